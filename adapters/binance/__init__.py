@@ -4,10 +4,16 @@ Binance package.
 This package contains the implementation of binance adapters.
 """
 
-from .binance_client import BinanceClient
-from .order_manager import OrderManager
+from core.lazy_imports import lazy_module_getattr
+
+__getattr__ = lazy_module_getattr(__name__, {
+    'BinanceClient': '.binance_client',
+    'OrderManager': '.order_manager',
+    'MarketDataCache': '.market_data',
+})
 
 __all__ = [
     'BinanceClient',
     'OrderManager',
+    'MarketDataCache',
 ]
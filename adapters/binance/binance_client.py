@@ -2,18 +2,52 @@ import logging
 import math
 import time
 import pandas as pd
+import requests
 
 from .config import Config
 from binance.client import Client
 from binance.exceptions import BinanceAPIException
+from recording.recorder import get_recorder, recording_client_class
+from core.metrics import metrics_client_class, metrics_enabled
+from core.timing import spans
+
+
+def create_rest_client(config):
+    """
+    python-binance Client'ı oluşturur
+    - config.base_url verilmişse spot (ping / sunucu zamanı) ve futures istekleri bu adrese gider
+      (ör. python -m mock_exchange ile çalışan yerel mock borsa)
+    - SESSION_RECORD_DIR verilmişse tüm istek ve cevaplar oturum kaydına yazılır (python -m recording)
+    - METRICS_PORT verilmişse istek sayısı, süresi, hata ve weight metrikleri tutulur (core.metrics)
+    """
+    client_class = Client
+    if config.base_url:
+        # Client, URL şablonlarını __init__ içinde formatlar ve ilk ping'i orada atar; bu yüzden alt sınıf kullanılır
+        client_class = type('LocalClient', (Client,), {
+            'API_URL': f"{config.base_url}/api",
+            'FUTURES_URL': f"{config.base_url}/fapi",
+            'FUTURES_DATA_URL': f"{config.base_url}/futures/data",
+        })
+        logging.info(f"Binance istekleri {config.base_url} adresine yönlendiriliyor")
+    if get_recorder() is not None:
+        client_class = recording_client_class(client_class)
+    if metrics_enabled():
+        client_class = metrics_client_class(client_class)
+    return client_class(config.api_key, config.api_secret)
 
 
 class BinanceClient:
-    def __init__(self,symbol, timeframe, leverage):
+    def __init__(self,symbol, timeframe, leverage, client=None, market_data=None):
+        """
+        Args:
+            client: Paylaşılan python-binance Client (runner ile aynı süreçte çalışan botlar için)
+            market_data: Paylaşılan MarketDataCache (aynı sembol verisini tek REST çağrısında toplar)
+        """
         try:
             self.config = Config()
             
-            self.client = Client(self.config.api_key, self.config.api_secret)
+            self.client = client if client is not None else create_rest_client(self.config)
+            self.market_data = market_data
                     # List of valid intervals
             self.valid_intervals = ['1m', '3m', '5m', '15m', '30m', '1h', '2h', '4h', '6h', '8h', '12h', '1d', '3d', '1w',
                                     '1M']
@@ -21,12 +55,19 @@ class BinanceClient:
             if timeframe not in self.valid_intervals:
                 raise ValueError(f"Geçersiz zaman aralığı: {timeframe}. Geçerli aralıklar: {self.valid_intervals}")
 
-            # Zaman damgasını otomatik olarak ayarla
-            self.client.time_offset = self.client.get_server_time()['serverTime'] - int(time.time() * 1000)
+            # Zaman damgasını otomatik olarak ayarla (paylaşılan client'ta ölçülmüşse tekrar ölçülmez)
+            self.time_offset = getattr(self.client, 'time_offset', None) if client is not None else None
+            if self.time_offset is None:
+                self.time_offset = self.client.get_server_time()['serverTime'] - int(time.time() * 1000)
+                self.client.time_offset = self.time_offset
             self.symbol = symbol
             self.leverage = leverage
             self.timeframe = timeframe
 
+            # Sembol bilgisi önbelleği ve uygulanan kaldıraç (tekrarlanan REST çağrılarını önlemek için)
+            self._symbol_data = None
+            self._applied_leverage = None
+
             self.set_leverage(self.leverage)
 
         except BinanceAPIException as e:
@@ -36,36 +77,72 @@ class BinanceClient:
             logging.error(f"Bağlantı hatası: {e}")
             raise
 
+    @staticmethod
+    def create_client(pool_size=10):
+        """
+        Birden fazla BinanceClient arasında paylaşılacak python-binance Client'ı oluşturur
+        Args:
+            pool_size: Aynı anda açık tutulabilecek HTTP bağlantı sayısı (bot sayısı kadar olmalı)
+        """
+        config = Config()
+        client = create_rest_client(config)
+        if pool_size > 10:
+            # requests varsayılan havuzu 10 bağlantı; fazlası her istekte yeniden bağlantı açtırır
+            adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            client.session.mount('http://' if config.base_url.startswith('http://') else 'https://', adapter)
+        client.time_offset = client.get_server_time()['serverTime'] - int(time.time() * 1000)
+        return client
+
     def set_leverage(self,leverage):
-        """Leverage ayarını yapar"""
+        """Leverage ayarını yapar (aynı kaldıraç zaten uygulanmışsa API çağrısı yapılmaz)"""
+        if self._applied_leverage == leverage:
+            logging.debug(f"Leverage zaten ayarlı: {leverage}")
+            return
         try:
             self.client.futures_change_leverage(symbol=self.symbol, leverage=leverage)
+            self._applied_leverage = leverage
             logging.info(f"Leverage ayarlandı: {self.leverage}")
         except BinanceAPIException as e:
             logging.error(f"Leverage ayarı hatası: {e}")
 
-    def get_symbol_info(self):
-        """Sembol için minimum miktar, adım boyutu ve fiyat hassasiyetini alır"""
+    def load_symbol_info(self, refresh=False):
+        """Exchange info'dan sembol verisini çeker ve önbelleğe alır"""
+        if self._symbol_data is not None and not refresh:
+            return self._symbol_data
         try:
-            exchange_info = self.client.futures_exchange_info()
+            if self.market_data is not None:
+                exchange_info = self.market_data.get_exchange_info(self.client)
+            else:
+                exchange_info = self.client.futures_exchange_info()
             for symbol_info in exchange_info['symbols']:
                 if symbol_info['symbol'] == self.symbol:
-                    filters = symbol_info['filters']
-                    min_qty, step_size, price_precision = None, None, None
+                    self._symbol_data = symbol_info
+                    break
+        except BinanceAPIException as e:
+            logging.error(f"Sembol bilgisi alınamadı: {e}")
+        return self._symbol_data
 
-                    for filter in filters:
-                        if filter['filterType'] == 'LOT_SIZE':
-                            min_qty = float(filter['minQty'])
-                            step_size = float(filter['stepSize'])
-                        elif filter['filterType'] == 'PRICE_FILTER':
-                            price_precision = float(filter['tickSize'])  # Fiyat hassasiyeti
+    def get_symbol_data(self):
+        """Önbellekteki ham sembol verisini döndürür (filtreler dahil)"""
+        return self.load_symbol_info()
 
-                    return min_qty, step_size, price_precision
+    def get_symbol_info(self):
+        """Sembol için minimum miktar, adım boyutu ve fiyat hassasiyetini alır"""
+        symbol_info = self.load_symbol_info()
+        if symbol_info is None:
+            return None, None, None
 
-        except BinanceAPIException as e:
-            logging.error(f"Sembol bilgisi alınamadı: {e}")
+        filters = symbol_info['filters']
+        min_qty, step_size, price_precision = None, None, None
+
+        for filter in filters:
+            if filter['filterType'] == 'LOT_SIZE':
+                min_qty = float(filter['minQty'])
+                step_size = float(filter['stepSize'])
+            elif filter['filterType'] == 'PRICE_FILTER':
+                price_precision = float(filter['tickSize'])  # Fiyat hassasiyeti
 
-        return None, None, None
+        return min_qty, step_size, price_precision
 
     def adjust_quantity(self, quantity):
         """İşlem miktarını adım boyutuna uygun şekilde yuvarlar"""
@@ -102,20 +179,27 @@ class BinanceClient:
     def fetch_current_price(self):
         """Mevcut piyasa fiyatını alır"""
         try:
-            ticker = self.client.futures_symbol_ticker(symbol=self.symbol)
+            if self.market_data is not None:
+                ticker = self.market_data.get_ticker(self.client, self.symbol)
+            else:
+                ticker = self.client.futures_symbol_ticker(symbol=self.symbol)
             return float(ticker['price'])
         except BinanceAPIException as e:
             logging.error(f"Mevcut fiyat alınamadı: {e}")
             return None
         
+    @spans.timed()
     def fetch_data(self):
         """Binance'ten geçmiş fiyat verilerini çeker"""
         try:
-            klines = self.client.futures_klines(
-                symbol=self.symbol,
-                interval=self.timeframe,
-                limit=100
-            )
+            if self.market_data is not None:
+                klines = self.market_data.get_klines(self.client, self.symbol, self.timeframe, limit=100)
+            else:
+                klines = self.client.futures_klines(
+                    symbol=self.symbol,
+                    interval=self.timeframe,
+                    limit=100
+                )
 
             df = pd.DataFrame(klines, columns=[
                 'Open time', 'Open', 'High', 'Low', 'Close', 'Volume',
@@ -1,5 +1,10 @@
+import os
+
+
 class Config:
     
     def __init__(self):
         self.api_key = 'o9m9CWJsKFixP1ubHTQqHFqcUloHxMYiPmDqSdG7gdnEeZneRh8fxWfWARAVDMPN'
-        self.api_secret = 'acG6DWoiNrngDEUK2Jexnn0ol2WT5uvwSWCCJz5luiGLMGNeQXtNMB8YmTbhwApa'
\ No newline at end of file
+        self.api_secret = 'acG6DWoiNrngDEUK2Jexnn0ol2WT5uvwSWCCJz5luiGLMGNeQXtNMB8YmTbhwApa'
+        # Boş değilse tüm REST istekleri bu adrese gider (ör. yerel mock borsa: http://127.0.0.1:8800)
+        self.base_url = os.getenv('BINANCE_BASE_URL', '').rstrip('/')
\ No newline at end of file
@@ -0,0 +1,80 @@
+import logging
+import threading
+import time
+
+from recording.recorder import get_recorder
+
+
+class MarketDataCache:
+    """
+    Aynı süreçte çalışan botlar arasında paylaşılan piyasa verisi önbelleği
+    - Aynı sembol/timeframe için kısa süre içinde gelen kline isteklerini tek REST çağrısında birleştirir
+    - Mevcut fiyat (ticker) ve exchange info istekleri için de aynı şekilde çalışır
+    - Hatalı çağrılar önbelleğe alınmaz, bir sonraki istekte tekrar denenir
+    """
+
+    def __init__(self, ttl=5, exchange_info_ttl=3600):
+        self.ttl = ttl  # Saniye cinsinden geçerlilik süresi
+        self.exchange_info_ttl = exchange_info_ttl  # Exchange info nadiren değişir
+        self._entries = {}  # anahtar: (alınma zamanı, değer)
+        self._key_locks = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key, fetch, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Aynı anahtar için eşzamanlı istekler tek bir REST çağrısını bekler
+        with key_lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < ttl:
+                self.hits += 1
+                return entry[1]
+
+            value = fetch()
+            self._entries[key] = (time.monotonic(), value)
+            self.misses += 1
+            return value
+
+    def put_klines(self, symbol, interval, limit, klines):
+        """Dışarıdan (ör. koordinatör süreci) gelen kline verisini önbelleğe yazar"""
+        recorder = get_recorder()
+        if recorder is not None:
+            recorder.stream('klines', {'symbol': symbol, 'interval': interval, 'limit': limit, 'data': klines})
+        self._entries[('klines', symbol, interval, limit)] = (time.monotonic(), klines)
+
+    def get_klines(self, client, symbol, interval, limit=100):
+        """Futures kline verisini döndürür (önbellekte güncel veri yoksa REST'ten çeker)"""
+        return self._get(
+            ('klines', symbol, interval, limit),
+            lambda: client.futures_klines(symbol=symbol, interval=interval, limit=limit)
+        )
+
+    def get_ticker(self, client, symbol):
+        """Futures sembol fiyatını döndürür"""
+        ticker = self._get(('ticker', symbol), lambda: client.futures_symbol_ticker(symbol=symbol))
+        return dict(ticker)
+
+    def get_exchange_info(self, client):
+        """Futures exchange info verisini döndürür (tüm semboller tek çağrıda gelir)"""
+        return self._get(('exchange_info',), client.futures_exchange_info, ttl=self.exchange_info_ttl)
+
+    def kline_ages(self):
+        """Önbellekteki kline verilerinin yaşı (saniye): {(sembol, timeframe): yaş}"""
+        now = time.monotonic()
+        return {(key[1], key[2]): now - fetched for key, (fetched, _) in list(self._entries.items())
+                if key[0] == 'klines'}
+
+    def stats(self):
+        """Önbellek isabet istatistiklerini döndürür"""
+        total = self.hits + self.misses
+        hit_rate = self.hits / total * 100 if total else 0.0
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': round(hit_rate, 1)}
+
+    def log_stats(self):
+        stats = self.stats()
+        logging.info(f"Piyasa verisi önbelleği: {stats['hits']} isabet, {stats['misses']} REST çağrısı "
+                     f"(%{stats['hit_rate']} isabet)")
@@ -1,6 +1,8 @@
 import logging
 from binance.exceptions import BinanceAPIException
 import time
+from core.order_latency import order_latency
+from core.timing import spans
 
 class OrderManager:
     def __init__(self, client, symbol):
@@ -30,7 +32,10 @@ class OrderManager:
             if take_profit:
                 order_params['takeProfitPrice'] = take_profit
 
+            # Emir yaşam döngüsü: gönderim ve borsa onayı (process_signal izi varsa)
+            order_latency.order_event(type, 'submit')
             order = self.client.futures_create_order(**order_params)
+            order_latency.order_event(type, 'ack')
             self.active_orders[order['orderId']] = order
 
             # Emir ilişkilerini kaydet
@@ -124,6 +129,7 @@ class OrderManager:
         except Exception as e:
             logging.error(f"İlişkili emirleri iptal hatası: {e}")
 
+    @spans.timed('execute_trade.fill_wait')
     def monitor_order_status(self, order_id, max_wait=30, check_interval=5):
         """Emir durumunu sürekli kontrol eder ve ilişkili emirleri yönetir"""
         start_time = time.time()
@@ -134,6 +140,7 @@ class OrderManager:
                     return False
 
                 if order_status['status'] == 'FILLED':
+                    order_latency.mark('fill')
                     # Emir gerçekleştiyse ilişkili emirleri kontrol et ve iptal et
                     self.cancel_related_orders(order_id)
                     return True
@@ -154,6 +161,7 @@ class OrderManager:
             except BinanceAPIException as e:
                 if e.code == -2011:  # Unknown order
                     logging.info(f"Emir zaten gerçekleşmiş veya iptal edilmiş: {order_id}")
+                    order_latency.mark('fill')
                     return True
                 else:
                     logging.error(f"Emir durumu kontrol hatası: {e}")
@@ -161,6 +169,7 @@ class OrderManager:
 
         return False
 
+    @spans.timed('execute_trade.order')
     def create_order_with_retry(self, side, type, quantity, price=None, stop_price=None, take_profit=None,
                                 parent_order_id=None, max_retries=None):
         """Emri birkaç kez deneyerek oluşturur"""
@@ -202,6 +211,7 @@ class OrderManager:
 
         return None
 
+    @spans.timed('execute_trade.verify_position')
     def verify_position(self, expected_side, expected_quantity, max_retries=3):
         """Pozisyonu doğrular"""
         for attempt in range(max_retries):
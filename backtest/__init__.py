@@ -0,0 +1,33 @@
+"""
+Backtest package.
+
+Yerel mum deposundan okunan geçmiş veri üzerinde strateji sinyallerini
+vektörel olarak hesaplayıp botların TP/SL ve sinyal onay kurallarıyla
+işlemleri simüle eden araçlar.
+"""
+
+from .candle_store import CandleStore, resample
+from .strategies import StrategyAdapter, STRATEGY_NAMES
+from .engine import VectorizedBacktester, BacktestResult, simulate_trades
+from .intrabar import IntrabarBacktester
+from .optimizer import ParameterSpace, ParameterSweep
+from .walkforward import WalkForwardOptimizer
+from .portfolio import PortfolioBacktester, PortfolioResult
+from .montecarlo import MonteCarloSimulator
+
+__all__ = [
+    'CandleStore',
+    'resample',
+    'StrategyAdapter',
+    'STRATEGY_NAMES',
+    'VectorizedBacktester',
+    'BacktestResult',
+    'simulate_trades',
+    'IntrabarBacktester',
+    'ParameterSpace',
+    'ParameterSweep',
+    'WalkForwardOptimizer',
+    'PortfolioBacktester',
+    'PortfolioResult',
+    'MonteCarloSimulator',
+]
@@ -0,0 +1,378 @@
+"""
+Backtest komut satırı aracı
+
+Kullanım:
+    python -m backtest download BTCUSDT --start 2024-01-01            # 1m veriyi data/candles altına indirir
+    python -m backtest import BTCUSDT BTCUSDT-1m-2024-01.csv          # CSV'den veri aktarır
+    python -m backtest run BTCUSDT --strategy psar_atr_strategy --timeframe 15m --start 2024-01-01
+    python -m backtest run BTCUSDT --strategy all --timeframe 1m --trades-csv trades.csv
+    python -m backtest run BTCUSDT --strategy all --timeframe 15m --mode intrabar   # 1m adımlı simülasyon
+    python -m backtest sweep BTCUSDT --strategy psar_atr_strategy --param zone_length=8:20:2 \
+        --param zone_multiplier=2.0,2.5,3.0 --param take_profit_percent=0.004:0.01:0.002 --output sweep.csv
+    python -m backtest sweep BTCUSDT --strategy atr_strategy --param key_value=1:4:0.5 \
+        --param atr_period=5:30:1 --method bayes --samples 60
+    python -m backtest walkforward BTCUSDT --train 90d --test 30d    # tek sembol walk-forward
+    python -m backtest walkforward --update --time-budget 3000       # main_*.py sembolleri (gece çalışması)
+    python -m backtest portfolio --balance 1000 --leverage 10 --max-positions 5   # ortak bakiyeli portföy testi
+    python -m backtest montecarlo --simulations 100000 --leverage 1,5,10           # logs/ pozisyon loglarından risk
+    python -m backtest montecarlo --trades-csv trades.csv --method shuffle
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+
+from backtest.candle_store import CandleStore, resample
+from backtest.engine import VectorizedBacktester
+from backtest.intrabar import IntrabarBacktester
+from backtest.montecarlo import MonteCarloSimulator, format_report, load_position_logs, load_trades_csv
+from backtest.optimizer import METRICS, ParameterSpace, ParameterSweep
+from backtest.portfolio import PortfolioBacktester
+from backtest.walkforward import WalkForwardOptimizer, discover_symbols, write_report
+from backtest.strategies import STRATEGY_NAMES
+
+
+def cmd_download(args, store):
+    from adapters.binance.binance_client import BinanceClient
+
+    client = BinanceClient.create_client()
+    added = store.download(client, args.symbol, args.interval, args.start, args.end)
+    print(f"{args.symbol} {args.interval}: {added} yeni mum eklendi -> {store.path(args.symbol, args.interval)}")
+
+
+def cmd_import(args, store):
+    count = store.import_csv(args.symbol, args.interval, args.csv)
+    print(f"{args.symbol} {args.interval}: {count} satır aktarıldı -> {store.path(args.symbol, args.interval)}")
+
+
+def cmd_run(args, store):
+    df = store.load(args.symbol, args.data_interval, args.start, args.end)
+    if args.mode == 'vectorized' and args.timeframe != args.data_interval:
+        df = resample(df, args.timeframe)
+    if args.mode == 'intrabar' and args.data_interval != '1m':
+        raise SystemExit("intrabar modu 1m veri gerektirir (--data-interval 1m)")
+
+    strategies = STRATEGY_NAMES if args.strategy == 'all' else [args.strategy]
+    overrides = json.loads(args.params) if args.params else None
+
+    results = []
+    for name in strategies:
+        if args.mode == 'intrabar':
+            backtester = IntrabarBacktester(
+                name, timeframe=args.timeframe, trade_amount=args.amount, commission=args.commission,
+                initial_balance=args.balance, overrides=overrides, slippage=args.slippage
+            )
+        else:
+            backtester = VectorizedBacktester(
+                name, timeframe=args.timeframe, trade_amount=args.amount, commission=args.commission,
+                initial_balance=args.balance, overrides=overrides, confirmation=not args.no_confirmation
+            )
+        result = backtester.run(df, symbol=args.symbol)
+        results.append(result)
+        print(result.summary())
+
+        if args.trades_csv:
+            path = args.trades_csv
+            if len(strategies) > 1:
+                root, ext = os.path.splitext(path)
+                path = f"{root}_{name}{ext or '.csv'}"
+            result.trades.to_csv(path, index=False)
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump([result.stats() for result in results], f, indent=2, ensure_ascii=False)
+
+
+def cmd_sweep(args, store):
+    df = store.load(args.symbol, args.data_interval, args.start, args.end)
+    if args.mode == 'vectorized' and args.timeframe != args.data_interval:
+        df = resample(df, args.timeframe)
+    if args.mode == 'intrabar' and args.data_interval != '1m':
+        raise SystemExit("intrabar modu 1m veri gerektirir (--data-interval 1m)")
+
+    space = ParameterSpace.from_specs(args.param)
+    sweep = ParameterSweep(
+        df, args.strategy, space, symbol=args.symbol, timeframe=args.timeframe, method=args.method,
+        samples=args.samples, workers=args.workers, metric=args.metric, min_trades=args.min_trades,
+        mode=args.mode, seed=args.seed, cache_dir=args.cache_dir, trade_amount=args.amount,
+        commission=args.commission, initial_balance=args.balance
+    )
+    table = sweep.run()
+    if table.empty:
+        print("Sonuç yok")
+        return
+
+    columns = ['rank'] + space.names + ['trades', 'win_rate', 'total_pnl', 'profit_factor', 'max_drawdown_pct']
+    print(table[columns].head(args.top).to_string(index=False))
+    if args.output:
+        table.to_csv(args.output, index=False)
+        print(f"{len(table)} sonuç yazıldı -> {args.output}")
+
+
+def cmd_walkforward(args, store):
+    if args.symbols:
+        targets = [(symbol, args.timeframe or '15m') for symbol in args.symbols]
+    else:
+        targets = [(symbol, args.timeframe or timeframe) for symbol, timeframe in discover_symbols(args.root)]
+    if not targets:
+        raise SystemExit("Sembol bulunamadı (sembol verin veya main_*.py dosyalarının olduğu klasörü --root ile seçin)")
+
+    client = None
+    if args.update:
+        from adapters.binance.binance_client import BinanceClient
+        client = BinanceClient.create_client()
+
+    space = ParameterSpace.from_specs(args.param) if args.param else None
+    deadline = time.monotonic() + args.time_budget if args.time_budget else None
+    failed = []
+
+    for symbol, timeframe in targets:
+        if deadline is not None and time.monotonic() >= deadline:
+            logging.warning(f"Süre sınırı doldu, {symbol} atlandı")
+            failed.append(symbol)
+            continue
+        try:
+            if client is not None:
+                latest = store.latest_open_time(symbol, args.data_interval)
+                if latest is None:
+                    logging.warning(f"{symbol}: depoda veri yok, önce 'download --start' ile indirin")
+                    failed.append(symbol)
+                    continue
+                store.download(client, symbol, args.data_interval, latest + 1)
+
+            df = store.load(symbol, args.data_interval, args.start, args.end)
+            if timeframe != args.data_interval:
+                df = resample(df, timeframe)
+
+            optimizer = WalkForwardOptimizer(
+                df, args.strategy, space, symbol=symbol, timeframe=timeframe, train=args.train, test=args.test,
+                step=args.step, anchored=args.anchored, method=args.method, samples=args.samples,
+                workers=args.workers, metric=args.metric, min_trades=args.min_trades, seed=args.seed,
+                cache_dir=args.output_dir, trade_amount=args.amount, commission=args.commission,
+                initial_balance=args.balance
+            )
+            report = optimizer.run(deadline=deadline)
+        except (FileNotFoundError, ValueError) as e:
+            logging.error(f"{symbol} walk-forward hatası: {e}")
+            failed.append(symbol)
+            continue
+
+        path = write_report(report, args.output_dir)
+        oos, baseline = report['out_of_sample'], report['baseline_out_of_sample']
+        print(f"{symbol} {args.strategy} ({timeframe}): önerilen {report['recommended_params']} | "
+              f"OOS {oos['windows']} pencere, {oos['trades']} işlem, PnL {oos['total_pnl']:.2f} "
+              f"(mevcut config {baseline['total_pnl']:.2f}) -> {path}")
+
+    if failed:
+        print(f"Tamamlanamayan semboller: {', '.join(failed)}")
+
+
+def cmd_portfolio(args, store):
+    symbols = args.symbols or [symbol for symbol, _ in discover_symbols(args.root)]
+    if not symbols:
+        raise SystemExit("Sembol bulunamadı (sembol verin veya main_*.py dosyalarının olduğu klasörü --root ile seçin)")
+
+    data = {}
+    for symbol in symbols:
+        try:
+            df = store.load(symbol, args.data_interval, args.start, args.end)
+        except FileNotFoundError as e:
+            logging.warning(f"{symbol} atlandı: {e}")
+            continue
+        data[symbol] = resample(df, args.timeframe) if args.timeframe != args.data_interval else df
+
+    symbol_overrides = {}
+    if args.recommended:
+        # walkforward çıktısındaki sembol bazında önerilen parametreler
+        with open(args.recommended, 'r', encoding='utf-8') as f:
+            recommended = json.load(f)
+        for symbol, strategies in recommended.items():
+            params = strategies.get(args.strategy, {}).get('params')
+            if params:
+                symbol_overrides[symbol] = params
+
+    backtester = PortfolioBacktester(
+        args.strategy, timeframe=args.timeframe, trade_amount=args.amount, leverage=args.leverage,
+        initial_balance=args.balance, max_positions=args.max_positions, commission=args.commission,
+        overrides=json.loads(args.params) if args.params else None, symbol_overrides=symbol_overrides,
+        confirmation=not args.no_confirmation
+    )
+    result = backtester.run(data)
+    print(result.summary())
+    print(result.per_symbol().to_string(index=False))
+
+    if args.trades_csv:
+        result.trades.to_csv(args.trades_csv, index=False)
+    if args.equity_csv:
+        result.equity.to_csv(args.equity_csv, index=False)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({**result.stats(), 'per_symbol': result.per_symbol().to_dict('records')}, f,
+                      indent=2, ensure_ascii=False)
+
+
+def cmd_montecarlo(args, store):
+    if args.trades_csv:
+        groups = {os.path.splitext(os.path.basename(path))[0]: load_trades_csv(path) for path in args.trades_csv}
+        # Backtest getirileri komisyon sonrasıdır
+        commission = args.commission if args.commission is not None else 0.0
+    else:
+        groups = load_position_logs(args.logs_dir, by_symbol=args.by_symbol)
+        commission = args.commission if args.commission is not None else 0.0004
+    if not groups:
+        raise SystemExit(f"İşlem bulunamadı ({args.logs_dir} altında pozisyon logu yok, --trades-csv verin)")
+
+    leverages = [float(value) if '.' in value else int(value) for value in args.leverage.split(',')]
+    reports = {}
+    for name, returns in groups.items():
+        simulator = MonteCarloSimulator(
+            returns, method=args.method, simulations=args.simulations, trades=args.trades,
+            initial_balance=args.balance, trade_amount=args.amount, leverages=leverages, ruin_level=args.ruin,
+            commission=commission, compound=args.compound, seed=args.seed
+        )
+        reports[name] = simulator.run()
+        print(format_report(name, reports[name]))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(reports, f, indent=2, ensure_ascii=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stratejiler için geçmiş veri testi")
+    parser.add_argument('--data-dir', default=os.path.join('data', 'candles'), help="Mum deposu klasörü")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    download = subparsers.add_parser('download', help="Binance Futures'tan mum verisi indirir")
+    download.add_argument('symbol')
+    download.add_argument('--interval', default='1m')
+    download.add_argument('--start', required=True)
+    download.add_argument('--end')
+
+    import_csv = subparsers.add_parser('import', help="CSV dosyasından mum verisi aktarır")
+    import_csv.add_argument('symbol')
+    import_csv.add_argument('csv')
+    import_csv.add_argument('--interval', default='1m')
+
+    run = subparsers.add_parser('run', help="Backtest çalıştırır")
+    run.add_argument('symbol')
+    run.add_argument('--strategy', default='psar_atr_strategy', choices=list(STRATEGY_NAMES) + ['all'])
+    run.add_argument('--timeframe', default='15m', help="Strateji timeframe'i")
+    run.add_argument('--data-interval', default='1m', help="Depodaki verinin interval'i")
+    run.add_argument('--mode', default='vectorized', choices=['vectorized', 'intrabar'],
+                     help="vectorized: mum kapanışlarıyla, intrabar: 1m adımlarla olay tabanlı simülasyon")
+    run.add_argument('--start')
+    run.add_argument('--end')
+    run.add_argument('--amount', type=float, default=100, help="İşlem başına pozisyon büyüklüğü (USDT)")
+    run.add_argument('--balance', type=float, default=1000, help="Drawdown hesabı için başlangıç bakiyesi")
+    run.add_argument('--commission', type=float, default=0.0004, help="Giriş ve çıkışta ayrı uygulanan komisyon")
+    run.add_argument('--slippage', type=float, default=0.0, help="intrabar modunda market emir kayması")
+    run.add_argument('--params', help='Config değerlerini değiştirmek için JSON, ör. \'{"zone_multiplier": 2.5}\'')
+    run.add_argument('--no-confirmation', action='store_true', help="Sinyal onay beklemesini kapatır")
+    run.add_argument('--trades-csv', help="İşlem listesinin yazılacağı CSV dosyası")
+    run.add_argument('--json', help="İstatistiklerin yazılacağı JSON dosyası")
+
+    sweep = subparsers.add_parser('sweep', help="Config parametreleri için paralel tarama / optimizasyon")
+    sweep.add_argument('symbol')
+    sweep.add_argument('--strategy', default='psar_atr_strategy', choices=list(STRATEGY_NAMES))
+    sweep.add_argument('--param', action='append', required=True,
+                       help="Taranacak parametre: ad=v1,v2,v3 veya ad=başlangıç:bitiş:adım (tekrarlanabilir)")
+    sweep.add_argument('--method', default='grid', choices=['grid', 'random', 'bayes'])
+    sweep.add_argument('--samples', type=int, default=50, help="random/bayes için denenecek set sayısı")
+    sweep.add_argument('--workers', type=int, help="Worker süreç sayısı (varsayılan: CPU sayısı)")
+    sweep.add_argument('--metric', default='total_pnl', choices=list(METRICS), help="Sıralama metriği")
+    sweep.add_argument('--min-trades', type=int, default=1, help="Daha az işlem yapan setler sona atılır")
+    sweep.add_argument('--timeframe', default='15m')
+    sweep.add_argument('--data-interval', default='1m')
+    sweep.add_argument('--mode', default='vectorized', choices=['vectorized', 'intrabar'])
+    sweep.add_argument('--start')
+    sweep.add_argument('--end')
+    sweep.add_argument('--amount', type=float, default=100)
+    sweep.add_argument('--balance', type=float, default=1000)
+    sweep.add_argument('--commission', type=float, default=0.0004)
+    sweep.add_argument('--seed', type=int)
+    sweep.add_argument('--cache-dir', default=os.path.join('data', 'sweeps'), help="Sonuç önbelleği klasörü")
+    sweep.add_argument('--top', type=int, default=20, help="Ekrana yazılacak sonuç sayısı")
+    sweep.add_argument('--output', help="Sıralı sonuç tablosunun yazılacağı CSV dosyası")
+
+    walkforward = subparsers.add_parser('walkforward', help="Walk-forward optimizasyon ve önerilen config")
+    walkforward.add_argument('symbols', nargs='*', help="Semboller (boşsa main_*.py dosyalarından okunur)")
+    walkforward.add_argument('--root', default='.', help="main_*.py dosyalarının bulunduğu klasör")
+    walkforward.add_argument('--strategy', default=os.getenv('STRATEGY', 'psar_atr_strategy'),
+                             choices=list(STRATEGY_NAMES))
+    walkforward.add_argument('--param', action='append',
+                             help="Taranacak parametre (boşsa stratejinin varsayılan arama uzayı)")
+    walkforward.add_argument('--train', default='90d', help="Eğitim penceresi (ör. 90d veya mum sayısı)")
+    walkforward.add_argument('--test', default='30d', help="Test penceresi")
+    walkforward.add_argument('--step', help="Pencere kaydırma adımı (varsayılan: test uzunluğu)")
+    walkforward.add_argument('--anchored', action='store_true', help="Eğitim her zaman verinin başından başlar")
+    walkforward.add_argument('--method', default='grid', choices=['grid', 'random'])
+    walkforward.add_argument('--samples', type=int, default=100)
+    walkforward.add_argument('--workers', type=int)
+    walkforward.add_argument('--metric', default='total_pnl', choices=list(METRICS))
+    walkforward.add_argument('--min-trades', type=int, default=5)
+    walkforward.add_argument('--timeframe', help="Strateji timeframe'i (varsayılan: main_*.py'deki değer)")
+    walkforward.add_argument('--data-interval', default='1m')
+    walkforward.add_argument('--start')
+    walkforward.add_argument('--end')
+    walkforward.add_argument('--amount', type=float, default=100)
+    walkforward.add_argument('--balance', type=float, default=1000)
+    walkforward.add_argument('--commission', type=float, default=0.0004)
+    walkforward.add_argument('--seed', type=int)
+    walkforward.add_argument('--time-budget', type=float, help="Tüm semboller için toplam süre sınırı (saniye)")
+    walkforward.add_argument('--update', action='store_true', help="Önce depodaki veriyi Binance'ten günceller")
+    walkforward.add_argument('--output-dir', default=os.path.join('data', 'walkforward'),
+                             help="Rapor ve önbellek klasörü")
+
+    portfolio = subparsers.add_parser('portfolio', help="Ortak bakiye ve marjinle çoklu sembol backtesti")
+    portfolio.add_argument('symbols', nargs='*', help="Semboller (boşsa main_*.py dosyalarından okunur)")
+    portfolio.add_argument('--root', default='.', help="main_*.py dosyalarının bulunduğu klasör")
+    portfolio.add_argument('--strategy', default=os.getenv('STRATEGY', 'psar_atr_strategy'),
+                           choices=list(STRATEGY_NAMES))
+    portfolio.add_argument('--timeframe', default='15m')
+    portfolio.add_argument('--data-interval', default='1m')
+    portfolio.add_argument('--start')
+    portfolio.add_argument('--end')
+    portfolio.add_argument('--amount', type=float, default=float(os.getenv('TRADE_AMOUNT', 100)),
+                           help="İşlem başına nominal pozisyon (TRADE_AMOUNT)")
+    portfolio.add_argument('--leverage', type=int, default=int(os.getenv('LEVERAGE', 10)))
+    portfolio.add_argument('--balance', type=float, default=1000, help="Ortak cüzdan başlangıç bakiyesi")
+    portfolio.add_argument('--max-positions', type=int, help="Eşzamanlı açık pozisyon limiti")
+    portfolio.add_argument('--commission', type=float, default=0.0004)
+    portfolio.add_argument('--params', help="Tüm semboller için Config değerleri (JSON)")
+    portfolio.add_argument('--recommended', help="walkforward recommended_configs.json (sembol bazında parametreler)")
+    portfolio.add_argument('--no-confirmation', action='store_true')
+    portfolio.add_argument('--trades-csv')
+    portfolio.add_argument('--equity-csv', help="Mum bazında bakiye / marjin / pozisyon sayısı")
+    portfolio.add_argument('--json')
+
+    montecarlo = subparsers.add_parser('montecarlo', help="İşlem sırası yeniden örnekleme ile risk tahmini")
+    montecarlo.add_argument('--trades-csv', action='append', help="Backtest işlem CSV'si (tekrarlanabilir)")
+    montecarlo.add_argument('--logs-dir', default='logs', help="Bot pozisyon loglarının klasörü")
+    montecarlo.add_argument('--by-symbol', action='store_true', help="Loglar strateji yerine sembol bazında")
+    montecarlo.add_argument('--method', default='bootstrap', choices=['bootstrap', 'shuffle'])
+    montecarlo.add_argument('--simulations', type=int, default=10000)
+    montecarlo.add_argument('--trades', type=int, help="Simülasyon başına işlem sayısı (bootstrap)")
+    montecarlo.add_argument('--leverage', default='1', help="Virgülle ayrılmış kaldıraçlar, ör. 1,5,10")
+    montecarlo.add_argument('--amount', type=float, default=100, help="İşlem başına marjin (USDT)")
+    montecarlo.add_argument('--balance', type=float, default=1000)
+    montecarlo.add_argument('--ruin', type=float, default=0.5, help="İflas seviyesi (başlangıç bakiyesinin oranı)")
+    montecarlo.add_argument('--commission', type=float,
+                            help="Giriş ve çıkışta düşülecek komisyon (varsayılan: pozisyon loglarında 0.0004, "
+                                 "backtest CSV'sinde 0)")
+    montecarlo.add_argument('--compound', action='store_true', help="Marjin bakiyeyle orantılı büyür")
+    montecarlo.add_argument('--seed', type=int)
+    montecarlo.add_argument('--json')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    store = CandleStore(args.data_dir)
+    {'download': cmd_download, 'import': cmd_import, 'run': cmd_run, 'sweep': cmd_sweep,
+     'walkforward': cmd_walkforward, 'portfolio': cmd_portfolio,
+     'montecarlo': cmd_montecarlo}[args.command](args, store)
+
+
+if __name__ == "__main__":
+    main()
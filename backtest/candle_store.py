@@ -0,0 +1,246 @@
+import logging
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+# Binance interval -> milisaniye
+INTERVAL_MS = {
+    '1m': 60_000, '3m': 180_000, '5m': 300_000, '15m': 900_000, '30m': 1_800_000,
+    '1h': 3_600_000, '2h': 7_200_000, '4h': 14_400_000, '6h': 21_600_000,
+    '8h': 28_800_000, '12h': 43_200_000, '1d': 86_400_000,
+}
+
+
+def interval_ms(interval):
+    """Binance interval metnini milisaniyeye çevirir"""
+    if interval not in INTERVAL_MS:
+        raise ValueError(f"Desteklenmeyen interval: {interval}")
+    return INTERVAL_MS[interval]
+
+
+def to_ms(value):
+    """Tarih metni / datetime / milisaniye değerini milisaniyeye çevirir"""
+    if value is None:
+        return None
+    if isinstance(value, (int, np.integer)):
+        return int(value)
+    return int(pd.Timestamp(value).timestamp() * 1000)
+
+
+def candles_to_frame(open_time, open_, high, low, close, volume):
+    """Dizileri BinanceClient.fetch_data ile aynı formatta DataFrame'e çevirir"""
+    df = pd.DataFrame({
+        'Open time': np.asarray(open_time, dtype=np.int64),
+        'Open': np.asarray(open_, dtype=float),
+        'High': np.asarray(high, dtype=float),
+        'Low': np.asarray(low, dtype=float),
+        'Close': np.asarray(close, dtype=float),
+        'Volume': np.asarray(volume, dtype=float),
+    })
+    df['datetime'] = pd.to_datetime(df['Open time'], unit='ms')
+    df['hl2'] = (df['High'] + df['Low']) / 2
+    return df
+
+
+def resample(df, interval):
+    """
+    Mum verisini daha büyük bir timeframe'e çevirir (ör. 1m -> 15m)
+    - Sonda henüz tamamlanmamış mum varsa atılır
+    """
+    step = interval_ms(interval)
+    open_time = df['Open time'].to_numpy(dtype=np.int64)
+    if len(open_time) == 0:
+        return df.copy()
+
+    bucket = open_time // step * step
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], len(bucket)] - 1
+
+    high = np.maximum.reduceat(df['High'].to_numpy(dtype=float), starts)
+    low = np.minimum.reduceat(df['Low'].to_numpy(dtype=float), starts)
+    volume = np.add.reduceat(df['Volume'].to_numpy(dtype=float), starts)
+    result = candles_to_frame(
+        bucket[starts], df['Open'].to_numpy(dtype=float)[starts], high, low,
+        df['Close'].to_numpy(dtype=float)[ends], volume
+    )
+
+    # Son mumun kapanışı henüz gelmediyse (kaynak verinin son mumu kovanın sonuna ulaşmadıysa) at
+    source_step = int(np.median(np.diff(open_time))) if len(open_time) > 1 else step
+    if open_time[-1] + source_step < bucket[-1] + step:
+        result = result.iloc[:-1].reset_index(drop=True)
+    return result
+
+
+class CandleStore:
+    """
+    Geçmiş mum verisi için yerel depo
+    - Her sembol/interval için tek bir sıkıştırılmış numpy dosyası tutar (data/candles/BTCUSDT_1m.npz)
+    - Binance'ten sayfalı indirme ve mevcut veriye ekleme (tekrarlanan mumlar atılır)
+    - Verilen tarih aralığını fetch_data ile aynı kolonlara sahip DataFrame olarak döndürür
+    """
+
+    FIELDS = ('open_time', 'open', 'high', 'low', 'close', 'volume')
+
+    def __init__(self, root=os.path.join('data', 'candles')):
+        self.root = root
+
+    def path(self, symbol, interval):
+        return os.path.join(self.root, f"{symbol.upper()}_{interval}.npz")
+
+    def exists(self, symbol, interval):
+        return os.path.exists(self.path(symbol, interval))
+
+    def symbols(self, interval):
+        """Depoda verilen interval için verisi bulunan semboller"""
+        if not os.path.isdir(self.root):
+            return []
+        suffix = f"_{interval}.npz"
+        return sorted(name[:-len(suffix)] for name in os.listdir(self.root) if name.endswith(suffix))
+
+    def latest_open_time(self, symbol, interval):
+        """Depodaki son mumun açılış zamanı (ms), veri yoksa None"""
+        arrays = self._read_arrays(symbol, interval)
+        if arrays is None or not len(arrays['open_time']):
+            return None
+        return int(arrays['open_time'][-1])
+
+    def _read_arrays(self, symbol, interval):
+        path = self.path(symbol, interval)
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as data:
+            return {field: data[field] for field in self.FIELDS}
+
+    def _write_arrays(self, symbol, interval, arrays):
+        os.makedirs(self.root, exist_ok=True)
+        path = self.path(symbol, interval)
+        # Yarım yazılmış dosya kalmaması için önce geçici dosyaya yaz
+        tmp_path = f"{path}.tmp.npz"
+        np.savez_compressed(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+
+    def save(self, symbol, interval, df):
+        """fetch_data formatındaki DataFrame'i depoya yazar (mevcut veriyle birleştirir)"""
+        self._merge(symbol, interval, {
+            'open_time': df['Open time'].to_numpy(dtype=np.int64),
+            'open': df['Open'].to_numpy(dtype=float),
+            'high': df['High'].to_numpy(dtype=float),
+            'low': df['Low'].to_numpy(dtype=float),
+            'close': df['Close'].to_numpy(dtype=float),
+            'volume': df['Volume'].to_numpy(dtype=float),
+        })
+
+    def _klines_to_arrays(self, klines):
+        rows = np.array([k[:6] for k in klines], dtype=float)
+        return {
+            'open_time': rows[:, 0].astype(np.int64),
+            'open': rows[:, 1],
+            'high': rows[:, 2],
+            'low': rows[:, 3],
+            'close': rows[:, 4],
+            'volume': rows[:, 5],
+        }
+
+    def append_klines(self, symbol, interval, klines):
+        """Binance kline listesini (futures_klines çıktısı) depoya ekler, eklenen mum sayısını döndürür"""
+        if not klines:
+            return 0
+        return self._merge(symbol, interval, self._klines_to_arrays(klines))
+
+    def _merge(self, symbol, interval, new_arrays):
+        current = self._read_arrays(symbol, interval)
+        before = 0 if current is None else len(current['open_time'])
+        if current is not None:
+            new_arrays = {field: np.concatenate([current[field], new_arrays[field]]) for field in self.FIELDS}
+
+        # Aynı açılış zamanına sahip mumlardan en son eklenen kalır
+        open_time = new_arrays['open_time']
+        order = np.argsort(open_time, kind='stable')[::-1]
+        # np.unique değerleri sıralı döndürdüğü için sonuç açılış zamanına göre sıralı olur
+        _, first = np.unique(open_time[order], return_index=True)
+        keep = order[first]
+        merged = {field: new_arrays[field][keep] for field in self.FIELDS}
+
+        self._write_arrays(symbol, interval, merged)
+        return len(keep) - before
+
+    def import_csv(self, symbol, interval, csv_path):
+        """
+        CSV dosyasından mum verisi aktarır
+        Binance veri arşivi (data.binance.vision) formatı ve 'Open time,Open,High,Low,Close,Volume'
+        başlıklı dosyalar desteklenir
+        """
+        df = pd.read_csv(csv_path)
+        if not {'Open time', 'Open', 'High', 'Low', 'Close', 'Volume'}.issubset(df.columns):
+            first_column = str(df.columns[0])
+            header = None if first_column.isdigit() else 0
+            df = pd.read_csv(csv_path, header=header)
+            df = df.iloc[:, :6]
+            df.columns = ['Open time', 'Open', 'High', 'Low', 'Close', 'Volume']
+        self.save(symbol, interval, df)
+        return len(df)
+
+    def download(self, client, symbol, interval, start, end=None, batch=1500, pause=0.1):
+        """
+        Binance Futures'tan mum verisini sayfalı olarak indirip depoya ekler
+
+        Args:
+            client: python-binance Client (BinanceClient.create_client())
+            start / end: Başlangıç / bitiş (tarih metni, datetime veya ms)
+        """
+        start_ms = to_ms(start)
+        end_ms = to_ms(end) if end is not None else int(time.time() * 1000)
+        step = interval_ms(interval)
+        pages = []
+        total = 0
+
+        def flush():
+            nonlocal total
+            if pages:
+                merged = {field: np.concatenate([page[field] for page in pages]) for field in self.FIELDS}
+                total += self._merge(symbol, interval, merged)
+                pages.clear()
+
+        while start_ms < end_ms:
+            klines = client.futures_klines(symbol=symbol, interval=interval, startTime=start_ms,
+                                           endTime=end_ms, limit=batch)
+            if not klines:
+                break
+            start_ms = int(klines[-1][0]) + step
+            page_size = len(klines)
+
+            # Henüz kapanmamış mum depoya yazılmaz
+            now_ms = int(time.time() * 1000)
+            klines = [k for k in klines if int(k[6]) < now_ms]
+            if klines:
+                pages.append(self._klines_to_arrays(klines))
+
+            # Dosyayı her sayfada yeniden yazmamak için belirli aralıklarla diske yaz
+            if len(pages) >= 100:
+                flush()
+                logging.info(f"{symbol} {interval}: {pd.to_datetime(start_ms, unit='ms')} tarihine kadar indirildi")
+            if page_size < batch:
+                break
+            time.sleep(pause)
+
+        flush()
+        logging.info(f"{symbol} {interval}: indirme tamamlandı ({total} yeni mum)")
+        return total
+
+    def load(self, symbol, interval, start=None, end=None):
+        """
+        Depodaki mum verisini fetch_data formatında döndürür
+
+        Args:
+            start / end: Opsiyonel tarih aralığı (end hariç)
+        """
+        arrays = self._read_arrays(symbol, interval)
+        if arrays is None:
+            raise FileNotFoundError(f"Mum verisi bulunamadı: {self.path(symbol, interval)}")
+
+        open_time = arrays['open_time']
+        lo = 0 if start is None else np.searchsorted(open_time, to_ms(start), side='left')
+        hi = len(open_time) if end is None else np.searchsorted(open_time, to_ms(end), side='left')
+        return candles_to_frame(*(arrays[field][lo:hi] for field in self.FIELDS))
@@ -0,0 +1,269 @@
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+from backtest.candle_store import interval_ms
+from backtest.strategies import StrategyAdapter
+
+TRADE_COLUMNS = ['signal_time', 'entry_time', 'exit_time', 'side', 'entry_price', 'exit_price',
+                 'exit_reason', 'return_pct', 'pnl']
+
+
+def find_exit(open_, high, low, start, side, take_profit, stop_loss):
+    """
+    start mumundan itibaren TP veya SL fiyatına ilk ulaşılan mumu bulur
+    - Arama küçük bloklarla başlar ve büyüyerek devam eder (uzun pozisyonlarda tüm diziyi taramadan)
+
+    Returns:
+        tuple: (mum indeksi, sl_hit, tp_hit), ulaşılmadıysa (-1, False, False)
+    """
+    n = len(high)
+    size = 256
+    while start < n:
+        stop = min(start + size, n)
+        if side == 1:
+            sl_hit = low[start:stop] <= stop_loss
+            tp_hit = high[start:stop] >= take_profit
+        else:
+            sl_hit = high[start:stop] >= stop_loss
+            tp_hit = low[start:stop] <= take_profit
+
+        hits = np.flatnonzero(sl_hit | tp_hit)
+        if len(hits):
+            k = hits[0]
+            return start + k, bool(sl_hit[k]), bool(tp_hit[k])
+        start = stop
+        size *= 4
+    return -1, False, False
+
+
+def exit_price(open_price, side, take_profit, stop_loss, sl_hit):
+    """
+    Çıkış fiyatı ve sebebi
+    - Mum TP/SL seviyesinin ötesinde açıldıysa (gap) emir açılış fiyatından dolar
+    - Aynı mumda hem TP hem SL görüldüyse mum içi sıra bilinmediğinden SL kabul edilir
+    """
+    if side == 1:
+        if open_price <= stop_loss:
+            return open_price, 'SL'
+        if open_price >= take_profit:
+            return open_price, 'TP'
+    else:
+        if open_price >= stop_loss:
+            return open_price, 'SL'
+        if open_price <= take_profit:
+            return open_price, 'TP'
+    return (stop_loss, 'SL') if sl_hit else (take_profit, 'TP')
+
+
+def simulate_trades(open_, high, low, close, buy, sell, take_profit_percent, stop_loss_percent,
+                    confirm_bars=0):
+    """
+    Sinyal dizilerinden botların işlem kurallarıyla işlem listesini üretir
+    - Pozisyon açıkken yeni sinyal dikkate alınmaz, pozisyon TP veya SL ile kapanır
+    - Sinyal, confirm_bars mum sonra hala aktifse onaylanır; işlem onay mumunun kapanışından açılır
+    - Her mumda en fazla bir işlem açılır
+    - Pozisyon kapandığı mumun sinyali yeni işlem için kullanılabilir (bot kapanıştan hemen sonra
+      sinyal kontrolü yapar)
+
+    Returns:
+        list: (sinyal mumu, giriş mumu, çıkış mumu, yön, giriş fiyatı, çıkış fiyatı, sebep) demetleri
+    """
+    n = len(close)
+    candidates = np.flatnonzero(buy | sell)
+    trades = []
+    next_bar = 0
+    last_entry = -1
+
+    while True:
+        position = np.searchsorted(candidates, next_bar)
+        if position >= len(candidates):
+            break
+
+        signal_bar = int(candidates[position])
+        side = 1 if buy[signal_bar] else -1
+        entry_bar = signal_bar + confirm_bars
+        if entry_bar >= n:
+            break
+
+        # Onay anında sinyal artık aktif değilse iptal edilir
+        confirmed = buy[entry_bar] if side == 1 else sell[entry_bar]
+        if not confirmed or entry_bar == last_entry:
+            next_bar = entry_bar + 1
+            continue
+
+        entry = close[entry_bar]
+        if side == 1:
+            take_profit = entry * (1 + take_profit_percent)
+            stop_loss = entry * (1 - stop_loss_percent)
+        else:
+            take_profit = entry * (1 - take_profit_percent)
+            stop_loss = entry * (1 + stop_loss_percent)
+
+        last_entry = entry_bar
+        exit_bar, sl_hit, _ = find_exit(open_, high, low, entry_bar + 1, side, take_profit, stop_loss)
+        if exit_bar < 0:
+            # Veri sonunda hala açık pozisyon son kapanıştan kapatılır
+            trades.append((signal_bar, entry_bar, n - 1, side, entry, close[-1], 'END'))
+            break
+
+        price, reason = exit_price(open_[exit_bar], side, take_profit, stop_loss, sl_hit)
+        trades.append((signal_bar, entry_bar, exit_bar, side, entry, price, reason))
+        next_bar = exit_bar
+
+    return trades
+
+
+def build_trade_frame(df, raw_trades, commission, trade_amount):
+    """
+    (sinyal, giriş, çıkış indeksi, yön, giriş, çıkış fiyatı, sebep) demetlerini işlem tablosuna çevirir
+    - Giriş mum kapanışında, çıkış mumun içinde; zamanlar mum açılışına göre verilir
+    """
+    if not raw_trades:
+        return pd.DataFrame(columns=TRADE_COLUMNS)
+
+    signal_bar, entry_bar, exit_bar, side, entry, exit_, reason = (np.array(column) for column in zip(*raw_trades))
+    times = df['datetime'].to_numpy()
+    returns = side * (exit_ / entry - 1) - 2 * commission
+
+    return pd.DataFrame({
+        'signal_time': times[signal_bar],
+        'entry_time': times[entry_bar],
+        'exit_time': times[exit_bar],
+        'side': np.where(side == 1, 'BUY', 'SELL'),
+        'entry_price': entry,
+        'exit_price': exit_,
+        'exit_reason': reason,
+        'return_pct': returns * 100,
+        'pnl': returns * trade_amount,
+    })
+
+
+class BacktestResult:
+    """Backtest sonucu: işlem listesi ve PnL / win rate / drawdown istatistikleri"""
+
+    def __init__(self, symbol, strategy, timeframe, trades, bars, elapsed, initial_balance=1000.0,
+                 start=None, end=None):
+        self.symbol = symbol
+        self.strategy = strategy
+        self.timeframe = timeframe
+        self.trades = trades
+        self.bars = bars
+        self.elapsed = elapsed
+        self.initial_balance = initial_balance
+        self.start = start
+        self.end = end
+
+    def equity_curve(self):
+        """Her işlem sonrası bakiye"""
+        return self.initial_balance + self.trades['pnl'].cumsum()
+
+    def stats(self):
+        trades = self.trades
+        count = len(trades)
+        wins = int((trades['pnl'] > 0).sum())
+        gross_profit = float(trades.loc[trades['pnl'] > 0, 'pnl'].sum())
+        gross_loss = float(-trades.loc[trades['pnl'] < 0, 'pnl'].sum())
+
+        max_drawdown = 0.0
+        max_drawdown_pct = 0.0
+        if count:
+            equity = np.r_[self.initial_balance, self.equity_curve().to_numpy()]
+            peak = np.maximum.accumulate(equity)
+            drawdown = peak - equity
+            max_drawdown = float(drawdown.max())
+            max_drawdown_pct = float((drawdown / peak).max() * 100)
+
+        return {
+            'symbol': self.symbol,
+            'strategy': self.strategy,
+            'timeframe': self.timeframe,
+            'start': str(self.start) if self.start is not None else None,
+            'end': str(self.end) if self.end is not None else None,
+            'bars': self.bars,
+            'trades': count,
+            'wins': wins,
+            'losses': count - wins,
+            'win_rate': round(wins / count * 100, 2) if count else 0.0,
+            'total_pnl': round(float(trades['pnl'].sum()), 4),
+            'total_return_pct': round(float(trades['pnl'].sum()) / self.initial_balance * 100, 2),
+            'avg_trade_pct': round(float(trades['return_pct'].mean()), 4) if count else 0.0,
+            'profit_factor': round(gross_profit / gross_loss, 3) if gross_loss else None,
+            'max_drawdown': round(max_drawdown, 4),
+            'max_drawdown_pct': round(max_drawdown_pct, 2),
+            'take_profit_exits': int((trades['exit_reason'] == 'TP').sum()),
+            'stop_loss_exits': int((trades['exit_reason'] == 'SL').sum()),
+            'elapsed_seconds': round(self.elapsed, 3),
+        }
+
+    def summary(self):
+        stats = self.stats()
+        profit_factor = stats['profit_factor'] if stats['profit_factor'] is not None else '-'
+        return (
+            f"{stats['symbol']} {stats['strategy']} ({stats['timeframe']}, {stats['bars']} mum, "
+            f"{stats['start']} - {stats['end']})\n"
+            f"  İşlem: {stats['trades']} (TP {stats['take_profit_exits']}, SL {stats['stop_loss_exits']}) | "
+            f"Win rate: %{stats['win_rate']} | Profit factor: {profit_factor}\n"
+            f"  PnL: {stats['total_pnl']:.2f} USDT (%{stats['total_return_pct']}) | "
+            f"Max drawdown: {stats['max_drawdown']:.2f} USDT (%{stats['max_drawdown_pct']}) | "
+            f"Süre: {stats['elapsed_seconds']} sn"
+        )
+
+    def log_report(self, logger=None):
+        logger = logger or logging
+        for line in self.summary().splitlines():
+            logger.info(line)
+
+
+class VectorizedBacktester:
+    """
+    Vektörel geçmiş veri testi
+    - Stratejinin sinyal kolonları tüm geçmiş için tek seferde hesaplanır (mum kapanışındaki değerler)
+    - İşlemler Config'teki TP/SL yüzdeleri, sinyal onay beklemesi ve mum başına tek işlem kuralıyla
+      simüle edilir
+    - Onay beklemesi mum süresinden kısaysa (ör. 15m mumda 121 sn) sinyal aynı mumun kapanışında
+      onaylanmış sayılır; 1m gibi kısa mumlarda bekleme kadar sonraki mumda sinyal tekrar kontrol edilir
+    - Mum içi TP/SL sırası bilinmediği için aynı mumda ikisi de görülürse SL kabul edilir
+    """
+
+    def __init__(self, strategy, timeframe='15m', trade_amount=100, commission=0.0004,
+                 initial_balance=1000.0, overrides=None, confirmation=True):
+        self.adapter = StrategyAdapter(strategy, timeframe, overrides)
+        self.timeframe = timeframe
+        self.trade_amount = trade_amount
+        self.commission = commission  # İşlem başına (giriş ve çıkış ayrı ayrı) komisyon oranı
+        self.initial_balance = initial_balance
+        self.confirmation = confirmation
+
+    @property
+    def confirm_bars(self):
+        if not self.confirmation:
+            return 0
+        return int(self.adapter.confirmation_delay * 1000 // interval_ms(self.timeframe))
+
+    def build_trades(self, df, raw_trades):
+        """simulate_trades çıktısını işlem tablosuna çevirir"""
+        return build_trade_frame(df, raw_trades, self.commission, self.trade_amount)
+
+    def run(self, df, symbol=''):
+        """Verilen mum verisi üzerinde backtest çalıştırır"""
+        started = time.perf_counter()
+        df = df.reset_index(drop=True)
+        buy, sell = self.adapter.signals(df)
+
+        raw_trades = simulate_trades(
+            df['Open'].to_numpy(dtype=float), df['High'].to_numpy(dtype=float),
+            df['Low'].to_numpy(dtype=float), df['Close'].to_numpy(dtype=float),
+            buy, sell, self.adapter.take_profit_percent, self.adapter.stop_loss_percent,
+            confirm_bars=self.confirm_bars
+        )
+        trades = self.build_trades(df, raw_trades)
+
+        return BacktestResult(
+            symbol, self.adapter.name, self.timeframe, trades, len(df), time.perf_counter() - started,
+            initial_balance=self.initial_balance,
+            start=df['datetime'].iloc[0] if len(df) else None,
+            end=df['datetime'].iloc[-1] if len(df) else None,
+        )
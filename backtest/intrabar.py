@@ -0,0 +1,310 @@
+import math
+import time
+
+import numpy as np
+import pandas as pd
+
+from backtest.candle_store import interval_ms, resample
+from backtest.engine import BacktestResult, build_trade_frame
+from backtest.strategies import StrategyAdapter
+
+# Botların döngü aralıkları (bot.py LOOP_INTERVAL); onay kontrolünün hangi döngüde yapılacağını belirler
+LOOP_INTERVALS = {
+    'psar_atr_strategy': 60,
+    'eralp_strateji2': 60,
+    'atr_strategy': 10,
+    'skorlama_strategy': 60,
+}
+
+
+def _prev(values, bar):
+    """Her dakika için ait olduğu mumdan bir önceki kapanmış mumun değeri (ilk mumda NaN)"""
+    values = np.asarray(values, dtype=float)
+    return np.where(bar > 0, values[np.maximum(bar - 1, 0)], np.nan)
+
+
+def _partial_atr(closed, bar, high, low, close, period):
+    """Son mumu henüz kapanmamış (high/low/close) mum olan ATR"""
+    prev_close = _prev(closed['Close'], bar)
+    true_range = np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+    if period == 1:
+        return true_range
+
+    tr = pd.Series(np.fmax(np.fmax(
+        closed['High'] - closed['Low'],
+        np.abs(closed['High'] - closed['Close'].shift())),
+        np.abs(closed['Low'] - closed['Close'].shift())))
+    prev_sum = _prev(tr.rolling(window=period - 1).sum(), bar)
+    return (prev_sum + true_range) / period
+
+
+def _partial_donchian_middle(closed, bar, high, low, length):
+    upper = np.maximum(_prev(closed['High'].rolling(window=length - 1).max(), bar), high) if length > 1 else high
+    lower = np.minimum(_prev(closed['Low'].rolling(window=length - 1).min(), bar), low) if length > 1 else low
+    return (upper + lower) / 2
+
+
+def zone_partial_signals(adapter, closed, bar, high, low, close):
+    """
+    psar_atr_strategy / eralp_strateji2: determine_position'ın son satırını, son mum henüz
+    kapanmamışken (dakika dakika) hesaplar
+    """
+    config = adapter.config
+    atr = _partial_atr(closed, bar, high, low, close, config.zone_length)
+    hl2 = (high + low) / 2
+    down = hl2 + atr * config.zone_multiplier
+    up = hl2 - atr * config.zone_multiplier
+
+    # Önceki mumun bölge değerlerine göre daraltma (calculate_zones ile aynı kurallar)
+    prev_close = _prev(closed['Close'], bar)
+    prev_down = _prev(closed['down_zone'], bar)
+    prev_up = _prev(closed['up_zone'], bar)
+    down = np.where((prev_close < prev_down) & (prev_down < down), prev_down, down)
+    up = np.where((prev_close > prev_up) & (prev_up > up), prev_up, up)
+
+    prev_decider = _prev(closed['zone_decider'], bar)
+    decider = np.where((prev_decider == -1) & (close > down), 1,
+                       np.where((prev_decider == 1) & (close < up), -1, prev_decider))
+
+    middle = _partial_donchian_middle(closed, bar, high, low, config.donchian_length)
+    buy = (decider == 1) & (prev_decider == -1) & (close > middle)
+    sell = (decider == -1) & (prev_decider == 1) & (close < middle)
+
+    if adapter.name == 'eralp_strateji2':
+        # market_conditions_ok: en az 200 satır veri (score filter yeni stratejide her zaman geçer)
+        can_trade = bar >= 199
+        buy &= can_trade
+        sell &= can_trade
+    return buy, sell
+
+
+def trailing_stop_partial_signals(adapter, closed, bar, high, low, close):
+    """atr_strategy: determine_position'ın son satırını, son mum henüz kapanmamışken hesaplar"""
+    config = adapter.config
+    n_loss = config.key_value * _partial_atr(closed, bar, high, low, close, config.atr_period)
+    prev_close = _prev(closed['Close'], bar)
+    prev_stop = _prev(closed['trailing_stop'], bar)
+
+    candidate_up = close - n_loss
+    candidate_down = close + n_loss
+    stop = np.where(
+        (close > prev_stop) & (prev_close > prev_stop), np.where(candidate_up > prev_stop, candidate_up, prev_stop),
+        np.where(
+            (close < prev_stop) & (prev_close < prev_stop),
+            np.where(candidate_down < prev_stop, candidate_down, prev_stop),
+            np.where(close > prev_stop, candidate_up, candidate_down)
+        )
+    )
+
+    # ema(1) kapanışa eşit olduğundan kesişimler doğrudan kapanışla kontrol edilir
+    above = (close > stop) & (prev_close <= prev_stop)
+    below = (close < stop) & (prev_close >= prev_stop)
+    return (close > stop) & above, (close < stop) & below
+
+
+PARTIAL_SIGNALS = {
+    'psar_atr_strategy': zone_partial_signals,
+    'eralp_strateji2': zone_partial_signals,
+    'atr_strategy': trailing_stop_partial_signals,
+}
+
+
+def _path_exit(open_price, high, low, close, side, take_profit, stop_loss):
+    """
+    1m mumu içinde TP/SL'den hangisinin önce tetiklendiğini belirler
+    - Açılış seviyenin ötesindeyse emir açılış fiyatından dolar
+    - İkisi de aynı mumdaysa fiyat yolu yükselen mumda açılış-dip-tepe-kapanış,
+      düşen mumda açılış-tepe-dip-kapanış kabul edilir
+    """
+    if side == 1:
+        if open_price <= stop_loss:
+            return open_price, 'SL'
+        if open_price >= take_profit:
+            return open_price, 'TP'
+        sl_hit, tp_hit = low <= stop_loss, high >= take_profit
+        low_first = close >= open_price
+        if sl_hit and (not tp_hit or low_first):
+            return stop_loss, 'SL'
+        return take_profit, 'TP'
+
+    if open_price >= stop_loss:
+        return open_price, 'SL'
+    if open_price <= take_profit:
+        return open_price, 'TP'
+    sl_hit, tp_hit = high >= stop_loss, low <= take_profit
+    high_first = close < open_price
+    if sl_hit and (not tp_hit or high_first):
+        return stop_loss, 'SL'
+    return take_profit, 'TP'
+
+
+class IntrabarBacktester:
+    """
+    Olay tabanlı (event-driven) mum içi backtest
+    - Strateji sinyalleri üst timeframe'de (15m/1h) hesaplanır, simülasyon 1m mumlarla adım adım ilerler
+    - Her 1m adımında bot gibi henüz kapanmamış üst timeframe mumuna bakılır (son mum o ana kadarki
+      1m mumlardan oluşur)
+    - Sinyal onayı botun döngü aralığıyla modellenir: 60 sn döngüde 121 sn bekleme, tespitten sonraki
+      üçüncü döngüde (180 sn) kontrol edilir; onay anında sinyal hala aktif olmalıdır
+    - TAKE_PROFIT_MARKET / STOP_MARKET emirleri 1m mumun içinde tetiklendiği fiyattan dolar
+    - Aynı üst timeframe mumunda ikinci işlem açılmaz
+    - Mum içi hesaplaması tanımlı olmayan stratejilerde (skorlama) sinyal üst timeframe mumunun son
+      dakikasında görülür
+    """
+
+    def __init__(self, strategy, timeframe='15m', trade_amount=100, commission=0.0004,
+                 initial_balance=1000.0, overrides=None, loop_interval=None, slippage=0.0):
+        self.adapter = StrategyAdapter(strategy, timeframe, overrides)
+        self.timeframe = timeframe
+        self.trade_amount = trade_amount
+        self.commission = commission
+        self.initial_balance = initial_balance
+        self.loop_interval = loop_interval or LOOP_INTERVALS.get(strategy, 60)
+        self.slippage = slippage  # Market emirlerinde fiyat aleyhine kayma oranı
+
+    @property
+    def confirm_steps(self):
+        """Tespitten onay kontrolüne kadar geçen 1m adım sayısı"""
+        delay = self.adapter.confirmation_delay
+        if delay <= 0:
+            return 0
+        # Bot her döngüde geçen süreyi kontrol eder; bekleme dolduktan sonraki ilk döngüde onaylar
+        confirm_after = math.ceil(delay / self.loop_interval) * self.loop_interval
+        return int(confirm_after // 60)
+
+    def minute_signals(self, minutes, bars):
+        """
+        Her 1m adımında botun göreceği sinyaller
+
+        Returns:
+            tuple: (dakika -> üst timeframe mum indeksi, buy, sell) dizileri
+        """
+        closed = self.adapter.compute(bars)
+        open_time = minutes['Open time'].to_numpy(dtype=np.int64)
+        bucket = open_time // interval_ms(self.timeframe) * interval_ms(self.timeframe)
+        bar = np.searchsorted(bars['Open time'].to_numpy(dtype=np.int64), bucket)
+
+        partial = PARTIAL_SIGNALS.get(self.adapter.name)
+        if partial is None:
+            # Mum kapanışındaki sinyal, mumun son dakikasında görülür
+            last_minute = np.r_[bar[1:] != bar[:-1], True]
+            buy = closed['buy'].to_numpy(dtype=bool)[bar] & last_minute
+            sell = closed['sell'].to_numpy(dtype=bool)[bar] & last_minute
+            return bar, buy, sell
+
+        # Üst timeframe mumunun o dakikaya kadarki high/low değerleri
+        groups = pd.Series(bar)
+        high = minutes['High'].groupby(groups).cummax().to_numpy(dtype=float)
+        low = minutes['Low'].groupby(groups).cummin().to_numpy(dtype=float)
+        close = minutes['Close'].to_numpy(dtype=float)
+
+        buy, sell = partial(self.adapter, closed, bar, high, low, close)
+        return bar, np.asarray(buy, dtype=bool), np.asarray(sell & ~buy, dtype=bool)
+
+    def simulate(self, minutes, bar, buy, sell):
+        """
+        1m dizileri üzerinde bot durum makinesini çalıştırır (bekle -> onay -> pozisyon -> TP/SL)
+        Sadece sinyal olan dakikalar ve pozisyon çıkışları ziyaret edilir
+        """
+        open_ = minutes['Open'].to_numpy(dtype=float)
+        high = minutes['High'].to_numpy(dtype=float)
+        low = minutes['Low'].to_numpy(dtype=float)
+        close = minutes['Close'].to_numpy(dtype=float)
+        n = len(close)
+
+        tp_percent = self.adapter.take_profit_percent
+        sl_percent = self.adapter.stop_loss_percent
+        confirm_steps = self.confirm_steps
+        candidates = np.flatnonzero(buy | sell)
+
+        trades = []
+        next_minute = 0
+        last_trade_bar = -1
+
+        while True:
+            position = np.searchsorted(candidates, next_minute)
+            # Son işlem yapılan mumdaki sinyaller atlanır
+            while position < len(candidates) and bar[candidates[position]] == last_trade_bar:
+                position += 1
+            if position >= len(candidates):
+                break
+
+            signal_minute = int(candidates[position])
+            side = 1 if buy[signal_minute] else -1
+            confirm_minute = signal_minute + confirm_steps
+            if confirm_minute >= n:
+                break
+
+            still_active = buy[confirm_minute] if side == 1 else sell[confirm_minute]
+            if not still_active or bar[confirm_minute] == last_trade_bar:
+                next_minute = confirm_minute + 1
+                continue
+
+            entry = close[confirm_minute] * (1 + side * self.slippage)
+            if side == 1:
+                take_profit = entry * (1 + tp_percent)
+                stop_loss = entry * (1 - sl_percent)
+            else:
+                take_profit = entry * (1 - tp_percent)
+                stop_loss = entry * (1 + sl_percent)
+            last_trade_bar = bar[confirm_minute]
+
+            exit_minute = self._find_exit_minute(high, low, confirm_minute + 1, side, take_profit, stop_loss)
+            if exit_minute < 0:
+                trades.append((signal_minute, confirm_minute, n - 1, side, entry, close[-1], 'END'))
+                break
+
+            price, reason = _path_exit(open_[exit_minute], high[exit_minute], low[exit_minute],
+                                       close[exit_minute], side, take_profit, stop_loss)
+            if reason == 'SL':
+                # STOP_MARKET tetiklendikten sonra market emri olarak dolar
+                price *= 1 - side * self.slippage
+            trades.append((signal_minute, confirm_minute, exit_minute, side, entry, price, reason))
+
+            # Bot pozisyonun kapandığını aynı dakikanın döngüsünde görür ve hemen yeni sinyal arar
+            next_minute = exit_minute
+
+        return trades
+
+    @staticmethod
+    def _find_exit_minute(high, low, start, side, take_profit, stop_loss):
+        n = len(high)
+        size = 1024
+        while start < n:
+            stop = min(start + size, n)
+            if side == 1:
+                hits = np.flatnonzero((low[start:stop] <= stop_loss) | (high[start:stop] >= take_profit))
+            else:
+                hits = np.flatnonzero((high[start:stop] >= stop_loss) | (low[start:stop] <= take_profit))
+            if len(hits):
+                return start + int(hits[0])
+            start = stop
+            size *= 4
+        return -1
+
+    def run(self, minutes, symbol=''):
+        """
+        1m mum verisi üzerinde backtest çalıştırır
+
+        Args:
+            minutes: 1m mum verisi (CandleStore.load formatında)
+        """
+        started = time.perf_counter()
+        bars = resample(minutes, self.timeframe)
+        # Tamamlanmamış son üst timeframe mumuna ait dakikalar atılır
+        if len(bars):
+            end_time = bars['Open time'].iloc[-1] + interval_ms(self.timeframe)
+            minutes = minutes[minutes['Open time'] < end_time]
+        minutes = minutes.reset_index(drop=True)
+
+        bar, buy, sell = self.minute_signals(minutes, bars)
+        raw_trades = self.simulate(minutes, bar, buy, sell)
+
+        trades = build_trade_frame(minutes, raw_trades, self.commission, self.trade_amount)
+
+        return BacktestResult(
+            symbol, self.adapter.name, self.timeframe, trades, len(bars), time.perf_counter() - started,
+            initial_balance=self.initial_balance,
+            start=minutes['datetime'].iloc[0] if len(minutes) else None,
+            end=minutes['datetime'].iloc[-1] if len(minutes) else None,
+        )
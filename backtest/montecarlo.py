@@ -0,0 +1,224 @@
+import fnmatch
+import logging
+import re
+import time
+
+import numpy as np
+import pandas as pd
+
+# Botların pozisyon kapanış logları (dosya deseni -> strateji); psar ve eralp botları aynı deseni kullanır
+POSITION_LOG_PATTERNS = {
+    'psar_positions_*.csv': 'psar_atr_strategy',
+    'atr_positions_*.csv': 'atr_strategy',
+}
+
+PERCENTILES = (1, 5, 25, 50, 75, 95, 99)
+
+
+def parse_percent(values):
+    """'+0.45%' biçimindeki metinleri orana çevirir (0.0045)"""
+    text = pd.Series(values).astype(str).str.replace('%', '', regex=False).str.strip()
+    return pd.to_numeric(text, errors='coerce').to_numpy(dtype=float) / 100
+
+
+def load_position_log(path):
+    """
+    Bot pozisyon kapanış CSV'sinden işlem başına (kaldıraçsız, yön düzeltilmiş) getirileri okur
+    'Fiyat Değişimi' kolonu pozisyon yönüne göre hesaplanmış fiyat değişimidir
+    """
+    df = pd.read_csv(path)
+    if 'Fiyat Değişimi' not in df.columns:
+        raise ValueError(f"{path}: 'Fiyat Değişimi' kolonu yok")
+    if 'Tarih/Saat' in df.columns:
+        df = df.sort_values('Tarih/Saat', kind='stable')
+    returns = parse_percent(df['Fiyat Değişimi'])
+    return returns[np.isfinite(returns)]
+
+
+def load_position_logs(logs_dir='logs', by_symbol=False):
+    """
+    Pozisyon loglarını strateji (veya sembol) bazında toplar
+    Arşive taşınmış günler (core.log_archive) ve logs/ altındaki güncel CSV'ler birlikte okunur;
+    yalnızca zaman, kaynak dosya ve fiyat değişimi kolonları yüklenir
+
+    Returns:
+        dict: {ad: getiri dizisi}
+    """
+    from core.log_archive import LogArchive
+
+    try:
+        df = LogArchive(logs_dir).query('positions', columns=['time', 'source', 'price_change_pct'])
+    except (OSError, ValueError) as e:
+        logging.warning(f"Pozisyon logları okunamadı ({logs_dir}): {e}")
+        return {}
+    groups = {}
+    for pattern, strategy in POSITION_LOG_PATTERNS.items():
+        for source in sorted(df['source'].unique()):
+            if not fnmatch.fnmatch(f"{source}.csv", pattern):
+                continue
+            returns = df.loc[df['source'] == source, 'price_change_pct'].to_numpy(dtype=float) / 100
+            returns = returns[np.isfinite(returns)]
+            if not len(returns):
+                continue
+            if by_symbol:
+                symbol = re.sub(r'^.*_positions_', '', source).upper()
+                key = f"{strategy} {symbol}"
+            else:
+                key = strategy
+            groups[key] = np.concatenate([groups[key], returns]) if key in groups else returns
+    return groups
+
+
+def load_trades_csv(path):
+    """Backtest işlem CSV'sinden (run --trades-csv) komisyon sonrası işlem getirileri"""
+    df = pd.read_csv(path)
+    if 'return_pct' not in df.columns:
+        raise ValueError(f"{path}: 'return_pct' kolonu yok")
+    returns = df['return_pct'].to_numpy(dtype=float) / 100
+    return returns[np.isfinite(returns)]
+
+
+class MonteCarloSimulator:
+    """
+    İşlem sırası yeniden örnekleme ile risk tahmini
+    - bootstrap: işlemler yerine koyarak rastgele seçilir (getiri ve drawdown dağılımı)
+    - shuffle: mevcut işlemlerin sırası karıştırılır (sabit pozisyonda toplam PnL aynı, drawdown değişir)
+    - Tüm simülasyonlar numpy dizileriyle parça parça hesaplanır (simülasyon x işlem)
+    - Her işlemde trade_amount marjin x kaldıraç nominal pozisyon açılır (botlardaki kaldıraçlı PnL);
+      compound=True ise marjin güncel bakiyenin trade_amount / initial_balance oranıdır
+    - İflas: bakiye başlangıcın ruin_level oranına (varsayılan %50) veya altına düştüğü simülasyonlar
+    """
+
+    def __init__(self, returns, method='bootstrap', simulations=10000, trades=None, initial_balance=1000.0,
+                 trade_amount=100, leverages=(1,), ruin_level=0.5, commission=0.0, compound=False, seed=None,
+                 chunk_elements=4_000_000):
+        if method not in ('bootstrap', 'shuffle'):
+            raise ValueError(f"Bilinmeyen yöntem: {method} (bootstrap veya shuffle)")
+        self.returns = np.asarray(returns, dtype=float)
+        if not len(self.returns):
+            raise ValueError("Monte Carlo için işlem yok")
+        if method == 'shuffle' and trades not in (None, len(self.returns)):
+            raise ValueError("shuffle yönteminde işlem sayısı mevcut işlem sayısına eşit olmalı")
+
+        self.method = method
+        self.simulations = int(simulations)
+        self.trades = int(trades or len(self.returns))
+        self.initial_balance = initial_balance
+        self.trade_amount = trade_amount
+        self.leverages = tuple(leverages)
+        self.ruin_level = ruin_level
+        self.commission = commission  # Loglardaki getirilere eklenecek işlem başı (giriş + çıkış ayrı) komisyon
+        self.compound = compound
+        self.seed = seed
+        self.chunk_elements = chunk_elements
+
+    def _sample(self, rng, count):
+        """(count, trades) boyutunda işlem getirisi matrisi"""
+        if self.method == 'bootstrap':
+            index = rng.integers(0, len(self.returns), size=(count, self.trades))
+        else:
+            index = rng.permuted(np.broadcast_to(np.arange(self.trades), (count, self.trades)), axis=1)
+        return self.returns[index] - 2 * self.commission
+
+    def _metrics(self, returns):
+        """
+        Her kaldıraç için simülasyon başına (son bakiye, max drawdown oranı, en düşük bakiye)
+        Sabit pozisyonda bakiye yolu kaldıraçla doğrusal ölçeklendiği için kümülatif toplam bir kez hesaplanır
+        """
+        balance = self.initial_balance
+        if self.compound:
+            for leverage in self.leverages:
+                fraction = self.trade_amount / balance * leverage
+                # Bir işlemde bakiyenin tamamını kaybetmek bakiyeyi sıfırlar
+                equity = balance * np.cumprod(np.maximum(1 + returns * fraction, 0.0), axis=1)
+                peak = np.maximum(np.maximum.accumulate(equity, axis=1), balance)
+                yield leverage, equity[:, -1], ((peak - equity) / peak).max(axis=1), equity.min(axis=1)
+            return
+
+        cumulative = np.cumsum(returns * self.trade_amount, axis=1)
+        running_max = np.maximum(np.maximum.accumulate(cumulative, axis=1), 0.0)
+        gap = running_max - cumulative
+        lowest = cumulative.min(axis=1)
+        for leverage in self.leverages:
+            drawdown = (leverage * gap / (balance + leverage * running_max)).max(axis=1)
+            final_balance = balance + leverage * cumulative[:, -1]
+            lowest_balance = balance + leverage * lowest
+            # Bakiyesi sıfırlanan hesap işlem yapamaz: son bakiye 0, drawdown %100
+            busted = lowest_balance <= 0
+            final_balance[busted] = 0.0
+            drawdown[busted] = 1.0
+            yield leverage, final_balance, drawdown, lowest_balance
+
+    def run(self):
+        """
+        Returns:
+            dict: İşlem özeti ve her kaldıraç için getiri / drawdown yüzdelikleri, iflas olasılığı, histogram
+        """
+        started = time.perf_counter()
+        rng = np.random.default_rng(self.seed)
+        chunk = max(1, self.chunk_elements // self.trades)
+        final = {leverage: [] for leverage in self.leverages}
+        drawdown = {leverage: [] for leverage in self.leverages}
+        ruined = {leverage: [] for leverage in self.leverages}
+        ruin_balance = self.initial_balance * self.ruin_level
+
+        done = 0
+        while done < self.simulations:
+            count = min(chunk, self.simulations - done)
+            for leverage, final_balance, max_drawdown, lowest in self._metrics(self._sample(rng, count)):
+                final[leverage].append(final_balance)
+                drawdown[leverage].append(max_drawdown)
+                ruined[leverage].append(lowest <= ruin_balance)
+            done += count
+
+        results = []
+        for leverage in self.leverages:
+            final_return = (np.concatenate(final[leverage]) / self.initial_balance - 1) * 100
+            max_drawdown = np.concatenate(drawdown[leverage]) * 100
+            counts, edges = np.histogram(final_return, bins=30)
+            results.append({
+                'leverage': leverage,
+                'final_return_pct': self._percentiles(final_return),
+                'max_drawdown_pct': self._percentiles(max_drawdown),
+                'mean_return_pct': round(float(final_return.mean()), 2),
+                'loss_probability': round(float((final_return < 0).mean()), 4),
+                'ruin_probability': round(float(np.concatenate(ruined[leverage]).mean()), 4),
+                'histogram': {'counts': counts.tolist(), 'edges': [round(float(e), 2) for e in edges]},
+            })
+
+        returns = self.returns - 2 * self.commission
+        return {
+            'method': self.method,
+            'simulations': self.simulations,
+            'trades': self.trades,
+            'source_trades': len(self.returns),
+            'win_rate': round(float((returns > 0).mean() * 100), 2),
+            'avg_trade_pct': round(float(returns.mean() * 100), 4),
+            'initial_balance': self.initial_balance,
+            'trade_amount': self.trade_amount,
+            'ruin_level': self.ruin_level,
+            'compound': self.compound,
+            'leverages': results,
+            'elapsed_seconds': round(time.perf_counter() - started, 3),
+        }
+
+    @staticmethod
+    def _percentiles(values):
+        return {f"p{p}": round(float(v), 2) for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES))}
+
+
+def format_report(name, report):
+    """Monte Carlo sonucunu okunabilir metne çevirir"""
+    lines = [
+        f"{name}: {report['source_trades']} işlem (win rate %{report['win_rate']}, ortalama %{report['avg_trade_pct']}), "
+        f"{report['simulations']} simülasyon x {report['trades']} işlem ({report['method']}), "
+        f"{report['elapsed_seconds']} sn"
+    ]
+    for row in report['leverages']:
+        ret, dd = row['final_return_pct'], row['max_drawdown_pct']
+        lines.append(
+            f"  {row['leverage']}x: getiri medyan %{ret['p50']} (p5 %{ret['p5']}, p95 %{ret['p95']}) | "
+            f"max drawdown medyan %{dd['p50']} (p95 %{dd['p95']}) | zarar olasılığı %{row['loss_probability'] * 100:.1f} | "
+            f"iflas olasılığı %{row['ruin_probability'] * 100:.2f}"
+        )
+    return '\n'.join(lines)
@@ -0,0 +1,585 @@
+import hashlib
+import itertools
+import json
+import logging
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from backtest.candle_store import candles_to_frame, interval_ms, resample
+from backtest.engine import VectorizedBacktester, simulate_trades
+from backtest.intrabar import IntrabarBacktester
+from strategies import indicators
+
+# Sadece işlem simülasyonunu etkileyen parametreler; sinyaller bunlardan bağımsız hesaplanır
+TRADE_PARAMS = {
+    'take_profit_percent', 'stop_loss_percent', 'TAKE_PROFIT_PERCENT', 'STOP_LOSS_PERCENT',
+    'signal_confirmation_delay', 'min_time_between_trades', 'waiting_period',
+}
+
+# Hızlı sinyal yolunun desteklediği parametreler (diğerleri için stratejinin kendi kodu çalışır)
+FAST_SIGNAL_PARAMS = {
+    'psar_atr_strategy': {'zone_length', 'zone_multiplier', 'donchian_length'},
+    'eralp_strateji2': {'zone_length', 'zone_multiplier', 'donchian_length'},
+    'atr_strategy': {'atr_period', 'key_value'},
+}
+
+METRICS = ('total_pnl', 'win_rate', 'profit_factor', 'max_drawdown', 'avg_trade_pct')
+
+
+def parse_param_spec(text):
+    """
+    Parametre tanımını ayrıştırır
+    - 'zone_length=8,10,12' : değer listesi
+    - 'zone_multiplier=2.0:4.0:0.5' : başlangıç:bitiş:adım (bitiş dahil)
+    """
+    if '=' not in text:
+        raise ValueError(f"Geçersiz parametre tanımı: {text} (ör. zone_length=8,10,12)")
+    name, spec = text.split('=', 1)
+
+    if ':' in spec:
+        parts = spec.split(':')
+        if len(parts) != 3:
+            raise ValueError(f"Aralık tanımı başlangıç:bitiş:adım olmalı: {text}")
+        start, stop, step = (_parse_number(part) for part in parts)
+        count = int(math.floor((stop - start) / step + 1e-9)) + 1
+        values = [start + i * step for i in range(count)]
+        if all(isinstance(v, int) for v in (start, stop, step)):
+            values = [int(v) for v in values]
+        else:
+            values = [round(v, 10) for v in values]
+    else:
+        values = [_parse_number(part) for part in spec.split(',') if part.strip()]
+
+    if not values:
+        raise ValueError(f"Parametre için değer yok: {text}")
+    return name.strip(), values
+
+
+def _parse_number(text):
+    text = text.strip()
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def score_stats(stats, metric='total_pnl', min_trades=1):
+    """Sıralama skoru (büyük olan daha iyi); yetersiz işlem yapan setler en sona düşer"""
+    if stats['trades'] < min_trades:
+        return -np.inf
+    value = stats[metric]
+    if value is None:
+        # Zararlı işlem yoksa profit factor tanımsız; en iyi kabul edilir
+        return np.inf if stats['trades'] else -np.inf
+    return -value if metric == 'max_drawdown' else value
+
+
+def params_key(params):
+    """Parametre setinin sıralı ve tekrar üretilebilir gösterimi"""
+    return json.dumps(params, sort_keys=True)
+
+
+def signal_key(params):
+    """Sinyal hesaplamasını etkileyen parametreler"""
+    return params_key({k: v for k, v in params.items() if k not in TRADE_PARAMS})
+
+
+class ParameterSpace:
+    """Taranacak parametreler ve olası değerleri"""
+
+    def __init__(self, values):
+        self.values = {name: list(options) for name, options in values.items()}
+        self.names = sorted(self.values)
+
+    @classmethod
+    def from_specs(cls, specs):
+        return cls(dict(parse_param_spec(spec) for spec in specs))
+
+    @property
+    def size(self):
+        return math.prod(len(self.values[name]) for name in self.names)
+
+    def grid(self):
+        for combination in itertools.product(*(self.values[name] for name in self.names)):
+            yield dict(zip(self.names, combination))
+
+    def random(self, count, rng):
+        """Tekrarsız rastgele parametre setleri (uzay küçükse tüm uzay)"""
+        if count >= self.size:
+            return list(self.grid())
+        seen, result = set(), []
+        while len(result) < count:
+            params = {name: self.values[name][rng.integers(len(self.values[name]))] for name in self.names}
+            key = params_key(params)
+            if key not in seen:
+                seen.add(key)
+                result.append(params)
+        return result
+
+
+class TPESampler:
+    """
+    Bağımlılıksız basit Bayesian optimizasyon (Tree-structured Parzen Estimator)
+    - İlk denemeler rastgele yapılır
+    - Sonrasında sonuçlar iyi (en iyi %gamma) ve kötü olarak ikiye ayrılır; her parametre değeri için
+      iki grupta görülme olasılığı hesaplanır ve iyi/kötü oranı en yüksek aday seçilir
+    """
+
+    def __init__(self, space, seed=None, gamma=0.25, n_startup=10, n_candidates=64):
+        self.space = space
+        self.rng = np.random.default_rng(seed)
+        self.gamma = gamma
+        self.n_startup = n_startup
+        self.n_candidates = n_candidates
+
+    def _density(self, observations, name):
+        options = self.space.values[name]
+        # Laplace yumuşatma: hiç görülmemiş değerlerin de seçilme şansı kalır
+        counts = np.ones(len(options))
+        for params in observations:
+            counts[options.index(params[name])] += 1
+        return counts / counts.sum()
+
+    def suggest(self, history, count, exclude=()):
+        """
+        Args:
+            history: (parametreler, skor) listesi, skor büyük olan daha iyi
+            exclude: Daha önce denenmiş parametre anahtarları
+        """
+        exclude = set(exclude)
+        if len(history) < self.n_startup:
+            candidates = self.space.random(count + len(exclude), self.rng)
+            return [p for p in candidates if params_key(p) not in exclude][:count]
+
+        ordered = sorted(history, key=lambda item: item[1], reverse=True)
+        split = max(1, int(math.ceil(self.gamma * len(ordered))))
+        good = [params for params, _ in ordered[:split]]
+        bad = [params for params, _ in ordered[split:]] or good
+
+        good_density = {name: self._density(good, name) for name in self.space.names}
+        bad_density = {name: self._density(bad, name) for name in self.space.names}
+
+        suggestions = []
+        for _ in range(count):
+            best, best_score = None, -np.inf
+            for _ in range(self.n_candidates):
+                params, score = {}, 0.0
+                for name in self.space.names:
+                    options = self.space.values[name]
+                    index = self.rng.choice(len(options), p=good_density[name])
+                    params[name] = options[index]
+                    score += math.log(good_density[name][index]) - math.log(bad_density[name][index])
+                key = params_key(params)
+                if key not in exclude and score > best_score:
+                    best, best_score = params, score
+            if best is None:
+                remaining = [p for p in self.space.random(len(exclude) + 1, self.rng) if params_key(p) not in exclude]
+                if not remaining:
+                    break
+                best = remaining[0]
+            exclude.add(params_key(best))
+            suggestions.append(best)
+        return suggestions
+
+
+class SharedCandles:
+    """
+    Mum dizilerini worker süreçleri arasında kopyalamadan paylaşmak için shared memory bloğu
+    Satırlar: open_time, open, high, low, close, volume (float64; ms zaman damgası float64'te tam saklanır)
+    """
+
+    FIELDS = ('Open time', 'Open', 'High', 'Low', 'Close', 'Volume')
+
+    def __init__(self, shm, rows, owner):
+        self.shm = shm
+        self.rows = rows
+        self.owner = owner
+        self.array = np.ndarray((len(self.FIELDS), rows), dtype=np.float64, buffer=shm.buf)
+
+    @classmethod
+    def create(cls, df):
+        rows = len(df)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, len(cls.FIELDS) * rows * 8))
+        shared = cls(shm, rows, owner=True)
+        for i, field in enumerate(cls.FIELDS):
+            shared.array[i] = df[field].to_numpy(dtype=np.float64)
+        return shared
+
+    @classmethod
+    def attach(cls, name, rows):
+        return cls(shared_memory.SharedMemory(name=name), rows, owner=False)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def frame(self):
+        a = self.array
+        return candles_to_frame(a[0].astype(np.int64), a[1], a[2], a[3], a[4], a[5])
+
+    def close(self):
+        self.array = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class SignalCache:
+    """
+    Parametre setleri arasında ortak indikatör ara sonuçlarını saklar
+    - ATR her uzunluk için bir kez, zone_decider her (uzunluk, çarpan) için bir kez hesaplanır
+    - Aynı sinyal parametrelerine sahip setler (sadece TP/SL farklı) sinyalleri yeniden kullanır
+    - Hızlı yol stratejilerin kullandığı strategies.indicators çekirdekleriyle birebir aynı sonucu verir
+    """
+
+    def __init__(self, df, max_entries=256):
+        self.df = df.reset_index(drop=True)
+        self.open = self.df['Open'].to_numpy(dtype=float)
+        self.high = self.df['High'].to_numpy(dtype=float)
+        self.low = self.df['Low'].to_numpy(dtype=float)
+        self.close = self.df['Close'].to_numpy(dtype=float)
+        self.hl2 = ((self.df['High'] + self.df['Low']) / 2).to_numpy()
+        self.max_entries = max_entries
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _memo(self, key, compute):
+        if key in self._entries:
+            self.hits += 1
+            return self._entries[key]
+        self.misses += 1
+        if len(self._entries) >= self.max_entries:
+            # En eski kaydı at (dict ekleme sırasını korur)
+            self._entries.pop(next(iter(self._entries)))
+        value = self._entries[key] = compute()
+        return value
+
+    def atr(self, period):
+        return self._memo(('atr', period), lambda: indicators.atr(self.high, self.low, self.close, period))
+
+    def donchian_middle(self, length):
+        def compute():
+            upper = self.df['High'].rolling(window=length).max()
+            lower = self.df['Low'].rolling(window=length).min()
+            return ((upper + lower) / 2).to_numpy()
+        return self._memo(('donchian', length), compute)
+
+    def zone_decider(self, length, multiplier):
+        def compute():
+            atr = self.atr(length)
+            down, up = indicators.atr_zones(self.close, self.hl2 + atr * multiplier, self.hl2 - atr * multiplier)
+            return indicators.zone_decider(self.close, down, up)
+        return self._memo(('zone_decider', length, multiplier), compute)
+
+    def trailing_stop(self, period, key_value):
+        return self._memo(('trailing_stop', period, key_value),
+                          lambda: indicators.atr_trailing_stop(self.close, key_value * self.atr(period)))
+
+    def signals(self, adapter, params):
+        """Verilen parametre seti için (buy, sell) dizileri"""
+        key = (adapter.name, signal_key(params))
+        fast = FAST_SIGNAL_PARAMS.get(adapter.name)
+        if fast is None or not set(params) - TRADE_PARAMS <= fast:
+            # Hızlı yolun bilmediği bir parametre: stratejinin kendi kodu
+            return self._memo(key, lambda: adapter.signals(self.df))
+        return self._memo(key, lambda: self._fast_signals(adapter))
+
+    def _fast_signals(self, adapter):
+        config = adapter.config
+        close = self.close
+
+        if adapter.name == 'atr_strategy':
+            stop = self.trailing_stop(config.atr_period, config.key_value)
+            prev_close = np.r_[np.nan, close[:-1]]
+            prev_stop = np.r_[np.nan, stop[:-1]]
+            buy = (close > stop) & (prev_close <= prev_stop)
+            sell = (close < stop) & (prev_close >= prev_stop)
+            return buy, sell & ~buy
+
+        decider = self.zone_decider(config.zone_length, config.zone_multiplier)
+        middle = self.donchian_middle(config.donchian_length)
+        prev_decider = np.r_[0, decider[:-1]]
+        buy = (decider == 1) & (prev_decider == -1) & (close > middle)
+        sell = (decider == -1) & (prev_decider == 1) & (close < middle)
+        if adapter.name == 'eralp_strateji2':
+            can_trade = np.arange(len(close)) >= 199
+            buy &= can_trade
+            sell &= can_trade
+        return buy, sell
+
+
+# Worker süreç durumu (initializer ile bir kez kurulur)
+_WORKER = {}
+
+
+def _init_worker(shm_name, rows, strategy, timeframe, mode, settings):
+    shared = SharedCandles.attach(shm_name, rows)
+    df = shared.frame()
+    shared.close()
+    _WORKER.update(strategy=strategy, timeframe=timeframe, mode=mode, settings=settings, minute_signals={})
+    if mode == 'intrabar':
+        bars = resample(df, timeframe)
+        # Tamamlanmamış son üst timeframe mumuna ait dakikalar atılır (IntrabarBacktester.run ile aynı)
+        if len(bars):
+            end_time = bars['Open time'].iloc[-1] + interval_ms(timeframe)
+            df = df[df['Open time'] < end_time].reset_index(drop=True)
+        _WORKER['minutes'] = df
+        _WORKER['bars'] = bars
+    else:
+        _WORKER['cache'] = SignalCache(df)
+
+
+def _evaluate(params):
+    """Tek parametre setini çalıştırıp istatistiklerini döndürür (worker içinde)"""
+    strategy, timeframe, settings = _WORKER['strategy'], _WORKER['timeframe'], _WORKER['settings']
+
+    if _WORKER['mode'] == 'intrabar':
+        backtester = IntrabarBacktester(strategy, timeframe, overrides=params, **settings)
+        key = signal_key(params)
+        if key not in _WORKER['minute_signals']:
+            _WORKER['minute_signals'][key] = backtester.minute_signals(_WORKER['minutes'], _WORKER['bars'])
+        bar, buy, sell = _WORKER['minute_signals'][key]
+        minutes = _WORKER['minutes']
+        raw_trades = backtester.simulate(minutes, bar, buy, sell)
+        return _stats(backtester, raw_trades)
+
+    cache = _WORKER['cache']
+    backtester = VectorizedBacktester(strategy, timeframe, overrides=params, **settings)
+    buy, sell = cache.signals(backtester.adapter, params)
+    raw_trades = simulate_trades(
+        cache.open, cache.high, cache.low, cache.close, buy, sell,
+        backtester.adapter.take_profit_percent, backtester.adapter.stop_loss_percent,
+        confirm_bars=backtester.confirm_bars
+    )
+    return _stats(backtester, raw_trades)
+
+
+def _stats(backtester, raw_trades):
+    """
+    Taramada sıralama için gereken istatistikler
+    BacktestResult.stats ile aynı formüller; her set için DataFrame oluşturmamak için numpy ile hesaplanır
+    """
+    initial_balance = backtester.initial_balance
+    count = len(raw_trades)
+    if not count:
+        return {'trades': 0, 'win_rate': 0.0, 'total_pnl': 0.0, 'total_return_pct': 0.0, 'avg_trade_pct': 0.0,
+                'profit_factor': None, 'max_drawdown': 0.0, 'max_drawdown_pct': 0.0,
+                'take_profit_exits': 0, 'stop_loss_exits': 0}
+
+    _, _, _, side, entry, exit_, reason = (np.array(column) for column in zip(*raw_trades))
+    returns = side * (exit_ / entry - 1) - 2 * backtester.commission
+    pnl = returns * backtester.trade_amount
+    gross_profit = float(pnl[pnl > 0].sum())
+    gross_loss = float(-pnl[pnl < 0].sum())
+    total = float(pnl.sum())
+
+    equity = np.r_[initial_balance, initial_balance + np.cumsum(pnl)]
+    peak = np.maximum.accumulate(equity)
+    drawdown = peak - equity
+    wins = int((pnl > 0).sum())
+
+    return {
+        'trades': count,
+        'win_rate': round(wins / count * 100, 2),
+        'total_pnl': round(total, 4),
+        'total_return_pct': round(total / initial_balance * 100, 2),
+        'avg_trade_pct': round(float((returns * 100).mean()), 4),
+        'profit_factor': round(gross_profit / gross_loss, 3) if gross_loss else None,
+        'max_drawdown': round(float(drawdown.max()), 4),
+        'max_drawdown_pct': round(float((drawdown / peak).max() * 100), 2),
+        'take_profit_exits': int((reason == 'TP').sum()),
+        'stop_loss_exits': int((reason == 'SL').sum()),
+    }
+
+
+def _evaluate_batch(batch):
+    return [(params, _evaluate(params)) for params in batch]
+
+
+def _evaluate_ranges(params, ranges):
+    """
+    Parametre setini verilen [başlangıç, bitiş) mum aralıklarında ayrı ayrı çalıştırır (worker içinde)
+    - Sinyaller tüm veri üzerinde bir kez hesaplanır; aralık öncesi geçmiş indikatörlerin ısınması için
+      kullanılır (canlıda bot da geçmiş mumlarla başlar)
+    """
+    cache = _WORKER['cache']
+    backtester = VectorizedBacktester(_WORKER['strategy'], _WORKER['timeframe'], overrides=params,
+                                      **_WORKER['settings'])
+    buy, sell = cache.signals(backtester.adapter, params)
+    tp_percent = backtester.adapter.take_profit_percent
+    sl_percent = backtester.adapter.stop_loss_percent
+
+    results = []
+    for start, end in ranges:
+        window = slice(start, end)
+        raw_trades = simulate_trades(
+            cache.open[window], cache.high[window], cache.low[window], cache.close[window],
+            buy[window], sell[window], tp_percent, sl_percent, confirm_bars=backtester.confirm_bars
+        )
+        results.append(_stats(backtester, raw_trades))
+    return results
+
+
+def _evaluate_range_batch(batch):
+    return [(params, ranges, _evaluate_ranges(params, ranges)) for params, ranges in batch]
+
+
+class ParameterSweep:
+    """
+    Strateji Config parametreleri için paralel tarama / optimizasyon
+    - grid: tüm kombinasyonlar, random: rastgele N set, bayes: TPE ile N set
+    - Mum dizileri shared memory ile worker süreçlerine bir kez aktarılır
+    - Aynı indikatör ara sonuçlarını paylaşan setler aynı worker'a gruplanır (ATR uzunluğa göre bir kez)
+    - Sonuçlar parametre hash'i ile diskte saklanır; tekrar çalıştırmada hesaplanmış setler atlanır
+    """
+
+    def __init__(self, df, strategy, space, symbol='', timeframe='15m', method='grid', samples=50,
+                 workers=None, metric='total_pnl', min_trades=1, mode='vectorized', seed=None,
+                 cache_dir=os.path.join('data', 'sweeps'), trade_amount=100, commission=0.0004,
+                 initial_balance=1000.0, logger=None):
+        if method not in ('grid', 'random', 'bayes'):
+            raise ValueError(f"Bilinmeyen yöntem: {method}")
+        if metric not in METRICS:
+            raise ValueError(f"Bilinmeyen metrik: {metric} (seçenekler: {', '.join(METRICS)})")
+        if mode not in ('vectorized', 'intrabar'):
+            raise ValueError(f"Bilinmeyen mod: {mode}")
+
+        if df.empty:
+            raise ValueError("Parametre taraması için mum verisi boş")
+
+        self.df = df.reset_index(drop=True)
+        self.strategy = strategy
+        self.space = space
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.method = method
+        self.samples = samples
+        self.workers = workers or os.cpu_count() or 1
+        self.metric = metric
+        self.min_trades = min_trades
+        self.mode = mode
+        self.seed = seed
+        self.cache_dir = cache_dir
+        self.settings = {'trade_amount': trade_amount, 'commission': commission,
+                         'initial_balance': initial_balance}
+        self.logger = logger or logging
+        self.results = {}  # params_key -> (params, stats)
+
+    def _data_fingerprint(self):
+        open_time = self.df['Open time']
+        raw = f"{len(self.df)}:{open_time.iloc[0] if len(self.df) else ''}:{open_time.iloc[-1] if len(self.df) else ''}:" \
+              f"{float(self.df['Close'].sum()):.6f}"
+        return hashlib.sha1(raw.encode()).hexdigest()[:12]
+
+    @property
+    def cache_path(self):
+        return os.path.join(self.cache_dir, f"{self.symbol or 'data'}_{self.strategy}_{self.timeframe}_{self.mode}_"
+                                            f"{self._data_fingerprint()}.jsonl")
+
+    def result_hash(self, params):
+        """Parametre seti + işlem ayarları için sonuç önbelleği anahtarı"""
+        raw = params_key({'params': params, 'settings': self.settings})
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def _load_cache(self):
+        cache = {}
+        if os.path.exists(self.cache_path):
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        cache[entry['hash']] = entry['stats']
+                    except (ValueError, KeyError):
+                        continue
+        return cache
+
+    def _append_cache(self, entries):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self.cache_path, 'a', encoding='utf-8') as f:
+            for params, stats in entries:
+                f.write(json.dumps({'hash': self.result_hash(params), 'params': params, 'stats': stats}) + '\n')
+
+    def score(self, stats):
+        """Sıralama skoru (büyük olan daha iyi)"""
+        return score_stats(stats, self.metric, self.min_trades)
+
+    def _batches(self, param_sets):
+        """Ortak ara sonuçları olan setleri yan yana getirip worker başına birkaç parçaya böler"""
+        ordered = sorted(param_sets, key=lambda p: (signal_key(p), params_key(p)))
+        size = max(1, math.ceil(len(ordered) / (self.workers * 4)))
+        return [ordered[i:i + size] for i in range(0, len(ordered), size)]
+
+    def _evaluate_sets(self, pool, param_sets, cache):
+        pending = []
+        for params in param_sets:
+            key = params_key(params)
+            cached = cache.get(self.result_hash(params))
+            if cached is not None:
+                self.results[key] = (params, cached)
+            elif key not in self.results:
+                pending.append(params)
+
+        if not pending:
+            return 0
+        evaluated = []
+        for batch_result in pool.map(_evaluate_batch, self._batches(pending)):
+            evaluated.extend(batch_result)
+        for params, stats in evaluated:
+            self.results[params_key(params)] = (params, stats)
+        self._append_cache(evaluated)
+        return len(evaluated)
+
+    def run(self):
+        """Taramayı çalıştırır ve sıralı sonuç tablosunu döndürür"""
+        started = time.perf_counter()
+        cache = self._load_cache()
+        rng = np.random.default_rng(self.seed)
+        shared = SharedCandles.create(self.df)
+        evaluated = 0
+
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker,
+                initargs=(shared.name, shared.rows, self.strategy, self.timeframe, self.mode, self.settings)
+            ) as pool:
+                if self.method == 'grid':
+                    evaluated += self._evaluate_sets(pool, list(self.space.grid()), cache)
+                elif self.method == 'random':
+                    evaluated += self._evaluate_sets(pool, self.space.random(self.samples, rng), cache)
+                else:
+                    sampler = TPESampler(self.space, seed=self.seed)
+                    target = min(self.samples, self.space.size)
+                    while len(self.results) < target:
+                        history = [(params, self.score(stats)) for params, stats in self.results.values()]
+                        # Skoru sonsuz olan (işlem yok) setler yoğunluk hesabını bozmasın
+                        history = [(p, s if np.isfinite(s) else (-1e12 if s < 0 else 1e12)) for p, s in history]
+                        count = min(self.workers, target - len(self.results))
+                        suggestions = sampler.suggest(history, count, exclude=self.results.keys())
+                        if not suggestions:
+                            break
+                        evaluated += self._evaluate_sets(pool, suggestions, cache)
+        finally:
+            shared.close()
+
+        table = self.table()
+        self.logger.info(f"Parametre taraması tamamlandı: {len(table)} set ({evaluated} yeni hesaplandı, "
+                         f"{len(table) - evaluated} önbellekten), {time.perf_counter() - started:.1f} sn")
+        return table
+
+    def table(self):
+        """Sonuçları seçilen metriğe göre sıralı DataFrame olarak döndürür"""
+        rows = []
+        for params, stats in self.results.values():
+            rows.append({**params, **stats, 'score': self.score(stats)})
+        if not rows:
+            return pd.DataFrame()
+        table = pd.DataFrame(rows).sort_values('score', ascending=False, kind='stable').reset_index(drop=True)
+        table.insert(0, 'rank', np.arange(1, len(table) + 1))
+        return table.drop(columns=['score'])
@@ -0,0 +1,331 @@
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+from backtest.candle_store import interval_ms
+from backtest.engine import TRADE_COLUMNS, exit_price
+from backtest.strategies import StrategyAdapter
+
+
+def align_candles(data):
+    """
+    Sembollerin mum verisini ortak zaman eksenine hizalar
+
+    Args:
+        data: {sembol: fetch_data formatında DataFrame}
+
+    Returns:
+        tuple: (open_time dizisi, {'Open'|'High'|'Low'|'Close': zaman x sembol dizisi}, satır indeksleri)
+               Sembolün o zamanda mumu yoksa değerler NaN olur
+    """
+    symbols = list(data)
+    times = np.unique(np.concatenate([data[s]['Open time'].to_numpy(dtype=np.int64) for s in symbols]))
+    rows = {}
+    arrays = {field: np.full((len(times), len(symbols)), np.nan) for field in ('Open', 'High', 'Low', 'Close')}
+    for column, symbol in enumerate(symbols):
+        df = data[symbol]
+        rows[symbol] = np.searchsorted(times, df['Open time'].to_numpy(dtype=np.int64))
+        for field in arrays:
+            arrays[field][rows[symbol], column] = df[field].to_numpy(dtype=float)
+    return times, arrays, rows
+
+
+class PortfolioResult:
+    """Portföy backtest sonucu: ortak bakiye eğrisi, işlemler ve kapasite istatistikleri"""
+
+    def __init__(self, symbols, strategy, timeframe, trades, equity, rejected, liquidated, elapsed,
+                 initial_balance=1000.0, max_positions=None):
+        self.symbols = symbols
+        self.strategy = strategy
+        self.timeframe = timeframe
+        self.trades = trades
+        self.equity = equity
+        self.rejected = rejected
+        self.liquidated = liquidated
+        self.elapsed = elapsed
+        self.initial_balance = initial_balance
+        self.max_positions = max_positions
+
+    def per_symbol(self):
+        """Sembol bazında işlem sayısı, PnL ve reddedilen sinyal sayısı"""
+        rows = []
+        for symbol in self.symbols:
+            trades = self.trades[self.trades['symbol'] == symbol]
+            count = len(trades)
+            rows.append({
+                'symbol': symbol,
+                'trades': count,
+                'win_rate': round(float((trades['pnl'] > 0).sum()) / count * 100, 2) if count else 0.0,
+                'total_pnl': round(float(trades['pnl'].sum()), 4),
+                'rejected_signals': int(self.rejected.get(symbol, 0)),
+            })
+        return pd.DataFrame(rows)
+
+    def stats(self):
+        trades = self.trades
+        count = len(trades)
+        wins = int((trades['pnl'] > 0).sum())
+        equity = self.equity['equity'].to_numpy()
+        peak = np.maximum.accumulate(np.r_[self.initial_balance, equity])[1:]
+        drawdown = peak - equity
+        open_positions = self.equity['open_positions'].to_numpy()
+        margin_usage = np.divide(self.equity['used_margin'].to_numpy(), equity,
+                                 out=np.zeros(len(equity)), where=equity > 0)
+        final_equity = float(equity[-1]) if len(equity) else self.initial_balance
+
+        return {
+            'symbols': len(self.symbols),
+            'strategy': self.strategy,
+            'timeframe': self.timeframe,
+            'start': str(self.equity['datetime'].iloc[0]) if len(self.equity) else None,
+            'end': str(self.equity['datetime'].iloc[-1]) if len(self.equity) else None,
+            'bars': len(self.equity),
+            'trades': count,
+            'win_rate': round(wins / count * 100, 2) if count else 0.0,
+            'total_pnl': round(final_equity - self.initial_balance, 4),
+            'total_return_pct': round((final_equity / self.initial_balance - 1) * 100, 2),
+            'max_drawdown': round(float(drawdown.max()), 4) if len(drawdown) else 0.0,
+            'max_drawdown_pct': round(float((drawdown / peak).max() * 100), 2) if len(drawdown) else 0.0,
+            'max_open_positions': int(open_positions.max()) if len(open_positions) else 0,
+            'avg_open_positions': round(float(open_positions.mean()), 3) if len(open_positions) else 0.0,
+            'peak_margin_usage_pct': round(float(margin_usage.max() * 100), 2) if len(margin_usage) else 0.0,
+            'rejected_signals': int(sum(self.rejected.values())),
+            'liquidated': self.liquidated,
+            'elapsed_seconds': round(self.elapsed, 3),
+        }
+
+    def summary(self):
+        stats = self.stats()
+        limit = self.max_positions if self.max_positions else 'sınırsız'
+        lines = [
+            f"Portföy {stats['strategy']} ({stats['timeframe']}, {stats['symbols']} sembol, {stats['bars']} mum, "
+            f"{stats['start']} - {stats['end']})",
+            f"  İşlem: {stats['trades']} | Win rate: %{stats['win_rate']} | PnL: {stats['total_pnl']:.2f} USDT "
+            f"(%{stats['total_return_pct']})",
+            f"  Max drawdown: {stats['max_drawdown']:.2f} USDT (%{stats['max_drawdown_pct']}) | "
+            f"Eşzamanlı pozisyon: max {stats['max_open_positions']}, ort. {stats['avg_open_positions']} "
+            f"(limit {limit})",
+            f"  Maksimum marjin kullanımı: %{stats['peak_margin_usage_pct']} | Reddedilen sinyal: "
+            f"{stats['rejected_signals']}" + (" | LİKİDASYON" if stats['liquidated'] else ""),
+        ]
+        return '\n'.join(lines)
+
+    def log_report(self, logger=None):
+        logger = logger or logging
+        for line in self.summary().splitlines():
+            logger.info(line)
+
+
+class PortfolioBacktester:
+    """
+    Çoklu sembol portföy backtesti (tek futures cüzdanı)
+    - Tüm sembollerin sinyalleri ortak zaman ekseninde (zaman x sembol dizileri) işlenir; her mumda
+      çıkış, onay ve giriş kontrolleri tüm semboller için vektörel yapılır
+    - Her sembol botlarla aynı kurallara uyar (sinyal onayı, mum başına tek işlem, TP/SL emirleri)
+    - Pozisyon büyüklüğü botlardaki gibi TRADE_AMOUNT (nominal), kullanılan marjin nominal / kaldıraç
+    - Yeni pozisyon için serbest marjin (bakiye + gerçekleşmemiş PnL - kullanılan marjin) yeterli olmalı
+      ve eşzamanlı pozisyon limiti aşılmamalı; aksi halde sinyal reddedilir (kapasite ölçümü)
+    - Bakiye bakım marjininin altına düşerse tüm pozisyonlar kapatılır (likidasyon) ve simülasyon durur
+    """
+
+    def __init__(self, strategy='psar_atr_strategy', timeframe='15m', trade_amount=100, leverage=10,
+                 initial_balance=1000.0, max_positions=None, commission=0.0004, maintenance_margin=0.004,
+                 overrides=None, symbol_overrides=None, confirmation=True):
+        self.strategy = strategy
+        self.timeframe = timeframe
+        self.trade_amount = trade_amount
+        self.leverage = leverage
+        self.initial_balance = initial_balance
+        self.max_positions = max_positions
+        self.commission = commission
+        self.maintenance_margin = maintenance_margin  # Nominal değere göre bakım marjini oranı
+        self.overrides = overrides or {}
+        self.symbol_overrides = symbol_overrides or {}  # {sembol: {parametre: değer}} (ör. walk-forward önerisi)
+        self.confirmation = confirmation
+
+    def adapter(self, symbol):
+        overrides = {**self.overrides, **self.symbol_overrides.get(symbol, {})}
+        return StrategyAdapter(self.strategy, self.timeframe, overrides)
+
+    def prepare(self, data):
+        """Hizalanmış fiyat dizileri, sinyaller ve sembol bazında TP/SL / onay parametreleri"""
+        symbols = list(data)
+        times, arrays, rows = align_candles(data)
+        buy = np.zeros((len(times), len(symbols)), dtype=bool)
+        sell = np.zeros_like(buy)
+        take_profit = np.zeros(len(symbols))
+        stop_loss = np.zeros(len(symbols))
+        confirm_bars = np.zeros(len(symbols), dtype=np.int64)
+
+        for column, symbol in enumerate(symbols):
+            adapter = self.adapter(symbol)
+            symbol_buy, symbol_sell = adapter.signals(data[symbol])
+            buy[rows[symbol], column] = symbol_buy
+            sell[rows[symbol], column] = symbol_sell
+            take_profit[column] = adapter.take_profit_percent
+            stop_loss[column] = adapter.stop_loss_percent
+            if self.confirmation:
+                confirm_bars[column] = int(adapter.confirmation_delay * 1000 // interval_ms(self.timeframe))
+
+        return symbols, times, arrays, buy, sell, take_profit, stop_loss, confirm_bars
+
+    def run(self, data):
+        """
+        Args:
+            data: {sembol: fetch_data formatında DataFrame} (aynı timeframe)
+        """
+        started = time.perf_counter()
+        data = {symbol: df.reset_index(drop=True) for symbol, df in data.items() if len(df)}
+        if not data:
+            raise ValueError("Portföy backtesti için mum verisi yok")
+
+        symbols, times, arrays, buy, sell, tp_percent, sl_percent, confirm_bars = self.prepare(data)
+        open_, high, low, close = arrays['Open'], arrays['High'], arrays['Low'], arrays['Close']
+        # Mumu olmayan sembolde pozisyon değeri son kapanıştan hesaplanır
+        mark = pd.DataFrame(close).ffill().to_numpy()
+        n, count = close.shape
+        signal = buy | sell
+        notional = float(self.trade_amount)
+        margin = notional / self.leverage
+        max_positions = self.max_positions or count
+
+        # Sembol bazında durum
+        in_position = np.zeros(count, dtype=bool)
+        side = np.zeros(count, dtype=np.int64)
+        entry = np.zeros(count)
+        take_profit = np.zeros(count)
+        stop_loss = np.zeros(count)
+        entry_bar = np.full(count, -1, dtype=np.int64)
+        signal_bar = np.full(count, -1, dtype=np.int64)
+        pending = np.zeros(count, dtype=bool)
+        pending_side = np.zeros(count, dtype=np.int64)
+        confirm_at = np.full(count, -1, dtype=np.int64)
+        next_bar = np.zeros(count, dtype=np.int64)
+
+        balance = self.initial_balance
+        equity = np.empty(n)
+        used_margin = np.zeros(n)
+        open_positions = np.zeros(n, dtype=np.int64)
+        trades = []
+        rejected = dict.fromkeys(symbols, 0)
+        liquidated = False
+
+        def close_position(column, bar, price, reason):
+            nonlocal balance
+            pnl = side[column] * (price / entry[column] - 1) * notional - notional * self.commission
+            balance += pnl
+            trades.append((symbols[column], signal_bar[column], entry_bar[column], bar, side[column],
+                           entry[column], price, reason))
+            in_position[column] = False
+
+        for t in range(n):
+            # 1) Açık pozisyonlarda mum içi TP/SL (pozisyon bu mumdan önce açılmış olmalı)
+            active = in_position & (entry_bar < t)
+            if active.any():
+                long = side == 1
+                sl_hit = active & np.where(long, low[t] <= stop_loss, high[t] >= stop_loss)
+                tp_hit = active & np.where(long, high[t] >= take_profit, low[t] <= take_profit)
+                for column in np.flatnonzero(sl_hit | tp_hit):
+                    price, reason = exit_price(open_[t, column], side[column], take_profit[column],
+                                               stop_loss[column], sl_hit[column])
+                    close_position(column, t, price, reason)
+                    # Bot kapanıştan hemen sonra sinyal kontrolü yapar
+                    next_bar[column] = t
+
+            # 2) Yeni sinyaller onay beklemesine alınır
+            start = signal[t] & ~in_position & ~pending & (next_bar <= t)
+            if start.any():
+                pending |= start
+                pending_side[start] = np.where(buy[t, start], 1, -1)
+                signal_bar[start] = t
+                confirm_at[start] = t + confirm_bars[start]
+
+            # 3) Onay zamanı gelen sinyaller: sinyal hala aktifse ortak bakiyeden pozisyon açılır
+            due = pending & (confirm_at == t)
+            if due.any():
+                pending &= ~due
+                still_active = np.where(pending_side == 1, buy[t], sell[t])
+                for column in np.flatnonzero(due):
+                    next_bar[column] = t + 1
+                    if not still_active[column] or entry_bar[column] == t:
+                        continue
+
+                    unrealized = float(np.sum(side[in_position] * (mark[t, in_position] / entry[in_position] - 1)))
+                    free_margin = balance + unrealized * notional - in_position.sum() * margin
+                    if in_position.sum() >= max_positions or free_margin < margin:
+                        rejected[symbols[column]] += 1
+                        continue
+
+                    price = close[t, column]
+                    side[column] = pending_side[column]
+                    entry[column] = price
+                    if side[column] == 1:
+                        take_profit[column] = price * (1 + tp_percent[column])
+                        stop_loss[column] = price * (1 - sl_percent[column])
+                    else:
+                        take_profit[column] = price * (1 - tp_percent[column])
+                        stop_loss[column] = price * (1 + sl_percent[column])
+                    entry_bar[column] = t
+                    in_position[column] = True
+                    balance -= notional * self.commission
+
+            # 4) Piyasa değeri ile bakiye ve bakım marjini kontrolü
+            positions = int(in_position.sum())
+            unrealized = 0.0
+            if positions:
+                unrealized = float(np.sum(side[in_position] * (mark[t, in_position] / entry[in_position] - 1))) * notional
+            equity[t] = balance + unrealized
+            used_margin[t] = positions * margin
+            open_positions[t] = positions
+
+            if positions and equity[t] <= positions * notional * self.maintenance_margin:
+                for column in np.flatnonzero(in_position):
+                    close_position(column, t, mark[t, column], 'LIQ')
+                equity[t] = balance
+                used_margin[t] = 0.0
+                open_positions[t] = 0
+                liquidated = True
+                equity, used_margin, open_positions = equity[:t + 1], used_margin[:t + 1], open_positions[:t + 1]
+                times = times[:t + 1]
+                break
+
+        if not liquidated:
+            # Veri sonunda açık pozisyonlar son kapanıştan kapatılır
+            for column in np.flatnonzero(in_position):
+                close_position(column, n - 1, mark[-1, column], 'END')
+            if len(equity):
+                equity[-1] = balance
+
+        equity_frame = pd.DataFrame({
+            'datetime': pd.to_datetime(times, unit='ms'),
+            'equity': equity,
+            'used_margin': used_margin,
+            'open_positions': open_positions,
+        })
+        return PortfolioResult(
+            symbols, self.strategy, self.timeframe, self._trade_frame(trades, times), equity_frame, rejected,
+            liquidated, time.perf_counter() - started, initial_balance=self.initial_balance,
+            max_positions=self.max_positions,
+        )
+
+    def _trade_frame(self, trades, times):
+        if not trades:
+            return pd.DataFrame(columns=['symbol'] + TRADE_COLUMNS)
+
+        symbol, signal_bar, entry_bar, exit_bar, side, entry, exit_, reason = (np.array(c) for c in zip(*trades))
+        datetimes = pd.to_datetime(times, unit='ms').to_numpy()
+        returns = side * (exit_ / entry - 1) - 2 * self.commission
+        return pd.DataFrame({
+            'symbol': symbol,
+            'signal_time': datetimes[signal_bar],
+            'entry_time': datetimes[entry_bar],
+            'exit_time': datetimes[exit_bar],
+            'side': np.where(side == 1, 'BUY', 'SELL'),
+            'entry_price': entry,
+            'exit_price': exit_,
+            'exit_reason': reason,
+            'return_pct': returns * 100,
+            'pnl': returns * self.trade_amount,
+        }).sort_values('entry_time', kind='stable').reset_index(drop=True)
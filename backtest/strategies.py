@@ -0,0 +1,83 @@
+import importlib
+
+import numpy as np
+
+STRATEGY_NAMES = ('psar_atr_strategy', 'eralp_strateji2', 'atr_strategy', 'skorlama_strategy')
+
+
+class StrategyAdapter:
+    """
+    Strateji paketlerini backtest için ortak arayüze çevirir
+    - psar/eralp/atr: Strategy.determine_position, config alanları küçük harfli
+    - skorlama: SkorlamaStrategy.analyze_data, küçük harfli kolonlar ve büyük harfli config alanları
+    - overrides ile config değerleri (zone_length, take_profit_percent vb.) değiştirilebilir
+    """
+
+    def __init__(self, name, timeframe='15m', overrides=None):
+        if name not in STRATEGY_NAMES:
+            raise ValueError(f"Bilinmeyen strateji: {name} (seçenekler: {', '.join(STRATEGY_NAMES)})")
+
+        self.name = name
+        self.timeframe = timeframe
+
+        if name == 'skorlama_strategy':
+            from strategies.skorlama_strategy.config import SkorlamaConfig
+            from strategies.skorlama_strategy.strategy import SkorlamaStrategy
+
+            self.config = SkorlamaConfig()
+            self._apply_overrides(overrides)
+            self.strategy = SkorlamaStrategy(self.config)
+        else:
+            module = importlib.import_module(f'strategies.{name}.strategy')
+            self.strategy = module.Strategy(timeframe)
+            self.config = self.strategy.config
+            self._apply_overrides(overrides)
+
+    def _apply_overrides(self, overrides):
+        for key, value in (overrides or {}).items():
+            if not hasattr(self.config, key):
+                raise ValueError(f"{self.name} config içinde '{key}' parametresi yok")
+            setattr(self.config, key, value)
+
+    @property
+    def take_profit_percent(self):
+        return getattr(self.config, 'take_profit_percent', getattr(self.config, 'TAKE_PROFIT_PERCENT', None))
+
+    @property
+    def stop_loss_percent(self):
+        return getattr(self.config, 'stop_loss_percent', getattr(self.config, 'STOP_LOSS_PERCENT', None))
+
+    @property
+    def confirmation_delay(self):
+        """Sinyal onay bekleme süresi (saniye); skorlama botunda onay beklemesi yok"""
+        return getattr(self.config, 'signal_confirmation_delay', 0)
+
+    def compute(self, df):
+        """
+        Tüm geçmiş için sinyal kolonlarını hesaplar
+
+        Returns:
+            DataFrame: df kolonlarına ek olarak strateji kolonları ve bool 'buy' / 'sell'
+        """
+        df = df.reset_index(drop=True).copy()
+
+        if self.name == 'skorlama_strategy':
+            data = df.rename(columns={'Open': 'open', 'High': 'high', 'Low': 'low',
+                                      'Close': 'close', 'Volume': 'volume'})
+            # PSAR sadece gösterim amaçlı ve ta kütüphanesinde çok yavaş, backtestte atlanır
+            analysis = self.strategy.analyze_data(data, include_psar=False)
+            for key in ('zone_decider', 'middle_donchian', 'adx', 'score'):
+                df[key] = analysis[key].to_numpy()
+            df['buy'] = analysis['buy_signals'].to_numpy(dtype=bool)
+            df['sell'] = analysis['sell_signals'].to_numpy(dtype=bool)
+            return df
+
+        df = self.strategy.determine_position(df)
+        df['buy'] = df['buy'].to_numpy(dtype=bool)
+        df['sell'] = df['sell'].to_numpy(dtype=bool) & ~df['buy'].to_numpy(dtype=bool)
+        return df
+
+    def signals(self, df):
+        """Sadece (buy, sell) bool dizilerini döndürür"""
+        result = self.compute(df)
+        return np.asarray(result['buy'], dtype=bool), np.asarray(result['sell'], dtype=bool)
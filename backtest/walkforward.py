@@ -0,0 +1,391 @@
+import ast
+import glob
+import hashlib
+import json
+import logging
+import math
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+import pandas as pd
+
+from backtest.candle_store import interval_ms
+from backtest.optimizer import (
+    ParameterSpace, SharedCandles, _evaluate_range_batch, _init_worker, params_key, score_stats, signal_key,
+)
+
+# Parametre verilmediğinde (gece çalışması) kullanılan arama uzayları; mevcut Config değerlerini içerir
+DEFAULT_SPACES = {
+    'psar_atr_strategy': {
+        'zone_length': [8, 10, 12, 14, 20],
+        'zone_multiplier': [2.0, 2.5, 3.0, 3.5],
+        'donchian_length': [10, 20, 30],
+        'take_profit_percent': [0.004, 0.005, 0.0075, 0.01],
+    },
+    'eralp_strateji2': {
+        'zone_length': [8, 10, 12, 14, 20],
+        'zone_multiplier': [2.0, 2.5, 3.0, 3.5],
+        'donchian_length': [10, 20, 30],
+        'take_profit_percent': [0.004, 0.005, 0.0075, 0.01],
+    },
+    'atr_strategy': {
+        'atr_period': [5, 10, 14, 20],
+        'key_value': [1, 1.5, 2, 3],
+        'take_profit_percent': [0.004, 0.005, 0.0075, 0.01],
+    },
+    'skorlama_strategy': {
+        'TAKE_PROFIT_PERCENT': [0.004, 0.005, 0.0075, 0.01],
+        'STOP_LOSS_PERCENT': [0.01, 0.015, 0.02],
+    },
+}
+
+DURATION_UNITS = {'m': 60_000, 'h': 3_600_000, 'd': 86_400_000, 'w': 604_800_000}
+
+
+def parse_duration(text, timeframe):
+    """'90d', '12h', '2w' gibi süreleri veya doğrudan mum sayısını timeframe mum sayısına çevirir"""
+    text = str(text).strip()
+    if text.isdigit():
+        return int(text)
+    unit = text[-1]
+    if unit not in DURATION_UNITS or not text[:-1].replace('.', '', 1).isdigit():
+        raise ValueError(f"Geçersiz süre: {text} (ör. 90d, 12h, 2w veya mum sayısı)")
+    return int(float(text[:-1]) * DURATION_UNITS[unit] // interval_ms(timeframe))
+
+
+def discover_symbols(root='.'):
+    """
+    main_*.py başlatıcılarındaki run_main(symbol=..., timeframe=...) çağrılarını okur
+    Dosyalar import edilmez, sadece kaynak kod ayrıştırılır
+
+    Returns:
+        list: Tekrarsız (sembol, timeframe) listesi
+    """
+    found = []
+    for path in sorted(glob.glob(os.path.join(root, 'main_*.py'))):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                tree = ast.parse(f.read(), filename=path)
+        except (OSError, SyntaxError) as e:
+            logging.warning(f"{path} okunamadı: {e}")
+            continue
+
+        for node in ast.walk(tree):
+            if not (isinstance(node, ast.Call) and getattr(node.func, 'id', None) == 'run_main'):
+                continue
+            keywords = {kw.arg: kw.value.value for kw in node.keywords if isinstance(kw.value, ast.Constant)}
+            if 'symbol' in keywords:
+                entry = (keywords['symbol'], keywords.get('timeframe', '15m'))
+                if entry not in found:
+                    found.append(entry)
+    return found
+
+
+class Window:
+    """Walk-forward penceresi: [train_start, train_end) eğitim, [train_end, test_end) test mum aralığı"""
+
+    def __init__(self, index, train_start, train_end, test_end):
+        self.index = index
+        self.train_start = train_start
+        self.train_end = train_end
+        self.test_end = test_end
+
+    @property
+    def train(self):
+        return self.train_start, self.train_end
+
+    @property
+    def test(self):
+        return self.train_end, self.test_end
+
+
+def build_windows(bars, train_bars, test_bars, step_bars=None, anchored=False):
+    """
+    Kayan eğitim/test pencerelerini oluşturur
+    - Pencereler verinin başından hizalanır; yeni veri geldiğinde önceki pencereler değişmez, sadece
+      sona yeni pencereler eklenir
+    - anchored=True ise eğitim her zaman verinin başından başlar (genişleyen pencere)
+    """
+    step_bars = step_bars or test_bars
+    if train_bars <= 0 or test_bars <= 0 or step_bars <= 0:
+        raise ValueError("Eğitim, test ve adım uzunlukları pozitif olmalı")
+
+    windows = []
+    start = 0
+    while start + train_bars + test_bars <= bars:
+        train_start = 0 if anchored else start
+        windows.append(Window(len(windows), train_start, start + train_bars, start + train_bars + test_bars))
+        start += step_bars
+    return windows
+
+
+class WalkForwardOptimizer:
+    """
+    Walk-forward optimizasyon ve örneklem dışı (out-of-sample) doğrulama
+    - Her pencerede Config parametreleri eğitim aralığında optimize edilir, seçilen set hemen ardından
+      gelen görülmemiş test aralığında skorlanır
+    - Her parametre setinin sinyalleri tüm veri için bir kez hesaplanır ve tüm pencerelerde kullanılır;
+      setler worker süreçlerine dağıtılır (mum verisi shared memory ile paylaşılır)
+    - Pencere sonuçları diskte saklanır; yeni veri geldiğinde sadece yeni pencereler hesaplanır
+    - time_budget verilirse süre dolduğunda kalan setler atlanır ve o ana kadarki sonuçlarla devam edilir
+    - Önerilen config son pencerenin (en güncel veri) eğitim sonucudur
+    """
+
+    def __init__(self, df, strategy, space=None, symbol='', timeframe='15m', train='90d', test='30d', step=None,
+                 anchored=False, method='grid', samples=100, workers=None, metric='total_pnl', min_trades=5,
+                 seed=None, time_budget=None, cache_dir=os.path.join('data', 'walkforward'), trade_amount=100,
+                 commission=0.0004, initial_balance=1000.0, logger=None):
+        if method not in ('grid', 'random'):
+            raise ValueError(f"Walk-forward için desteklenmeyen yöntem: {method} (grid veya random)")
+        if df.empty:
+            raise ValueError("Walk-forward için mum verisi boş")
+
+        self.df = df.reset_index(drop=True)
+        self.strategy = strategy
+        self.space = space or ParameterSpace(DEFAULT_SPACES[strategy])
+        self.symbol = symbol
+        self.timeframe = timeframe
+        self.windows = build_windows(
+            len(self.df), parse_duration(train, timeframe), parse_duration(test, timeframe),
+            parse_duration(step, timeframe) if step else None, anchored
+        )
+        self.method = method
+        self.samples = samples
+        self.workers = workers or os.cpu_count() or 1
+        self.metric = metric
+        self.min_trades = min_trades
+        self.seed = seed
+        self.time_budget = time_budget
+        self.cache_dir = cache_dir
+        self.settings = {'trade_amount': trade_amount, 'commission': commission,
+                         'initial_balance': initial_balance}
+        self.logger = logger or logging
+        self.results = {}  # (params_key, start, end) -> stats
+        self.timed_out = False
+
+    @property
+    def cache_path(self):
+        return os.path.join(self.cache_dir, f"{self.symbol or 'data'}_{self.strategy}_{self.timeframe}.jsonl")
+
+    def param_sets(self):
+        """Denenecek setler; mevcut Config (boş override) her zaman karşılaştırma için eklenir"""
+        if self.method == 'grid':
+            sets = list(self.space.grid())
+        else:
+            sets = self.space.random(self.samples, np.random.default_rng(self.seed))
+        return [{}] + sets
+
+    def range_hash(self, params, start, end):
+        """
+        Parametre seti + mum aralığı için önbellek anahtarı
+        Aralığın sonuna kadarki veri değişmediği sürece (veri sadece sona eklenir) anahtar aynı kalır
+        """
+        open_time = self.df['Open time']
+        raw = params_key({
+            'params': params, 'settings': self.settings,
+            'data': [int(open_time.iloc[0]), int(open_time.iloc[start]), int(open_time.iloc[end - 1]), end],
+        })
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def _load_cache(self):
+        cache = {}
+        if os.path.exists(self.cache_path):
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        cache[entry['hash']] = entry['stats']
+                    except (ValueError, KeyError):
+                        continue
+        return cache
+
+    def _append_cache(self, entries):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self.cache_path, 'a', encoding='utf-8') as f:
+            for params, start, end, stats in entries:
+                f.write(json.dumps({'hash': self.range_hash(params, start, end), 'params': params,
+                                    'range': [start, end], 'stats': stats}) + '\n')
+
+    def _tasks(self, param_sets, cache):
+        """Önbellekte olmayan (set, aralık) çiftlerinden worker görevleri"""
+        ranges = sorted({r for window in self.windows for r in (window.train, window.test)})
+        tasks = []
+        for params in param_sets:
+            missing = []
+            for start, end in ranges:
+                cached = cache.get(self.range_hash(params, start, end))
+                if cached is not None:
+                    self.results[(params_key(params), start, end)] = cached
+                else:
+                    missing.append((start, end))
+            if missing:
+                tasks.append((params, missing))
+        # Aynı sinyal parametrelerine sahip setler aynı worker'da ara sonuçları paylaşır; karşılaştırma
+        # için mevcut Config önce çalıştırılır
+        tasks.sort(key=lambda task: (task[0] != {}, signal_key(task[0])))
+        return tasks
+
+    def _evaluate(self, tasks, deadline):
+        """Görevleri worker süreçlerinde çalıştırır, hesaplanan aralık sayısını döndürür"""
+        if not tasks:
+            return 0
+        # Mevcut Config (ilk görev) ayrı grupta çalışır ki diğer setler süre sınırına takılsa da sonucu gelsin
+        first = 1 if tasks[0][0] == {} else 0
+        size = max(1, math.ceil((len(tasks) - first) / (self.workers * 4)))
+        batches = [tasks[:first]] if first else []
+        batches += [tasks[i:i + size] for i in range(first, len(tasks), size)]
+        shared = SharedCandles.create(self.df)
+        pool = ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker,
+            initargs=(shared.name, shared.rows, self.strategy, self.timeframe, 'vectorized', self.settings)
+        )
+        evaluated = 0
+
+        try:
+            pending = {pool.submit(_evaluate_range_batch, batch) for batch in batches}
+            while pending:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                entries = []
+                for future in done:
+                    for params, ranges, stats_list in future.result():
+                        for (start, end), stats in zip(ranges, stats_list):
+                            self.results[(params_key(params), start, end)] = stats
+                            entries.append((params, start, end, stats))
+                self._append_cache(entries)
+                evaluated += len(entries)
+
+                if pending and deadline is not None and time.monotonic() >= deadline:
+                    self.timed_out = True
+                    self.logger.warning(f"{self.symbol} walk-forward süre sınırına ulaşıldı, "
+                                        f"{len(pending)} görev grubu atlandı")
+                    break
+        finally:
+            # Süre dolduysa çalışan görevlerin bitmesi beklenmez
+            pool.shutdown(wait=not self.timed_out, cancel_futures=True)
+            shared.close()
+        return evaluated
+
+    def stats(self, params, start, end):
+        return self.results.get((params_key(params), start, end))
+
+    def run(self, deadline=None):
+        """
+        Walk-forward çalıştırır
+
+        Args:
+            deadline: time.monotonic() cinsinden bitiş zamanı (birden fazla sembol için ortak süre sınırı)
+
+        Returns:
+            dict: Pencere sonuçları, örneklem dışı özet ve önerilen config
+        """
+        started = time.perf_counter()
+        if self.time_budget is not None:
+            own_deadline = time.monotonic() + self.time_budget
+            deadline = own_deadline if deadline is None else min(deadline, own_deadline)
+
+        if not self.windows:
+            raise ValueError(f"{self.symbol}: veri ({len(self.df)} mum) en az bir eğitim+test penceresi için yetersiz")
+
+        param_sets = self.param_sets()
+        tasks = self._tasks(param_sets, self._load_cache())
+        cached = len(self.results)
+        evaluated = self._evaluate(tasks, deadline)
+
+        windows = [self._window_report(window, param_sets) for window in self.windows]
+        windows = [window for window in windows if window is not None]
+        report = {
+            'symbol': self.symbol,
+            'strategy': self.strategy,
+            'timeframe': self.timeframe,
+            'metric': self.metric,
+            'generated_at': pd.Timestamp.now().isoformat(timespec='seconds'),
+            'param_sets': len(param_sets),
+            'evaluated_ranges': evaluated,
+            'cached_ranges': cached,
+            'timed_out': self.timed_out,
+            'windows': windows,
+            'out_of_sample': self._summary(windows, 'test'),
+            'baseline_out_of_sample': self._summary(windows, 'baseline'),
+            'recommended_params': windows[-1]['params'] if windows else None,
+            'elapsed_seconds': round(time.perf_counter() - started, 3),
+        }
+        self.logger.info(
+            f"{self.symbol} {self.strategy} walk-forward: {len(windows)} pencere, {len(param_sets)} set "
+            f"({evaluated} aralık yeni hesaplandı, {cached} önbellekten), OOS PnL {report['out_of_sample']['total_pnl']:.2f} "
+            f"(mevcut config {report['baseline_out_of_sample']['total_pnl']:.2f}), "
+            f"{report['elapsed_seconds']} sn"
+        )
+        return report
+
+    def _window_report(self, window, param_sets):
+        """Eğitim aralığında en iyi seti seçip test aralığındaki sonucunu döndürür"""
+        best, best_score, best_train = None, -np.inf, None
+        for params in param_sets:
+            train = self.stats(params, *window.train)
+            if train is None or self.stats(params, *window.test) is None:
+                continue
+            score = score_stats(train, self.metric, self.min_trades)
+            if best is None or score > best_score:
+                best, best_score, best_train = params, score, train
+        if best is None:
+            return None
+
+        times = self.df['datetime']
+        return {
+            'index': window.index,
+            'train_start': str(times.iloc[window.train_start]),
+            'test_start': str(times.iloc[window.train_end]),
+            'test_end': str(times.iloc[window.test_end - 1]),
+            'params': best,
+            'train': best_train,
+            'test': self.stats(best, *window.test),
+            'baseline': self.stats({}, *window.test),
+        }
+
+    @staticmethod
+    def _summary(windows, key):
+        """Test aralıklarının birleşik sonucu"""
+        stats = [window[key] for window in windows if window.get(key) is not None]
+        trades = sum(s['trades'] for s in stats)
+        wins = sum(round(s['trades'] * s['win_rate'] / 100) for s in stats)
+        return {
+            'windows': len(stats),
+            'trades': trades,
+            'win_rate': round(wins / trades * 100, 2) if trades else 0.0,
+            'total_pnl': round(sum(s['total_pnl'] for s in stats), 4),
+            'profitable_windows': sum(1 for s in stats if s['total_pnl'] > 0),
+            'max_drawdown_pct': max((s['max_drawdown_pct'] for s in stats), default=0.0),
+        }
+
+
+def write_report(report, output_dir=os.path.join('data', 'walkforward')):
+    """Sembol raporunu ve tüm semboller için önerilen config dosyasını yazar"""
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"{report['symbol']}_{report['strategy']}_{report['timeframe']}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    # Sembol bazında önerilen config özeti (diğer sembollerin önceki sonuçları korunur)
+    summary_path = os.path.join(output_dir, 'recommended_configs.json')
+    summary = {}
+    if os.path.exists(summary_path):
+        with open(summary_path, 'r', encoding='utf-8') as f:
+            try:
+                summary = json.load(f)
+            except ValueError:
+                summary = {}
+    summary.setdefault(report['symbol'], {})[report['strategy']] = {
+        'timeframe': report['timeframe'],
+        'params': report['recommended_params'],
+        'out_of_sample': report['out_of_sample'],
+        'baseline_out_of_sample': report['baseline_out_of_sample'],
+        'generated_at': report['generated_at'],
+    }
+    tmp_path = f"{summary_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, summary_path)
+    return path
@@ -0,0 +1,20 @@
+"""
+Benchmark package.
+
+Botların kaynak kullanımı ve gecikmesi için ölçüm araçları. Yük testi,
+botları yerel mock borsaya (mock_exchange) karşı hızlandırılmış replay ile
+çalıştırır; mikro benchmark gösterge, strateji ve I/O fonksiyonlarını farklı
+bar sayılarında ölçer. Sonuçlar sürümler arasında karşılaştırılabilir JSON
+rapor olarak kaydedilir.
+"""
+
+from .load import LoadBenchmark, compare_reports, summarize
+from .micro import MicroBenchmark, compare_micro
+
+__all__ = [
+    'LoadBenchmark',
+    'compare_reports',
+    'summarize',
+    'MicroBenchmark',
+    'compare_micro',
+]
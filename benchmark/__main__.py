@@ -0,0 +1,144 @@
+"""
+Performans benchmark komut satırı aracı
+
+Kullanım:
+    python -m benchmark load                                         # 1, 13, 50 ve 200 bot, 120 dakika x60 replay
+    python -m benchmark load --bots 13 --minutes 240 --strategy psar_atr_strategy,atr_strategy
+    python -m benchmark load --bots 50 --latency 50 --jitter 30 --error-rate 0.01 --compare eski.json
+    python -m benchmark compare data/benchmarks/load_eski.json data/benchmarks/load_yeni.json
+    python -m benchmark micro                                        # tüm ölçümler, repodaki baseline ile karşılaştırma
+    python -m benchmark micro --filter 'psar_atr_strategy|fetch_data' --sizes 1000,100000
+    python -m benchmark micro --save-baseline                        # benchmark/baselines/micro.json günceller
+"""
+
+import argparse
+import logging
+import os
+import sys
+from datetime import datetime
+
+from backtest.candle_store import CandleStore
+from benchmark.load import DEFAULT_BOT_COUNTS, LoadBenchmark, compare_reports
+from benchmark.micro import BASELINE_PATH, DEFAULT_SIZES, MicroBenchmark, compare_micro
+from benchmark.report import load_report, write_report
+
+REPORT_DIR = os.path.join('data', 'benchmarks')
+
+
+def print_comparison(rows, threshold):
+    if not rows:
+        print("Karşılaştırılacak ortak senaryo yok")
+        return False
+    micro = 'case' in rows[0]
+    if micro:
+        print(f"{'Ölçüm':<52} {'Bar':>7} {'Önceki ms':>12} {'Şimdiki ms':>12} {'Değişim':>9}")
+    else:
+        print(f"{'Bot':>5} {'Metrik':<32} {'Önceki':>12} {'Şimdiki':>12} {'Değişim':>9}")
+    for row in rows:
+        change = f"{row['change'] * 100:+.1f}%" if row['change'] is not None else '-'
+        flag = '  <- GERİLEME' if row['regression'] else ''
+        if micro:
+            print(f"{row['case']:<52} {row['bars']:>7} {row['baseline']:>12} {row['current']:>12} {change:>9}{flag}")
+        else:
+            print(f"{row['bots']:>5} {row['metric']:<32} {row['baseline']:>12} {row['current']:>12} "
+                  f"{change:>9}{flag}")
+    regressions = [row for row in rows if row['regression']]
+    if regressions:
+        print(f"\n{len(regressions)} metrikte %{threshold * 100:g} üzerinde gerileme")
+    return bool(regressions)
+
+
+def cmd_load(args, store):
+    benchmark = LoadBenchmark(
+        store, bot_counts=[int(count) for count in args.bots.split(',')], strategies=args.strategy.split(','),
+        timeframe=args.timeframe, minutes=args.minutes, speed=args.speed, warmup_minutes=args.warmup,
+        latency_ms=args.latency, jitter_ms=args.jitter, error_rate=args.error_rate, seed=args.seed,
+        workdir=args.workdir, keep_workdir=args.keep_workdir
+    )
+    report = benchmark.run()
+    output = args.output or os.path.join(REPORT_DIR, f"load_{datetime.now():%Y%m%d_%H%M%S}.json")
+    write_report(report, output)
+    logging.info(f"Rapor kaydedildi: {output}")
+
+    if args.compare:
+        if print_comparison(compare_reports(load_report(args.compare), report, args.threshold), args.threshold):
+            sys.exit(1)
+
+
+def cmd_micro(args, store):
+    sizes = [int(size) for size in args.sizes.split(',')]
+    report = MicroBenchmark(sizes=sizes, pattern=args.filter, min_time=args.min_time).run()
+    if args.save_baseline:
+        # --filter ile sadece bazı ölçümler çalıştırıldıysa diğer baseline değerleri korunur
+        if os.path.exists(BASELINE_PATH):
+            report['results'] = {**load_report(BASELINE_PATH)['results'], **report['results']}
+        write_report(report, BASELINE_PATH)
+        logging.info(f"Baseline güncellendi: {BASELINE_PATH}")
+        return
+
+    output = args.output or os.path.join(REPORT_DIR, f"micro_{datetime.now():%Y%m%d_%H%M%S}.json")
+    write_report(report, output)
+    logging.info(f"Rapor kaydedildi: {output}")
+    if not os.path.exists(args.compare):
+        logging.warning(f"Karşılaştırma raporu bulunamadı: {args.compare}")
+        return
+    if print_comparison(compare_micro(load_report(args.compare), report, args.threshold), args.threshold):
+        sys.exit(1)
+
+
+def cmd_compare(args, store):
+    baseline, current = load_report(args.baseline), load_report(args.current)
+    # Mikro benchmark raporları 'results', yük testi raporları 'scenarios' içerir
+    compare = compare_micro if 'results' in current else compare_reports
+    if print_comparison(compare(baseline, current, args.threshold), args.threshold):
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Botlar için yük, gecikme ve mikro benchmarklar")
+    parser.add_argument('--data-dir', default=os.path.join('data', 'candles'), help="Mum deposu klasörü")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    load = subparsers.add_parser('load', help="Mock borsaya karşı N bot ile yük testi")
+    load.add_argument('--bots', default=','.join(str(count) for count in DEFAULT_BOT_COUNTS),
+                      help="Virgülle ayrılmış bot sayıları (her biri ayrı senaryo)")
+    load.add_argument('--strategy', default='psar_atr_strategy',
+                      help="Virgülle ayrılmış stratejiler (botlara sırayla dağıtılır)")
+    load.add_argument('--timeframe', default='15m')
+    load.add_argument('--minutes', type=int, default=120, help="Senaryo başına replay edilen dakika")
+    load.add_argument('--speed', type=float, default=60.0, help="Replay hızı (60: saniyede bir dakika)")
+    load.add_argument('--warmup', type=int, default=3000, help="Replay öncesi geçmiş olarak sunulan dakika")
+    load.add_argument('--latency', type=float, default=0.0, help="Mock sunucuda istek başına gecikme (ms)")
+    load.add_argument('--jitter', type=float, default=0.0, help="Gecikmeye eklenen rastgele sapma (ms)")
+    load.add_argument('--error-rate', type=float, default=0.0, help="/fapi/ isteklerinde hata enjeksiyon oranı")
+    load.add_argument('--seed', type=int, default=0)
+    load.add_argument('--output', help="JSON rapor dosyası (varsayılan data/benchmarks/load_<zaman>.json)")
+    load.add_argument('--compare', help="Karşılaştırılacak önceki JSON rapor")
+    load.add_argument('--threshold', type=float, default=0.2, help="Gerileme eşiği (0.2 = %%20 artış)")
+    load.add_argument('--workdir', help="Bot süreçlerinin çalışma klasörlerinin oluşturulacağı yer")
+    load.add_argument('--keep-workdir', action='store_true', help="Bot loglarını inceleme için sakla")
+
+    micro = subparsers.add_parser('micro', help="Gösterge, strateji ve I/O fonksiyonları için mikro benchmark")
+    micro.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                       help="Virgülle ayrılmış bar sayıları")
+    micro.add_argument('--filter', help="Sadece adı bu regex ile eşleşen ölçümler (ör. 'eralp|fetch_data')")
+    micro.add_argument('--min-time', type=float, default=0.2, help="Ölçüm başına en az toplam süre (saniye)")
+    micro.add_argument('--output', help="JSON rapor dosyası (varsayılan data/benchmarks/micro_<zaman>.json)")
+    micro.add_argument('--compare', default=BASELINE_PATH,
+                       help="Karşılaştırılacak rapor (varsayılan: repodaki baseline)")
+    micro.add_argument('--threshold', type=float, default=0.2, help="Yavaşlama eşiği (0.2 = %%20)")
+    micro.add_argument('--save-baseline', action='store_true', help="Sonucu repodaki baseline olarak kaydet")
+
+    compare = subparsers.add_parser('compare', help="İki benchmark raporunu karşılaştırır")
+    compare.add_argument('baseline')
+    compare.add_argument('current')
+    compare.add_argument('--threshold', type=float, default=0.2, help="Gerileme eşiği (0.2 = %%20 artış)")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    store = CandleStore(args.data_dir)
+    {'load': cmd_load, 'micro': cmd_micro, 'compare': cmd_compare}[args.command](args, store)
+
+
+if __name__ == "__main__":
+    main()
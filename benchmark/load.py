@@ -0,0 +1,511 @@
+import logging
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+
+try:
+    import psutil
+except ImportError:  # psutil yoksa RSS /proc ve resource ile ölçülür
+    psutil = None
+
+from benchmark.report import change_row, environment
+from core.runner import BotSpec, MultiSymbolRunner
+from mock_exchange.engine import MINUTE_MS, MockExchange
+from mock_exchange.server import MockBinanceServer
+
+DEFAULT_BOT_COUNTS = (1, 13, 50, 200)
+HOSTED_STRATEGIES = ('psar_atr_strategy', 'eralp_strateji2', 'atr_strategy')
+
+# Karşılaştırmada artışı gerileme sayılan metrikler (senaryo içindeki yol)
+REGRESSION_METRICS = (
+    ('startup_seconds',),
+    ('cpu', 'avg_percent'),
+    ('rss_mb', 'peak'),
+    ('rest', 'calls_per_minute'),
+    ('latency_ms', 'cycle', 'p95'),
+    ('latency_ms', 'candle_to_signal', 'p95'),
+    ('latency_ms', 'signal_compute', 'p95'),
+    ('latency_ms', 'signal_to_order', 'p95'),
+)
+
+
+def summarize(values_ms):
+    """Milisaniye değerlerinin dağılım özeti (değer yoksa count 0)"""
+    if not len(values_ms):
+        return {'count': 0}
+    values = np.asarray(values_ms, dtype=float)
+    p50, p95, p99 = np.percentile(values, (50, 95, 99))
+    return {'count': int(len(values)), 'mean': round(float(values.mean()), 3), 'p50': round(float(p50), 3),
+            'p95': round(float(p95), 3), 'p99': round(float(p99), 3), 'max': round(float(values.max()), 3)}
+
+
+def build_exchange(store, count, minutes, warmup_minutes=3000, shift_step=997, **kwargs):
+    """
+    Depodaki 1m verilerden count sembollük mock borsa kurar
+    - Depoda yeterli sembol yoksa mevcut seriler shift_step dakika kaydırılarak farklı adlarla çoğaltılır
+      (BTCUSDT -> BTC1USDT, BTC2USDT ...); tüm semboller aynı zaman eksenini paylaşır
+    """
+    sources = store.symbols('1m')
+    if not sources:
+        raise ValueError(f"{store.root} altında 1m mum verisi yok (önce 'python -m backtest download')")
+
+    span = warmup_minutes + minutes + 1
+    loaded = {}
+    candles = {}
+    for i in range(count):
+        source = sources[i % len(sources)]
+        copy = i // len(sources)
+        if source not in loaded:
+            df = store.load(source, '1m')
+            loaded[source] = {
+                'open_time': df['Open time'].to_numpy(dtype=np.int64),
+                'open': df['Open'].to_numpy(dtype=float),
+                'high': df['High'].to_numpy(dtype=float),
+                'low': df['Low'].to_numpy(dtype=float),
+                'close': df['Close'].to_numpy(dtype=float),
+                'volume': df['Volume'].to_numpy(dtype=float),
+            }
+        arrays = loaded[source]
+        offset = copy * shift_step
+        if len(arrays['open_time']) < offset + span:
+            raise ValueError(f"{source}: {count} bot için yeterli veri yok ({offset + span} dakika gerekli, "
+                             f"{len(arrays['open_time'])} var); --minutes veya --warmup değerini azaltın")
+        name = source if copy == 0 else f"{source[:-4]}{copy}{source[-4:]}"
+        candles[name] = {field: values[offset:offset + span] for field, values in arrays.items()}
+        candles[name]['open_time'] = arrays['open_time'][:span]
+    return MockExchange(candles, warmup_minutes=warmup_minutes, **kwargs)
+
+
+def build_specs(symbols, strategies, timeframe, leverage=10, trade_amount=100):
+    """Sembollere stratejileri sırayla dağıtır"""
+    return [BotSpec(symbol, timeframe=timeframe, strategy=strategies[i % len(strategies)], leverage=leverage,
+                    trade_amount=trade_amount) for i, symbol in enumerate(symbols)]
+
+
+class ResourceSampler:
+    """Süreç CPU süresi ve RSS belleğini arka plan thread'inde periyodik örnekler"""
+
+    def __init__(self, interval=1.0):
+        self.interval = interval
+        self.samples = []  # (duvar saati, cpu saniyesi, rss MB)
+        self._stop = threading.Event()
+        self._thread = None
+        self._process = psutil.Process() if psutil is not None else None
+
+    def _rss_mb(self):
+        if self._process is not None:
+            return self._process.memory_info().rss / 1024 / 1024
+        try:
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+        except (OSError, ValueError, AttributeError):
+            import resource
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    def sample(self):
+        times = os.times()
+        self.samples.append((time.time(), times.user + times.system, self._rss_mb()))
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self):
+        self.sample()
+        self._thread = threading.Thread(target=self._run, name='benchmark-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.sample()
+
+    def report(self):
+        wall = np.array([s[0] for s in self.samples])
+        cpu = np.array([s[1] for s in self.samples])
+        rss = np.array([s[2] for s in self.samples])
+        elapsed = wall[-1] - wall[0]
+        steps = np.diff(cpu) / np.maximum(np.diff(wall), 1e-9) * 100 if len(wall) > 1 else np.zeros(1)
+        return {
+            'cpu': {'seconds': round(float(cpu[-1] - cpu[0]), 3),
+                    'avg_percent': round(float((cpu[-1] - cpu[0]) / elapsed * 100), 1) if elapsed else 0.0,
+                    'peak_percent': round(float(steps.max()), 1)},
+            'rss_mb': {'start': round(float(rss[0]), 1), 'peak': round(float(rss.max()), 1),
+                       'end': round(float(rss[-1]), 1)},
+        }
+
+
+class LatencyProbe:
+    """
+    Bot örneklerinin metotlarını sararak zaman damgası toplar (bot kodu değiştirilmez)
+    - run_cycle: döngü süresi
+    - fetch_data -> _set_pending_signal: veri çekme zamanı ve sinyal tespit süresi
+    - process_signal -> ilk başarılı emir: onaylanan sinyalden borsanın emri kabul etmesine kadar geçen süre
+    """
+
+    def __init__(self):
+        self.cycles = []  # ms
+        self.signals = []  # {'bot', 'fetch_start', 'fetch_end', 'detected'}
+        self.orders = []  # ms
+        self._last_fetch = {}
+        self._confirmed = {}
+        self._lock = threading.Lock()
+
+    def attach(self, name, bot):
+        probe = self
+
+        run_cycle = bot.run_cycle
+
+        def timed_cycle():
+            started = time.perf_counter()
+            try:
+                return run_cycle()
+            finally:
+                with probe._lock:
+                    probe.cycles.append((time.perf_counter() - started) * 1000)
+
+        bot.run_cycle = timed_cycle
+
+        fetch_data = bot.client.fetch_data
+
+        def timed_fetch():
+            started = time.time()
+            try:
+                return fetch_data()
+            finally:
+                probe._last_fetch[name] = (started, time.time())
+
+        bot.client.fetch_data = timed_fetch
+
+        set_pending_signal = getattr(bot, '_set_pending_signal', None)
+        if set_pending_signal is not None:
+            def timed_signal(*args, **kwargs):
+                detected = time.time()
+                fetch_start, fetch_end = probe._last_fetch.get(name, (detected, detected))
+                with probe._lock:
+                    probe.signals.append({'bot': name, 'fetch_start': fetch_start, 'fetch_end': fetch_end,
+                                          'detected': detected})
+                return set_pending_signal(*args, **kwargs)
+
+            bot._set_pending_signal = timed_signal
+
+        process_signal = getattr(bot, 'process_signal', None)
+        order_manager = getattr(getattr(bot, 'executor', None), 'order_manager', None)
+        if process_signal is not None and order_manager is not None:
+            def timed_process(*args, **kwargs):
+                probe._confirmed[name] = time.time()
+                return process_signal(*args, **kwargs)
+
+            create_order = order_manager.create_order
+
+            def timed_order(*args, **kwargs):
+                order = create_order(*args, **kwargs)
+                confirmed = probe._confirmed.pop(name, None) if order else None
+                if confirmed is not None:
+                    with probe._lock:
+                        probe.orders.append((time.time() - confirmed) * 1000)
+                return order
+
+            bot.process_signal = timed_process
+            order_manager.create_order = timed_order
+
+
+class BenchmarkRunner(MultiSymbolRunner):
+    """
+    Benchmark için MultiSymbolRunner
+    - NTP kontrolü yapılmaz (ağ yok)
+    - Botların döngü aralığı, hata bekleme süresi, sinyal onay beklemesi ve önbellek süresi replay hızına göre
+      kısaltılır; executor içindeki sabit time.sleep beklemeleri (emir takibi) ölçeklenmez
+    - Sunucu saati replay ile hızlı ilerlediği için executor'ların zaman farkı toleransı kapatılır
+    """
+
+    def __init__(self, specs, speed, probe, **kwargs):
+        self.speed = speed
+        self.probe = probe
+        super().__init__(specs, market_data_ttl=5 / speed, restart_delay=60 / speed, **kwargs)
+
+    async def _setup_shared(self):
+        from adapters.binance.binance_client import BinanceClient
+        from adapters.binance.market_data import MarketDataCache
+
+        if self.market_data is None:
+            self.market_data = MarketDataCache(ttl=self.market_data_ttl)
+        self.client = await self._loop.run_in_executor(None, BinanceClient.create_client, self._pool_size())
+
+    async def _periodic_ntp_check(self):
+        return
+
+    def _create_bot(self, spec):
+        bot = super()._create_bot(spec)
+        bot.LOOP_INTERVAL = bot.LOOP_INTERVAL / self.speed
+        bot.ERROR_RETRY_INTERVAL = bot.ERROR_RETRY_INTERVAL / self.speed
+        config = getattr(bot, 'config', None)
+        if hasattr(config, 'signal_confirmation_delay'):
+            config.signal_confirmation_delay = config.signal_confirmation_delay / self.speed
+        executor = getattr(bot, 'executor', None)
+        order_manager = getattr(executor, 'order_manager', None)
+        if order_manager is not None:
+            order_manager.retry_delay = order_manager.retry_delay / self.speed
+        if hasattr(executor, 'time_tolerance'):
+            # Hızlandırılmış replay'de sunucu saati duvar saatinden hızlı ilerler; offset farkı
+            # işletim sistemi saat senkronizasyonunu (w32tm) tetiklemesin
+            executor.time_tolerance = float('inf')
+        self.probe.attach(spec.name, bot)
+        return bot
+
+
+def _bot_process(base_url, spec_texts, speed, workdir, startup_timeout, conn):
+    """Botları ayrı süreçte çalıştırır (CPU / RSS ölçümü mock sunucudan bağımsız olsun diye)"""
+    os.chdir(workdir)
+    output = open(os.path.join(workdir, 'bots_output.txt'), 'w', encoding='utf-8')
+    sys.stdout = sys.stderr = output
+    os.environ['BINANCE_BASE_URL'] = base_url
+    os.environ['TELEGRAM_API_URL'] = base_url
+
+    probe = LatencyProbe()
+    sampler = ResourceSampler()
+    specs = [BotSpec.parse(text) for text in spec_texts]
+    runner = BenchmarkRunner(specs, speed=speed, probe=probe)
+    started = time.perf_counter()
+    thread = threading.Thread(target=runner.run, name='benchmark-runner', daemon=True)
+    thread.start()
+
+    deadline = time.monotonic() + startup_timeout
+    while time.monotonic() < deadline:
+        states = [status['state'] for status in runner.status.values()]
+        if all(state in ('running', 'stopped') for state in states):
+            break
+        time.sleep(0.1)
+    startup_seconds = time.perf_counter() - started
+    sampler.start()
+    conn.send({'ready': True, 'startup_seconds': round(startup_seconds, 3),
+               'running': sum(status['state'] == 'running' for status in runner.status.values())})
+
+    conn.recv()  # Ana süreçten durdurma mesajı
+    sampler.stop()
+    resources = sampler.report()
+    runner.stop()
+    thread.join(timeout=30)
+
+    conn.send({
+        'resources': resources,
+        'cycles': probe.cycles,
+        'signals': probe.signals,
+        'orders': probe.orders,
+        'ticks': sum(status['ticks'] for status in runner.status.values()),
+        'bot_errors': sum(status['errors'] for status in runner.status.values()),
+    })
+    output.flush()
+    # Emir takibi gibi uzun time.sleep adımlarındaki thread'ler beklenmeden çıkılır
+    os._exit(0)
+
+
+class LoadBenchmark:
+    """
+    Yerel mock borsaya karşı N botu hızlandırılmış replay ile çalıştırıp kaynak ve gecikme ölçen benchmark
+    - Mock sunucu ve replay saati ana süreçte, botlar (MultiSymbolRunner) ayrı süreçte çalışır
+    - Her bot sayısı ayrı bir senaryodur; her senaryoda yeni bot süreci ve yeni mock borsa kullanılır
+    - Ölçümler: bot sürecinin CPU ve RSS değeri, dakika başına REST çağrısı (simüle dakika = üretimdeki dakika),
+      döngü süresi, mum kapanışından sinyale ve onaylanan sinyalden emrin kabulüne kadar geçen süre
+    """
+
+    def __init__(self, store, bot_counts=DEFAULT_BOT_COUNTS, strategies=('psar_atr_strategy',), timeframe='15m',
+                 minutes=120, speed=60.0, warmup_minutes=3000, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0,
+                 seed=0, startup_timeout=600, workdir=None, keep_workdir=False):
+        unknown = [name for name in strategies if name not in HOSTED_STRATEGIES]
+        if unknown:
+            raise ValueError(f"Runner'da paylaşılan client ile çalışmayan strateji: {unknown} "
+                             f"(desteklenenler: {', '.join(HOSTED_STRATEGIES)})")
+        self.store = store
+        self.bot_counts = [int(count) for count in bot_counts]
+        self.strategies = list(strategies)
+        self.timeframe = timeframe
+        self.minutes = int(minutes)
+        self.speed = float(speed)
+        self.warmup_minutes = warmup_minutes
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.seed = seed
+        self.startup_timeout = startup_timeout
+        self.workdir = workdir
+        self.keep_workdir = keep_workdir
+
+    def settings(self):
+        return {
+            'bot_counts': self.bot_counts, 'strategies': self.strategies, 'timeframe': self.timeframe,
+            'minutes': self.minutes, 'speed': self.speed, 'warmup_minutes': self.warmup_minutes,
+            'latency_ms': self.latency_ms, 'jitter_ms': self.jitter_ms, 'error_rate': self.error_rate,
+            'seed': self.seed,
+        }
+
+    def run(self):
+        report = {
+            **environment(),
+            'settings': self.settings(),
+            'scenarios': [],
+        }
+        for count in self.bot_counts:
+            logging.info(f"Yük testi: {count} bot, {self.minutes} dakika x{self.speed:g} hız")
+            scenario = self.run_scenario(count)
+            report['scenarios'].append(scenario)
+            logging.info(format_scenario(scenario))
+        return report
+
+    def run_scenario(self, count):
+        exchange = build_exchange(self.store, count, self.minutes, warmup_minutes=self.warmup_minutes)
+        # Replay başlangıcı şu anki zamana hizalanır (botlar sunucu saatiyle yerel saati karşılaştırır)
+        exchange.time_shift = int(time.time() * 1000) // MINUTE_MS * MINUTE_MS - exchange.now
+        specs = build_specs(list(exchange.books), self.strategies, self.timeframe)
+        server = MockBinanceServer(exchange, latency_ms=self.latency_ms, jitter_ms=self.jitter_ms,
+                                   error_rate=self.error_rate, error_paths=('/fapi/',), seed=self.seed)
+        if self.workdir:
+            # --workdir henüz yoksa oluşturulur (mkdtemp üst klasörü oluşturmaz)
+            os.makedirs(self.workdir, exist_ok=True)
+        workdir = os.path.abspath(tempfile.mkdtemp(prefix=f'load_{count}_', dir=self.workdir))
+        context = multiprocessing.get_context('spawn')
+        parent_conn, child_conn = context.Pipe()
+        process = None
+        try:
+            base_url = server.start()
+            process = context.Process(
+                target=_bot_process, name=f'benchmark-bots-{count}',
+                args=(base_url, [self._spec_text(spec) for spec in specs], self.speed, workdir,
+                      self.startup_timeout, child_conn)
+            )
+            process.start()
+            if not parent_conn.poll(self.startup_timeout + 60):
+                raise RuntimeError(f"{count} bot başlatılamadı (bkz. {workdir}/bots_output.txt)")
+            ready = parent_conn.recv()
+
+            counts_before = Counter(server.request_counts)
+            telegram_before = server.telegram_messages
+            orders_before = len(exchange.orders)
+            timeline, wall_seconds = self._drive_clock(exchange, server)
+            requests = server.request_counts - counts_before
+
+            parent_conn.send('stop')
+            if not parent_conn.poll(120):
+                raise RuntimeError(f"{count} bot süreci sonuç göndermedi (bkz. {workdir}/bots_output.txt)")
+            result = parent_conn.recv()
+            process.join(timeout=30)
+        finally:
+            if process is not None and process.is_alive():
+                process.kill()
+            server.stop()
+            if not self.keep_workdir:
+                shutil.rmtree(workdir, ignore_errors=True)
+
+        rest_calls = sum(count_ for (method, path), count_ in requests.items() if path.startswith(('/fapi', '/api')))
+        return {
+            'bots': count,
+            'running_bots': ready['running'],
+            'startup_seconds': ready['startup_seconds'],
+            'wall_seconds': round(wall_seconds, 3),
+            'simulated_minutes': self.minutes,
+            **result['resources'],
+            'rest': {
+                'calls': rest_calls,
+                'calls_per_minute': round(rest_calls / self.minutes, 1),
+                'calls_per_wall_minute': round(rest_calls / wall_seconds * 60, 1) if wall_seconds else 0.0,
+                'endpoints': {f"{method} {path}": value for (method, path), value in sorted(requests.items())},
+                'injected_errors': server.injected_errors,
+            },
+            'telegram_messages': server.telegram_messages - telegram_before,
+            'latency_ms': self._latencies(result, timeline),
+            'signals': len(result['signals']),
+            'orders': len(exchange.orders) - orders_before,
+            'fills': exchange.fills,
+            'ticks': result['ticks'],
+            'bot_errors': result['bot_errors'],
+            'workdir': workdir if self.keep_workdir else None,
+        }
+
+    def _drive_clock(self, exchange, server):
+        """Replay saatini speed hızında ilerletir; her adımın duvar saatini (mum kapanışı) kaydeder"""
+        interval = 60.0 / self.speed
+        timeline = []  # (duvar saati, sunucu zamanı)
+        started = time.monotonic()
+        next_tick = started + interval
+        for _ in range(self.minutes):
+            time.sleep(max(0.0, next_tick - time.monotonic()))
+            next_tick += interval
+            exchange.advance(1)
+            timeline.append((time.time(), exchange.server_time))
+        return timeline, time.monotonic() - started
+
+    @staticmethod
+    def _latencies(result, timeline):
+        """Bot sürecinin zaman damgalarını replay saatiyle eşleştirerek gecikme dağılımlarını hesaplar"""
+        closes = np.array([wall for wall, _ in timeline])
+        candle_to_signal = []
+        compute = []
+        for signal in result['signals']:
+            compute.append((signal['detected'] - signal['fetch_end']) * 1000)
+            # Verinin çekildiği andaki en son 1m mum kapanışı
+            index = np.searchsorted(closes, signal['fetch_start'], side='right') - 1
+            if index >= 0:
+                candle_to_signal.append((signal['detected'] - closes[index]) * 1000)
+        return {
+            'cycle': summarize(result['cycles']),
+            'candle_to_signal': summarize(candle_to_signal),
+            'signal_compute': summarize(compute),
+            'signal_to_order': summarize(result['orders']),
+        }
+
+    @staticmethod
+    def _spec_text(spec):
+        return f"{spec.symbol}:{spec.timeframe}:{spec.strategy}:{spec.leverage}:{spec.trade_amount}"
+
+
+def format_scenario(scenario):
+    latency = scenario['latency_ms']
+
+    def p95(name):
+        return f"{latency[name]['p95']:.1f}" if latency[name]['count'] else '-'
+
+    return (f"{scenario['bots']} bot: başlangıç {scenario['startup_seconds']:.1f} sn, "
+            f"CPU ort. %{scenario['cpu']['avg_percent']} (tepe %{scenario['cpu']['peak_percent']}), "
+            f"RSS tepe {scenario['rss_mb']['peak']} MB, REST {scenario['rest']['calls_per_minute']}/dk, "
+            f"döngü p95 {p95('cycle')} ms, mum->sinyal p95 {p95('candle_to_signal')} ms, "
+            f"sinyal->emir p95 {p95('signal_to_order')} ms ({scenario['signals']} sinyal, "
+            f"{scenario['orders']} emir, {scenario['bot_errors']} hata)")
+
+
+def _metric(scenario, path):
+    value = scenario
+    for key in path:
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def compare_reports(baseline, current, threshold=0.2):
+    """
+    İki yük testi raporunu aynı bot sayılı senaryolar üzerinden karşılaştırır
+
+    Returns:
+        list: {'bots', 'metric', 'baseline', 'current', 'change', 'regression'} satırları
+    """
+    previous = {scenario['bots']: scenario for scenario in baseline['scenarios']}
+    rows = []
+    for scenario in current['scenarios']:
+        old = previous.get(scenario['bots'])
+        if old is None:
+            continue
+        for path in REGRESSION_METRICS:
+            before, after = _metric(old, path), _metric(scenario, path)
+            if before is None or after is None:
+                continue
+            rows.append(change_row({'bots': scenario['bots']}, '.'.join(path), before, after, threshold))
+    return rows
+
@@ -0,0 +1,352 @@
+import csv
+import importlib
+import inspect
+import logging
+import os
+import re
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from backtest.candle_store import candles_to_frame
+from benchmark.report import change_row, environment
+
+DEFAULT_SIZES = (100, 1_000, 10_000, 100_000)
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines', 'micro.json')
+
+STRATEGY_CLASSES = {
+    'psar_atr_strategy': ('strategies.psar_atr_strategy.strategy', 'Strategy'),
+    'eralp_strateji2': ('strategies.eralp_strateji2.strategy', 'Strategy'),
+    'atr_strategy': ('strategies.atr_strategy.strategy', 'Strategy'),
+    'skorlama_strategy': ('strategies.skorlama_strategy.strategy', 'SkorlamaStrategy'),
+}
+
+
+def synthetic_candles(n, seed=0, start_ms=1_700_000_000_000, step_ms=60_000):
+    """fetch_data formatında, rastgele yürüyüşle üretilmiş n barlık mum verisi"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.002, n)))
+    open_ = np.r_[close[0], close[:-1]]
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.001, n)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.001, n)))
+    volume = rng.uniform(10, 1000, n)
+    return candles_to_frame(start_ms + np.arange(n, dtype=np.int64) * step_ms, open_, high, low, close, volume)
+
+
+def to_klines(df, step_ms=60_000):
+    """DataFrame'i futures_klines çıktısı formatına (metin fiyatlı listeler) çevirir"""
+    return [
+        [int(t), f"{o:.8f}", f"{h:.8f}", f"{l:.8f}", f"{c:.8f}", f"{v:.3f}", int(t) + step_ms - 1,
+         f"{c * v:.8f}", 100, f"{v / 2:.3f}", f"{c * v / 2:.8f}", '0']
+        for t, o, h, l, c, v in zip(df['Open time'], df['Open'], df['High'], df['Low'], df['Close'], df['Volume'])
+    ]
+
+
+class MicroCase:
+    """
+    Tek bir ölçüm
+
+    Args:
+        name: 'grup.metot' biçiminde ad (raporda anahtar)
+        setup: setup(n) -> parametresiz çağrılabilir; veri hazırlığı ölçüme dahil edilmez
+    """
+
+    def __init__(self, name, setup):
+        self.name = name
+        self.setup = setup
+
+
+def _strategy_cases(name, calls):
+    """
+    Strateji metotları için ölçümler
+    calls: metot adı -> (hazırlık, çağrı); hazırlık mum verisinden metodun girdisini üretir
+    """
+    module_name, class_name = STRATEGY_CLASSES[name]
+    strategy_class = getattr(importlib.import_module(module_name), class_name)
+
+    # Yeni eklenen calculate_* metotları ölçüm listesinde unutulmasın
+    missing = [method for method, _ in inspect.getmembers(strategy_class, inspect.isfunction)
+               if method.startswith('calculate_') and method not in calls]
+    if missing:
+        logging.warning(f"{name}: benchmark'ta olmayan metotlar: {', '.join(missing)}")
+
+    def make_setup(prepare, call):
+        def setup(n):
+            strategy = strategy_class() if name == 'skorlama_strategy' else strategy_class('15m')
+            data = prepare(strategy, synthetic_candles(n))
+            return lambda: call(strategy, data)
+        return setup
+
+    return [MicroCase(f"{name}.{method}", make_setup(prepare, call)) for method, (prepare, call) in calls.items()]
+
+
+def _frame(strategy, df):
+    return df
+
+
+def _lower(strategy, df):
+    return df.rename(columns={'Open': 'open', 'High': 'high', 'Low': 'low', 'Close': 'close', 'Volume': 'volume'})
+
+
+def _with_atr(strategy, df):
+    df['atr'] = strategy.calculate_atr(df, strategy.config.atr_period)
+    return df
+
+
+def _score_inputs(strategy, df):
+    data = _lower(strategy, df)
+    high, low, close = data['high'], data['low'], data['close']
+    ema50, ema200 = strategy.calculate_ema(close)
+    return (strategy.calculate_adx(high, low, close)[0], ema50, ema200, strategy.calculate_rsi(close),
+            data['volume'], strategy.calculate_volume_ma(data['volume']))
+
+
+def strategy_cases():
+    """Dört stratejinin tüm calculate_* metotları ve determine_position / analyze_data"""
+    zone_strategies = {
+        'calculate_psar': (_frame, lambda s, df: s.calculate_psar(df)),
+        'calculate_atr': (_frame, lambda s, df: s.calculate_atr(df, s.config.zone_length)),
+        'calculate_zones': (_frame, lambda s, df: s.calculate_zones(df)),
+        'calculate_donchian': (_frame, lambda s, df: s.calculate_donchian(df)),
+        'calculate_ema': (_frame, lambda s, df: s.calculate_ema(df, s.config.ema_medium_period)),
+        'calculate_hma': (_frame, lambda s, df: s.calculate_hma(df, s.config.hma_long_period)),
+        'determine_position': (_frame, lambda s, df: s.determine_position(df)),
+    }
+    eralp = dict(zone_strategies, calculate_rsi=(_frame, lambda s, df: s.calculate_rsi(df, s.config.rsi_length)))
+    atr = {
+        'calculate_atr_trailing_stop': (_frame, lambda s, df: s.calculate_atr_trailing_stop(df)),
+        'calculate_super_trend': (_with_atr, lambda s, df: s.calculate_super_trend(df)),
+        'calculate_atr': (_frame, lambda s, df: s.calculate_atr(df, s.config.atr_period)),
+        'calculate_ema': (_frame, lambda s, df: s.calculate_ema(df, 1)),
+        'determine_position': (_frame, lambda s, df: s.determine_position(df)),
+    }
+    skorlama = {
+        'calculate_psar': (_lower, lambda s, df: s.calculate_psar(df['high'], df['low'], df['close'])),
+        'calculate_atr_zone': (_lower, lambda s, df: s.calculate_atr_zone(df['high'], df['low'], df['close'])),
+        'calculate_donchian_channel': (_lower, lambda s, df: s.calculate_donchian_channel(df['high'], df['low'])),
+        'calculate_ema': (_lower, lambda s, df: s.calculate_ema(df['close'])),
+        'calculate_adx': (_lower, lambda s, df: s.calculate_adx(df['high'], df['low'], df['close'])),
+        'calculate_rsi': (_lower, lambda s, df: s.calculate_rsi(df['close'])),
+        'calculate_volume_ma': (_lower, lambda s, df: s.calculate_volume_ma(df['volume'])),
+        'calculate_atr_volatility': (_lower,
+                                     lambda s, df: s.calculate_atr_volatility(df['high'], df['low'], df['close'])),
+        'calculate_score': (_score_inputs, lambda s, inputs: s.calculate_score(*inputs)),
+        'analyze_data': (_lower, lambda s, df: s.analyze_data(df)),
+    }
+    return (_strategy_cases('psar_atr_strategy', zone_strategies) + _strategy_cases('eralp_strateji2', eralp)
+            + _strategy_cases('atr_strategy', atr) + _strategy_cases('skorlama_strategy', skorlama))
+
+
+class _KlineSource:
+    """fetch_data'nın çağırdığı futures_klines için hazır kline listesi döndüren kaynak"""
+
+    def __init__(self, klines):
+        self.klines = klines
+
+    def futures_klines(self, **kwargs):
+        return self.klines
+
+
+def _fetch_data_setup(n):
+    from adapters.binance.binance_client import BinanceClient
+
+    # __init__ ağ bağlantısı ve kaldıraç ayarı yaptığı için atlanır; fetch_data sadece bu alanları kullanır
+    client = BinanceClient.__new__(BinanceClient)
+    client.client = _KlineSource(to_klines(synthetic_candles(n)))
+    client.market_data = None
+    client.symbol = 'BTCUSDT'
+    client.timeframe = '1m'
+    return client.fetch_data
+
+
+def _signal_row():
+    strategy = importlib.import_module('strategies.psar_atr_strategy.strategy').Strategy('15m')
+    return strategy.determine_position(synthetic_candles(300)).iloc[-1]
+
+
+def _fill_csv(path, rows):
+    """CSV dosyasının son satırını çoğaltarak dosyayı verilen satır sayısına getirir (ilk sütun benzersiz tutulur)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        sample = list(reader)[-1]
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows([f"{i:08x}", *sample[1:]] for i in range(rows - 1))
+        writer.writerow(sample)
+
+
+def _fill_signals(logger, rows):
+    """Sinyal veritabanını son kaydı çoğaltarak verilen kayıt sayısına getirir (signal_id benzersiz tutulur)"""
+    from core.signal_logger import HEADER
+
+    connection = logger._connection()
+    sample = logger.read_signals(limit=1)[-1]
+    connection.execute('DELETE FROM signals')
+    connection.execute('BEGIN')
+    connection.executemany(logger._insert_sql(),
+                           ([f"{i:08x}"] + [sample[name] for name in HEADER[1:]] for i in range(rows - 1)))
+    connection.execute(logger._insert_sql(), [sample[name] for name in HEADER])
+    connection.execute('COMMIT')
+
+
+def _log_signal_setup(n):
+    from core.signal_logger import SignalLogger
+
+    logger = SignalLogger()
+    row = _signal_row()
+    logger.log_signal('PSAR_ATR_Strategy', 'BTCUSDT', row)
+    _fill_signals(logger, n)
+    return lambda: logger.log_signal('PSAR_ATR_Strategy', 'BTCUSDT', row)
+
+
+def _update_signal_setup(n):
+    from core.signal_logger import SignalLogger
+
+    logger = SignalLogger()
+    # Güncellenen kayıt en son eklenendir (en son açılan pozisyon)
+    signal_id = logger.log_signal('PSAR_ATR_Strategy', 'BTCUSDT', _signal_row())
+    _fill_signals(logger, n)
+    return lambda: logger.update_position_closed(signal_id, 101.5, 1.25, 1.5)
+
+
+def _trade_activity_setup(n):
+    from core.trade_journal import trade_journal
+    from strategies.psar_atr_strategy.bot import Bot
+
+    # Metot bottan sadece sembolü kullanır; bot oluşturmak borsa bağlantısı gerektirir
+    bot = Bot.__new__(Bot)
+    bot.symbol = 'BTCUSDT'
+    row = _signal_row()
+    bot._log_trade_activity_to_csv('SIGNAL_DETECTED', side='BUY', price=row['Close'], signal_data=row)
+    # Yazma işlem günlüğü thread'inde yapılır; ölçülen süre botun ödediği kuyruğa ekleme maliyetidir
+    trade_journal.flush()
+    _fill_csv('logs/psar_trades_btcusdt.csv', n)
+    return lambda: bot._log_trade_activity_to_csv('SIGNAL_DETECTED', side='BUY', price=row['Close'],
+                                                  details='benchmark', signal_data=row)
+
+
+def _position_close_setup(n):
+    from datetime import datetime
+
+    from core.trade_journal import trade_journal
+    from strategies.psar_atr_strategy.bot import Bot
+
+    bot = Bot.__new__(Bot)
+    args = (datetime.now(), 'BTCUSDT', 'LONG', 100.0, 101.5, 1.5, 15.0, 'KAR')
+    bot._log_position_close_to_csv(*args)
+    trade_journal.flush()
+    _fill_csv('logs/psar_positions_btcusdt.csv', n)
+    return lambda: bot._log_position_close_to_csv(*args)
+
+
+def _telegram_csv_setup(n):
+    from core.telegram.telegram_notifier import TelegramNotifier
+    from core.trade_journal import trade_journal
+
+    notifier = TelegramNotifier('BTCUSDT')
+    message = '🟢 <b>LONG</b> BTCUSDT\nGiriş: 101.50\nTP: 102.00\nSL: 99.50'
+    notifier._log_to_csv(message, 'SUCCESS')
+    trade_journal.flush()
+    _fill_csv('logs/telegram_btcusdt.csv', n)
+    return lambda: notifier._log_to_csv(message, 'SUCCESS')
+
+
+def io_cases():
+    """
+    fetch_data DataFrame oluşturma ve CSV logger'lar
+    - Logger ölçümlerinde bar sayısı, yazmadan önce dosyada (sinyal kaydında veritabanında) bulunan satır sayısıdır
+    """
+    return [
+        MicroCase('binance_client.fetch_data', _fetch_data_setup),
+        MicroCase('signal_logger.log_signal', _log_signal_setup),
+        MicroCase('signal_logger.update_position_closed', _update_signal_setup),
+        MicroCase('psar_atr_strategy.bot._log_trade_activity_to_csv', _trade_activity_setup),
+        MicroCase('psar_atr_strategy.bot._log_position_close_to_csv', _position_close_setup),
+        MicroCase('telegram_notifier._log_to_csv', _telegram_csv_setup),
+    ]
+
+
+def all_cases():
+    return strategy_cases() + io_cases()
+
+
+def measure(func, min_time=0.2, max_repeat=10_000):
+    """
+    Fonksiyonu toplam süre min_time'ı geçene kadar tekrar tekrar çalıştırır
+    - İlk çağrı ısınma sayılır; tek çağrısı min_time'dan uzun sürenler için tek ölçüm kullanılır
+    """
+    started = time.perf_counter()
+    func()
+    first = time.perf_counter() - started
+    if first >= min_time:
+        samples = [first]
+    else:
+        samples = []
+        total = 0.0
+        while total < min_time and len(samples) < max_repeat:
+            started = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - started
+            samples.append(elapsed)
+            total += elapsed
+    values = np.array(samples) * 1000
+    return {'median_ms': round(float(np.median(values)), 4), 'min_ms': round(float(values.min()), 4),
+            'repeats': len(samples)}
+
+
+class MicroBenchmark:
+    """
+    Gösterge / strateji fonksiyonları ve I/O yolları için mikro benchmark
+    - Her ölçüm 100, 1k, 10k ve 100k bar (varsayılan) için ayrı çalıştırılır
+    - Logger'lar geçici bir çalışma klasöründe (logs/ altında) çalıştırılır
+    - Sonuç: {'results': {ad: {bar sayısı: {'median_ms', 'min_ms', 'repeats'}}}}
+    """
+
+    def __init__(self, sizes=DEFAULT_SIZES, pattern=None, min_time=0.2):
+        self.sizes = [int(size) for size in sizes]
+        self.pattern = re.compile(pattern) if pattern else None
+        self.min_time = min_time
+
+    def cases(self):
+        return [case for case in all_cases() if self.pattern is None or self.pattern.search(case.name)]
+
+    def run(self):
+        report = {**environment(), 'settings': {'sizes': self.sizes, 'min_time': self.min_time}, 'results': {}}
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory(prefix='micro_') as workdir:
+            os.chdir(workdir)
+            try:
+                for case in self.cases():
+                    report['results'][case.name] = {}
+                    for size in self.sizes:
+                        # Bot loglarının konsol / dosya yazımı ölçüme karışmasın
+                        logging.disable(logging.INFO)
+                        try:
+                            result = measure(case.setup(size), self.min_time)
+                        finally:
+                            logging.disable(logging.NOTSET)
+                        report['results'][case.name][str(size)] = result
+                        logging.info(f"{case.name} [{size}]: {result['median_ms']:.3f} ms "
+                                     f"(min {result['min_ms']:.3f}, {result['repeats']} tekrar)")
+            finally:
+                os.chdir(cwd)
+        return report
+
+
+def compare_micro(baseline, current, threshold=0.2, metric='min_ms'):
+    """
+    İki mikro benchmark raporunu ortak ölçüm / bar sayıları üzerinden karşılaştırır
+    Varsayılan olarak en iyi süre (min_ms) kullanılır; kısa ölçümlerde medyana göre daha az gürültülüdür
+    """
+    rows = []
+    for name, sizes in current['results'].items():
+        previous = baseline['results'].get(name, {})
+        for size, result in sizes.items():
+            if size in previous:
+                rows.append(change_row({'case': name, 'bars': int(size)}, metric, previous[size][metric],
+                                       result[metric], threshold))
+    return rows
@@ -0,0 +1,52 @@
+import json
+import os
+import platform
+import subprocess
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+
+def git_commit():
+    """Çalışılan git commit'inin kısa hash'i (git yoksa None)"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=10,
+                              cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def environment():
+    """Raporların başına eklenen ortam bilgisi (sonuçlar farklı makineler arasında karşılaştırılırken gerekli)"""
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def change_row(key, metric, before, after, threshold):
+    """Karşılaştırma satırı; değer threshold oranından fazla arttıysa gerileme sayılır"""
+    change = (after - before) / before if before else None
+    return {
+        **key, 'metric': metric, 'baseline': before, 'current': after,
+        'change': round(change, 4) if change is not None else None,
+        'regression': change is not None and change > threshold,
+    }
+
+
+def load_report(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_report(report, path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+        f.write('\n')
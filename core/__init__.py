@@ -6,9 +6,21 @@ This package contains core classes
 
 from .trading_signal import TradingSignal
 from .logging_config import LoggingConfig
+from .startup import StartupOrchestrator
+from .import_profiler import ImportProfiler
+from .timing import SpanTimer
+from .profiler import SamplingProfiler
+from .watchdog import TickWatchdog
+from .log_server import LogWriter
 __all__ = [
     'TradingSignal',
     'LoggingConfig',
+    'StartupOrchestrator',
+    'ImportProfiler',
+    'SpanTimer',
+    'SamplingProfiler',
+    'TickWatchdog',
+    'LogWriter',
     'telegram',
 
 ]
@@ -0,0 +1,339 @@
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+from datetime import datetime
+
+from core.logging_config import LoggingConfig
+from core.metrics import STREAM_LAG, STREAM_MESSAGES, start_metrics_server
+from core.runner import BotSpec, MultiSymbolRunner
+
+try:
+    import resource  # Sadece Unix
+except ImportError:
+    resource = None
+
+
+def _spec_to_tuple(spec):
+    return (spec.symbol, spec.timeframe, spec.strategy, spec.leverage, spec.trade_amount)
+
+
+def _max_rss_mb():
+    """Sürecin en yüksek bellek kullanımı (MB)"""
+    if resource is None:
+        return None
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def _worker_inbox(inbox, runner, market_data):
+    """Koordinatörden gelen mesajları işler (piyasa verisi, yeni botlar, durdurma)"""
+    while True:
+        message = inbox.get()
+        kind = message[0]
+        if kind == 'klines':
+            _, symbol, interval, limit, klines, sent_at = message
+            market_data.put_klines(symbol, interval, limit, klines)
+            STREAM_MESSAGES.inc(symbol=symbol, interval=interval)
+            STREAM_LAG.set(round(time.time() - sent_at, 6), symbol=symbol, interval=interval)
+        elif kind == 'add_specs':
+            runner.add_specs([BotSpec(*spec) for spec in message[1]])
+        elif kind == 'stop':
+            runner.stop()
+            return
+
+
+def _worker_heartbeat(worker_id, runner, market_data, outbox, interval):
+    """Bot durumlarını ve kaynak kullanımını periyodik olarak koordinatöre bildirir"""
+    while True:
+        outbox.put(('heartbeat', worker_id, {
+            'pid': os.getpid(),
+            'time': time.time(),
+            'bots': {name: dict(status) for name, status in list(runner.status.items())},
+            'market_data': market_data.stats(),
+            'max_rss_mb': _max_rss_mb(),
+        }))
+        time.sleep(interval)
+
+
+def worker_main(worker_id, specs, cpu, inbox, outbox, market_data_ttl, heartbeat_interval):
+    """
+    Worker süreci giriş noktası
+    - Verilen CPU çekirdeğine sabitlenir (destekleniyorsa)
+    - Kendi shard'ındaki botları MultiSymbolRunner ile çalıştırır
+    - Piyasa verisini koordinatörden alır, güncel veri yoksa REST'e düşer
+    """
+    if cpu is not None and hasattr(os, 'sched_setaffinity'):
+        try:
+            os.sched_setaffinity(0, {cpu})
+        except OSError as e:
+            logging.warning(f"CPU affinity ayarlanamadı (worker {worker_id}, cpu {cpu}): {e}")
+
+    from adapters.binance.market_data import MarketDataCache
+
+    logger = LoggingConfig().setup_logging(f"runner_worker_{worker_id}")
+    logger.info(f"Worker {worker_id} başlatıldı (pid {os.getpid()}, cpu {cpu}): {len(specs)} bot")
+
+    market_data = MarketDataCache(ttl=market_data_ttl)
+    # METRICS_PORT verilmişse her worker kendi portunda (METRICS_PORT + 1 + worker numarası) metrik yayınlar
+    start_metrics_server(port_offset=worker_id + 1, logger=logger)
+    runner = MultiSymbolRunner([BotSpec(*spec) for spec in specs], logger=logger, market_data=market_data)
+
+    threading.Thread(target=_worker_inbox, args=(inbox, runner, market_data),
+                     name='worker-inbox', daemon=True).start()
+    threading.Thread(target=_worker_heartbeat, args=(worker_id, runner, market_data, outbox, heartbeat_interval),
+                     name='worker-heartbeat', daemon=True).start()
+    runner.run()
+
+
+class WorkerHandle:
+    """Koordinatör tarafında bir worker sürecinin kaydı"""
+
+    def __init__(self, worker_id, cpu, specs):
+        self.worker_id = worker_id
+        self.cpu = cpu
+        self.specs = list(specs)
+        self.process = None
+        self.inbox = None
+        self.last_heartbeat = None
+        self.health = {}
+
+    @property
+    def alive(self):
+        return self.process is not None and self.process.is_alive()
+
+    def to_dict(self):
+        bots = self.health.get('bots', {})
+        return {
+            'worker_id': self.worker_id,
+            'pid': self.process.pid if self.process else None,
+            'cpu': self.cpu,
+            'alive': self.alive,
+            'last_heartbeat': self.last_heartbeat,
+            'specs': [spec.name for spec in self.specs],
+            'bots': bots,
+            'market_data': self.health.get('market_data'),
+            'max_rss_mb': self.health.get('max_rss_mb'),
+        }
+
+
+class Coordinator:
+    """
+    Bot tanımlarını (BotSpec) N worker sürecine dağıtan koordinatör
+    - Aynı sembolün botları aynı worker'a düşer (piyasa verisi önbelleği paylaşılır)
+    - Worker'lar farklı CPU çekirdeklerine sabitlenir
+    - Piyasa verisi (kline) koordinatörde bir kez çekilip ilgili worker'lara gönderilir
+    - Ölen worker'ın botları yaşayan worker'lara dağıtılır (hiç worker kalmadıysa yenisi açılır)
+    - Worker sağlık bilgileri logs/coordinator_status.json dosyasına yazılır (dashboard okur)
+    """
+
+    STATUS_FILE = os.path.join('logs', 'coordinator_status.json')
+    RESPAWN_DELAY = 30  # Hiç worker kalmadığında yeni worker açmadan önce beklenecek süre (saniye)
+
+    def __init__(self, specs, workers=None, logger=None, market_data_interval=15, heartbeat_interval=10,
+                 status_file=None, kline_limit=100):
+        if not specs:
+            raise ValueError("En az bir bot tanımı gerekli")
+        self.specs = list(specs)
+        self.logger = logger or logging
+        self.market_data_interval = market_data_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.status_file = status_file or self.STATUS_FILE
+        self.kline_limit = kline_limit
+
+        self.cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else list(range(os.cpu_count() or 1))
+        groups = self._group_by_symbol(self.specs)
+        self.worker_count = max(1, min(workers or len(self.cpus), len(groups)))
+
+        self.workers = []
+        self.rebalances = 0
+        self._orphan_specs = []  # Yeni worker bekleyen botlar
+        self._respawn_at = 0
+        self.client = None
+        self._next_worker_id = 0
+        self._context = multiprocessing.get_context('spawn')
+        self._outbox = self._context.Queue()
+        self._stop = threading.Event()
+
+    @staticmethod
+    def _group_by_symbol(specs):
+        groups = {}
+        for spec in specs:
+            groups.setdefault(spec.symbol, []).append(spec)
+        return list(groups.values())
+
+    def shard(self, specs, count):
+        """Botları sembol grupları halinde, en az yüklü worker'a ekleyerek dağıtır"""
+        shards = [[] for _ in range(count)]
+        for group in sorted(self._group_by_symbol(specs), key=len, reverse=True):
+            min(shards, key=len).extend(group)
+        return shards
+
+    def _spawn(self, specs):
+        worker_id = self._next_worker_id
+        self._next_worker_id += 1
+        cpu = self.cpus[worker_id % len(self.cpus)] if self.cpus else None
+
+        handle = WorkerHandle(worker_id, cpu, specs)
+        handle.inbox = self._context.Queue()
+        handle.process = self._context.Process(
+            target=worker_main,
+            args=(worker_id, [_spec_to_tuple(spec) for spec in specs], cpu, handle.inbox, self._outbox,
+                  self.market_data_interval * 2, self.heartbeat_interval),
+            name=f"runner-worker-{worker_id}",
+            daemon=False,
+        )
+        handle.process.start()
+        self.workers.append(handle)
+        self.logger.info(f"Worker {worker_id} başlatıldı (pid {handle.process.pid}, cpu {cpu}): " +
+                         ", ".join(spec.name for spec in specs))
+        return handle
+
+    def run(self):
+        """Koordinatörü çalıştırır (SIGINT/SIGTERM ile durdurulana kadar bloklar)"""
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: self._stop.set())
+
+        for shard in self.shard(self.specs, self.worker_count):
+            self._spawn(shard)
+
+        publisher = threading.Thread(target=self._publish_market_data, name='coordinator-market-data', daemon=True)
+        publisher.start()
+
+        last_status_write = 0
+        try:
+            while not self._stop.is_set():
+                self._drain_heartbeats(timeout=1)
+                self._check_workers()
+                if time.time() - last_status_write >= self.heartbeat_interval:
+                    self.write_status()
+                    last_status_write = time.time()
+        finally:
+            self.shutdown()
+
+    def _drain_heartbeats(self, timeout):
+        try:
+            message = self._outbox.get(timeout=timeout)
+        except queue.Empty:
+            return
+        while message is not None:
+            kind, worker_id, payload = message
+            if kind == 'heartbeat':
+                for handle in self.workers:
+                    if handle.worker_id == worker_id:
+                        handle.health = payload
+                        handle.last_heartbeat = payload['time']
+            try:
+                message = self._outbox.get_nowait()
+            except queue.Empty:
+                message = None
+
+    def _check_workers(self):
+        """Ölen worker'ları tespit eder ve botlarını yeniden dağıtır"""
+        for handle in list(self.workers):
+            if handle.process.is_alive() or self._stop.is_set():
+                continue
+            self.logger.error(f"Worker {handle.worker_id} durdu (exit code {handle.process.exitcode}), "
+                              f"{len(handle.specs)} bot yeniden dağıtılıyor")
+            self.workers.remove(handle)
+            self._rebalance(handle.specs)
+
+        # Hiç worker kalmadıysa bekleyen botlar için gecikmeli olarak yeni worker açılır (crash döngüsünü önler)
+        if self._orphan_specs and time.time() >= self._respawn_at and not self._stop.is_set():
+            specs, self._orphan_specs = self._orphan_specs, []
+            self._respawn_at = time.time() + self.RESPAWN_DELAY
+            self._spawn(specs)
+
+    def _rebalance(self, specs):
+        self.rebalances += 1
+        alive = [handle for handle in self.workers if handle.alive]
+        if not alive:
+            self._orphan_specs.extend(specs)
+            return
+
+        for group in self._group_by_symbol(specs):
+            target = min(alive, key=lambda handle: len(handle.specs))
+            target.specs.extend(group)
+            target.inbox.put(('add_specs', [_spec_to_tuple(spec) for spec in group]))
+            self.logger.info(f"Worker {target.worker_id} devraldı: " + ", ".join(spec.name for spec in group))
+
+    def _publish_market_data(self):
+        """Tüm worker'ların ihtiyaç duyduğu kline verisini tek noktadan çekip dağıtır"""
+        try:
+            from adapters.binance.binance_client import BinanceClient
+            self.client = BinanceClient.create_client()
+        except Exception as e:
+            self.logger.error(f"Koordinatör Binance bağlantısı kurulamadı, worker'lar veriyi kendisi çekecek: {e}")
+            return
+
+        while not self._stop.is_set():
+            started = time.time()
+            subscribers = {}
+            for handle in list(self.workers):
+                if handle.alive:
+                    for spec in handle.specs:
+                        subscribers.setdefault((spec.symbol, spec.timeframe), set()).add(handle)
+
+            for (symbol, interval), handles in subscribers.items():
+                try:
+                    klines = self.client.futures_klines(symbol=symbol, interval=interval, limit=self.kline_limit)
+                except Exception as e:
+                    self.logger.warning(f"Kline verisi alınamadı ({symbol} {interval}): {e}")
+                    continue
+                for handle in handles:
+                    handle.inbox.put(('klines', symbol, interval, self.kline_limit, klines, time.time()))
+
+            self._stop.wait(max(0, self.market_data_interval - (time.time() - started)))
+
+    def status(self):
+        """Koordinatör ve worker sağlık özetini döndürür"""
+        workers = [handle.to_dict() for handle in self.workers]
+        # Ölü worker'ın son bildirdiği bot durumları çalışan sayılmaz
+        bots = [bot for worker in workers if worker['alive'] for bot in worker['bots'].values()]
+        return {
+            'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'updated_ts': time.time(),
+            'coordinator_pid': os.getpid(),
+            'rebalances': self.rebalances,
+            'totals': {
+                'workers': len(workers),
+                'workers_alive': sum(1 for worker in workers if worker['alive']),
+                'bots': sum(len(worker['specs']) for worker in workers),
+                'bots_running': sum(1 for bot in bots if bot['state'] == 'running'),
+                'bots_error': sum(1 for bot in bots if bot['state'] == 'error'),
+                'ticks': sum(bot['ticks'] for bot in bots),
+                'errors': sum(bot['errors'] for bot in bots),
+            },
+            'workers': workers,
+        }
+
+    def write_status(self):
+        """Durum dosyasını atomik olarak yazar"""
+        try:
+            os.makedirs(os.path.dirname(self.status_file) or '.', exist_ok=True)
+            tmp_file = f"{self.status_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.status(), f, ensure_ascii=False, indent=2)
+            os.replace(tmp_file, self.status_file)
+        except Exception as e:
+            self.logger.error(f"Koordinatör durum dosyası yazılamadı: {e}")
+
+    def shutdown(self, timeout=30):
+        """Worker'lara durma mesajı gönderir, kapanmayanları sonlandırır"""
+        self._stop.set()
+        self.logger.info("Koordinatör durduruluyor...")
+        for handle in self.workers:
+            if handle.alive:
+                handle.inbox.put(('stop',))
+
+        deadline = time.time() + timeout
+        for handle in self.workers:
+            handle.process.join(max(0, deadline - time.time()))
+            if handle.process.is_alive():
+                self.logger.warning(f"Worker {handle.worker_id} zamanında kapanmadı, sonlandırılıyor")
+                handle.process.terminate()
+                handle.process.join(5)
+        self.write_status()
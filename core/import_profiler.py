@@ -0,0 +1,131 @@
+import importlib.abc
+import logging
+import os
+import sys
+import threading
+import time
+
+
+class _TimingLoader:
+    """Orijinal loader'ı saran ve exec_module süresini ölçen yardımcı"""
+
+    def __init__(self, loader, profiler):
+        self._loader = loader
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        # Modül kendi loader'ını görmeli (importlib.resources, pkgutil vb. için)
+        module.__loader__ = self._loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+        self._profiler._enter(module.__name__)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit(module.__name__)
+
+
+class _TimingFinder(importlib.abc.MetaPathFinder):
+    """sys.meta_path'e eklenen ve bulunan modüllerin loader'ını saran finder"""
+
+    def __init__(self, profiler):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self:
+                continue
+            find_spec = getattr(finder, 'find_spec', None)
+            if find_spec is None:
+                continue
+            spec = find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+
+        if spec.loader is not None and hasattr(spec.loader, 'exec_module'):
+            spec.loader = _TimingLoader(spec.loader, self._profiler)
+        return spec
+
+
+class ImportProfiler:
+    """
+    Import sürelerini ölçen yardımcı sınıf (python -X importtime benzeri rapor)
+    - Her zaman toplam import süresini loglar
+    - IMPORT_PROFILE=1 ile modül bazlı self/cumulative süre tablosu loglanır
+
+    Kullanım:
+        with ImportProfiler(logger, label='strategies.psar_atr_strategy'):
+            importlib.import_module('strategies.psar_atr_strategy')
+    """
+
+    def __init__(self, logger=None, label='import', enabled=None, top=15):
+        self.logger = logger or logging
+        self.label = label
+        if enabled is None:
+            enabled = os.getenv('IMPORT_PROFILE', '0') == '1'
+        self.enabled = enabled
+        self.top = top
+        self.records = []  # (modül adı, self süre, cumulative süre, derinlik)
+        self.elapsed = None
+        self._finder = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _enter(self, name):
+        # [modül adı, başlangıç zamanı, alt importların toplam süresi]
+        self._stack().append([name, time.perf_counter(), 0.0])
+
+    def _exit(self, name):
+        stack = self._stack()
+        _, started, children = stack.pop()
+        cumulative = time.perf_counter() - started
+        if stack:
+            stack[-1][2] += cumulative
+        with self._lock:
+            self.records.append((name, cumulative - children, cumulative, len(stack)))
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        if self.enabled:
+            self._finder = _TimingFinder(self)
+            sys.meta_path.insert(0, self._finder)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.elapsed = time.perf_counter() - self._started
+        if self._finder is not None:
+            try:
+                sys.meta_path.remove(self._finder)
+            except ValueError:
+                pass
+            self._finder = None
+        self.log_report()
+        return False
+
+    def report(self):
+        """Rapor satırlarını döndürür (en yavaş modüller cumulative süreye göre)"""
+        lines = [f"Import süresi ({self.label}): {self.elapsed * 1000:.1f} ms"]
+        if self.records:
+            lines.append(f"  {'self [ms]':>10} | {'cumulative [ms]':>15} | modül")
+            slowest = sorted(self.records, key=lambda record: record[2], reverse=True)[:self.top]
+            for name, self_time, cumulative, depth in slowest:
+                lines.append(f"  {self_time * 1000:10.1f} | {cumulative * 1000:15.1f} | {'  ' * depth}{name}")
+        return lines
+
+    def log_report(self):
+        """Raporu loglar"""
+        self.logger.info("\n".join(self.report()))
@@ -0,0 +1,26 @@
+import importlib
+import sys
+
+
+def lazy_module_getattr(package, mapping):
+    """
+    Paket için PEP 562 __getattr__ üretir: isimler ilk erişimde ilgili alt modülden yüklenir
+    Böylece örneğin sadece strategy/config import eden kod binance gibi ağır bağımlılıkları yüklemek zorunda kalmaz.
+
+    Args:
+        package: Paketin __name__ değeri
+        mapping: {isim: göreli alt modül} (ör. {'Bot': '.bot'})
+
+    Kullanım (paketin __init__.py dosyasında):
+        __getattr__ = lazy_module_getattr(__name__, {'Bot': '.bot'})
+    """
+
+    def __getattr__(name):
+        if name in mapping:
+            value = getattr(importlib.import_module(mapping[name], package), name)
+            # Sonraki erişimler __getattr__'a düşmez
+            setattr(sys.modules[package], name, value)
+            return value
+        raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+    return __getattr__
@@ -0,0 +1,526 @@
+import argparse
+import csv
+import fnmatch
+import glob
+import json
+import logging
+import os
+import sqlite3
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+ARCHIVE_DIRNAME = 'archive'
+STAGING_SUFFIX = '.compacting'
+SIGNALS_DB = 'sinyal_kontrol.db'
+
+# Yeniden adlandırılan CSV'ye o anda yazmakta olan süreçler için bekleme (yazıcılar dosyayı her toplu yazımda açar)
+RENAME_GRACE_SECONDS = 1.0
+# Pozisyonu sonradan kapanan sinyaller güncellendiği için son günlerin sinyal bölümleri her çalışmada yenilenir
+SIGNAL_REFRESH_DAYS = 7
+
+# (CSV kolonu, arşiv alanı, tür, gösterim formatı); türler: time, float, percent ("+1.23%" -> 1.23), bool, str
+# Formatı None olan float kolonlar CSV'ye biçimlendirilmeden (str(float)) yazılmıştır
+TRADES_COLUMNS = (
+    ('Tarih/Saat', 'time', 'time', None),
+    ('Sembol', 'symbol', 'str', None),
+    ('Aksiyon', 'action', 'str', None),
+    ('Yön', 'side', 'str', None),
+    ('Miktar', 'quantity', 'float', '.6f'),
+    ('Fiyat', 'price', 'float', '.4f'),
+    ('Detaylar', 'details', 'str', None),
+    ('Sinyal_İndikatörleri', 'indicators', 'str', None),
+)
+POSITIONS_COLUMNS = (
+    ('Tarih/Saat', 'time', 'time', None),
+    ('Sembol', 'symbol', 'str', None),
+    ('Pozisyon', 'position', 'str', None),
+    ('Giriş Fiyatı', 'entry_price', 'float', '.4f'),
+    ('Çıkış Fiyatı', 'exit_price', 'float', '.4f'),
+    ('Fiyat Değişimi', 'price_change_pct', 'percent', '+.2f'),
+    ('Kaldıraçlı P&L', 'leveraged_pnl_pct', 'percent', '+.2f'),
+    ('Durum', 'status', 'str', None),
+)
+TELEGRAM_COLUMNS = (
+    ('Tarih/Saat', 'time', 'time', None),
+    ('Sembol', 'symbol', 'str', None),
+    ('Environment', 'environment', 'str', None),
+    ('Mesaj', 'message', 'str', None),
+    ('Durum', 'status', 'str', None),
+    ('Hata Mesajı', 'error', 'str', None),
+)
+# Skorlama botunun trades_<sembol>.csv ve positions_<sembol>.csv dosyaları
+SKORLAMA_TRADES_COLUMNS = (
+    ('timestamp', 'time', 'time', None),
+    ('symbol', 'symbol', 'str', None),
+    ('action', 'action', 'str', None),
+    ('position', 'position', 'str', None),
+) + tuple((name, name, 'float', None) for name in (
+    'price', 'size', 'leverage', 'trade_amount', 'take_profit', 'stop_loss',
+)) + (
+    ('pnl_percent', 'pnl_pct', 'float', None),
+    ('reason', 'reason', 'str', None),
+) + tuple((name, name, 'float', None) for name in ('score', 'adx', 'rsi'))
+SKORLAMA_POSITIONS_COLUMNS = (
+    ('timestamp', 'time', 'time', None),
+    ('symbol', 'symbol', 'str', None),
+    ('position', 'position', 'str', None),
+    ('entry_price', 'entry_price', 'float', None),
+    ('current_price', 'current_price', 'float', None),
+    ('pnl_percent', 'pnl_pct', 'float', None),
+) + tuple((name, name, 'float', None) for name in ('take_profit', 'stop_loss', 'leverage', 'trade_amount'))
+SIGNAL_COLUMNS = (
+    ('signal_id', 'signal_id', 'str', None),
+    ('timestamp', 'time', 'time', None),
+    ('strategy', 'strategy', 'str', None),
+    ('symbol', 'symbol', 'str', None),
+    ('bar_index', 'bar_index', 'str', None),
+    ('signal_type', 'signal_type', 'str', None),
+) + tuple((name, name, 'float', '.4f') for name in (
+    'close', 'high', 'low', 'pSAR_UpValue', 'pSAR_DownValue', 'zoneATR', 'upZone', 'downZone', 'zoneDecider',
+)) + (
+    ('greenZone', 'greenZone', 'bool', None),
+    ('redZone', 'redZone', 'bool', None),
+) + tuple((name, name, 'float', '.4f') for name in (
+    'middleDonchian', 'upperDonchian', 'lowerDonchian', 'emaLower', 'emaMedium', 'hmaLong',
+)) + (
+    ('position_opened', 'position_opened', 'bool', None),
+    ('entry_price', 'entry_price', 'float', '.4f'),
+    ('exit_price', 'exit_price', 'float', '.4f'),
+    ('pnl_usdt', 'pnl_usdt', 'float', '.4f'),
+    ('pnl_percent', 'pnl_pct', 'percent', '.2f'),
+    ('position_closed_at', 'position_closed_at', 'time', None),
+)
+
+# Veri kümesi -> (logs/ altındaki CSV deseni, kolonlar); sinyaller CSV yerine SQLite kaydından okunur
+DATASETS = {
+    'trades': ('*_trades_*.csv', TRADES_COLUMNS),
+    'positions': ('*_positions_*.csv', POSITIONS_COLUMNS),
+    'telegram': ('telegram_*.csv', TELEGRAM_COLUMNS),
+    'skorlama_trades': ('trades_*.csv', SKORLAMA_TRADES_COLUMNS),
+    'skorlama_positions': ('positions_*.csv', SKORLAMA_POSITIONS_COLUMNS),
+    'signals': (None, SIGNAL_COLUMNS),
+}
+
+
+def _typed_column(values, kind):
+    """Metin kolonunu arşiv türüne çevirir (boş / hatalı değerler NaN, NaT veya False olur)"""
+    text = pd.Series(values, dtype=object).fillna('').astype(str).str.strip()
+    if kind == 'time':
+        # Skorlama zamanları mikrosaniyeli yazılır; arşivde saniyeye yuvarlanır
+        return pd.to_datetime(text, format='ISO8601', errors='coerce').to_numpy(dtype='datetime64[s]')
+    if kind == 'float':
+        return pd.to_numeric(text, errors='coerce').to_numpy(dtype=float)
+    if kind == 'percent':
+        return pd.to_numeric(text.str.rstrip('%'), errors='coerce').to_numpy(dtype=float)
+    if kind == 'bool':
+        return (text.str.lower() == 'true').to_numpy(dtype=bool)
+    return text.to_numpy(dtype=str)
+
+
+def _typed_arrays(frame, columns):
+    """CSV (veya veritabanı) satırlarını alan adı -> numpy dizisi sözlüğüne çevirir; eksik kolonlar boş kalır"""
+    arrays = {}
+    for header, field, kind, _ in columns:
+        values = frame[header] if header in frame.columns else [''] * len(frame)
+        arrays[field] = _typed_column(values, kind)
+    return arrays
+
+
+def dataset_for(filename):
+    """CSV dosya adının (ör. psar_trades_btcusdt.csv) veri kümesi; arşive alınmayan dosyalar için None"""
+    name = os.path.basename(filename)
+    for dataset, (pattern, _) in DATASETS.items():
+        if pattern is not None and fnmatch.fnmatchcase(name, pattern):
+            return dataset
+    return None
+
+
+def _row_days(times):
+    """Satırların günleri; zamanı okunamayan satırlar önceki satırın gününe düşer"""
+    days = pd.Series(times).dt.date.ffill().bfill()
+    if days.isna().all():
+        days = pd.Series([date.today()] * len(days))
+    return days.to_numpy()
+
+
+def _select(arrays, mask):
+    return {name: values[mask] for name, values in arrays.items()}
+
+
+def _as_day(value):
+    if value is None or isinstance(value, date) and not isinstance(value, datetime):
+        return value
+    return pd.Timestamp(value).date()
+
+
+def _first_day(path):
+    """CSV'nin ilk veri satırının günü (satırlar Tarih/Saat ile başlar); okunamazsa None"""
+    try:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            f.readline()
+            line = f.readline()
+        return datetime.strptime(line[:10], '%Y-%m-%d').date()
+    except (OSError, ValueError):
+        return None
+
+
+class LogArchive:
+    """
+    Bot CSV loglarının gün bazında bölümlenmiş kolonsal arşivi
+    - compact(): trade, pozisyon ve Telegram CSV'lerinin (skorlama botunun trades_/positions_ dosyaları dahil)
+      kapanmış (bugünden önceki) günlerini arşive taşır. CSV önce yeniden adlandırılır (botlar yeni dosyaya
+      yazmaya devam eder), eski günlerin satırları tiplenip logs/archive/<veri kümesi>/<YYYY-MM-DD>.npz
+      bölümlerine eklenir, bugünün satırları güncel CSV'ye geri yazılır ve yeniden adlandırılan dosya silinir
+    - Sinyaller (sinyal_kontrol.db) kapanmış günler için kopyalanır; veritabanından silinmez, son günler yenilenir
+    - Kolonlar tiplidir: zamanlar datetime64, fiyat ve yüzdeler float ("+1.23%" -> 1.23), metinler str
+    - query(): yalnızca istenen günlerin dosyalarını ve istenen kolonları okur (npz üyeleri ayrı ayrı açılır);
+      live=True iken henüz arşivlenmemiş satırlar (güncel CSV / veritabanı) da eklenir
+
+    Kullanım:
+        from core.log_archive import LogArchive
+
+        archive = LogArchive()
+        archive.compact()
+        df = archive.query('positions', columns=['time', 'symbol', 'leveraged_pnl_pct'], start='2026-10-01')
+    """
+
+    def __init__(self, logs_dir='logs', root=None):
+        self.logs_dir = logs_dir
+        self.root = root or os.path.join(logs_dir, ARCHIVE_DIRNAME)
+
+    # --- Bölümler ---
+
+    def _partition_path(self, dataset, day):
+        return os.path.join(self.root, dataset, f"{day.isoformat()}.npz")
+
+    def days(self, dataset):
+        """Arşivdeki bölümlerin günleri (eskiden yeniye)"""
+        paths = glob.glob(os.path.join(self.root, dataset, '????-??-??.npz'))
+        return sorted(date.fromisoformat(os.path.basename(path)[:10]) for path in paths)
+
+    def sources(self, dataset):
+        """Arşive alınmış CSV dosyalarının adları (uzantısız, ör. psar_positions_btcusdt)"""
+        try:
+            with open(os.path.join(self.root, dataset, 'sources.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _add_sources(self, dataset, stem, days):
+        sources = self.sources(dataset)
+        first, last = sources.get(stem, (days[0].isoformat(), days[-1].isoformat()))
+        sources[stem] = [min(first, days[0].isoformat()), max(last, days[-1].isoformat())]
+        path = os.path.join(self.root, dataset, 'sources.json')
+        with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(sources, f, indent=2, sort_keys=True)
+        os.replace(f"{path}.tmp", path)
+
+    def _write_partition(self, dataset, day, arrays, merge=True):
+        path = self._partition_path(dataset, day)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        if merge and os.path.exists(path):
+            with np.load(path) as existing:
+                arrays = {name: np.concatenate([existing[name], values]) if name in existing.files else values
+                          for name, values in arrays.items()}
+        order = np.argsort(arrays['time'], kind='stable')
+        tmp_path = f"{path[:-len('.npz')]}.tmp.npz"
+        np.savez_compressed(tmp_path, **{name: values[order] for name, values in arrays.items()})
+        os.replace(tmp_path, path)
+
+    def _write_days(self, dataset, arrays, merge=True):
+        """Satırları günlerine göre bölümlere yazar"""
+        days = _row_days(arrays['time'])
+        written = []
+        for day in sorted(set(days)):
+            self._write_partition(dataset, day, _select(arrays, days == day), merge=merge)
+            written.append(day)
+        return written
+
+    # --- Sıkıştırma ---
+
+    def compact(self, today=None):
+        """
+        Kapanmış günleri arşive taşır
+        Returns:
+            dict: veri kümesi -> arşive yazılan satır sayısı (güncel CSV'de kalan bugünün satırları hariç)
+        """
+        today = _as_day(today) or date.today()
+        staged = []
+        renamed = False
+        for dataset, (pattern, _) in DATASETS.items():
+            if pattern is None:
+                continue
+            # Önceki çalışmada yarıda kalan dosyalar önce işlenir
+            staged += [(dataset, path) for path in sorted(glob.glob(os.path.join(self.logs_dir, pattern + STAGING_SUFFIX)))]
+            for path in sorted(glob.glob(os.path.join(self.logs_dir, pattern))):
+                first = _first_day(path)
+                if first is None or first >= today or os.path.exists(path + STAGING_SUFFIX):
+                    continue
+                os.replace(path, path + STAGING_SUFFIX)
+                staged.append((dataset, path + STAGING_SUFFIX))
+                renamed = True
+        if renamed:
+            time.sleep(RENAME_GRACE_SECONDS)
+
+        counts = {dataset: 0 for dataset in DATASETS}
+        for dataset, staging in staged:
+            try:
+                counts[dataset] += self._archive_csv(dataset, staging, today)
+            except (OSError, ValueError, pd.errors.ParserError) as e:
+                logging.error(f"Arşivleme hatası ({staging}): {e}")
+                continue
+            os.remove(staging)
+        counts['signals'] = self._archive_signals(today)
+        return counts
+
+    def _archive_csv(self, dataset, path, today):
+        """Bugünden önceki satırları arşive yazar, bugünün satırlarını güncel CSV'ye geri koyar"""
+        _, columns = DATASETS[dataset]
+        frame = self._read_csv(path)
+        if frame.empty:
+            return 0
+        arrays = _typed_arrays(frame, columns)
+        current = _row_days(arrays['time']) >= today
+        stem = os.path.splitext(os.path.basename(path)[:-len(STAGING_SUFFIX)])[0]
+        archived = int((~current).sum())
+        if archived:
+            arrays = _select(arrays, ~current)
+            arrays['source'] = np.full(archived, stem)
+            days = self._write_days(dataset, arrays)
+            self._add_sources(dataset, stem, days)
+            logging.info(f"{os.path.basename(path)} arşivlendi: {archived} satır, {len(days)} gün")
+        if current.any():
+            self._restore_live(path[:-len(STAGING_SUFFIX)], list(frame.columns), frame[current].values.tolist())
+        return archived
+
+    def _restore_live(self, path, header, rows):
+        """
+        Bugünün satırlarını güncel CSV'ye geri yazar
+        Botlar yeniden adlandırmadan sonra yeni dosyayı açmış olabilir: o dosya da kenara alınıp satırları
+        bugünkülerin arkasına eklenir. Birleşik dosya os.link ile yerine konur (var olan dosyanın üzerine
+        yazmaz), böylece arada yazılan satırlar kaybolmaz.
+        """
+        tmp_path = f"{path}.tmp"
+        newer_path = f"{path}.newer"
+        while True:
+            with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(header)
+                writer.writerows(rows)
+            if os.path.exists(newer_path):
+                os.remove(newer_path)
+            try:
+                os.link(tmp_path, path)
+                break
+            except FileExistsError:
+                os.replace(path, newer_path)
+                time.sleep(RENAME_GRACE_SECONDS)
+                rows += self._read_csv(newer_path).values.tolist()
+        os.remove(tmp_path)
+
+    @staticmethod
+    def _read_csv(path):
+        return pd.read_csv(path, dtype=str, keep_default_na=False, encoding='utf-8', encoding_errors='replace',
+                           on_bad_lines='skip')
+
+    def _signals_db(self):
+        path = os.path.join(self.logs_dir, SIGNALS_DB)
+        return path if os.path.exists(path) else None
+
+    def _read_signals(self, since=None, until=None):
+        """Sinyal kayıtlarını [since, until) gün aralığında okur (salt okunur bağlantı)"""
+        db = self._signals_db()
+        if db is None:
+            return pd.DataFrame(columns=[header for header, _, _, _ in SIGNAL_COLUMNS])
+        headers = [header for header, _, _, _ in SIGNAL_COLUMNS]
+        sql = f'SELECT {", ".join(f"{chr(34)}{name}{chr(34)}" for name in headers)} FROM signals WHERE 1=1'
+        params = []
+        if since is not None:
+            sql += ' AND timestamp >= ?'
+            params.append(since.isoformat())
+        if until is not None:
+            sql += ' AND timestamp < ?'
+            params.append(until.isoformat())
+        connection = sqlite3.connect(f"file:{db}?mode=ro", uri=True, timeout=30)
+        try:
+            rows = connection.execute(sql + ' ORDER BY rowid', params).fetchall()
+        finally:
+            connection.close()
+        return pd.DataFrame(rows, columns=headers)
+
+    def _archive_signals(self, today):
+        """Kapanmış günlerin sinyallerini yazar; son SIGNAL_REFRESH_DAYS gün ve eksik günler baştan yazılır"""
+        if self._signals_db() is None:
+            return 0
+        archived = self.days('signals')
+        since = None
+        if archived:
+            since = min(today - timedelta(days=SIGNAL_REFRESH_DAYS), archived[-1] + timedelta(days=1))
+        frame = self._read_signals(since=since, until=today)
+        if frame.empty:
+            return 0
+        self._write_days('signals', _typed_arrays(frame, SIGNAL_COLUMNS), merge=False)
+        return len(frame)
+
+    # --- Sorgu ---
+
+    def _live_arrays(self, dataset, sources=None):
+        """Henüz arşivlenmemiş satırlar (güncel CSV'ler veya son arşiv gününden sonraki sinyaller)"""
+        pattern, columns = DATASETS[dataset]
+        if pattern is None:
+            archived = self.days(dataset)
+            frame = self._read_signals(since=archived[-1] + timedelta(days=1) if archived else None)
+            return [_typed_arrays(frame, columns)] if not frame.empty else []
+        if sources is not None:
+            # Yalnızca adı verilen dosyalar okunur (desene uyan diğer CSV'ler açılmaz)
+            paths = [os.path.join(self.logs_dir, f"{stem}.csv") for stem in sorted(sources)]
+            paths = [path for path in paths if os.path.exists(path)]
+        else:
+            paths = sorted(glob.glob(os.path.join(self.logs_dir, pattern)))
+        parts = []
+        for path in paths:
+            stem = os.path.splitext(os.path.basename(path))[0]
+            try:
+                frame = self._read_csv(path)
+            except (OSError, pd.errors.ParserError) as e:
+                logging.warning(f"Log okunamadı ({path}): {e}")
+                continue
+            if frame.empty:
+                continue
+            arrays = _typed_arrays(frame, columns)
+            arrays['source'] = np.full(len(frame), stem)
+            parts.append(arrays)
+        return parts
+
+    def query(self, dataset, columns=None, start=None, end=None, symbols=None, sources=None, live=True, tail=None):
+        """
+        Arşivden (ve istenirse güncel loglardan) satırları okur
+        Args:
+            dataset: trades, positions, telegram veya signals
+            columns: Okunacak alanlar (None: hepsi); diskten yalnızca bunlar ve filtre alanları açılır
+            start, end: Gün aralığı (dahil); aralık dışındaki bölüm dosyaları açılmaz
+            symbols: Sembol filtresi
+            sources: CSV dosya adı filtresi (uzantısız, ör. psar_positions_btcusdt)
+            live: Henüz arşivlenmemiş satırlar da eklensin
+            tail: Yalnızca en yeni N satır (bölümler yeniden eskiye okunur, yeterli satırda durulur)
+        Returns:
+            pd.DataFrame: Zamana göre sıralı satırlar
+        """
+        if dataset not in DATASETS:
+            raise ValueError(f"Bilinmeyen veri kümesi: {dataset} ({', '.join(DATASETS)})")
+        start, end = _as_day(start), _as_day(end)
+        fields = [field for _, field, _, _ in DATASETS[dataset][1]]
+        if DATASETS[dataset][0] is not None:
+            fields.append('source')
+        wanted = list(columns) if columns else fields
+        unknown = [name for name in wanted if name not in fields]
+        if unknown:
+            raise ValueError(f"{dataset} için bilinmeyen kolon: {', '.join(unknown)}")
+        load = list(dict.fromkeys(wanted + ['time'] + (['symbol'] if symbols else []) +
+                                  (['source'] if sources else [])))
+        symbols = set(symbols) if symbols else None
+        sources = set(sources) if sources else None
+
+        def keep(arrays):
+            mask = np.ones(len(arrays['time']), dtype=bool)
+            if symbols is not None:
+                mask &= np.isin(arrays['symbol'], list(symbols))
+            if sources is not None:
+                mask &= np.isin(arrays['source'], list(sources))
+            if start is not None or end is not None:
+                days = arrays['time'].astype('datetime64[D]')
+                if start is not None:
+                    mask &= days >= np.datetime64(start)
+                if end is not None:
+                    mask &= days <= np.datetime64(end)
+            return {name: arrays[name][mask] for name in load}
+
+        # En yeniden eskiye: önce güncel satırlar, sonra bölümler
+        parts = []
+        rows = 0
+        if live:
+            for arrays in reversed(self._live_arrays(dataset, sources)):
+                parts.append(keep(arrays))
+                rows += len(parts[-1]['time'])
+        known = self.sources(dataset) if sources is not None else None
+        for day in reversed(self.days(dataset)):
+            if tail is not None and rows >= tail:
+                break
+            if (start is not None and day < start) or (end is not None and day > end):
+                continue
+            if known is not None and not any(stem in known and known[stem][0] <= day.isoformat() <= known[stem][1]
+                                             for stem in sources):
+                continue
+            with np.load(self._partition_path(dataset, day)) as data:
+                parts.append(keep({name: data[name] for name in load}))
+            rows += len(parts[-1]['time'])
+
+        if not parts:
+            return pd.DataFrame({name: pd.Series(dtype=object) for name in wanted})
+        merged = {name: np.concatenate([part[name] for part in reversed(parts)]) for name in load}
+        order = np.argsort(merged['time'], kind='stable')
+        frame = pd.DataFrame({name: merged[name][order] for name in wanted})
+        if tail is not None:
+            frame = frame.iloc[-tail:]
+        return frame.reset_index(drop=True)
+
+    @staticmethod
+    def to_records(dataset, frame):
+        """Sorgu sonucunu CSV başlıkları ve CSV'deki biçimle dict listesine çevirir (dashboard tabloları)"""
+        columns = [column for column in DATASETS[dataset][1] if column[1] in frame.columns]
+        records = []
+        for row in frame.itertuples(index=False):
+            values = row._asdict()
+            record = {}
+            for header, field, kind, spec in columns:
+                value = values[field]
+                if kind == 'time':
+                    record[header] = '' if pd.isna(value) else pd.Timestamp(value).strftime('%Y-%m-%d %H:%M:%S')
+                elif kind in ('float', 'percent'):
+                    if pd.isna(value) or (value == 0 and spec == '.6f'):
+                        text = ''
+                    elif spec is None:
+                        text = np.format_float_positional(value, trim='-')
+                    else:
+                        text = format(value, spec)
+                    record[header] = f"{text}%" if kind == 'percent' and text else text
+                elif kind == 'bool':
+                    record[header] = 'true' if value else ''
+                else:
+                    record[header] = value
+            records.append(record)
+        return records
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bot loglarının kolonsal arşivi")
+    parser.add_argument('--logs-dir', default='logs')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('compact', help="Kapanmış günleri logs/archive/ altına taşır (ör. günlük cron)")
+    query_parser = subparsers.add_parser('query', help="Arşivden satır okur")
+    query_parser.add_argument('dataset', choices=list(DATASETS))
+    query_parser.add_argument('--columns', help="Virgülle ayrılmış alanlar")
+    query_parser.add_argument('--start', help="İlk gün (YYYY-MM-DD)")
+    query_parser.add_argument('--end', help="Son gün (YYYY-MM-DD)")
+    query_parser.add_argument('--symbol', action='append', help="Sembol filtresi (tekrarlanabilir)")
+    query_parser.add_argument('--tail', type=int, help="Yalnızca en yeni N satır")
+    query_parser.add_argument('--csv', help="Sonucu CSV olarak yaz")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    archive = LogArchive(args.logs_dir)
+    if args.command == 'compact':
+        for name, count in archive.compact().items():
+            print(f"{name}: {count} satır arşivlendi")
+    else:
+        result = archive.query(args.dataset, columns=args.columns.split(',') if args.columns else None,
+                               start=args.start, end=args.end, symbols=args.symbol, tail=args.tail)
+        if args.csv:
+            result.to_csv(args.csv, index=False)
+            print(f"{len(result)} satır yazıldı: {args.csv}")
+        else:
+            with pd.option_context('display.max_rows', 50, 'display.width', 200):
+                print(result)
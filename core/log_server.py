@@ -0,0 +1,434 @@
+import atexit
+import csv
+import gzip
+import json
+import logging
+import os
+import queue
+import shutil
+import signal
+import socket
+import socketserver
+import struct
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, SocketHandler
+
+from core.logging_config import LOG_SERVER_ENV, LoggingConfig
+from core.metrics import metrics
+
+# WARNING ve üstü kayıtların (tüm süreçlerden) toplandığı dosya
+ERRORS_LOG = 'errors'
+DEFAULT_SOCKET = os.path.join('logs', 'log_server.sock')
+
+# Tek kaydın en büyük boyutu (bozuk veya kötü niyetli bağlantı belleği dolduramasın)
+MAX_RECORD_BYTES = 1024 * 1024
+
+# Karşı süreçten kabul edilen kayıt alanları ve türleri; diğer alanlar atılır
+RECORD_FIELDS = {
+    'name': str, 'msg': str, 'levelname': str, 'levelno': int, 'created': float, 'msecs': float,
+    'relativeCreated': float, 'process': int, 'processName': str, 'thread': int, 'threadName': str,
+    'module': str, 'funcName': str, 'lineno': int, 'log_file': str,
+}
+
+
+def socket_path(value=None):
+    """
+    LOG_SERVER değerini çözer: yazıcının Unix soketinin yolu (ör. logs/log_server.sock)
+    Returns:
+        str: Mutlak yol; tanımsızsa veya platformda Unix soketi yoksa None
+    """
+    value = (os.getenv(LOG_SERVER_ENV, '') if value is None else value).strip()
+    if not value:
+        return None
+    if not hasattr(socket, 'AF_UNIX'):
+        sys.stderr.write("LOG_SERVER: bu platformda Unix soketi yok, loglar süreç başına dosyalara yazılıyor\n")
+        return None
+    return os.path.abspath(value)
+
+
+def encode_record(fields):
+    """Kaydı uzunluk önekli JSON olarak kodlar (pickle kullanılmaz: karşı taraf yalnızca veri alır)"""
+    data = json.dumps(fields, ensure_ascii=False, default=str).encode('utf-8')
+    return struct.pack('>L', len(data)) + data
+
+
+def decode_record(data):
+    """
+    Karşı süreçten gelen JSON kaydı doğrular
+    Returns:
+        dict: İzin verilen alanlar (CSV kaydıysa csv_path/csv_header/csv_row da); geçersizse ValueError
+    """
+    fields = json.loads(data.decode('utf-8'))
+    if not isinstance(fields, dict):
+        raise ValueError("kayıt dict değil")
+    record = {}
+    for name, kind in RECORD_FIELDS.items():
+        if name in fields:
+            value = fields[name]
+            if kind is float and isinstance(value, int) and not isinstance(value, bool):
+                value = float(value)
+            if not isinstance(value, kind) or isinstance(value, bool):
+                raise ValueError(f"{name} alanı geçersiz")
+            record[name] = value
+    if 'csv_path' in fields:
+        path, header, row = fields['csv_path'], fields.get('csv_header'), fields.get('csv_row')
+        if not isinstance(path, str) or not all(isinstance(values, list) and all(isinstance(v, str) for v in values)
+                                                for values in (header, row)):
+            raise ValueError("CSV kaydı geçersiz")
+        record.update(csv_path=path, csv_header=header, csv_row=row)
+    return record
+
+
+def _inside(path, directory):
+    """path (sembolik bağlar çözülerek) directory içinde mi"""
+    path, directory = os.path.realpath(path), os.path.realpath(directory)
+    return os.path.commonpath([path, directory]) == directory and path != directory
+
+
+def _gzip_namer(name):
+    return name + '.gz'
+
+
+def _gzip_rotator(source, dest):
+    """Döndürülen log dosyasını sıkıştırır (yalnızca yazıcı süreçte çalışır, başka süreç dosyayı tutmaz)"""
+    with open(source, 'rb') as src, gzip.open(dest, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+def _append_csv(path, header, row):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'a', newline='', encoding='utf-8') as csvfile:
+        writer = csv.writer(csvfile)
+        if csvfile.tell() == 0:
+            writer.writerow(header)
+        writer.writerow(row)
+
+
+class _RecordStream(socketserver.StreamRequestHandler):
+    """Bir bot sürecinin bağlantısı: uzunluk önekli JSON kayıtları doğrulayıp kuyruğa koyar"""
+
+    def handle(self):
+        while True:
+            chunk = self.rfile.read(4)
+            if len(chunk) < 4:
+                return
+            length = struct.unpack('>L', chunk)[0]
+            if length > MAX_RECORD_BYTES:
+                sys.stderr.write(f"Log sunucusu: {length} baytlık kayıt reddedildi, bağlantı kapatılıyor\n")
+                return
+            data = self.rfile.read(length)
+            if len(data) < length:
+                return
+            try:
+                fields = decode_record(data)
+            except ValueError as e:
+                self.server.rejected += 1
+                sys.stderr.write(f"Log sunucusu: geçersiz kayıt reddedildi ({e})\n")
+                continue
+            self.server.records.put(logging.makeLogRecord(fields))
+
+
+class _Server(socketserver.ThreadingUnixStreamServer if hasattr(socket, 'AF_UNIX') else object):
+    daemon_threads = True
+    rejected = 0
+
+
+class LogWriter:
+    """
+    Tek yazıcılı log sunucusu
+    - Bot süreçleri kayıtlarını yerel Unix soketi üzerinden uzunluk önekli JSON olarak gönderir
+    - Soket dosyası yalnızca sahibine açıktır (0600); kayıtlar veri olarak çözülür, izin verilen alanlar dışında
+      hiçbir şey alınmaz (pickle kullanılmaz)
+    - Bağlantı thread'leri yalnızca kayıtları çözer; dosyalara tek bir yazıcı thread'i yazar,
+      böylece süreçler arası dosya kilidine ve rotation yarışına gerek kalmaz
+    - Her logger kendi dosyasına (logs/<ad>.txt) yazılır; WARNING ve üstü ayrıca logs/errors.txt dosyasında toplanır
+    - Döndürülen dosyalar gzip ile sıkıştırılır (<ad>.txt.1.gz, <ad>.txt.2.gz ...)
+    - forward_csv ile gönderilen paylaşılan CSV satırları da aynı yazıcıdan geçer (dosya boşsa başlık yazılır);
+      log klasörü dışındaki veya .csv olmayan yollar reddedilir
+    """
+
+    def __init__(self, path=DEFAULT_SOCKET, config=None):
+        self.path = os.path.abspath(path)
+        self.config = config or LoggingConfig()
+        self.written = 0
+        self.rejected = 0
+        self._records = queue.Queue()
+        self._handlers = {}
+        self._server = None
+        self._thread = None
+        self._formatter = logging.Formatter(self.config.log_format, self.config.date_format)
+
+    @property
+    def address(self):
+        return self.path
+
+    def start(self):
+        """Sunucuyu ve yazıcı thread'ini başlatır; sokette başka yazıcı dinliyorsa OSError fırlatır"""
+        self._remove_stale_socket()
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # Soket dosyası baştan 0600 oluşturulur (bind ile chmod arasında başka kullanıcı bağlanamasın)
+        umask = os.umask(0o177)
+        try:
+            server = _Server(self.path, _RecordStream)
+        finally:
+            os.umask(umask)
+        os.chmod(self.path, 0o600)
+        server.records = self._records
+        self._server = server
+        threading.Thread(target=server.serve_forever, name='log-server', daemon=True).start()
+        self._thread = threading.Thread(target=self._run, name='log-writer', daemon=True)
+        self._thread.start()
+        metrics.register_collector(self._collect_metrics)
+        atexit.register(self.stop)
+        return self
+
+    def stop(self, timeout=5):
+        """Yeni bağlantıları kapatır, kuyruktaki kayıtları yazar ve dosyaları kapatır"""
+        if self._server is None:
+            return
+        server, self._server = self._server, None
+        server.shutdown()
+        server.server_close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+        self._records.put(None)
+        self._thread.join(timeout)
+        for handler in self._handlers.values():
+            handler.close()
+        self._handlers.clear()
+
+    @property
+    def depth(self):
+        return self._records.qsize()
+
+    def _remove_stale_socket(self):
+        """Önceki yazıcıdan kalan soket dosyasını siler; dinleyen bir yazıcı varsa OSError fırlatır"""
+        if not os.path.exists(self.path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.path)
+        except OSError:
+            os.remove(self.path)
+            return
+        finally:
+            probe.close()
+        raise OSError(f"Log sunucusu zaten çalışıyor: {self.path}")
+
+    def _run(self):
+        while True:
+            record = self._records.get()
+            if record is None:
+                return
+            try:
+                self._write(record)
+            except Exception as e:
+                # Yazıcının kendi hataları iletilmez (döngüye girmesin), stderr'e yazılır
+                sys.stderr.write(f"Log yazıcı hatası ({record.name}): {e}\n")
+
+    def _write(self, record):
+        csv_path = getattr(record, 'csv_path', None)
+        if csv_path:
+            if not csv_path.endswith('.csv') or not _inside(csv_path, self.config.log_dir):
+                self.rejected += 1
+                sys.stderr.write(f"Log yazıcı: log klasörü dışındaki CSV yolu reddedildi ({csv_path})\n")
+                return
+            _append_csv(csv_path, record.csv_header, record.csv_row)
+        else:
+            self._handler(getattr(record, 'log_file', record.name)).handle(record)
+            if record.levelno >= logging.WARNING:
+                self._handler(ERRORS_LOG).handle(record)
+        self.written += 1
+
+    def _handler(self, name):
+        # Dosya adı karşı süreçten geldiği için klasör kısmı atılır
+        name = os.path.basename(name) or 'root'
+        handler = self._handlers.get(name)
+        if handler is None:
+            os.makedirs(self.config.log_dir, exist_ok=True)
+            handler = RotatingFileHandler(os.path.join(self.config.log_dir, f"{name}.txt"),
+                                          maxBytes=self.config.max_bytes, backupCount=self.config.backup_count,
+                                          encoding='utf-8')
+            handler.namer = _gzip_namer
+            handler.rotator = _gzip_rotator
+            handler.setFormatter(self._formatter)
+            self._handlers[name] = handler
+        return handler
+
+    def _collect_metrics(self):
+        return [
+            ('log_writer_queue_depth', 'gauge', 'Yazılmayı bekleyen log kaydı', (), [((), self.depth)]),
+            ('log_writer_records_total', 'counter', 'Yazıcının dosyalara yazdığı kayıtlar', (), [((), self.written)]),
+            ('log_writer_rejected_total', 'counter', 'Geçersiz olduğu için yazılmayan kayıtlar', (),
+             [((), self.rejected + (self._server.rejected if self._server else 0))]),
+        ]
+
+
+class _ForwardHandler(SocketHandler):
+    """
+    Kayıtları yazıcının Unix soketine JSON olarak gönderen SocketHandler (QueueListener thread'inde çalışır)
+    Yazıcıya ulaşılamazsa kayıt kaybolmaz, bu sürecin yerel dosyasına (rotation'sız) eklenir.
+    """
+
+    def __init__(self, path, config):
+        # port=None: SocketHandler AF_UNIX soketine bağlanır
+        super().__init__(path, None)
+        self.config = config
+        self.forwarded = 0
+        self.fallbacks = 0
+        self._fallback_handlers = {}
+        self._down = False
+
+    def makePickle(self, record):
+        # Adı SocketHandler'dan gelir; kayıt pickle değil JSON olarak kodlanır
+        fields = {name: getattr(record, name) for name in RECORD_FIELDS if getattr(record, name, None) is not None}
+        # Mesaj argümanlarıyla birleştirilip metin olarak gönderilir (QueueHandler.prepare bunu zaten yapmış olabilir)
+        fields['msg'] = record.getMessage()
+        if record.exc_info:
+            fields['msg'] += '\n' + logging.Formatter().formatException(record.exc_info)
+        if getattr(record, 'csv_path', None):
+            fields.update(csv_path=record.csv_path, csv_header=record.csv_header, csv_row=record.csv_row)
+        return encode_record(fields)
+
+    def emit(self, record):
+        try:
+            self.send(self.makePickle(record))
+        except Exception:
+            self.handleError(record)
+            return
+        # send() bağlantı hatasını yutar ve soketi kapatır; soket yoksa kayıt gönderilememiştir
+        if self.sock is not None:
+            self.forwarded += 1
+            self._down = False
+            return
+        if not self._down:
+            self._down = True
+            sys.stderr.write(f"Log sunucusuna ({self.address}) ulaşılamadı, "
+                             f"kayıtlar yerel dosyalara yazılıyor\n")
+        self.fallbacks += 1
+        self._write_fallback(record)
+
+    def _write_fallback(self, record):
+        csv_path = getattr(record, 'csv_path', None)
+        if csv_path:
+            _append_csv(csv_path, record.csv_header, record.csv_row)
+            return
+        name = getattr(record, 'log_file', record.name)
+        handler = self._fallback_handlers.get(name)
+        if handler is None:
+            os.makedirs(self.config.log_dir, exist_ok=True)
+            handler = logging.FileHandler(os.path.join(self.config.log_dir, f"{name}.txt"), encoding='utf-8')
+            handler.setFormatter(logging.Formatter(self.config.log_format, self.config.date_format))
+            self._fallback_handlers[name] = handler
+        handler.handle(record)
+
+    def close(self):
+        for handler in self._fallback_handlers.values():
+            handler.close()
+        super().close()
+
+
+class _NamedQueueHandler(QueueHandler):
+    """Kaydı biçimlendirip kuyruğa koyar; yazıcı hangi dosyaya yazacağını log_file alanından öğrenir"""
+
+    def __init__(self, records, log_file):
+        super().__init__(records)
+        self.log_file = log_file
+
+    def prepare(self, record):
+        record = super().prepare(record)
+        record.log_file = self.log_file
+        return record
+
+
+_forwarder = None
+_forwarder_lock = threading.Lock()
+
+
+def _forward_queue():
+    """Süreç genelinde tek kuyruk + gönderici thread (ilk kullanımda başlar); LOG_SERVER tanımsızsa None"""
+    global _forwarder
+    path = socket_path()
+    if path is None:
+        return None
+    with _forwarder_lock:
+        if _forwarder is None:
+            records = queue.Queue()
+            handler = _ForwardHandler(path, LoggingConfig())
+            listener = QueueListener(records, handler)
+            listener.start()
+            # Kapanışta kuyruktaki kayıtlar gönderilir (logging.shutdown'dan önce çalışır)
+            atexit.register(listener.stop)
+            metrics.register_collector(lambda: [
+                ('log_forward_queue_depth', 'gauge', 'Log sunucusuna gönderilmeyi bekleyen kayıt', (),
+                 [((), records.qsize())]),
+                ('log_forward_fallback_total', 'counter', 'Sunucuya ulaşılamadığı için yerel dosyaya yazılan kayıt',
+                 (), [((), handler.fallbacks)]),
+            ])
+            _forwarder = records
+        return _forwarder
+
+
+def forwarding_handler(name):
+    """
+    Kayıtları log sunucusuna ileten handler (bot thread'i yalnızca kuyruğa ekler, diske veya sokete beklemez)
+    Args:
+        name: Yazıcı tarafındaki log dosyasının adı (logs/<name>.txt)
+    Returns:
+        logging.Handler veya LOG_SERVER tanımsızsa None
+    """
+    records = _forward_queue()
+    return None if records is None else _NamedQueueHandler(records, name)
+
+
+def forward_csv(path, header, row):
+    """
+    Paylaşılan CSV dosyasına yazılacak satırı log sunucusuna iletir
+    Returns:
+        bool: LOG_SERVER tanımsızsa False (çağıran dosyaya kendisi yazar)
+    """
+    records = _forward_queue()
+    if records is None:
+        return False
+    records.put_nowait(logging.makeLogRecord({
+        'name': 'csv', 'msg': os.path.basename(path),
+        'csv_path': os.path.abspath(path), 'csv_header': [str(value) for value in header],
+        'csv_row': [str(value) for value in row],
+    }))
+    return True
+
+
+def start_log_writer():
+    """
+    LOG_SERVER tanımlıysa ve adreste dinleyen başka yazıcı yoksa yazıcıyı bu süreçte başlatır
+    Returns:
+        LogWriter veya None (tanımsız ya da port başka bir yazıcıda)
+    """
+    path = socket_path()
+    if path is None:
+        return None
+    try:
+        return LogWriter(path).start()
+    except OSError:
+        return None
+
+
+if __name__ == "__main__":
+    # python -m core.log_server [soket yolu]: bağımsız yazıcı süreci (main_*.py botları için)
+    path = socket_path(sys.argv[1] if len(sys.argv) > 1 else os.getenv(LOG_SERVER_ENV) or DEFAULT_SOCKET)
+    if path is None:
+        sys.exit(1)
+    writer = LogWriter(path).start()
+    print(f"Log sunucusu dinliyor: {writer.path} (botlarda LOG_SERVER={writer.path})")
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+    stop.wait()
+    writer.stop()
+    print(f"Log sunucusu durduruldu ({writer.written} kayıt yazıldı)")
@@ -5,6 +5,9 @@ import os
 from datetime import datetime
 from logging.handlers import RotatingFileHandler
 
+# Tanımlıysa (yazıcının Unix soketi, ör. logs/log_server.sock) dosya kayıtları tek yazıcı sürece iletilir (core/log_server.py)
+LOG_SERVER_ENV = 'LOG_SERVER'
+
 class LoggingConfig:
     def __init__(self):
         self.log_dir = "logs"
@@ -39,14 +42,7 @@ class LoggingConfig:
 
         # Dosya handler oluştur
         log_file = os.path.join(self.log_dir, f"{name}.txt")
-        file_handler = RotatingFileHandler(
-            log_file,
-            maxBytes=self.max_bytes,
-            backupCount=self.backup_count,
-            encoding='utf-8'
-        )
-        file_handler.setLevel(self.log_level)
-        file_handler.setFormatter(formatter)
+        file_handler = self.create_file_handler(name)
 
         # Konsol handler oluştur
         console_handler = logging.StreamHandler()
@@ -62,6 +58,31 @@ class LoggingConfig:
 
         return logger
 
+    def create_file_handler(self, name):
+        """
+        logs/<name>.txt için dosya handler'ı oluşturur
+        LOG_SERVER tanımlıysa dosyaya bu süreç yazmaz: kayıtlar kuyruğa eklenir ve log sunucusuna iletilir
+        (rotation ve sıkıştırma tek yazıcıda yapılır). Tanımsızsa süreç içi RotatingFileHandler döner.
+        """
+        if os.getenv(LOG_SERVER_ENV):
+            from core.log_server import forwarding_handler
+            handler = forwarding_handler(name)
+            # Platformda Unix soketi yoksa None döner, süreç kendi dosyasına yazar
+            if handler is not None:
+                handler.setLevel(self.log_level)
+                return handler
+
+        os.makedirs(self.log_dir, exist_ok=True)
+        handler = RotatingFileHandler(
+            os.path.join(self.log_dir, f"{name}.txt"),
+            maxBytes=self.max_bytes,
+            backupCount=self.backup_count,
+            encoding='utf-8'
+        )
+        handler.setLevel(self.log_level)
+        handler.setFormatter(logging.Formatter(self.log_format, self.date_format))
+        return handler
+
 # Standalone setup_logging function for direct import
 def setup_logging(name):
     """
@@ -0,0 +1,389 @@
+import atexit
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+METRICS_PORT_ENV = 'METRICS_PORT'
+METRICS_HOST_ENV = 'METRICS_HOST'
+
+# Süreçlerin dinlediği portu dashboard'a bildirdiği klasör (<pid>.json)
+DISCOVERY_DIR = os.path.join('logs', 'metrics')
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values):
+    if not names:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Etiket değerlerine göre ayrılmış tek metrik (Prometheus metin formatı)"""
+
+    kind = None
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.label_names)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Summary(_Metric):
+    """Toplam ve sayı (_sum / _count); son değer ayrıca <ad>_last olarak yazılır"""
+
+    kind = 'summary'
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            total, count, _ = self._values.get(key, (0.0, 0, 0.0))
+            self._values[key] = (total + value, count + 1, value)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, (total, count, _) in items:
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        lines += [f"# HELP {self.name}_last Son ölçüm", f"# TYPE {self.name}_last gauge"]
+        for key, (_, _, last) in items:
+            lines.append(f"{self.name}_last{_format_labels(self.label_names, key)} {_format_value(last)}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Süreç içi metrik kaydı
+    - counter / gauge / summary: kod içinden güncellenen metrikler
+    - collector: her okumada çağrılıp (ad, tür, açıklama, etiket adları, [(etiket değerleri, değer)]) döndüren
+      fonksiyonlar (bot pozisyonları, RSS gibi anlık değerler için)
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name, help_text, labels):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, labels)
+            return metric
+
+    def counter(self, name, help_text, labels=()):
+        return self._register(Counter, name, help_text, labels)
+
+    def gauge(self, name, help_text, labels=()):
+        return self._register(Gauge, name, help_text, labels)
+
+    def summary(self, name, help_text, labels=()):
+        return self._register(Summary, name, help_text, labels)
+
+    def register_collector(self, collector):
+        with self._lock:
+            self._collectors.append(collector)
+
+    def unregister_collector(self, collector):
+        with self._lock:
+            if collector in self._collectors:
+                self._collectors.remove(collector)
+
+    def render(self):
+        """Prometheus metin formatı (text/plain; version=0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        lines = []
+        for metric in metrics:
+            lines += metric.render()
+        for collector in collectors:
+            try:
+                families = collector()
+            except Exception as e:
+                logging.error(f"Metrik toplayıcı hatası: {e}")
+                continue
+            for name, kind, help_text, label_names, samples in families:
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+                for values, value in samples:
+                    if value is not None:
+                        lines.append(f"{name}{_format_labels(label_names, values)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _process_metrics():
+    """Süreç RSS, CPU süresi ve thread sayısı"""
+    rss = cpu = threads = None
+    if psutil is not None:
+        process = psutil.Process()
+        with process.oneshot():
+            rss = process.memory_info().rss
+            times = process.cpu_times()
+            cpu = times.user + times.system
+            threads = process.num_threads()
+    else:
+        try:
+            with open('/proc/self/statm') as f:
+                rss = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+            times = os.times()
+            cpu = times.user + times.system
+            threads = threading.active_count()
+        except (OSError, ValueError, AttributeError):
+            pass
+    return [
+        ('process_resident_memory_bytes', 'gauge', 'Süreç bellek kullanımı (RSS)', (), [((), rss)]),
+        ('process_cpu_seconds_total', 'counter', 'Süreç toplam CPU süresi', (), [((), cpu)]),
+        ('process_threads', 'gauge', 'Süreçteki thread sayısı', (), [((), threads)]),
+        ('process_start_time_seconds', 'gauge', 'Süreç başlangıç zamanı (epoch)', (), [((), _STARTED)]),
+    ]
+
+
+_STARTED = time.time()
+
+# Süreç genelinde paylaşılan metrik kaydı
+metrics = MetricsRegistry()
+metrics.register_collector(_process_metrics)
+
+# Ortak metrikler
+LOOP_ITERATIONS = metrics.counter('bot_loop_iterations_total', 'Tamamlanan bot döngüsü sayısı', ('bot',))
+TICK_DURATION = metrics.summary('bot_tick_duration_seconds', 'Bot döngüsü süresi', ('bot',))
+BOT_ERRORS = metrics.counter('bot_errors_total', 'Runner tarafından yakalanan bot hataları', ('bot', 'type'))
+SLOW_TICKS = metrics.counter('bot_slow_ticks_total', 'Süre bütçesini aşan bot döngüleri (watchdog)', ('bot',))
+REST_REQUESTS = metrics.counter('binance_rest_requests_total', 'Binance REST istekleri',
+                                ('method', 'path', 'status'))
+REST_DURATION = metrics.summary('binance_rest_request_duration_seconds', 'Binance REST istek süresi', ('path',))
+REST_ERRORS = metrics.counter('binance_rest_errors_total', 'Binance REST hataları (API kodu veya istisna türü)',
+                              ('path', 'type'))
+REST_WEIGHT = metrics.gauge('binance_rest_used_weight_1m', 'Son cevaptaki X-MBX-USED-WEIGHT-1M değeri')
+LOG_ERRORS = metrics.counter('log_errors_total', 'ERROR ve üzeri log kayıtları', ('level', 'module'))
+TELEGRAM_MESSAGES = metrics.counter('telegram_messages_total', 'Telegram bildirimleri', ('status',))
+TELEGRAM_QUEUE_DEPTH = metrics.gauge('telegram_queue_depth', 'Gönderilmeyi bekleyen Telegram mesajı sayısı')
+STREAM_MESSAGES = metrics.counter('market_data_stream_messages_total', 'Koordinatörden gelen kline mesajları',
+                                  ('symbol', 'interval'))
+STREAM_LAG = metrics.gauge('market_data_stream_lag_seconds',
+                           "Koordinatörün veriyi gönderdiği an ile worker'ın aldığı an arasındaki süre",
+                           ('symbol', 'interval'))
+
+
+class ErrorCountingHandler(logging.Handler):
+    """ERROR ve üzeri log kayıtlarını modül bazında sayar (hatalar türüne göre metriğe yansır)"""
+
+    def __init__(self):
+        super().__init__(level=logging.ERROR)
+
+    def emit(self, record):
+        LOG_ERRORS.inc(level=record.levelname, module=record.module)
+
+
+def metrics_client_class(base):
+    """python-binance Client sınıfını istek sayısı, süresi, hata ve weight metriği tutan alt sınıfa çevirir"""
+    from binance.exceptions import BinanceAPIException
+    from urllib.parse import urlsplit
+
+    class MetricsClient(base):
+        def _request(self, method, uri, signed, force_params=False, **kwargs):
+            path = urlsplit(uri).path
+            begin = time.perf_counter()
+            try:
+                result = super()._request(method, uri, signed, force_params, **kwargs)
+            except BinanceAPIException as e:
+                REST_REQUESTS.inc(method=method.upper(), path=path, status=e.status_code)
+                REST_ERRORS.inc(path=path, type=f"api_{e.code}")
+                raise
+            except Exception as e:
+                REST_REQUESTS.inc(method=method.upper(), path=path, status='error')
+                REST_ERRORS.inc(path=path, type=type(e).__name__)
+                raise
+            finally:
+                REST_DURATION.observe(time.perf_counter() - begin, path=path)
+            REST_REQUESTS.inc(method=method.upper(), path=path, status=self.response.status_code)
+            weight = self.response.headers.get('X-MBX-USED-WEIGHT-1M')  # requests başlıkları büyük/küçük harf duyarsız
+            if weight is not None:
+                REST_WEIGHT.set(int(weight))
+            return result
+
+    MetricsClient.__name__ = f"Metrics{base.__name__}"
+    return MetricsClient
+
+
+class _Handler(BaseHTTPRequestHandler):
+    registry = metrics
+
+    def do_GET(self):
+        path = self.path.split('?')[0]
+        if path.startswith('/profile'):
+            self._profile(status_only=True)
+            return
+        if path not in ('/metrics', '/'):
+            self.send_error(404)
+            return
+        self._reply(200, self.registry.render(), 'text/plain; version=0.0.4; charset=utf-8')
+
+    def do_POST(self):
+        # Profil kontrolü (core.profiler): POST /profile/cpu/start, /profile/cpu/stop, /profile/memory/snapshot ...
+        if not self.path.startswith('/profile'):
+            self.send_error(404)
+            return
+        self._profile(status_only=False)
+
+    def _profile(self, status_only):
+        from core.profiler import handle_profile_request
+
+        path = '/profile/status' if status_only else self.path
+        status, text = handle_profile_request(path)
+        self._reply(status, text, 'text/plain; charset=utf-8')
+
+    def _reply(self, status, text, content_type):
+        body = text.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Her scrape isteği loglanmaz
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def metrics_enabled():
+    return bool(os.getenv(METRICS_PORT_ENV))
+
+
+def start_metrics_server(port_offset=0, logger=None):
+    """
+    METRICS_PORT verilmişse /metrics HTTP sunucusunu arka plan thread'inde başlatır (süreç başına bir kez)
+    - METRICS_PORT=0 ile boş bir port seçilir; çoklu süreçte worker'lar METRICS_PORT + 1 + worker numarası kullanır
+    - Dinlenen port logs/metrics/<pid>.json dosyasına yazılır (dashboard bu dosyadan bulur)
+    Returns:
+        int: Dinlenen port (kapalıysa None)
+    """
+    global _server
+    logger = logger or logging
+    value = os.getenv(METRICS_PORT_ENV)
+    if not value:
+        return None
+    with _server_lock:
+        if _server is not None:
+            return _server.server_address[1]
+        base = int(value)
+        port = base + port_offset if base else 0
+        host = os.getenv(METRICS_HOST_ENV, '127.0.0.1')
+        try:
+            _server = ThreadingHTTPServer((host, port), _Handler)
+        except OSError as e:
+            logger.error(f"Metrik sunucusu başlatılamadı ({host}:{port}): {e}")
+            return None
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, name='metrics-server', daemon=True).start()
+        logging.getLogger().addHandler(ErrorCountingHandler())
+        port = _server.server_address[1]
+        _write_discovery(host, port)
+        logger.info(f"Metrikler yayında: http://{host}:{port}/metrics")
+        return port
+
+
+def _write_discovery(host, port):
+    try:
+        os.makedirs(DISCOVERY_DIR, exist_ok=True)
+        path = os.path.abspath(os.path.join(DISCOVERY_DIR, f"{os.getpid()}.json"))
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'pid': os.getpid(), 'host': host, 'port': port, 'argv': sys.argv, 'started': _STARTED}, f)
+        atexit.register(_remove_discovery, path)
+    except OSError as e:
+        logging.warning(f"Metrik portu kaydedilemedi: {e}")
+
+
+def _remove_discovery(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+_SAMPLE = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{[^}]*\})?\s+(\S+)$')
+_LABEL = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+def parse_metrics(text):
+    """Prometheus metin formatını [(ad, {etiketler}, değer)] listesine çevirir (dashboard için)"""
+    samples = []
+    for line in text.splitlines():
+        if not line or line.startswith('#'):
+            continue
+        match = _SAMPLE.match(line)
+        if not match:
+            continue
+        name, labels, value = match.groups()
+        labels = {key: raw.replace('\\"', '"').replace('\\n', '\n').replace('\\\\', '\\')
+                  for key, raw in _LABEL.findall(labels or '')}
+        try:
+            samples.append((name, labels, float(value)))
+        except ValueError:
+            continue
+    return samples
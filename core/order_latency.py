@@ -0,0 +1,294 @@
+import functools
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+# Emir yaşam döngüsü adımları (sırasıyla)
+STAGES = ('signal', 'confirmed', 'submit', 'ack', 'fill', 'verified', 'sl_placed', 'tp_placed', 'protected')
+
+# Histogramı tutulan aralıklar: ad -> (başlangıç adımı, bitiş adımı)
+INTERVALS = {
+    'signal_to_confirmed': ('signal', 'confirmed'),
+    'confirmed_to_submit': ('confirmed', 'submit'),
+    'submit_to_ack': ('submit', 'ack'),
+    'ack_to_fill': ('ack', 'fill'),
+    'fill_to_verified': ('fill', 'verified'),
+    'fill_to_sl': ('fill', 'sl_placed'),
+    'fill_to_tp': ('fill', 'tp_placed'),
+    'time_to_protection': ('fill', 'protected'),
+    'signal_to_protected': ('signal', 'protected'),
+}
+
+# Emir tipine göre OrderManager olaylarının karşılık geldiği adım (gönderim, borsa onayı)
+ORDER_STAGES = {
+    'LIMIT': ('submit', 'ack'),
+    'MARKET': ('submit', 'ack'),
+    'STOP_MARKET': (None, 'sl_placed'),
+    'TAKE_PROFIT_MARKET': (None, 'tp_placed'),
+}
+
+DEFAULT_PATH = os.path.join('logs', 'order_latency.json')
+
+
+class LatencyHistogram:
+    """
+    HDR tarzı gecikme histogramı (mikrosaniye çözünürlük)
+    - 256'dan küçük değerler birebir, büyük değerler 2'nin kuvvetleri arasında 128 eşit kovaya ayrılır
+      (göreli hata %1'in altında, 2 anlamlı basamak); bellek kullanımı değer aralığından bağımsızdır
+    - Kovalar seyrek tutulur ve JSON'a yazılabilir; aynı yapıdaki histogramlar birleştirilebilir
+    """
+
+    SUB_BUCKET_BITS = 8
+    SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+    SUB_BUCKET_HALF = SUB_BUCKET_COUNT >> 1
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    @classmethod
+    def _index(cls, value):
+        if value < cls.SUB_BUCKET_COUNT:
+            return value
+        shift = value.bit_length() - cls.SUB_BUCKET_BITS
+        return cls.SUB_BUCKET_COUNT + (shift - 1) * cls.SUB_BUCKET_HALF + (value >> shift) - cls.SUB_BUCKET_HALF
+
+    @classmethod
+    def _value(cls, index):
+        """Kovanın temsil ettiği değer (kova orta noktası)"""
+        if index < cls.SUB_BUCKET_COUNT:
+            return index
+        shift = (index - cls.SUB_BUCKET_COUNT) // cls.SUB_BUCKET_HALF + 1
+        mantissa = (index - cls.SUB_BUCKET_COUNT) % cls.SUB_BUCKET_HALF + cls.SUB_BUCKET_HALF
+        return (mantissa << shift) + (1 << (shift - 1))
+
+    def record(self, seconds):
+        value = max(int(round(seconds * 1_000_000)), 0)
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        for attribute, pick in (('min', min), ('max', max)):
+            value = getattr(other, attribute)
+            if value is not None:
+                current = getattr(self, attribute)
+                setattr(self, attribute, value if current is None else pick(current, value))
+
+    def percentile(self, percent):
+        """Yüzdelik değer (milisaniye)"""
+        if not self.count:
+            return None
+        target = max(1, int(self.count * percent / 100.0 + 0.5))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._value(index), self.max) / 1000.0
+        return self.max / 1000.0
+
+    def summary(self):
+        if not self.count:
+            return {'count': 0}
+        return {
+            'count': self.count, 'mean': round(self.total / self.count / 1000.0, 3),
+            'min': self.min / 1000.0, 'p50': self.percentile(50), 'p90': self.percentile(90),
+            'p99': self.percentile(99), 'p999': self.percentile(99.9), 'max': self.max / 1000.0,
+        }
+
+    def to_dict(self):
+        return {'counts': {str(index): count for index, count in sorted(self.counts.items())}, 'count': self.count,
+                'total_us': self.total, 'min_us': self.min, 'max_us': self.max}
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls()
+        histogram.counts = {int(index): count for index, count in data.get('counts', {}).items()}
+        histogram.count = data.get('count', 0)
+        histogram.total = data.get('total_us', 0)
+        histogram.min = data.get('min_us')
+        histogram.max = data.get('max_us')
+        return histogram
+
+
+class OrderLifecycle:
+    """Tek bir işlemin adım zaman damgaları (epoch saniye)"""
+
+    def __init__(self, strategy, symbol, signal_time=None):
+        self.strategy = strategy
+        self.symbol = symbol
+        self.marks = {}
+        now = time.time()
+        self.marks['signal'] = signal_time if signal_time is not None else now
+        self.marks['confirmed'] = now
+
+    @property
+    def key(self):
+        return f"{self.strategy}:{self.symbol}"
+
+    def mark(self, stage, timestamp=None):
+        # Yeniden denemelerde ilk gönderim, ilk onay ve ilk dolum zamanı korunur
+        if stage not in self.marks:
+            self.marks[stage] = time.time() if timestamp is None else timestamp
+            if stage in ('sl_placed', 'tp_placed') and 'sl_placed' in self.marks and 'tp_placed' in self.marks:
+                self.marks['protected'] = max(self.marks['sl_placed'], self.marks['tp_placed'])
+
+    def intervals(self):
+        return {name: self.marks[end] - self.marks[start] for name, (start, end) in INTERVALS.items()
+                if start in self.marks and end in self.marks}
+
+
+class OrderLatencyTracker:
+    """
+    Emir yaşam döngüsü gecikmeleri (sinyal -> onay -> gönderim -> borsa onayı -> dolum -> SL/TP aktif)
+    - İşlem izi process_signal çağrısı boyunca thread'e bağlıdır; Executor ve OrderManager aynı thread'de adım işaretler
+    - Strateji/sembol ve aralık bazında HDR tarzı histogramlar tutulur, her işlemden sonra JSON dosyasına yazılır
+    - Dosya ilk kayıtta okunur; süreçler yalnızca kendi strateji/sembol anahtarlarını günceller
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        self.histograms = {}  # 'strateji:sembol' -> {aralık: LatencyHistogram}
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def traced(self, strategy):
+        """
+        Bot.process_signal dekoratörü: çağrı boyunca işlem izini açar
+        Sinyal zamanı olarak bot.pending_signal_time (datetime) kullanılır
+        """
+
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(bot, *args, **kwargs):
+                signal_time = getattr(bot, 'pending_signal_time', None)
+                if signal_time is not None and hasattr(signal_time, 'timestamp'):
+                    signal_time = signal_time.timestamp()
+                lifecycle = OrderLifecycle(strategy, bot.symbol, signal_time)
+                self._local.current = lifecycle
+                try:
+                    return func(bot, *args, **kwargs)
+                finally:
+                    self._local.current = None
+                    self.finish(lifecycle)
+
+            return wrapper
+
+        return decorator
+
+    def current(self):
+        return getattr(self._local, 'current', None)
+
+    def mark(self, stage):
+        lifecycle = self.current()
+        if lifecycle is not None:
+            lifecycle.mark(stage)
+
+    def order_event(self, order_type, phase):
+        """OrderManager olayı: phase 'submit' (istek gönderilmeden önce) veya 'ack' (borsa cevabı alındı)"""
+        lifecycle = self.current()
+        if lifecycle is None:
+            return
+        stages = ORDER_STAGES.get(order_type)
+        if stages is None:
+            return
+        stage = stages[0] if phase == 'submit' else stages[1]
+        if stage is not None:
+            lifecycle.mark(stage)
+
+    def finish(self, lifecycle):
+        """İşlem izini histogramlara ekler, kaydeder ve özetini loglar"""
+        intervals = lifecycle.intervals()
+        if 'submit' not in lifecycle.marks:
+            return  # Emir gönderilmeden biten sinyaller (miktar / fiyat hatası) ölçülmez
+        with self._lock:
+            self._load()
+            histograms = self.histograms.setdefault(lifecycle.key, {})
+            for name, seconds in intervals.items():
+                histograms.setdefault(name, LatencyHistogram()).record(seconds)
+            self._save(lifecycle.key)
+
+        parts = [f"{name}={seconds * 1000:.0f}ms" for name, seconds in intervals.items()]
+        logging.info(f"Emir gecikmeleri [{lifecycle.key}]: " + ", ".join(parts))
+        if 'fill' in lifecycle.marks and 'protected' not in lifecycle.marks:
+            logging.warning(f"[{lifecycle.key}] Pozisyon açıldı ancak SL ve TP emirlerinin ikisi birden aktif olmadı")
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        for key, intervals in load_histograms(self.path).items():
+            self.histograms.setdefault(key, intervals)
+
+    def _save(self, key):
+        # Diğer süreçlerin anahtarları korunur; yazma geçici dosya üzerinden atomik yapılır
+        try:
+            data = {}
+            if os.path.exists(self.path):
+                with open(self.path, encoding='utf-8') as f:
+                    data = json.load(f)
+            data[key] = {name: histogram.to_dict() for name, histogram in self.histograms[key].items()}
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(temp_path, self.path)
+        except (OSError, ValueError) as e:
+            logging.error(f"Emir gecikme histogramı kaydedilemedi: {e}")
+
+    def summary(self):
+        with self._lock:
+            self._load()
+            return {key: {name: histogram.summary() for name, histogram in intervals.items()}
+                    for key, intervals in self.histograms.items()}
+
+
+def load_histograms(path=DEFAULT_PATH):
+    """Kaydedilmiş histogramları okur: {'strateji:sembol': {aralık: LatencyHistogram}}"""
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        logging.error(f"Emir gecikme histogramı okunamadı: {e}")
+        return {}
+    return {key: {name: LatencyHistogram.from_dict(values) for name, values in intervals.items()}
+            for key, intervals in data.items()}
+
+
+def format_histograms(histograms):
+    lines = [f"{'strateji:sembol':<32} {'aralık':<22} {'sayı':>6} {'p50 ms':>10} {'p90 ms':>10} "
+             f"{'p99 ms':>10} {'max ms':>10}"]
+    for key in sorted(histograms):
+        for name in INTERVALS:
+            histogram = histograms[key].get(name)
+            if histogram is None or not histogram.count:
+                continue
+            row = histogram.summary()
+            lines.append(f"{key:<32} {name:<22} {row['count']:>6} {row['p50']:>10.1f} {row['p90']:>10.1f} "
+                         f"{row['p99']:>10.1f} {row['max']:>10.1f}")
+    return "\n".join(lines)
+
+
+# Süreç genelinde paylaşılan izleyici
+order_latency = OrderLatencyTracker()
+
+
+if __name__ == "__main__":
+    # python -m core.order_latency [logs/order_latency.json]
+    print(format_histograms(load_histograms(sys.argv[1] if len(sys.argv) > 1 else DEFAULT_PATH)))
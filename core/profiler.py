@@ -0,0 +1,271 @@
+import linecache
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+
+PROFILE_DIR = os.path.join('logs', 'profiles')
+INTERVAL_ENV = 'PROFILE_INTERVAL_MS'
+MAX_SECONDS_ENV = 'PROFILE_MAX_SECONDS'
+
+# Boşta bekleyen thread'lerin en üst çerçeveleri (log özetinde sayılmaz, collapsed dosyada durur)
+IDLE_FRAMES = ('selectors:select', 'threading:wait', 'queue:get', 'concurrent.futures.thread:_worker',
+               'socketserver:serve_forever')
+
+
+def _profile_path(kind, extension):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    return os.path.join(PROFILE_DIR, f"{kind}_{os.getpid()}_{datetime.now():%Y%m%d_%H%M%S}.{extension}")
+
+
+def _frame_name(frame):
+    code = frame.f_code
+    module = frame.f_globals.get('__name__', os.path.basename(code.co_filename))
+    return f"{module}:{code.co_name}:{frame.f_lineno}"
+
+
+class SamplingProfiler:
+    """
+    İstatistiksel (örnekleme) CPU profili
+    - Arka plan thread'i her `interval` saniyede tüm thread'lerin yığınını okur (sys._current_frames)
+    - Kod enstrümante edilmez; ek yük örnekleme aralığıyla sınırlıdır (varsayılan 10 ms)
+    - Durdurulunca yığınlar collapsed formatında (`thread;modül:fonksiyon:satır;... sayı`) logs/profiles/ altına yazılır;
+      dosya flamegraph.pl veya speedscope ile flamegraph'a çevrilebilir
+    - max_seconds dolunca kendiliğinden durur (unutulan profil süreci yormasın diye)
+    """
+
+    def __init__(self, interval=None, max_seconds=None, logger=None):
+        if interval is None:
+            interval = float(os.getenv(INTERVAL_ENV, '10')) / 1000.0
+        if max_seconds is None:
+            max_seconds = float(os.getenv(MAX_SECONDS_ENV, '600'))
+        self.interval = interval
+        self.max_seconds = max_seconds
+        self.logger = logger or logging
+        self.stacks = Counter()
+        self.samples = 0
+        self.started = None
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        with self._lock:
+            if self.running:
+                return False
+            self.stacks = Counter()
+            self.samples = 0
+            self.started = time.monotonic()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._sample_loop, name='sampling-profiler', daemon=True)
+            self._thread.start()
+        self.logger.info(f"🔬 CPU profili başladı (aralık {self.interval * 1000:.0f} ms, "
+                         f"en fazla {self.max_seconds:.0f} sn)")
+        return True
+
+    def stop(self):
+        """Örneklemeyi durdurur ve profili yazar; yazılan dosyanın yolunu döner"""
+        with self._lock:
+            if self._thread is None:
+                return None
+            self._stop.set()
+            if self._thread is not threading.current_thread():
+                self._thread.join()
+            self._thread = None
+        return self.dump()
+
+    def toggle(self):
+        if self.running:
+            return self.stop()
+        self.start()
+        return None
+
+    def _sample_loop(self):
+        own = threading.get_ident()
+        deadline = self.started + self.max_seconds
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_name(frame))
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+            if time.monotonic() >= deadline:
+                self.logger.warning(f"CPU profili {self.max_seconds:.0f} sn sınırına ulaştı, durduruluyor")
+                threading.Thread(target=self.stop, name='sampling-profiler-stop', daemon=True).start()
+                return
+
+    def dump(self):
+        elapsed = time.monotonic() - self.started
+        try:
+            path = _profile_path('cpu', 'collapsed')
+            with open(path, 'w', encoding='utf-8') as f:
+                for stack, count in self.stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+        except OSError as e:
+            self.logger.error(f"CPU profili yazılamadı: {e}")
+            return None
+
+        # En çok örnekte en üstte görülen (self) fonksiyonlar; boşta bekleyen thread'ler hariç
+        leaves = Counter()
+        for stack, count in self.stacks.items():
+            leaf = stack.rsplit(';', 1)[-1]
+            if leaf.rsplit(':', 1)[0] not in IDLE_FRAMES:
+                leaves[leaf] += count
+        total = sum(leaves.values()) or 1
+        lines = [f"🔬 CPU profili kaydedildi: {path} ({elapsed:.0f} sn, {self.samples} örnek, "
+                 f"meşgul thread örneği {sum(leaves.values())})"]
+        for name, count in leaves.most_common(10):
+            lines.append(f"  {count * 100.0 / total:5.1f}%  {name}")
+        self.logger.info("\n".join(lines))
+        return path
+
+
+class MemorySnapshots:
+    """
+    tracemalloc ile bellek büyümesi takibi
+    - İlk snapshot() çağrısı tracemalloc'u başlatır ve referans snapshot'ı alır
+    - Sonraki her çağrı yeni snapshot'ı önceki ile karşılaştırır; satır bazlı en çok büyüyen ayırmalar
+      logs/profiles/ altına metin olarak, ham snapshot .tracemalloc olarak yazılır
+    - stop() takibi kapatır (tracemalloc açıkken ayırmalar belirgin şekilde yavaşlar)
+    """
+
+    def __init__(self, frames=10, top=25, logger=None):
+        self.frames = frames
+        self.top = top
+        self.logger = logger or logging
+        self._previous = None
+        self._lock = threading.Lock()
+
+    @property
+    def tracing(self):
+        return tracemalloc.is_tracing()
+
+    @staticmethod
+    def _take():
+        # tracemalloc'un, raporlamanın ve profilin kendi ayırmaları karşılaştırmaya karışmasın
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, linecache.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        ))
+
+    def snapshot(self):
+        """Snapshot alır; karşılaştırma raporunun yolunu döner (ilk çağrıda None)"""
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(self.frames)
+                self._previous = self._take()
+                self.logger.info(f"🧠 Bellek takibi başladı (tracemalloc, {self.frames} çerçeve); "
+                                 f"karşılaştırma için tekrar snapshot alın")
+                return None
+
+            current = self._take()
+            previous, self._previous = self._previous, current
+            try:
+                path = _profile_path('memory', 'txt')
+                current.dump(path[:-len('txt')] + 'tracemalloc')
+                stats = current.compare_to(previous, 'lineno') if previous is not None else current.statistics('lineno')
+                size, peak = tracemalloc.get_traced_memory()
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(f"tracemalloc: güncel {size / 1024 / 1024:.1f} MB, tepe {peak / 1024 / 1024:.1f} MB\n")
+                    for stat in stats[:self.top]:
+                        f.write(f"{stat}\n")
+                        for line in stat.traceback.format()[-6:]:
+                            f.write(f"    {line}\n")
+            except OSError as e:
+                self.logger.error(f"Bellek snapshot'ı yazılamadı: {e}")
+                return None
+
+        lines = [f"🧠 Bellek snapshot'ı kaydedildi: {path} (izlenen {size / 1024 / 1024:.1f} MB)"]
+        lines.extend(f"  {stat}" for stat in stats[:5])
+        self.logger.info("\n".join(lines))
+        return path
+
+    def stop(self):
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                return False
+            tracemalloc.stop()
+            self._previous = None
+        self.logger.info("🧠 Bellek takibi durduruldu")
+        return True
+
+
+# Süreç genelinde paylaşılan profil nesneleri
+cpu_profiler = SamplingProfiler()
+memory_snapshots = MemorySnapshots()
+
+_signals_installed = False
+
+
+def install_profiler_signals(logger=None):
+    """
+    SIGUSR1: CPU profilini başlatır / durdurup yazar
+    SIGUSR2: bellek snapshot'ı alır (ilk sinyal takibi başlatır)
+    Dosya yazımı sinyal işleyicisini bekletmesin diye ayrı thread'de yapılır. Yalnızca ana thread'den çağrılabilir;
+    Windows'ta sinyaller yoktur, profil metrik sunucusunun /profile uç noktalarıyla kontrol edilir.
+    """
+    global _signals_installed
+    if _signals_installed or not hasattr(signal, 'SIGUSR1'):
+        return False
+    if logger is not None:
+        cpu_profiler.logger = memory_snapshots.logger = logger
+
+    def handler(action, name):
+        return lambda *_: threading.Thread(target=action, name=name, daemon=True).start()
+
+    try:
+        signal.signal(signal.SIGUSR1, handler(cpu_profiler.toggle, 'profiler-signal'))
+        signal.signal(signal.SIGUSR2, handler(memory_snapshots.snapshot, 'memory-snapshot-signal'))
+    except ValueError:
+        return False  # Ana thread dışı
+    _signals_installed = True
+    return True
+
+
+def handle_profile_request(path):
+    """
+    Metrik sunucusunun /profile/... istekleri: (HTTP durum kodu, cevap metni)
+      /profile/cpu/start, /profile/cpu/stop, /profile/memory/snapshot, /profile/memory/stop, /profile/status
+    """
+    action = path.split('?')[0].rstrip('/')
+    if action == '/profile/cpu/start':
+        return (200, "started\n") if cpu_profiler.start() else (409, "already running\n")
+    if action == '/profile/cpu/stop':
+        written = cpu_profiler.stop()
+        return (200, f"{written}\n") if written else (409, "not running\n")
+    if action == '/profile/memory/snapshot':
+        written = memory_snapshots.snapshot()
+        return 200, f"{written or 'tracing started'}\n"
+    if action == '/profile/memory/stop':
+        return (200, "stopped\n") if memory_snapshots.stop() else (409, "not tracing\n")
+    if action in ('/profile', '/profile/status'):
+        return 200, f"cpu={'running' if cpu_profiler.running else 'stopped'} " \
+                    f"memory={'tracing' if memory_snapshots.tracing else 'stopped'}\n"
+    return 404, "unknown profile action\n"
+
+
+if __name__ == "__main__":
+    # python -m core.profiler <pid> [cpu|memory]: çalışan bota profil sinyali gönderir
+    if len(sys.argv) < 2:
+        print("Kullanım: python -m core.profiler <pid> [cpu|memory]")
+        sys.exit(1)
+    kind = sys.argv[2] if len(sys.argv) > 2 else 'cpu'
+    os.kill(int(sys.argv[1]), signal.SIGUSR2 if kind == 'memory' else signal.SIGUSR1)
+    print(f"{'SIGUSR2' if kind == 'memory' else 'SIGUSR1'} gönderildi: pid {sys.argv[1]}")
@@ -0,0 +1,363 @@
+import asyncio
+import importlib
+import inspect
+import logging
+import os
+import signal
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import ntplib
+
+from core.import_profiler import ImportProfiler
+from core.logging_config import LoggingConfig
+from core.metrics import BOT_ERRORS, LOOP_ITERATIONS, TICK_DURATION, metrics, start_metrics_server
+from core.profiler import install_profiler_signals
+from core.timing import spans
+from core.telegram.coalescer import telegram_coalescer
+from core.trade_journal import trade_journal
+from core.watchdog import watchdog
+
+
+class BotSpec:
+    """
+    Runner'da çalışacak tek bir botun tanımı
+    Metin formatı: SYMBOL[:TIMEFRAME[:STRATEGY[:LEVERAGE[:TRADE_AMOUNT]]]]
+    Örnek: BTCUSDT:15m:psar_atr_strategy:10:100
+    """
+
+    def __init__(self, symbol, timeframe='15m', strategy='psar_atr_strategy', leverage=10, trade_amount=100):
+        self.symbol = symbol.upper()
+        self.timeframe = timeframe
+        self.strategy = strategy
+        self.leverage = int(leverage)
+        self.trade_amount = int(trade_amount)
+
+    @property
+    def name(self):
+        return f"{self.symbol}:{self.strategy}"
+
+    @classmethod
+    def parse(cls, text, timeframe='15m', strategy='psar_atr_strategy', leverage=10, trade_amount=100):
+        """Metin tanımını BotSpec'e çevirir; eksik alanlar verilen varsayılanlarla doldurulur"""
+        parts = [part.strip() for part in text.strip().split(':')]
+        if not parts[0] or len(parts) > 5:
+            raise ValueError(f"Geçersiz bot tanımı: '{text}' (SYMBOL[:TIMEFRAME[:STRATEGY[:LEVERAGE[:TRADE_AMOUNT]]]])")
+        defaults = [None, timeframe, strategy, leverage, trade_amount]
+        values = [part if part else default for part, default in zip(parts, defaults)] + defaults[len(parts):]
+        return cls(*values)
+
+    def __repr__(self):
+        return f"BotSpec({self.symbol}:{self.timeframe}:{self.strategy}:{self.leverage}:{self.trade_amount})"
+
+
+def check_ntp_offset(servers=('pool.ntp.org', 'time.google.com', 'time.cloudflare.com')):
+    """
+    NTP sunucusu ile sistem saati arasındaki farkı ölçer ve loglar
+    Returns:
+        float: Saniye cinsinden fark (hiçbir sunucuya ulaşılamazsa None)
+    """
+    for server in servers:
+        try:
+            response = ntplib.NTPClient().request(server, version=3, timeout=5)
+            time_diff = response.tx_time - time.time()
+            if abs(time_diff) > 1.0:
+                logging.warning(f"UYARI: Sistem zamanında {time_diff:.3f} saniye fark tespit edildi! ({server})")
+            else:
+                logging.info(f"NTP kontrolü başarılı: {server}, fark: {time_diff:.3f} saniye")
+            return time_diff
+        except (socket.timeout, socket.gaierror, ntplib.NTPException, OSError) as e:
+            logging.warning(f"UYARI: NTP sunucusu {server} ile bağlantı kurulamadı: {e}")
+    logging.error("HATA: Hiçbir NTP sunucusu ile bağlantı kurulamadı!")
+    return None
+
+
+class MultiSymbolRunner:
+    """
+    Birden fazla sembol/stratejiyi tek süreçte, tek event loop üzerinde çalıştırır
+    - Tüm botlar tek bir python-binance Client ve tek bir piyasa verisi önbelleğini paylaşır
+    - NTP kontrolü tüm botlar için bir kez yapılır
+    - Her bot kendi asyncio task'ında çalışır; bir botun hatası diğerlerini etkilemez,
+      oluşturulamayan bot restart_delay sonra yeniden denenir
+    - Botların trade_logic kodu senkron (requests tabanlı) olduğu için döngü adımları
+      thread havuzunda çalışır, zamanlama ve bekleme event loop'ta yapılır
+    """
+
+    NTP_CHECK_INTERVAL = 180  # Saniye
+    MIN_THREADS = 32  # Sonradan eklenen botlar için thread havuzu payı (thread'ler ihtiyaç oldukça açılır)
+
+    def __init__(self, specs, logger=None, market_data_ttl=5, restart_delay=60, market_data=None):
+        """
+        Args:
+            market_data: Dışarıdan beslenen MarketDataCache (koordinatör worker'ları için); verilmezse oluşturulur
+        """
+        if not specs:
+            raise ValueError("En az bir bot tanımı gerekli")
+        names = [spec.name for spec in specs]
+        if len(names) != len(set(names)):
+            raise ValueError(f"Aynı sembol/strateji birden fazla kez tanımlanmış: {names}")
+
+        self.specs = list(specs)
+        self.logger = logger or logging
+        self.market_data_ttl = market_data_ttl
+        self.restart_delay = restart_delay
+
+        self.client = None
+        self.market_data = market_data
+        self.bots = {}
+        self.status = {spec.name: self._new_status() for spec in specs}
+        self._stop_event = None
+        self._stop_requested = False
+        self._tasks = []
+        self._tasks_started = False
+
+    @staticmethod
+    def _new_status():
+        return {'state': 'pending', 'ticks': 0, 'errors': 0, 'last_tick': None, 'last_error': None}
+
+    def run(self):
+        """Runner'ı çalıştırır (durdurulana kadar bloklar)"""
+        asyncio.run(self._main())
+
+    def stop(self):
+        """Tüm botları durdurur (signal handler veya başka thread'den çağrılabilir)"""
+        self._stop_requested = True
+        if self._stop_event is not None:
+            self._loop.call_soon_threadsafe(self._stop_event.set)
+
+    def add_specs(self, specs):
+        """Çalışan runner'a yeni botlar ekler (başka thread'den çağrılabilir)"""
+        if self._stop_event is not None:
+            self._loop.call_soon_threadsafe(self._start_specs, list(specs))
+        else:
+            self._start_specs(list(specs))
+
+    def _start_specs(self, specs):
+        for spec in specs:
+            if spec.name in self.status:
+                self.logger.warning(f"[{spec.name}] Bot zaten çalışıyor, eklenmedi")
+                continue
+            self.specs.append(spec)
+            self.status[spec.name] = self._new_status()
+            # Task'lar henüz oluşturulmadıysa bot, başlangıçtaki listeyle birlikte başlatılır
+            if self._tasks_started:
+                self._tasks.append(asyncio.create_task(self._run_bot(spec), name=spec.name))
+            self.logger.info(f"[{spec.name}] Bot runner'a eklendi")
+
+    async def _main(self):
+        self._loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        if self._stop_requested:
+            self._stop_event.set()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                self._loop.add_signal_handler(sig, self._stop_event.set)
+            except (NotImplementedError, RuntimeError):
+                pass  # Windows veya ana thread dışı
+        # SIGUSR1: CPU profili aç/kapat, SIGUSR2: bellek snapshot'ı (logs/profiles/)
+        install_profiler_signals(self.logger)
+        watchdog.logger = self.logger
+
+        # Her bot için bir thread; bir botun uzun süren emir takibi diğerlerini bekletmez
+        pool = ThreadPoolExecutor(max_workers=self._pool_size(), thread_name_prefix='runner')
+        self._loop.set_default_executor(pool)
+
+        metrics.register_collector(self._collect_metrics)
+        try:
+            await self._setup_shared()
+            self.logger.info(f"Runner başlatıldı: {len(self.specs)} bot - " +
+                             ", ".join(spec.name for spec in self.specs))
+
+            self._tasks = [asyncio.create_task(self._run_bot(spec), name=spec.name) for spec in self.specs]
+            self._tasks_started = True
+            self._tasks.append(asyncio.create_task(self._periodic_ntp_check(), name='ntp'))
+            await self._stop_event.wait()
+
+            self.logger.info("Runner durduruluyor...")
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            await self._stop_bots()
+            # Bekleyen Telegram özetleri ve mesajları gönderilir, işlem günlüğü kayıtları kapanmadan diske yazılır
+            await self._loop.run_in_executor(None, telegram_coalescer.close)
+            await self._loop.run_in_executor(None, trade_journal.flush)
+        finally:
+            if self.market_data is not None:
+                self.market_data.log_stats()
+            if spans.enabled:
+                spans.log_stats()
+            metrics.unregister_collector(self._collect_metrics)
+            # Devam eden emir takibi gibi adımlar yarıda kesilmez, asyncio.run bitmeden tamamlanır
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _pool_size(self):
+        return max(len(self.specs) + 2, self.MIN_THREADS)
+
+    async def _setup_shared(self):
+        """Paylaşılan client, piyasa verisi önbelleği ve NTP kontrolü (paralel)"""
+        from adapters.binance.binance_client import BinanceClient
+        from adapters.binance.market_data import MarketDataCache
+
+        if self.market_data is None:
+            self.market_data = MarketDataCache(ttl=self.market_data_ttl)
+        start_metrics_server(logger=self.logger)
+        client_future = self._loop.run_in_executor(None, BinanceClient.create_client, self._pool_size())
+        ntp_future = self._loop.run_in_executor(None, check_ntp_offset)
+        self.client, _ = await asyncio.gather(client_future, ntp_future)
+
+    def _create_bot(self, spec):
+        """Strateji modülünü import edip botu paylaşılan kaynaklarla oluşturur"""
+        with ImportProfiler(self.logger, label=f'strategies.{spec.strategy}'):
+            strategy_module = importlib.import_module(f'strategies.{spec.strategy}')
+            bot_class = strategy_module.Bot  # Paket alt modülleri ilk erişimde yükler
+
+        kwargs = {}
+        parameters = inspect.signature(bot_class).parameters
+        if 'client' in parameters and 'market_data' in parameters:
+            kwargs = {'client': self.client, 'market_data': self.market_data}
+        else:
+            self.logger.warning(f"[{spec.name}] Strateji paylaşılan client desteklemiyor, ayrı bağlantı kullanılacak")
+
+        return bot_class(symbol=spec.symbol, timeframe=spec.timeframe, leverage=spec.leverage,
+                         trade_amount=spec.trade_amount, **kwargs)
+
+    async def _run_bot(self, spec):
+        """Tek bir botun yaşam döngüsü: oluşturma, başlatma ve periyodik döngü"""
+        status = self.status[spec.name]
+        bot = None
+        started = False
+
+        while not self._stop_event.is_set():
+            try:
+                if not started:
+                    status['state'] = 'starting'
+                    if bot is None:
+                        bot = await self._loop.run_in_executor(None, self._create_bot, spec)
+                        self.bots[spec.name] = bot
+                    await self._loop.run_in_executor(None, bot.on_start)
+                    started = True
+                    status['state'] = 'running'
+                    self.logger.info(f"[{spec.name}] Bot başlatıldı")
+
+                begin = time.perf_counter()
+                # Süre bütçesini aşan döngüler watchdog tarafından yığın dökümüyle loglanır (TICK_BUDGET_SECONDS)
+                delay = await self._loop.run_in_executor(None, watchdog.call, spec.name, bot.run_cycle)
+                LOOP_ITERATIONS.inc(bot=spec.name)
+                TICK_DURATION.observe(time.perf_counter() - begin, bot=spec.name)
+                status['ticks'] += 1
+                status['last_tick'] = time.time()
+
+                if not bot.running:
+                    status['state'] = 'stopped'
+                    self.logger.info(f"[{spec.name}] Bot kendini durdurdu")
+                    return
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Hata sadece bu botu etkiler; bot başlatılamadıysa bir sonraki turda yeniden denenir
+                status['state'] = 'running' if started else 'error'
+                status['errors'] += 1
+                status['last_error'] = str(e)
+                BOT_ERRORS.inc(bot=spec.name, type=type(e).__name__)
+                self.logger.error(f"[{spec.name}] Bot hatası: {e}")
+                delay = self.restart_delay
+
+            await self._wait(delay)
+
+    async def _wait(self, delay):
+        """Belirtilen süre bekler; runner durdurulursa beklemeyi keser"""
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _periodic_ntp_check(self):
+        while not self._stop_event.is_set():
+            await self._wait(self.NTP_CHECK_INTERVAL)
+            if not self._stop_event.is_set():
+                await self._loop.run_in_executor(None, check_ntp_offset)
+
+    def _collect_metrics(self):
+        """Metrik okuması sırasında bot durumları, pozisyonlar, bekleyen sinyaller ve piyasa verisi yaşı"""
+        states = [((name, status['state']), 1) for name, status in list(self.status.items())]
+        positions, pending = [], []
+        for name, bot in list(self.bots.items()):
+            positions.append(((name,), getattr(bot, 'position', None)))
+            pending.append(((name,), 1 if getattr(bot, 'pending_signal', None) else 0))
+        ages = []
+        if self.market_data is not None:
+            ages = [((symbol, interval), round(age, 3))
+                    for (symbol, interval), age in self.market_data.kline_ages().items()]
+        return [
+            ('bot_state', 'gauge', 'Bot durumu (1: bot bu durumda)', ('bot', 'state'), states),
+            ('bot_position', 'gauge', 'Pozisyon yönü (1: long, -1: short, 0: yok)', ('bot',), positions),
+            ('bot_open_positions', 'gauge', 'Açık pozisyonu olan bot sayısı', (),
+             [((), sum(1 for _, position in positions if position))]),
+            ('bot_pending_signal', 'gauge', 'Onay bekleyen sinyal (1: var)', ('bot',), pending),
+            ('market_data_age_seconds', 'gauge', 'Önbellekteki kline verisinin yaşı', ('symbol', 'interval'), ages),
+        ]
+
+    async def _stop_bots(self):
+        for name, bot in self.bots.items():
+            self.status[name]['state'] = 'stopped'
+            stop_trading = getattr(bot, 'stop_trading', None)
+            try:
+                if stop_trading is not None:
+                    await self._loop.run_in_executor(None, stop_trading)
+                else:
+                    bot.running = False
+            except Exception as e:
+                self.logger.error(f"[{name}] Bot durdurma hatası: {e}")
+
+
+def run_main(symbol, name, title, timeframe='15m'):
+    """
+    main_*.py başlatıcıları için ortak giriş noktası
+    LEVERAGE, TRADE_AMOUNT ve STRATEGY ortam değişkenlerini okur ve tek botluk runner'ı çalıştırır
+    Args:
+        symbol: Trading sembolü (ör. BTCUSDT)
+        name: Logger ve log dosyası adı (ör. main_btc)
+        title: Log mesajlarında görünen kısa ad (ör. BTC)
+    """
+    logger = None
+    try:
+        # Loglama ayarları - Artık INFO seviyesinde loglar da yazılacak
+        logging_config = LoggingConfig()
+        logger = logging_config.setup_logging(name)
+
+        # Environment variables'dan leverage, trade_amount ve strategy oku
+        leverage = int(os.getenv('LEVERAGE', 10))
+        trade_amount = int(os.getenv('TRADE_AMOUNT', 100))
+        strategy = os.getenv('STRATEGY', 'psar_atr_strategy')
+
+        logger.info(f"{title} Trading Bot başlatılıyor...")
+        logger.info(f"Sembol: {symbol}, Timeframe: {timeframe}, Leverage: {leverage}, Trade Amount: {trade_amount}, Strategy: {strategy}")
+
+        spec = BotSpec(symbol, timeframe=timeframe, strategy=strategy, leverage=leverage, trade_amount=trade_amount)
+        MultiSymbolRunner([spec], logger=logger).run()
+
+    except Exception as e:
+        if logger:
+            logger.error(f"Bot çalıştırma hatası: {e}")
+            logger.exception("Detaylı hata bilgisi:")
+        else:
+            # Fallback logging if logger creation failed
+            logging.basicConfig(
+                level=logging.INFO,
+                format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                datefmt='%Y-%m-%d %H:%M:%S'
+            )
+            logging.error(f"HATA - Logger oluşturulamadı: {e}")
+    except KeyboardInterrupt:
+        if logger:
+            logger.info("Bot manuel olarak durduruldu (Ctrl+C)")
+        else:
+            # Fallback logging if logger creation failed
+            logging.basicConfig(
+                level=logging.INFO,
+                format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+                datefmt='%Y-%m-%d %H:%M:%S'
+            )
+            logging.info("Bot manuel olarak durduruldu")
@@ -2,146 +2,171 @@ import csv
 import os
 from datetime import datetime
 import logging
+import sqlite3
+import sys
+import threading
 import uuid
+from core.timing import spans
+
+# Sinyal kaydı kolonları (CSV export sırası)
+HEADER = [
+    'signal_id', 'timestamp', 'strategy', 'symbol', 'bar_index', 'signal_type',
+    'close', 'high', 'low', 'pSAR_UpValue', 'pSAR_DownValue',
+    'zoneATR', 'upZone', 'downZone', 'zoneDecider',
+    'greenZone', 'redZone', 'middleDonchian', 'upperDonchian',
+    'lowerDonchian', 'emaLower', 'emaMedium', 'hmaLong',
+    'position_opened', 'entry_price', 'exit_price', 'pnl_usdt', 'pnl_percent', 'position_closed_at'
+]
+
+# Pozisyon güncellemelerinde değiştirilebilen kolonlar (SQL'e yalnızca bu adlar girer)
+UPDATABLE = frozenset(HEADER[23:])
+
 
 class SignalLogger:
-    """Tüm stratejiler için ortak sinyal kontrol CSV logger'ı"""
-    
-    def __init__(self):
-        self.csv_filename = 'logs/sinyal_kontrol.csv'
-        self._ensure_csv_file()
-    
-    def _ensure_csv_file(self):
-        """CSV dosyasını oluştur ve header'ı ekle"""
+    """
+    Tüm stratejiler için ortak sinyal kontrol kaydı (SQLite, WAL modu)
+    - signal_id birincil anahtardır; pozisyon açılış/kapanış güncellemeleri indeks üzerinden tek satırı değiştirir
+    - WAL modu ve busy timeout ile aynı dosyaya birden fazla süreç güvenle yazar (runner worker'ları, main_*.py)
+    - Eski logs/sinyal_kontrol.csv dosyası ilk açılışta bir kez veritabanına aktarılır;
+      CSV görünümü export_csv() ile üretilir (dashboard ve `python -m core.signal_logger export`)
+    Dosya işlemleri import sırasında değil, ilk kayıt anında yapılır (lazy)
+    """
+
+    def __init__(self, db_filename='logs/sinyal_kontrol.db', csv_filename='logs/sinyal_kontrol.csv'):
+        self.db_filename = db_filename
+        self.csv_filename = csv_filename
+        self._ready = False
+        self._ready_lock = threading.Lock()
+        # Bağlantılar thread ve süreç başınadır (sqlite3 bağlantısı thread'ler/fork arasında paylaşılmaz)
+        self._local = threading.local()
+
+    def _connection(self):
+        """Bu thread'in bağlantısı; ilk kullanımda veritabanını hazırlar"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None and self._local.pid == os.getpid():
+            return connection
+        self._ensure_ready()
+        connection = self._connect()
+        self._local.connection = connection
+        self._local.pid = os.getpid()
+        return connection
+
+    def _connect(self):
+        # isolation_level=None: her komut kendi işleminde (autocommit), toplu işlemler BEGIN ile açılır
+        connection = sqlite3.connect(self.db_filename, timeout=30, isolation_level=None, check_same_thread=False)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        return connection
+
+    def _ensure_ready(self):
+        """Veritabanını ilk kullanımda bir kez hazırlar"""
+        if self._ready:
+            return
+        with self._ready_lock:
+            if not self._ready:
+                self._ensure_database()
+                self._ready = True
+
+    def _ensure_database(self):
+        """Tabloyu oluştur ve varsa eski CSV kayıtlarını aktar"""
+        os.makedirs(os.path.dirname(self.db_filename) or '.', exist_ok=True)
+        connection = self._connect()
         try:
-            # logs klasörü yoksa oluştur
-            os.makedirs('logs', exist_ok=True)
-            
-            # Dosya yoksa header ile oluştur
-            if not os.path.exists(self.csv_filename):
-                with open(self.csv_filename, 'w', newline='', encoding='utf-8') as csvfile:
-                    writer = csv.writer(csvfile)
-                    header = [
-                        'signal_id', 'timestamp', 'strategy', 'symbol', 'bar_index', 'signal_type',
-                        'close', 'high', 'low', 'pSAR_UpValue', 'pSAR_DownValue',
-                        'zoneATR', 'upZone', 'downZone', 'zoneDecider',
-                        'greenZone', 'redZone', 'middleDonchian', 'upperDonchian',
-                        'lowerDonchian', 'emaLower', 'emaMedium', 'hmaLong',
-                        'position_opened', 'entry_price', 'exit_price', 'pnl_usdt', 'pnl_percent', 'position_closed_at'
-                    ]
-                    writer.writerow(header)
-            else:
-                # Mevcut dosyada yeni alanlar var mı kontrol et
-                self._check_and_update_headers()
-                    
-        except Exception as e:
-            logging.error(f"Signal control CSV dosyası oluşturma hatası: {e}")
-    
-    def _check_and_update_headers(self):
-        """Mevcut CSV dosyasının header'ını kontrol et ve gerekirse güncelle"""
+            columns = ", ".join(f'"{name}" TEXT' for name in HEADER[1:])
+            connection.execute(f'CREATE TABLE IF NOT EXISTS signals (signal_id TEXT PRIMARY KEY, {columns})')
+            # Aktarım tek süreçte yapılsın diye yazma kilidi alınır; tablo doluysa atlanır
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                empty = connection.execute('SELECT 1 FROM signals LIMIT 1').fetchone() is None
+                if empty and os.path.exists(self.csv_filename):
+                    self._import_csv(connection)
+                connection.execute('COMMIT')
+            except Exception:
+                connection.execute('ROLLBACK')
+                raise
+        finally:
+            connection.close()
+
+    def _import_csv(self, connection):
+        """Eski sinyal_kontrol.csv kayıtlarını veritabanına aktarır (kolonlar ada göre eşlenir)"""
         try:
-            # Mevcut header'ı oku
             with open(self.csv_filename, 'r', encoding='utf-8') as csvfile:
                 reader = csv.reader(csvfile)
-                existing_header = next(reader, [])
-            
-            # Yeni header
-            new_header = [
-                'signal_id', 'timestamp', 'strategy', 'symbol', 'bar_index', 'signal_type',
-                'close', 'high', 'low', 'pSAR_UpValue', 'pSAR_DownValue',
-                'zoneATR', 'upZone', 'downZone', 'zoneDecider',
-                'greenZone', 'redZone', 'middleDonchian', 'upperDonchian',
-                'lowerDonchian', 'emaLower', 'emaMedium', 'hmaLong',
-                'position_opened', 'entry_price', 'exit_price', 'pnl_usdt', 'pnl_percent', 'position_closed_at'
-            ]
-            
-            # Header farklıysa dosyayı güncelle
-            if existing_header != new_header:
-                # Mevcut verileri oku
-                with open(self.csv_filename, 'r', encoding='utf-8') as csvfile:
-                    reader = csv.reader(csvfile)
-                    next(reader)  # Header'ı atla
-                    existing_data = list(reader)
-                
-                # Dosyayı yeni header ile yeniden yaz
-                with open(self.csv_filename, 'w', newline='', encoding='utf-8') as csvfile:
-                    writer = csv.writer(csvfile)
-                    writer.writerow(new_header)
-                    
-                    # Mevcut verileri yeni formata dönüştür
-                    for row in existing_data:
-                        # Eksik alanları boş string ile doldur
-                        while len(row) < len(new_header):
-                            row.append('')
-                        
-                        # signal_id yoksa oluştur
-                        if not row[0] or row[0] == 'timestamp':  # Eski format
-                            row.insert(0, str(uuid.uuid4())[:8])  # signal_id ekle
-                        
-                        writer.writerow(row)
-                
-                logging.info("Signal control CSV header güncellendi")
-                
+                header = next(reader, [])
+                rows = []
+                for row in reader:
+                    record = dict(zip(header, row))
+                    # Çok eski formatta signal_id kolonu yoktu
+                    if not record.get('signal_id'):
+                        record['signal_id'] = str(uuid.uuid4())[:8]
+                    rows.append(tuple(record.get(name, '') for name in HEADER))
+            connection.executemany(self._insert_sql('INSERT OR IGNORE'), rows)
+            logging.info(f"Sinyal kontrol CSV'si veritabanına aktarıldı: {len(rows)} kayıt ({self.db_filename})")
         except Exception as e:
-            logging.error(f"CSV header güncelleme hatası: {e}")
-    
+            logging.error(f"Sinyal kontrol CSV aktarma hatası: {e}")
+
+    @staticmethod
+    def _insert_sql(verb='INSERT'):
+        columns = ", ".join(f'"{name}"' for name in HEADER)
+        return f'{verb} INTO signals ({columns}) VALUES ({", ".join("?" * len(HEADER))})'
+
+    @spans.timed('csv_log.signal')
     def log_signal(self, strategy_name, symbol, signal_data):
         """
-        Sinyal verilerini CSV'ye kaydet
-        
+        Sinyal verilerini kaydet
+
         Args:
             strategy_name (str): Strateji adı
             symbol (str): Trading sembolü
             signal_data (dict): Sinyal verileri
-            
+
         Returns:
             str: Signal ID
         """
         try:
-            # Unique signal ID oluştur
-            signal_id = str(uuid.uuid4())[:8]
-            
+            connection = self._connection()
+
             # Timestamp
             timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
+
             # Bar index (eğer yoksa current timestamp kullan)
             bar_index = signal_data.get('bar_index', timestamp)
-            
+
             # Signal type (buy/sell)
             signal_type = 'BUY' if signal_data.get('buy', False) else 'SELL'
-            
+
             # Fiyat bilgileri
             close = signal_data.get('Close', signal_data.get('close', 0))
             high = signal_data.get('High', signal_data.get('high', 0))
             low = signal_data.get('Low', signal_data.get('low', 0))
-            
+
             # PSAR değerleri
             psar_up = signal_data.get('pSAR_UpValue', signal_data.get('psar', 0))
             psar_down = signal_data.get('pSAR_DownValue', signal_data.get('psar', 0))
-            
+
             # ATR Zone bilgileri
             zone_atr = signal_data.get('zoneATR', signal_data.get('atr', 0))
             up_zone = signal_data.get('upZone', signal_data.get('atr_upper', signal_data.get('upper_zone', 0)))
             down_zone = signal_data.get('downZone', signal_data.get('atr_lower', signal_data.get('lower_zone', 0)))
             zone_decider = signal_data.get('zoneDecider', signal_data.get('zone_decider', 0))
-            
+
             # Zone değişimleri
             green_zone = signal_data.get('greenZone', signal_data.get('buy_signal', False))
             red_zone = signal_data.get('redZone', signal_data.get('sell_signal', False))
-            
+
             # Donchian Channel
             middle_donchian = signal_data.get('middleDonchian', signal_data.get('middle_donchian', 0))
             upper_donchian = signal_data.get('upperDonchian', signal_data.get('upper_donchian', 0))
             lower_donchian = signal_data.get('lowerDonchian', signal_data.get('lower_donchian', 0))
-            
+
             # EMA/HMA değerleri
             ema_lower = signal_data.get('emaLower', signal_data.get('ema_lower', signal_data.get('ema_9', 0)))
             ema_medium = signal_data.get('emaMedium', signal_data.get('ema_medium', signal_data.get('ema_21', 0)))
             hma_long = signal_data.get('hmaLong', signal_data.get('hma_long', 0))
-            
-            # CSV verisi hazırla
-            csv_data = [
-                signal_id, timestamp, strategy_name, symbol, bar_index, signal_type,
+
+            # Kayıt verisi hazırla (signal_id eklenirken belirlenir)
+            values = [
+                timestamp, strategy_name, symbol, str(bar_index), signal_type,
                 f"{close:.4f}" if close else "",
                 f"{high:.4f}" if high else "",
                 f"{low:.4f}" if low else "",
@@ -161,20 +186,27 @@ class SignalLogger:
                 f"{hma_long:.4f}" if hma_long else "",
                 "", "", "", "", "", ""  # Pozisyon bilgileri boş
             ]
-            
-            # CSV'ye yaz
-            with open(self.csv_filename, 'a', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
-                writer.writerow(csv_data)
-            
-            logging.info(f"Sinyal kontrol CSV'ye kaydedildi: {strategy_name} - {symbol} - {signal_type} - ID: {signal_id}")
-            
+
+            # Unique signal ID oluştur (8 karakterlik ID çakışırsa yenisi denenir)
+            for _ in range(5):
+                signal_id = str(uuid.uuid4())[:8]
+                try:
+                    connection.execute(self._insert_sql(), [signal_id] + values)
+                    break
+                except sqlite3.IntegrityError:
+                    continue
+            else:
+                raise RuntimeError("Benzersiz signal ID üretilemedi")
+
+            logging.info(f"Sinyal kontrol kaydı eklendi: {strategy_name} - {symbol} - {signal_type} - ID: {signal_id}")
+
             return signal_id
-            
+
         except Exception as e:
-            logging.error(f"Sinyal kontrol CSV kaydetme hatası: {e}")
+            logging.error(f"Sinyal kontrol kaydetme hatası: {e}")
             return None
-    
+
+    @spans.timed('csv_log.signal_opened')
     def update_position_opened(self, signal_id, entry_price):
         """Pozisyon açıldığında sinyal kaydını güncelle"""
         try:
@@ -185,7 +217,8 @@ class SignalLogger:
             logging.info(f"Signal {signal_id} pozisyon açılış bilgisi güncellendi: {entry_price}")
         except Exception as e:
             logging.error(f"Pozisyon açılış güncelleme hatası: {e}")
-    
+
+    @spans.timed('csv_log.signal_closed')
     def update_position_closed(self, signal_id, exit_price, pnl_usdt, pnl_percent):
         """Pozisyon kapandığında kar/zarar bilgilerini güncelle"""
         try:
@@ -199,48 +232,71 @@ class SignalLogger:
             logging.info(f"Signal {signal_id} pozisyon kapanış bilgisi güncellendi: PnL USDT: {pnl_usdt}, PnL %: {pnl_percent}")
         except Exception as e:
             logging.error(f"Pozisyon kapanış güncelleme hatası: {e}")
-    
+
     def _update_signal_record(self, signal_id, update_data):
-        """Belirli bir signal ID'ye sahip kaydı güncelle"""
+        """Belirli bir signal ID'ye sahip kaydı güncelle (birincil anahtar üzerinden tek satır)"""
         try:
-            # Mevcut verileri oku
-            rows = []
-            header = []
-            
-            with open(self.csv_filename, 'r', encoding='utf-8') as csvfile:
-                reader = csv.reader(csvfile)
-                header = next(reader)
-                rows = list(reader)
-            
-            # Signal ID'yi bul ve güncelle
-            updated = False
-            for i, row in enumerate(rows):
-                if len(row) > 0 and row[0] == signal_id:
-                    # Güncelleme verilerini uygula
-                    for field, value in update_data.items():
-                        if field in header:
-                            field_index = header.index(field)
-                            if field_index < len(row):
-                                row[field_index] = value
-                            else:
-                                # Row eksik kolonlara sahipse, uzat
-                                while len(row) <= field_index:
-                                    row.append('')
-                                row[field_index] = value
-                    updated = True
-                    break
-            
-            if updated:
-                # Dosyayı güncelle
-                with open(self.csv_filename, 'w', newline='', encoding='utf-8') as csvfile:
-                    writer = csv.writer(csvfile)
-                    writer.writerow(header)
-                    writer.writerows(rows)
-            else:
+            fields = [field for field in update_data if field in UPDATABLE]
+            assignments = ", ".join(f'"{field}" = ?' for field in fields)
+            cursor = self._connection().execute(
+                f'UPDATE signals SET {assignments} WHERE signal_id = ?',
+                [update_data[field] for field in fields] + [signal_id]
+            )
+            if cursor.rowcount == 0:
                 logging.warning(f"Signal ID {signal_id} bulunamadı")
-                
         except Exception as e:
             logging.error(f"Signal record güncelleme hatası: {e}")
 
-# Global instance
-signal_logger = SignalLogger() 
\ No newline at end of file
+    def read_signals(self, limit=None):
+        """
+        Son kayıtları eklenme sırasıyla döndürür (dashboard için)
+        Returns:
+            list: HEADER kolonlarıyla dict listesi
+        """
+        # Veritabanı henüz yoksa ve aktarılacak eski CSV de yoksa dosya oluşturulmaz
+        if not os.path.exists(self.db_filename) and not os.path.exists(self.csv_filename):
+            return []
+        columns = ", ".join(f'"{name}"' for name in HEADER)
+        sql = f'SELECT {columns} FROM signals ORDER BY rowid DESC'
+        params = ()
+        if limit:
+            sql += ' LIMIT ?'
+            params = (limit,)
+        rows = self._connection().execute(sql, params).fetchall()
+        return [dict(zip(HEADER, row)) for row in reversed(rows)]
+
+    def export_csv(self, target=None):
+        """
+        Kayıtları sinyal_kontrol.csv formatında yazar
+        Args:
+            target: Dosya yolu veya yazılabilir dosya nesnesi (varsayılan csv_filename)
+        Returns:
+            int: Yazılan kayıt sayısı
+        """
+        rows = self.read_signals()
+        if target is None or isinstance(target, str):
+            path = target or self.csv_filename
+            with open(path, 'w', newline='', encoding='utf-8') as csvfile:
+                return self._write_csv(csvfile, rows)
+        return self._write_csv(target, rows)
+
+    @staticmethod
+    def _write_csv(csvfile, rows):
+        writer = csv.writer(csvfile)
+        writer.writerow(HEADER)
+        writer.writerows([row[name] or '' for name in HEADER] for row in rows)
+        return len(rows)
+
+# Global instance (oluşturulması dosya işlemi yapmaz)
+signal_logger = SignalLogger()
+
+
+if __name__ == "__main__":
+    # python -m core.signal_logger export [hedef.csv]
+    if len(sys.argv) < 2 or sys.argv[1] != 'export':
+        print("Kullanım: python -m core.signal_logger export [hedef.csv]")
+        sys.exit(1)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    target = sys.argv[2] if len(sys.argv) > 2 else None
+    count = signal_logger.export_csv(target)
+    print(f"{count} sinyal kaydı yazıldı: {target or signal_logger.csv_filename}")
@@ -0,0 +1,122 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class StartupOrchestrator:
+    """
+    Bot başlangıç adımlarını yöneten yardımcı sınıf
+    - Birbirinden bağımsız adımları paralel çalıştırma
+    - Kritik olmayan adımları ilk trading döngüsünden sonraya erteleme
+    - Faz bazlı başlangıç süresi raporu
+    """
+
+    def __init__(self, name, logger=None, max_workers=4):
+        self.name = name
+        self.logger = logger or logging
+        self.max_workers = max_workers
+        self.started_at = time.perf_counter()
+        self.timings = []  # (adım adı, süre saniye)
+        self.deferred_steps = []  # (adım adı, fonksiyon)
+        self.first_tick_done = False
+        self.ready_after = None  # İlk döngü tamamlandığında geçen toplam süre
+        self.lock = threading.Lock()
+
+    def _record(self, name, elapsed):
+        with self.lock:
+            self.timings.append((name, elapsed))
+
+    def _run_timed(self, name, func):
+        step_start = time.perf_counter()
+        try:
+            return func()
+        finally:
+            self._record(name, time.perf_counter() - step_start)
+
+    def run_step(self, name, func):
+        """Tek bir başlangıç adımını süresini ölçerek çalıştırır"""
+        return self._run_timed(name, func)
+
+    def run_parallel(self, phase, steps):
+        """
+        Birbirinden bağımsız adımları aynı anda çalıştırır
+        Args:
+            phase: Faz adı (rapor için)
+            steps: {adım adı: parametresiz fonksiyon}
+        Returns:
+            dict: {adım adı: fonksiyon sonucu}
+        Herhangi bir adım hata verirse hata yeniden fırlatılır, çünkü bu fazdaki adımlar kritiktir.
+        """
+        phase_start = time.perf_counter()
+        results = {}
+
+        if len(steps) == 1:
+            name, func = next(iter(steps.items()))
+            results[name] = self._run_timed(f"{phase}.{name}", func)
+        else:
+            workers = min(self.max_workers, len(steps))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"startup-{phase}") as pool:
+                futures = {
+                    name: pool.submit(self._run_timed, f"{phase}.{name}", func)
+                    for name, func in steps.items()
+                }
+                for name, future in futures.items():
+                    results[name] = future.result()
+
+        self._record(phase, time.perf_counter() - phase_start)
+        return results
+
+    def defer(self, name, func):
+        """Kritik olmayan bir adımı ilk trading döngüsünden sonraya erteler"""
+        if self.first_tick_done:
+            threading.Thread(target=self._run_deferred_step, args=(name, func), daemon=True).start()
+            return
+        self.deferred_steps.append((name, func))
+
+    def _run_deferred_step(self, name, func):
+        try:
+            self._run_timed(f"deferred.{name}", func)
+        except Exception as e:
+            self.logger.error(f"Ertelenen başlangıç adımı hatası ({name}): {e}")
+
+    def _run_deferred(self):
+        steps, self.deferred_steps = self.deferred_steps, []
+        for name, func in steps:
+            self._run_deferred_step(name, func)
+        if steps:
+            deferred = [(name, elapsed) for name, elapsed in self.timings if name.startswith('deferred.')]
+            self.logger.info(f"[{self.name}] Ertelenen başlangıç adımları tamamlandı: " +
+                             ", ".join(f"{name[9:]}={elapsed * 1000:.0f}ms" for name, elapsed in deferred))
+
+    def mark_first_tick(self):
+        """
+        İlk trading döngüsü tamamlandığında çağrılır
+        - Başlangıç raporunu loglar
+        - Ertelenen adımları arka plan thread'inde başlatır (trading döngüsünü bekletmez)
+        """
+        if self.first_tick_done:
+            return
+        self.first_tick_done = True
+        self.ready_after = time.perf_counter() - self.started_at
+        self.log_report()
+
+        if self.deferred_steps:
+            threading.Thread(target=self._run_deferred, name="startup-deferred", daemon=True).start()
+
+    def report(self):
+        """Faz süreleri raporunu satır listesi olarak döndürür"""
+        with self.lock:
+            timings = list(self.timings)
+
+        lines = [f"[{self.name}] Başlangıç süre raporu:"]
+        for name, elapsed in timings:
+            indent = "    " if '.' in name else "  "
+            lines.append(f"{indent}{name:<32} {elapsed * 1000:8.1f} ms")
+        if self.ready_after is not None:
+            lines.append(f"  {'first_signal_ready':<32} {self.ready_after * 1000:8.1f} ms")
+        return lines
+
+    def log_report(self):
+        """Başlangıç raporunu loglar"""
+        self.logger.info("\n".join(self.report()))
@@ -5,7 +5,11 @@ This package contains telegram notificaton service adapter
 """
 
 from .telegram_notifier import TelegramNotifier
+from .delivery import TelegramDelivery
+from .coalescer import NotificationCoalescer
 
 __all__ = [
     'TelegramNotifier',
+    'TelegramDelivery',
+    'NotificationCoalescer',
 ]
@@ -0,0 +1,211 @@
+import atexit
+import logging
+import os
+import threading
+import time
+
+from core.metrics import metrics
+from .delivery import telegram_delivery
+
+DEDUP_ENV = 'TELEGRAM_DEDUP_SECONDS'
+DIGEST_ENV = 'TELEGRAM_DIGEST_SECONDS'
+
+# Öncelik sınıfları
+PRIORITY_TRADE = 'trade'  # İşlem ve pozisyon bildirimleri, bot aç/kapa: hiç bastırılmaz, hemen gönderilir
+PRIORITY_ALERT = 'alert'  # Kritik hatalar: hemen gönderilir, aynı mesajın tekrarları bastırılır
+PRIORITY_INFO = 'info'    # Uyarılar: tekrarlar bastırılır, sembol bazında seri halinde gelenler özetlenir
+
+DIGEST_MAX_LINES = 10
+DIGEST_LINE_CHARS = 200
+
+
+def classify(message):
+    """Önceliği verilmemiş mesajın sınıfı: botların uyarıları ⚠️, kritik hataları 🚨 ile başlar"""
+    if message.startswith('⚠️'):
+        return PRIORITY_INFO
+    if message.startswith('🚨'):
+        return PRIORITY_ALERT
+    return PRIORITY_TRADE
+
+
+class _Burst:
+    __slots__ = ('started', 'notifier', 'lines')
+
+    def __init__(self, started, notifier):
+        self.started = started
+        self.notifier = notifier
+        self.lines = {}
+
+
+class _Recent:
+    __slots__ = ('sent', 'notifier', 'repeats')
+
+    def __init__(self, sent, notifier):
+        self.sent = sent
+        self.notifier = notifier
+        self.repeats = 0
+
+
+class NotificationCoalescer:
+    """
+    Telegram bildirimlerini birleştirip seyrelten katman (gönderim kuyruğunun önünde)
+    - trade: doğrudan kuyruğa gider
+    - Aynı sembolün aynı metni dedup_seconds içinde tekrar gönderilmez, tekrarlar sayılır; süre dolunca
+      mesaj bir kez "N kez tekrarlandı" notuyla gönderilir (hata sürüyorsa her dedup_seconds'ta bir mesaj)
+    - info: sembolün ilk uyarısı hemen gönderilir ve digest_seconds'lık bir seri açar; seri içindeki diğer
+      uyarılar tek bir özet mesajında (metin ve adet) seri bitince gönderilir
+    - alert: yeni metinler seri içinde de hemen gönderilir
+    Bastırılan mesajlar telegram_suppressed_total metriğinde sayılır.
+
+    TELEGRAM_DEDUP_SECONDS (varsayılan 600) ve TELEGRAM_DIGEST_SECONDS (varsayılan 60) ile ayarlanır;
+    ikisi de 0 ise birleştirme kapalıdır.
+    """
+
+    def __init__(self, dedup_seconds=None, digest_seconds=None, delivery=None, logger=None):
+        if dedup_seconds is None:
+            dedup_seconds = float(os.getenv(DEDUP_ENV, '600'))
+        if digest_seconds is None:
+            digest_seconds = float(os.getenv(DIGEST_ENV, '60'))
+        self.dedup_seconds = dedup_seconds
+        self.digest_seconds = digest_seconds
+        self.delivery = delivery or telegram_delivery
+        self.logger = logger or logging
+        self.suppressed = {'duplicate': 0, 'digest': 0}
+        self.digests = 0
+        self._recent = {}
+        self._bursts = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    @property
+    def enabled(self):
+        return self.dedup_seconds > 0 or self.digest_seconds > 0
+
+    def submit(self, notifier, message, priority=None):
+        """
+        Mesajı önceliğine göre gönderir, bastırır veya özete ekler (trading thread'inde çağrılır, beklemez)
+        Returns:
+            bool: Mesaj kabul edildi mi (bastırılan ve özete eklenen mesajlar için de True)
+        """
+        priority = priority or classify(message)
+        if priority == PRIORITY_TRADE or not self.enabled:
+            return self.delivery.submit(notifier, message)
+
+        self._ensure_started()
+        key = (notifier.symbol, message)
+        now = time.monotonic()
+        with self._lock:
+            recent = self._recent.pop(key, None)
+            if recent is not None and now - recent.sent < self.dedup_seconds:
+                recent.repeats += 1
+                self._recent[key] = recent
+                self.suppressed['duplicate'] += 1
+                return True
+            # Süresi dolmuş ama henüz notu gönderilmemiş tekrarlar bu mesaja eklenir
+            repeats = recent.repeats if recent is not None else 0
+
+            burst = self._bursts.get(notifier.symbol)
+            if priority == PRIORITY_INFO and self.digest_seconds > 0:
+                if burst is not None:
+                    burst.lines[message] = burst.lines.get(message, 0) + 1 + repeats
+                    self.suppressed['digest'] += 1
+                    return True
+                self._bursts[notifier.symbol] = _Burst(now, notifier)
+            if self.dedup_seconds > 0:
+                self._recent[key] = _Recent(now, notifier)
+            if repeats:
+                message = self._repeat_message(message, repeats, now - recent.sent)
+        return self.delivery.submit(notifier, message)
+
+    def flush(self, force=False):
+        """Süresi dolan özetleri ve tekrar notlarını gönderir; force=True ise hepsini (kapanışta)"""
+        now = time.monotonic()
+        outgoing = []
+        with self._lock:
+            for symbol, burst in list(self._bursts.items()):
+                if not force and now - burst.started < self.digest_seconds:
+                    continue
+                del self._bursts[symbol]
+                if burst.lines:
+                    outgoing.append((burst.notifier, self._digest_message(burst)))
+                    for message in burst.lines:
+                        # Özette duyurulan metnin sonraki tekrarları dedup'a takılır
+                        if self.dedup_seconds > 0:
+                            self._recent[(symbol, message)] = _Recent(now, burst.notifier)
+
+            for key, recent in list(self._recent.items()):
+                if not force and now - recent.sent < self.dedup_seconds:
+                    continue
+                if recent.repeats:
+                    outgoing.append((recent.notifier,
+                                     self._repeat_message(key[1], recent.repeats, now - recent.sent)))
+                    # Hata sürüyorsa bir sonraki tekrar notuna kadar yine bastırılır
+                    self._recent[key] = _Recent(now, recent.notifier)
+                else:
+                    del self._recent[key]
+            if force:
+                self._recent.clear()
+
+        for notifier, message in outgoing:
+            self.delivery.submit(notifier, message)
+        self.digests += len(outgoing)
+        return len(outgoing)
+
+    def close(self, timeout=10):
+        """Bekleyen özetleri gönderir ve gönderim kuyruğunu kapatır (runner dururken ve atexit)"""
+        self._stop.set()
+        self.flush(force=True)
+        return self.delivery.close(timeout)
+
+    @staticmethod
+    def _repeat_message(message, repeats, elapsed):
+        period = f"{elapsed:.0f} sn" if elapsed < 120 else f"{elapsed / 60:.0f} dk"
+        return f"{message}\n\n🔁 Son {period} içinde {repeats} kez tekrarlandı"
+
+    def _digest_message(self, burst):
+        total = sum(burst.lines.values())
+        title = f"{burst.notifier.symbol} uyarı özeti" if burst.notifier.symbol else "Uyarı özeti"
+        lines = [f"📋 <b>{title}</b> (son {self.digest_seconds:.0f} sn, {total} bildirim)"]
+        for message, count in sorted(burst.lines.items(), key=lambda item: -item[1])[:DIGEST_MAX_LINES]:
+            text = message if len(message) <= DIGEST_LINE_CHARS else message[:DIGEST_LINE_CHARS] + '...'
+            lines.append(f"• {text} (×{count})")
+        if len(burst.lines) > DIGEST_MAX_LINES:
+            lines.append(f"• ... {len(burst.lines) - DIGEST_MAX_LINES} farklı mesaj daha")
+        return "\n".join(lines)
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                # Gönderici önce başlatılır: atexit ters sırada çalıştığından özetler kuyruk kapanmadan eklenir
+                self.delivery._ensure_started()
+                self._thread = threading.Thread(target=self._run, name='telegram-coalescer', daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+                metrics.register_collector(self._collect_metrics)
+
+    def _run(self):
+        while not self._stop.wait(1.0):
+            try:
+                self.flush()
+            except Exception as e:
+                self.logger.error(f"Telegram özet hatası: {e}")
+
+    def _collect_metrics(self):
+        with self._lock:
+            pending = sum(sum(burst.lines.values()) for burst in self._bursts.values())
+            repeats = sum(recent.repeats for recent in self._recent.values())
+        return [
+            ('telegram_suppressed_total', 'counter', 'Birleştirme katmanında bastırılan Telegram mesajları',
+             ('reason',), [((reason,), count) for reason, count in self.suppressed.items()]),
+            ('telegram_coalesced_pending', 'gauge', 'Özet veya tekrar notu bekleyen bastırılmış mesajlar', (),
+             [((), pending + repeats)]),
+            ('telegram_digests_total', 'counter', 'Gönderilen özet ve tekrar notu mesajları', (),
+             [((), self.digests)]),
+        ]
+
+
+# Süreç genelinde paylaşılan katman
+telegram_coalescer = NotificationCoalescer()
@@ -4,7 +4,9 @@ class Config:
     def __init__(self):
         self.bot_token='7956697051:AAErScGMFGVxOyt3dGiw0jrFoakBELRdtm4'
         self.chat_id='891700810'
-        self.base_url = f"https://api.telegram.org/bot{self.bot_token}/sendMessage"
+        # TELEGRAM_API_URL verilirse bildirimler bu adrese gider (ör. yerel mock sunucu: http://127.0.0.1:8800)
+        api_url = os.getenv('TELEGRAM_API_URL', 'https://api.telegram.org').rstrip('/')
+        self.base_url = f"{api_url}/bot{self.bot_token}/sendMessage"
         
         # Environment configuration
         self.environment = os.getenv('ENV', 'TEST')  # Default olarak TEST, environment variable'dan alır
\ No newline at end of file
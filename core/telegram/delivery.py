@@ -0,0 +1,156 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+import requests
+
+from core.metrics import TELEGRAM_QUEUE_DEPTH, metrics
+
+CHAT_INTERVAL_ENV = 'TELEGRAM_CHAT_INTERVAL'
+
+
+class TelegramDelivery:
+    """
+    Arka plan Telegram gönderici
+    - send_notification mesajı sınırlı kuyruğa ekleyip hemen döner; gönderim tek worker thread'inde,
+      kalıcı bir requests.Session (bağlantı yeniden kullanımı) ile yapılır
+    - Aynı chat'e ardışık mesajlar arasında en az chat_interval saniye beklenir (Telegram: chat başına ~1 mesaj/sn)
+    - 429 cevabında Telegram'ın verdiği retry_after kadar, ağ ve 5xx hatalarında üstel artan sürelerle
+      (backoff, 2x, ... en fazla max_backoff) max_attempts denemeye kadar tekrar denenir
+    - Kuyruk doluysa yeni mesaj atılır, DROPPED olarak CSV'ye yazılır ve sayılır
+    - flush() kuyruk boşalana kadar bekler; close() (runner dururken ve atexit) tekrar denemeleri bırakıp
+      kalan mesajları birer kez gönderir, Telegram'a ulaşılamıyorsa kapanışı uzatmaz
+
+    Sıra korunur: tekrar denenen mesaj arkasındakileri bekletir.
+    """
+
+    def __init__(self, max_queue=1000, chat_interval=None, max_attempts=4, backoff=1.0, max_backoff=30.0,
+                 logger=None):
+        if chat_interval is None:
+            chat_interval = float(os.getenv(CHAT_INTERVAL_ENV, '1'))
+        self.chat_interval = chat_interval
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.logger = logger or logging
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._last_sent = {}
+        self._session = None
+        self._thread = None
+        self._lock = threading.Lock()
+        # Bekleme için time.sleep yerine kullanılır (replay sanal saati time.sleep'i değiştirir)
+        self._idle = threading.Event()
+        self._closing = threading.Event()
+
+    @property
+    def session(self):
+        """Tüm bildirimlerin paylaştığı HTTP oturumu (keep-alive bağlantısı yeniden kullanılır)"""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = requests.Session()
+        return self._session
+
+    @property
+    def depth(self):
+        return self._queue.qsize()
+
+    def submit(self, notifier, message):
+        """Mesajı gönderim kuyruğuna ekler; kuyruk doluysa False döner"""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((notifier, message))
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 100 == 0:
+                self.logger.warning(f"Telegram kuyruğu dolu, mesaj atlandı (toplam {self.dropped})")
+            notifier._log_to_csv(message, 'DROPPED', 'Telegram kuyruğu dolu')
+            return False
+        TELEGRAM_QUEUE_DEPTH.set(self.depth)
+        return True
+
+    def flush(self, timeout=30):
+        """Kuyruktaki tüm mesajlar gönderilene (veya vazgeçilene) kadar bekler; süre dolarsa False döner"""
+        if self._thread is None:
+            return True
+        deadline = time.perf_counter() + timeout
+        while self._queue.unfinished_tasks:
+            if time.perf_counter() >= deadline or not self._thread.is_alive():
+                self.logger.warning(f"Telegram kuyruğu boşaltılamadı: {self._queue.unfinished_tasks} mesaj bekliyor")
+                return False
+            self._idle.wait(0.01)
+        return True
+
+    def close(self, timeout=10):
+        """Kapanış: bekleyen tekrar denemeleri keser, kuyruktaki mesajları tek denemeyle gönderir"""
+        self._closing.set()
+        return self.flush(timeout)
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='telegram-delivery', daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+                metrics.register_collector(self._collect_metrics)
+
+    def _run(self):
+        while True:
+            notifier, message = self._queue.get()
+            try:
+                self._deliver(notifier, message)
+            except Exception as e:
+                self.failed += 1
+                self.logger.error(f"Beklenmeyen Telegram hatası: {e}")
+            finally:
+                self._queue.task_done()
+                TELEGRAM_QUEUE_DEPTH.set(self.depth)
+
+    def _deliver(self, notifier, message):
+        delay = self.backoff
+        for attempt in range(1, self.max_attempts + 1):
+            self._wait_for_chat(notifier.chat_id)
+            ok, error_msg, retryable, retry_after = notifier._attempt(message)
+            self._last_sent[notifier.chat_id] = time.perf_counter()
+            if ok or not retryable or attempt == self.max_attempts or self._closing.is_set():
+                break
+            self.retries += 1
+            wait = retry_after if retry_after is not None else delay
+            self.logger.warning(f"Telegram gönderilemedi ({error_msg}), {wait:.0f} sn sonra tekrar denenecek "
+                                f"({attempt}/{self.max_attempts})")
+            self._closing.wait(wait)
+            delay = min(delay * 2, self.max_backoff)
+
+        notifier._finish(message, ok, error_msg)
+        if ok:
+            self.sent += 1
+        else:
+            self.failed += 1
+
+    def _wait_for_chat(self, chat_id):
+        last = self._last_sent.get(chat_id)
+        if last is None or self.chat_interval <= 0:
+            return
+        remaining = self.chat_interval - (time.perf_counter() - last)
+        if remaining > 0:
+            self._idle.wait(remaining)
+
+    def _collect_metrics(self):
+        return [
+            ('telegram_delivered_total', 'counter', 'Kuyruktan gönderim sonucu', ('result',),
+             [(('sent',), self.sent), (('failed',), self.failed), (('dropped',), self.dropped)]),
+            ('telegram_retries_total', 'counter', 'Tekrar denenen Telegram gönderimleri', (), [((), self.retries)]),
+        ]
+
+
+# Süreç genelinde paylaşılan gönderici (thread'i ilk mesajda başlar)
+telegram_delivery = TelegramDelivery()
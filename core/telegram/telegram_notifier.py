@@ -1,9 +1,18 @@
 import requests
 import logging
-import csv
 import os
+import time
 from datetime import datetime
 from .config import Config
+from .coalescer import telegram_coalescer
+from .delivery import telegram_delivery
+from recording.recorder import get_recorder
+from core.log_server import forward_csv
+from core.metrics import TELEGRAM_MESSAGES
+from core.timing import spans
+from core.trade_journal import trade_journal
+
+TELEGRAM_CSV_HEADER = ['Tarih/Saat', 'Sembol', 'Environment', 'Mesaj', 'Durum', 'Hata Mesajı']
 
 class TelegramNotifier:
     def __init__(self, symbol=None):
@@ -20,6 +29,7 @@ class TelegramNotifier:
         env_prefix = f"{env_emoji} <b>[{self.environment}]</b>\n\n"
         return env_prefix + message
 
+    @spans.timed('csv_log.telegram')
     def _log_to_csv(self, message, status, error_msg=None):
         """Telegram mesajını CSV dosyasına loglar"""
         try:
@@ -43,65 +53,99 @@ class TelegramNotifier:
                 error_msg or ''                                # Hata mesajı
             ]
             
-            # Dosya yoksa header ekle
-            file_exists = os.path.exists(csv_filename)
-            
-            with open(csv_filename, 'a', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
-                
-                # Header yazma (sadece dosya yoksa)
-                if not file_exists:
-                    header = ['Tarih/Saat', 'Sembol', 'Environment', 'Mesaj', 'Durum', 'Hata Mesajı']
-                    writer.writerow(header)
-                
-                # Veri yazma
-                writer.writerow(csv_data)
-            
-            logging.debug(f"Telegram mesajı CSV'ye kaydedildi: {csv_filename}")
+            # LOG_SERVER tanımlıysa satır tek yazıcı sürece iletilir (telegram_general.csv'ye birden çok süreç yazar),
+            # değilse işlem günlüğü kuyruğuna eklenir ve diğer satırlarla toplu yazılır
+            if not forward_csv(csv_filename, TELEGRAM_CSV_HEADER, csv_data):
+                trade_journal.append(csv_filename, TELEGRAM_CSV_HEADER, list, (csv_data,))
             
         except Exception as e:
             logging.error(f"Telegram CSV log kaydetme hatası: {e}")
 
-    def send_notification(self, message):
+    @spans.timed('telegram_send')
+    def _post(self, payload):
+        """Telegram API isteği (SESSION_RECORD_DIR verilmişse mesaj ve cevap oturum kaydına yazılır)"""
+        recorder = get_recorder()
+        started = time.time()
+        begin = time.perf_counter()
         try:
-            # Mesaja environment bilgisini ekle
-            formatted_message = self._format_message_with_env(message)
-            
-            # Mesajı HTML formatında gönder
-            payload = {
-                'chat_id': self.chat_id,
-                'text': formatted_message,
-                'parse_mode': 'HTML'  # HTML formatını kullan
-            }
-
-            response = requests.post(
+            response = telegram_delivery.session.post(
                 self.base_url,
                 data=payload,
                 timeout=10
             )
-            response.raise_for_status()
-            if response.status_code == 200:
-                logging.info(f"Telegram bildirimi başarıyla gönderildi (ENV: {self.environment})")
-                # Başarılı mesajı CSV'ye logla
-                self._log_to_csv(message, 'SUCCESS')
-                return True
-            else:
-                error_msg = f"Telegram API Hatası: {response.status_code} - {response.text}"
-                logging.error(error_msg)
-                # Hatalı mesajı CSV'ye logla
-                self._log_to_csv(message, 'ERROR', error_msg)
-                return False
+        except requests.exceptions.RequestException as e:
+            TELEGRAM_MESSAGES.inc(status=type(e).__name__)
+            if recorder is not None:
+                recorder.telegram(payload['text'], started, time.perf_counter() - begin, None, str(e),
+                                  error=type(e).__name__)
+            raise
+        TELEGRAM_MESSAGES.inc(status=response.status_code)
+        if recorder is not None:
+            recorder.telegram(payload['text'], started, time.perf_counter() - begin, response.status_code,
+                              response.text)
+        return response
+
+    def _attempt(self, message):
+        """
+        Tek gönderim denemesi
+        Returns:
+            tuple: (başarılı mı, hata mesajı, tekrar denenebilir mi, Telegram'ın istediği bekleme süresi)
+        """
+        # Mesaja environment bilgisini ekle
+        formatted_message = self._format_message_with_env(message)
 
+        # Mesajı HTML formatında gönder
+        payload = {
+            'chat_id': self.chat_id,
+            'text': formatted_message,
+            'parse_mode': 'HTML'  # HTML formatını kullan
+        }
+
+        try:
+            response = self._post(payload)
         except requests.exceptions.RequestException as e:
-            error_msg = f"Telegram bildirim hatası: {str(e)}"
-            logging.error(error_msg)
-            # Hatalı mesajı CSV'ye logla
-            self._log_to_csv(message, 'ERROR', error_msg)
-            return False
-        except Exception as e:
-            error_msg = f"Beklenmeyen Telegram hatası: {str(e)}"
+            return False, f"Telegram bildirim hatası: {str(e)}", True, None
+
+        if response.status_code == 200:
+            return True, None, False, None
+
+        error_msg = f"Telegram API Hatası: {response.status_code} - {response.text}"
+        if response.status_code == 429:
+            # Flood sınırı: Telegram beklenecek süreyi parameters.retry_after ile bildirir
+            try:
+                retry_after = float(response.json().get('parameters', {}).get('retry_after'))
+            except (ValueError, TypeError, AttributeError):
+                retry_after = None
+            return False, error_msg, True, retry_after
+        return False, error_msg, response.status_code >= 500, None
+
+    def _finish(self, message, ok, error_msg=None):
+        """Gönderim sonucunu loglar ve CSV'ye yazar"""
+        if ok:
+            logging.info(f"Telegram bildirimi başarıyla gönderildi (ENV: {self.environment})")
+            self._log_to_csv(message, 'SUCCESS')
+        else:
             logging.error(error_msg)
-            # Hatalı mesajı CSV'ye logla
             self._log_to_csv(message, 'ERROR', error_msg)
-            return False
 
+    def send_notification(self, message, wait=False, priority=None):
+        """
+        Bildirimi gönderir
+        Args:
+            message: Mesaj metni (HTML)
+            wait: False ise mesaj birleştirme katmanından geçip arka plan kuyruğuna eklenir ve hemen dönülür
+                  (trading thread'i beklemez); True ise tek deneme ile senkron gönderilir
+                  (sonucu gereken çağıranlar için, ör. dashboard)
+            priority: 'trade', 'alert' veya 'info' (verilmezse mesajın başındaki ⚠️ / 🚨 işaretinden belirlenir)
+        Returns:
+            bool: wait=False iken kabul edildi mi, wait=True iken gönderildi mi
+        """
+        if not wait:
+            return telegram_coalescer.submit(self, message, priority)
+
+        try:
+            ok, error_msg, _, _ = self._attempt(message)
+        except Exception as e:
+            ok, error_msg = False, f"Beklenmeyen Telegram hatası: {str(e)}"
+        self._finish(message, ok, error_msg)
+        return ok
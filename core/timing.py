@@ -0,0 +1,208 @@
+import functools
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+TIMING_ENV = 'TIMING_SPANS'
+
+
+class _NullSpan:
+    """Ölçüm kapalıyken döndürülen, hiçbir şey yapmayan span"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ('timer', 'name', 'started')
+
+    def __init__(self, timer, name):
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        local = self.timer._local
+        local.depth = getattr(local, 'depth', 0) + 1
+        self.timer._open.setdefault(threading.get_ident(), []).append(self.name)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.started
+        local = self.timer._local
+        local.depth -= 1
+        self.timer._open.get(threading.get_ident(), [None]).pop()
+        self.timer._record(self.name, elapsed, local.depth)
+        return False
+
+
+class _Tick:
+    """Tek bir bot döngüsündeki span sürelerinin dökümü"""
+
+    __slots__ = ('timer', 'label', 'started', 'spans', 'top_level')
+
+    def __init__(self, timer, label):
+        self.timer = timer
+        self.label = label
+        self.spans = {}  # span adı -> [toplam saniye, sayı] (ilk görülme sırasıyla)
+        self.top_level = 0.0
+
+    def add(self, name, elapsed, depth):
+        entry = self.spans.get(name)
+        if entry is None:
+            self.spans[name] = [elapsed, 1]
+        else:
+            entry[0] += elapsed
+            entry[1] += 1
+        if depth == 0:
+            self.top_level += elapsed
+
+    def __enter__(self):
+        local = self.timer._local
+        local.tick = self
+        local.depth = 0
+        self.timer._open[threading.get_ident()] = [self.label]
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        total = time.perf_counter() - self.started
+        self.timer._local.tick = None
+        self.timer._open.pop(threading.get_ident(), None)
+        self.timer._record('tick', total, -1)
+        self.timer._log_tick(self, total)
+        return False
+
+
+class SpanTimer:
+    """
+    Sıcak yol (hot path) süre ölçümü
+    - span(name): with bloğunun süresini ölçer; kapalıyken paylaşılan boş nesne döner (ek yük bir metot çağrısı)
+    - timed(name): fonksiyonu span ile saran dekoratör
+    - tick(label): bot döngüsü; döngü sonunda span bazlı süre dökümü loglanır
+    - Her span için son `window` ölçümün p50/p95/p99 değerleri tutulur, report_interval saniyede bir loglanır
+
+    TIMING_SPANS=1 ortam değişkeni ile açılır.
+
+    Kullanım:
+        from core.timing import spans
+
+        with spans.tick(f"psar_atr_strategy:{symbol}"):
+            with spans.span('fetch_data'):
+                df = client.fetch_data()
+    """
+
+    def __init__(self, enabled=None, window=1000, report_interval=300, logger=None):
+        if enabled is None:
+            enabled = os.getenv(TIMING_ENV, '0') == '1'
+        self.enabled = enabled
+        self.window = window
+        self.report_interval = report_interval
+        self.logger = logger or logging
+        self._samples = {}
+        self._totals = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._open = {}  # thread id -> açık span adları (dıştan içe); başka thread'den okunabilir
+        self._last_report = time.monotonic()
+
+    def span(self, name):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def tick(self, label):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Tick(self, label)
+
+    def timed(self, name=None):
+        """Fonksiyon çağrısını span olarak ölçen dekoratör (varsayılan span adı fonksiyon adı)"""
+
+        def decorator(func):
+            span_name = name or func.__name__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _Span(self, span_name):
+                    return func(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def open_spans(self, thread_id):
+        """Verilen thread'de şu an açık olan tick ve span adları (dıştan içe; ölçüm kapalıysa boş)"""
+        return list(self._open.get(thread_id, ()))
+
+    def _record(self, name, elapsed, depth):
+        with self._lock:
+            samples = self._samples.get(name)
+            if samples is None:
+                samples = self._samples[name] = deque(maxlen=self.window)
+                self._totals[name] = 0
+            samples.append(elapsed)
+            self._totals[name] += 1
+        tick = getattr(self._local, 'tick', None)
+        if tick is not None and depth >= 0:
+            tick.add(name, elapsed, depth)
+
+    def _log_tick(self, tick, total):
+        parts = []
+        for name, (elapsed, count) in tick.spans.items():
+            parts.append(f"{name}={elapsed * 1000:.1f}" + (f"({count}x)" if count > 1 else ""))
+        other = total - tick.top_level
+        parts.append(f"diğer={other * 1000:.1f}")
+        self.logger.info(f"⏱️ Döngü süresi [{tick.label}] {total * 1000:.1f} ms: " + ", ".join(parts))
+
+        now = time.monotonic()
+        if now - self._last_report >= self.report_interval:
+            self._last_report = now
+            self.log_stats()
+
+    def stats(self):
+        """Span bazlı son ölçümlerin dağılımı (milisaniye)"""
+        with self._lock:
+            snapshot = {name: (list(samples), self._totals[name]) for name, samples in self._samples.items()}
+        result = {}
+        for name, (samples, total) in snapshot.items():
+            values = np.asarray(samples) * 1000
+            p50, p95, p99 = np.percentile(values, (50, 95, 99))
+            result[name] = {'count': total, 'p50': round(float(p50), 3), 'p95': round(float(p95), 3),
+                            'p99': round(float(p99), 3), 'max': round(float(values.max()), 3)}
+        return result
+
+    def log_stats(self):
+        """Span istatistiklerini tablo olarak loglar (p99'a göre en yavaştan)"""
+        stats = self.stats()
+        if not stats:
+            return
+        lines = [f"Span süreleri (son {self.window} ölçüm, ms)",
+                 f"  {'span':<36} {'sayı':>8} {'p50':>10} {'p95':>10} {'p99':>10} {'max':>10}"]
+        for name, row in sorted(stats.items(), key=lambda item: item[1]['p99'], reverse=True):
+            lines.append(f"  {name:<36} {row['count']:>8} {row['p50']:>10.2f} {row['p95']:>10.2f} "
+                         f"{row['p99']:>10.2f} {row['max']:>10.2f}")
+        self.logger.info("\n".join(lines))
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+            self._totals.clear()
+
+
+# Süreç genelinde paylaşılan ölçüm nesnesi
+spans = SpanTimer()
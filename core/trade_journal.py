@@ -0,0 +1,213 @@
+import atexit
+import csv
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+
+from core.metrics import metrics
+
+# Emir ve pozisyon olayları diske yazıldıktan sonra fsync edilir; diğerleri (sinyal, bot durumu) edilmez
+ORDER_ACTIONS = frozenset({
+    'POSITION_OPEN', 'ORDERS_CREATED', 'POSITION_CLOSE', 'POSITION_CANCELED',
+    'POSITION_CLOSE_ERROR', 'TRADE_FAILED', 'TRADE_ERROR',
+})
+
+TRADE_ACTIVITY_HEADER = ('Tarih/Saat', 'Sembol', 'Aksiyon', 'Yön', 'Miktar', 'Fiyat', 'Detaylar',
+                         'Sinyal_İndikatörleri')
+POSITION_CLOSE_HEADER = ('Tarih/Saat', 'Sembol', 'Pozisyon', 'Giriş Fiyatı', 'Çıkış Fiyatı', 'Fiyat Değişimi',
+                         'Kaldıraçlı P&L', 'Durum')
+
+
+def pick_indicators(signal_data, fields):
+    """
+    Sinyal verisinden loglanacak indikatörleri seçer (trading thread'inde, biçimlendirme yapılmaz)
+    Args:
+        signal_data: dict veya pandas Series
+        fields: (anahtar, etiket, format) üçlüleri
+    Returns:
+        tuple: (etiket, format, değer) üçlüleri
+    """
+    if signal_data is None:
+        return ()
+    return tuple((label, spec, signal_data[key]) for key, label, spec in fields if key in signal_data)
+
+
+def _format_indicators(indicators):
+    return " | ".join(f"{label}: {value:{spec}}" for label, spec, value in indicators)
+
+
+def _trade_activity_row(timestamp, symbol, action, side, quantity, price, details, indicators):
+    return [
+        datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S'),
+        symbol,
+        action,
+        side,
+        f"{quantity:.6f}" if quantity else "",
+        f"{price:.4f}" if price else "",
+        details,
+        _format_indicators(indicators),
+    ]
+
+
+def _position_close_row(timestamp, symbol, position_type, entry_price, exit_price, price_change_percent,
+                        leveraged_pnl_percent, status):
+    return [
+        timestamp.strftime('%Y-%m-%d %H:%M:%S'),
+        symbol,
+        position_type,
+        f"{entry_price:.4f}",
+        f"{exit_price:.4f}",
+        f"{price_change_percent:+.2f}%",
+        f"{leveraged_pnl_percent:+.2f}%",
+        status,
+    ]
+
+
+class TradeJournal:
+    """
+    Tampon kuyruklu CSV işlem günlüğü
+    - Botlar yalnızca kayıt ekler (append); satır biçimlendirme ve dosya yazımı arka plan thread'inde yapılır
+    - Kuyruk sınırlıdır: doluysa emir kayıtları yer açılana kadar bekler, tanı kayıtları atılır (sayılır)
+    - Kayıtlar dosya bazında gruplanıp toplu yazılır; grupta emir kaydı (durable) varsa dosya fsync edilir
+    - flush() kuyruk boşalana kadar bekler; süreç kapanırken (atexit) ve runner durdurulurken çağrılır
+
+    Kullanım:
+        from core.trade_journal import trade_journal
+
+        trade_journal.trade_activity('logs/psar_trades_btcusdt.csv', 'BTCUSDT', 'POSITION_OPEN', 'BUY', 0.01, 65000)
+    """
+
+    def __init__(self, max_queue=10000, batch_size=500, logger=None):
+        self.batch_size = batch_size
+        self.logger = logger or logging
+        self.dropped = 0
+        self.written = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def append(self, path, header, build, args, durable=False):
+        """
+        Kaydı kuyruğa ekler
+        Args:
+            path: CSV dosyası (yoksa header ile oluşturulur)
+            header: Başlık satırı
+            build: args'tan CSV satırı üreten fonksiyon (arka plan thread'inde çağrılır)
+            args: build argümanları (değişmeyecek değerler olmalı)
+            durable: True ise yazıldıktan sonra fsync edilir ve kuyruk doluysa beklenir
+        """
+        self._ensure_started()
+        record = (path, header, build, args, durable)
+        if durable:
+            self._queue.put(record)
+            return True
+        try:
+            self._queue.put_nowait(record)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                self.logger.warning(f"İşlem günlüğü kuyruğu dolu, tanı kayıtları atlanıyor (toplam {self.dropped})")
+            return False
+
+    def trade_activity(self, path, symbol, action, side="", quantity=0, price=0, details="", indicators=()):
+        """Bot trade aktivitesi satırı (emir olayları fsync edilir)"""
+        return self.append(path, TRADE_ACTIVITY_HEADER, _trade_activity_row,
+                           (time.time(), symbol, action, side, quantity, price, details, indicators),
+                           durable=action in ORDER_ACTIONS)
+
+    def position_close(self, path, timestamp, symbol, position_type, entry_price, exit_price, price_change_percent,
+                       leveraged_pnl_percent, status):
+        """Pozisyon kapanış satırı (her zaman fsync edilir)"""
+        return self.append(path, POSITION_CLOSE_HEADER, _position_close_row,
+                           (timestamp, symbol, position_type, entry_price, exit_price, price_change_percent,
+                            leveraged_pnl_percent, status),
+                           durable=True)
+
+    def flush(self, timeout=10):
+        """Kuyruktaki tüm kayıtlar yazılana kadar bekler; süre dolarsa False döner"""
+        if self._thread is None:
+            return True
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline or not self._thread.is_alive():
+                self.logger.warning(f"İşlem günlüğü boşaltılamadı: {self._queue.unfinished_tasks} kayıt bekliyor")
+                return False
+            time.sleep(0.01)
+        return True
+
+    @property
+    def depth(self):
+        return self._queue.qsize()
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='trade-journal', daemon=True)
+                self._thread.start()
+                atexit.register(self.flush)
+                metrics.register_collector(self._collect_metrics)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            try:
+                self._write(batch)
+            except Exception as e:
+                self.logger.error(f"İşlem günlüğü yazma hatası: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write(self, batch):
+        groups = {}
+        for path, header, build, args, durable in batch:
+            group = groups.setdefault(path, [header, [], False])
+            try:
+                group[1].append(build(*args))
+            except Exception as e:
+                self.logger.error(f"İşlem günlüğü satırı oluşturulamadı ({path}): {e}")
+                continue
+            group[2] = group[2] or durable
+
+        for path, (header, rows, durable) in groups.items():
+            if not rows:
+                continue
+            try:
+                # Klasör kontrolü kayıt başına değil, toplu yazım başına bir kez yapılır
+                directory = os.path.dirname(path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(path, 'a', newline='', encoding='utf-8') as csvfile:
+                    writer = csv.writer(csvfile)
+                    if csvfile.tell() == 0:
+                        writer.writerow(header)
+                    writer.writerows(rows)
+                    if durable:
+                        csvfile.flush()
+                        os.fsync(csvfile.fileno())
+                self.written += len(rows)
+            except OSError as e:
+                self.logger.error(f"İşlem günlüğü dosyası yazılamadı ({path}): {e}")
+
+    def _collect_metrics(self):
+        return [
+            ('trade_journal_queue_depth', 'gauge', 'Yazılmayı bekleyen işlem günlüğü kaydı', (), [((), self.depth)]),
+            ('trade_journal_written_total', 'counter', 'Yazılan işlem günlüğü satırları', (), [((), self.written)]),
+            ('trade_journal_dropped_total', 'counter', 'Kuyruk dolu olduğu için atılan tanı kayıtları', (),
+             [((), self.dropped)]),
+        ]
+
+
+# Süreç genelinde paylaşılan günlük (thread'i ilk kayıtta başlar)
+trade_journal = TradeJournal()
@@ -0,0 +1,134 @@
+import itertools
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+
+from core.logging_config import LoggingConfig
+from core.metrics import SLOW_TICKS, metrics
+from core.timing import spans
+
+BUDGET_ENV = 'TICK_BUDGET_SECONDS'
+SLOW_TICK_LOG = 'slow_ticks'
+
+
+class _WatchedTick:
+    __slots__ = ('label', 'thread_id', 'thread_name', 'started', 'reported')
+
+    def __init__(self, label):
+        thread = threading.current_thread()
+        self.label = label
+        self.thread_id = thread.ident
+        self.thread_name = thread.name
+        self.started = time.monotonic()
+        self.reported = False
+
+
+class TickWatchdog:
+    """
+    Yavaş döngü bekçisi
+    - Bot döngüleri call() ile çalıştırılıp kaydedilir; arka plan thread'i süre bütçesini aşan döngüleri yakalar
+    - Bütçe aşılınca tüm thread'lerin yığını ve döngüdeki açık span'ler logs/slow_ticks.txt dosyasına yazılır,
+      bot_slow_ticks_total metriği artırılır (her döngü için bir kez)
+    - Döngü bittiğinde toplam süre uyarı olarak loglanır
+
+    TICK_BUDGET_SECONDS ile ayarlanır (varsayılan 5, 0 kapatır).
+    Açık span'ler yalnızca TIMING_SPANS=1 iken bilinir; kapalıyken yığın dökümü yine yazılır.
+    """
+
+    def __init__(self, budget=None, logger=None):
+        if budget is None:
+            budget = float(os.getenv(BUDGET_ENV, '5'))
+        self.budget = budget
+        self.logger = logger or logging
+        self._active = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._dump_logger = None
+
+    @property
+    def enabled(self):
+        return self.budget > 0
+
+    def call(self, label, func, *args, **kwargs):
+        """func'ı izlenen döngü olarak çalıştırır (runner'ın executor thread'inde çağrılır)"""
+        if not self.enabled:
+            return func(*args, **kwargs)
+        tick = _WatchedTick(label)
+        key = next(self._ids)
+        with self._lock:
+            self._active[key] = tick
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._monitor, name='tick-watchdog', daemon=True)
+                self._thread.start()
+                metrics.register_collector(self._collect_metrics)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._active.pop(key, None)
+            if tick.reported:
+                self.logger.warning(f"🐢 [{label}] Yavaş döngü tamamlandı: {time.monotonic() - tick.started:.1f} sn "
+                                    f"(bütçe {self.budget:g} sn)")
+
+    def _monitor(self):
+        interval = min(max(self.budget / 4, 0.05), 1.0)
+        while True:
+            time.sleep(interval)
+            now = time.monotonic()
+            with self._lock:
+                overdue = [tick for tick in self._active.values()
+                           if not tick.reported and now - tick.started > self.budget]
+                for tick in overdue:
+                    tick.reported = True
+            for tick in overdue:
+                try:
+                    self._report(tick, now - tick.started)
+                except Exception as e:
+                    self.logger.error(f"Yavaş döngü dökümü yazılamadı: {e}")
+
+    def _report(self, tick, elapsed):
+        SLOW_TICKS.inc(bot=tick.label)
+        open_spans = spans.open_spans(tick.thread_id)
+        where = " > ".join(open_spans) if open_spans else "bilinmiyor (TIMING_SPANS=1 ile açılır)"
+        self.logger.warning(f"🐢 [{tick.label}] Döngü {elapsed:.1f} sn'dir sürüyor (bütçe {self.budget:g} sn), "
+                            f"açık span: {where} - yığın dökümü {SLOW_TICK_LOG}.txt dosyasına yazıldı")
+
+        frames = sys._current_frames()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        lines = [f"[{tick.label}] Döngü {elapsed:.3f} sn'dir sürüyor (bütçe {self.budget:g} sn)",
+                 f"Açık span'ler: {where}",
+                 f"--- Döngü thread'i: {tick.thread_name} ({tick.thread_id}) ---"]
+        if tick.thread_id in frames:
+            lines.append("".join(traceback.format_stack(frames[tick.thread_id])).rstrip())
+        for thread_id, frame in frames.items():
+            if thread_id in (tick.thread_id, threading.get_ident()):
+                continue
+            lines.append(f"--- Thread: {names.get(thread_id, '?')} ({thread_id}) ---")
+            lines.append("".join(traceback.format_stack(frame)).rstrip())
+        self._get_dump_logger().warning("\n".join(lines) + "\n")
+
+    def _get_dump_logger(self):
+        """Yığın dökümleri için ayrı, yalnızca dosyaya yazan logger (konsolu doldurmasın diye)"""
+        if self._dump_logger is None:
+            logger = logging.getLogger(SLOW_TICK_LOG)
+            logger.propagate = False
+            if not logger.handlers:
+                logger.addHandler(LoggingConfig().create_file_handler(SLOW_TICK_LOG))
+            self._dump_logger = logger
+        return self._dump_logger
+
+    def _collect_metrics(self):
+        """Metrik okuması sırasında devam eden döngülerin süresi"""
+        now = time.monotonic()
+        with self._lock:
+            running = [((tick.label,), now - tick.started) for tick in self._active.values()]
+        return [('bot_tick_running_seconds', 'gauge', 'Devam eden bot döngüsünün şu ana kadarki süresi', ('bot',),
+                 running)]
+
+
+# Süreç genelinde paylaşılan bekçi
+watchdog = TickWatchdog()
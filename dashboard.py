@@ -10,13 +10,16 @@ import subprocess
 import psutil
 import pandas as pd
 import csv
+import io
+import json
 from datetime import datetime
-from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify
+from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify, Response
 from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
 from werkzeug.security import check_password_hash, generate_password_hash
 import threading
 import time
 import logging
+import urllib.request
 from pathlib import Path
 
 # Configuration
@@ -102,6 +105,38 @@ def is_script_running(script_name):
                     return False
     return False
 
+def read_bot_metrics(pid, timeout=1.0):
+    """Scrape the bot process' local /metrics endpoint (port published in logs/metrics/<pid>.json)"""
+    discovery_file = os.path.join(LOGS_PATH, 'metrics', f'{pid}.json')
+    if not os.path.exists(discovery_file):
+        return None
+    try:
+        from core.metrics import parse_metrics
+        with open(discovery_file, 'r', encoding='utf-8') as f:
+            discovery = json.load(f)
+        url = f"http://{discovery['host']}:{discovery['port']}/metrics"
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            samples = parse_metrics(response.read().decode('utf-8'))
+    except Exception:
+        return None
+
+    def total(name):
+        return sum(value for sample_name, _, value in samples if sample_name == name)
+
+    ticks = total('bot_tick_duration_seconds_count')
+    return {
+        'port': discovery['port'],
+        'rss_mb': round(total('process_resident_memory_bytes') / 1024 / 1024, 2),
+        'loop_iterations': int(total('bot_loop_iterations_total')),
+        'avg_tick_ms': round(total('bot_tick_duration_seconds_sum') / ticks * 1000, 1) if ticks else None,
+        'errors': int(total('bot_errors_total') + total('log_errors_total')),
+        'rest_calls': int(total('binance_rest_requests_total')),
+        'rest_weight_1m': int(total('binance_rest_used_weight_1m')),
+        'open_positions': int(total('bot_open_positions')),
+        'pending_signals': int(total('bot_pending_signal')),
+        'telegram_queue_depth': int(total('telegram_queue_depth')),
+    }
+
 def get_process_info(script_name):
     """Get detailed process information"""
     with process_lock:
@@ -113,14 +148,17 @@ def get_process_info(script_name):
                 try:
                     # Get process details using psutil
                     proc = psutil.Process(pid)
+                    # Prefer the bot's own metrics endpoint when it exposes one
+                    metrics = read_bot_metrics(pid)
                     return {
                         'pid': pid,
-                        'memory_mb': round(proc.memory_info().rss / 1024 / 1024, 2),
+                        'memory_mb': metrics['rss_mb'] if metrics else round(proc.memory_info().rss / 1024 / 1024, 2),
                         'start_time': datetime.fromtimestamp(proc.create_time()).strftime('%Y-%m-%d %H:%M:%S'),
                         'status': 'Running',
                         'strategy': process_info.get('strategy', 'Unknown'),
                         'leverage': process_info.get('leverage', 'Unknown'),
-                        'trade_amount': process_info.get('trade_amount', 'Unknown')
+                        'trade_amount': process_info.get('trade_amount', 'Unknown'),
+                        'metrics': metrics
                     }
                 except psutil.NoSuchProcess:
                     # Process has finished
@@ -186,6 +224,8 @@ def start_script(script_name, leverage, trade_amount, strategy):
         env['LEVERAGE'] = str(leverage)
         env['TRADE_AMOUNT'] = str(trade_amount)
         env['STRATEGY'] = str(strategy)
+        # Bots publish a local metrics endpoint on a free port (discovered via logs/metrics/<pid>.json)
+        env.setdefault('METRICS_PORT', '0')
         
         # Execute the command with environment variables
         result = subprocess.run(
@@ -301,6 +341,13 @@ def stop_script(script_name):
         else:
             return False, f"Script {script_name} is not running"
 
+def get_signal_logger():
+    """Signal control store under LOGS_PATH (the bots' shared logs/sinyal_kontrol.db)"""
+    from core.signal_logger import SignalLogger
+
+    return SignalLogger(db_filename=os.path.join(LOGS_PATH, 'sinyal_kontrol.db'),
+                        csv_filename=os.path.join(LOGS_PATH, 'sinyal_kontrol.csv'))
+
 def read_csv_file(file_path, max_rows=100):
     """Read CSV file and return as list of dictionaries"""
     try:
@@ -369,6 +416,33 @@ def read_csv_file(file_path, max_rows=100):
     except Exception as e:
         return [{'error': f'Error reading file {file_path}: {str(e)}'}]
 
+def find_log_source(filenames):
+    """First of filenames that exists in LOGS_PATH or was compacted into the log archive (returns the name without .csv)"""
+    from core.log_archive import LogArchive, dataset_for
+
+    archive = LogArchive(LOGS_PATH)
+    for filename in filenames:
+        dataset = dataset_for(filename)
+        if os.path.exists(os.path.join(LOGS_PATH, filename)) or (
+                dataset is not None and filename[:-len('.csv')] in archive.sources(dataset)):
+            return filename[:-len('.csv')]
+    return None
+
+def read_log_table(source, max_rows=300):
+    """Last max_rows of a bot CSV log (archived days + current file) with the original CSV columns"""
+    from core.log_archive import LogArchive, dataset_for
+
+    dataset = dataset_for(f'{source}.csv')
+    if dataset is None:
+        return read_csv_file(os.path.join(LOGS_PATH, f'{source}.csv'), max_rows=max_rows)
+    try:
+        frame = LogArchive(LOGS_PATH).query(dataset, sources=[source], tail=max_rows)
+    except Exception as e:
+        return [{'error': f'Error reading {source}: {str(e)}'}]
+    if frame.empty:
+        return [{'error': f'No rows in {source}'}]
+    return LogArchive.to_records(dataset, frame)
+
 def read_log_file(file_path, lines=300):
     """Read log file and return last N lines"""
     try:
@@ -401,7 +475,8 @@ def dashboard():
         {'value': 'skorlama_strategy', 'name': 'Skorlama Strategy'}
     ]
     
-    return render_template('dashboard.html', scripts=scripts, strategies=strategies)
+    return render_template('dashboard.html', scripts=scripts, strategies=strategies,
+                           coordinator=read_coordinator_status())
 
 @app.route('/login', methods=['GET', 'POST'])
 def login():
@@ -479,7 +554,6 @@ def view_logs(coin):
     log_lines = []
     
     # Try to find trades file - check all possible formats
-    trades_file = None
     trades_file_patterns = [
         f'psar_trades_{coin.lower()}.csv',  # PSAR ATR Strategy
         f'atr_trades_{coin.lower()}.csv',   # ATR Strategy
@@ -497,15 +571,10 @@ def view_logs(coin):
             f'trades_{variant}.csv',
         ])
     
-    # Search for trades file
-    for pattern in trades_file_patterns:
-        potential_file = os.path.join(LOGS_PATH, pattern)
-        if os.path.exists(potential_file):
-            trades_file = potential_file
-            break
+    # Search for trades file (current CSV or rows already moved to the archive)
+    trades_file = find_log_source(trades_file_patterns)
     
     # Try to find positions file - check all possible formats
-    positions_file = None
     positions_file_patterns = [
         f'psar_positions_{coin.lower()}.csv',  # PSAR ATR Strategy
         f'atr_positions_{coin.lower()}.csv',   # ATR Strategy
@@ -523,26 +592,12 @@ def view_logs(coin):
             f'positions_{variant}.csv',
         ])
     
-    # Search for positions file
-    for pattern in positions_file_patterns:
-        potential_file = os.path.join(LOGS_PATH, pattern)
-        if os.path.exists(potential_file):
-            positions_file = potential_file
-            break
+    # Search for positions file (current CSV or rows already moved to the archive)
+    positions_file = find_log_source(positions_file_patterns)
     
     # Try to find telegram file - also check for general telegram file
-    telegram_file = None
-    for variant in coin_variants:
-        potential_file = os.path.join(LOGS_PATH, f'telegram_{variant}.csv')
-        if os.path.exists(potential_file):
-            telegram_file = potential_file
-            break
-    
-    # If specific telegram file not found, try general telegram file
-    if not telegram_file:
-        general_telegram_file = os.path.join(LOGS_PATH, 'telegram_general.csv')
-        if os.path.exists(general_telegram_file):
-            telegram_file = general_telegram_file
+    telegram_file = find_log_source([f'telegram_{variant}.csv' for variant in coin_variants] +
+                                    ['telegram_general.csv'])
     
     # Try to find log file
     log_file = None
@@ -554,21 +609,21 @@ def view_logs(coin):
     
     # Read data if files exist
     if trades_file:
-        trades_data = read_csv_file(trades_file, max_rows=300)  # Show last 300 rows
+        trades_data = read_log_table(trades_file, max_rows=300)  # Show last 300 rows
     else:
         # Debug: list available files
         available_files = [f for f in os.listdir(LOGS_PATH) if 'trades' in f.lower()]
         trades_data = [{'error': f'Trades file not found. Available files: {available_files}'}]
     
     if positions_file:
-        positions_data = read_csv_file(positions_file, max_rows=300)  # Show last 300 rows
+        positions_data = read_log_table(positions_file, max_rows=300)  # Show last 300 rows
     else:
         # Debug: list available files
         available_files = [f for f in os.listdir(LOGS_PATH) if 'positions' in f.lower()]
         positions_data = [{'error': f'Positions file not found. Available files: {available_files}'}]
     
     if telegram_file:
-        telegram_data = read_csv_file(telegram_file, max_rows=300)  # Show last 300 rows
+        telegram_data = read_log_table(telegram_file, max_rows=300)  # Show last 300 rows
     else:
         # Debug: list available files
         available_files = [f for f in os.listdir(LOGS_PATH) if f.startswith('telegram_')]
@@ -581,12 +636,12 @@ def view_logs(coin):
         available_files = [f for f in os.listdir(LOGS_PATH) if f.startswith('main_')]
         log_lines = [f'Log file not found. Available files: {available_files}']
     
-    # Signal control data - ortak dosya
-    signal_control_file = os.path.join(LOGS_PATH, 'sinyal_kontrol.csv')
-    signal_control_data = []
-    if os.path.exists(signal_control_file):
-        signal_control_data = read_csv_file(signal_control_file, max_rows=500)  # Show last 500 rows
-    else:
+    # Signal control data - shared SQLite store (legacy CSV is imported on first read)
+    try:
+        signal_control_data = get_signal_logger().read_signals(limit=500)  # Show last 500 rows
+    except Exception as e:
+        signal_control_data = [{'error': f'Error reading signal control store: {e}'}]
+    if not signal_control_data:
         signal_control_data = [{'error': 'Signal control file not found. Signals will appear after first detection.'}]
     
     return render_template('logs.html', 
@@ -597,6 +652,15 @@ def view_logs(coin):
                          signal_control_data=signal_control_data,
                          log_lines=log_lines)
 
+@app.route('/api/signal_control.csv')
+@login_required
+def api_signal_control_csv():
+    """CSV export of the signal control store (same columns as the former sinyal_kontrol.csv)"""
+    buffer = io.StringIO()
+    get_signal_logger().export_csv(buffer)
+    return Response(buffer.getvalue(), mimetype='text/csv',
+                    headers={'Content-Disposition': 'attachment; filename=sinyal_kontrol.csv'})
+
 @app.route('/api/process_status')
 @login_required
 def api_process_status():
@@ -613,6 +677,98 @@ def api_process_status():
     
     return jsonify(status)
 
+def read_coordinator_status(stale_after=60):
+    """Read worker health written by the multi-process coordinator (runner.py --workers)"""
+    status_file = os.path.join(LOGS_PATH, 'coordinator_status.json')
+    if not os.path.exists(status_file):
+        return None
+    try:
+        with open(status_file, 'r', encoding='utf-8') as f:
+            status = json.load(f)
+        status['stale'] = time.time() - status.get('updated_ts', 0) > stale_after
+        return status
+    except Exception as e:
+        print(f"Error reading coordinator status: {e}")
+        return None
+
+@app.route('/api/coordinator_status')
+@login_required
+def api_coordinator_status():
+    """API endpoint for coordinator worker health"""
+    status = read_coordinator_status()
+    if status is None:
+        return jsonify({'running': False})
+    status['running'] = not status['stale'] and status['totals']['workers_alive'] > 0
+    return jsonify(status)
+
+def parse_risk_params(args):
+    """Read Monte Carlo settings from query parameters (bounded so a page load stays within seconds)"""
+    def number(name, default, cast=float, low=None, high=None):
+        try:
+            value = cast(args.get(name, default))
+        except (TypeError, ValueError):
+            value = default
+        if low is not None:
+            value = max(low, value)
+        if high is not None:
+            value = min(high, value)
+        return value
+
+    leverages = []
+    for part in str(args.get('leverage', f'1,5,{DEFAULT_LEVERAGE}')).split(','):
+        try:
+            leverages.append(min(125, max(1, int(part))))
+        except ValueError:
+            continue
+    return {
+        'method': args.get('method') if args.get('method') in ('bootstrap', 'shuffle') else 'bootstrap',
+        'simulations': number('simulations', 10000, int, 1000, 100000),
+        'leverages': sorted(set(leverages)) or [1],
+        'trade_amount': number('amount', DEFAULT_TRADE_AMOUNT, float, 1),
+        'initial_balance': number('balance', 1000, float, 1),
+        'ruin_level': number('ruin', 0.5, float, 0.0, 0.99),
+        'commission': number('commission', 0.0004, float, 0.0, 0.01),
+        'by_symbol': args.get('by_symbol') in ('1', 'true', 'on'),
+    }
+
+def run_risk_analysis(params):
+    """Monte Carlo risk estimation on the bots' position close logs"""
+    from backtest.montecarlo import MonteCarloSimulator, load_position_logs
+
+    reports = {}
+    groups = load_position_logs(LOGS_PATH, by_symbol=params['by_symbol'])
+    for name, returns in sorted(groups.items()):
+        simulator = MonteCarloSimulator(
+            returns, method=params['method'], simulations=params['simulations'],
+            initial_balance=params['initial_balance'], trade_amount=params['trade_amount'],
+            leverages=params['leverages'], ruin_level=params['ruin_level'], commission=params['commission']
+        )
+        reports[name] = simulator.run()
+    return reports
+
+@app.route('/risk')
+@login_required
+def risk():
+    """Monte Carlo risk page"""
+    params = parse_risk_params(request.args)
+    error = None
+    try:
+        reports = run_risk_analysis(params)
+    except Exception as e:
+        reports = {}
+        error = str(e)
+    return render_template('risk.html', params=params, reports=reports, error=error)
+
+@app.route('/api/risk')
+@login_required
+def api_risk():
+    """API endpoint for Monte Carlo risk estimation"""
+    params = parse_risk_params(request.args)
+    try:
+        return jsonify({'params': params, 'reports': run_risk_analysis(params)})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/strategies')
 @login_required
 def strategies():
@@ -675,7 +831,7 @@ def request_strategy():
         
         # Send telegram message
         telegram = TelegramNotifier(symbol="GENERAL")
-        success = telegram.send_notification(message)
+        success = telegram.send_notification(message, wait=True)
         
         if success:
             flash(f'✅ Strateji talebiniz başarıyla gönderildi: {strategy_name}', 'success')
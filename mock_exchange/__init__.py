@@ -0,0 +1,17 @@
+"""
+Mock exchange package.
+
+Yerel mum deposundan replay edilen deterministik eşleştirme motoru ve onu
+Binance Futures REST / WebSocket API'si olarak sunan sunucu. Botlar ve
+BinanceClient, BINANCE_BASE_URL ile bu sunucuya yönlendirilerek ağ
+bağlantısı olmadan test ve benchmark edilebilir.
+"""
+
+from .engine import MockExchange, ExchangeError
+from .server import MockBinanceServer
+
+__all__ = [
+    'MockExchange',
+    'ExchangeError',
+    'MockBinanceServer',
+]
@@ -0,0 +1,70 @@
+"""
+Mock Binance Futures sunucusu
+
+Kullanım:
+    python -m mock_exchange BTCUSDT ETHUSDT --start 2024-03-01 --speed 60     # saniyede bir dakika replay
+    python -m mock_exchange --speed 1 --live-clock --port 8800                  # depodaki tüm semboller, gerçek saat
+    python -m mock_exchange BTCUSDT --latency 50 --jitter 30 --error-rate 0.02 --error-path /fapi/v1/order
+
+Botları sunucuya yönlendirmek için:
+    BINANCE_BASE_URL=http://127.0.0.1:8800 python runner.py BTCUSDT ETHUSDT
+"""
+
+import argparse
+import logging
+import os
+import time
+
+from backtest.candle_store import CandleStore
+from mock_exchange.engine import MINUTE_MS, MockExchange
+from mock_exchange.server import MockBinanceServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Yerel mum deposundan replay yapan mock Binance Futures sunucusu")
+    parser.add_argument('symbols', nargs='*', help="Semboller (verilmezse depodaki tüm 1m semboller)")
+    parser.add_argument('--data-dir', default=os.path.join('data', 'candles'), help="Mum deposu klasörü")
+    parser.add_argument('--start', help="Replay başlangıcı (verilmezse verinin başından --warmup sonrası)")
+    parser.add_argument('--end', help="Replay bitişi")
+    parser.add_argument('--warmup', type=int, default=3000, help="Başlangıç öncesi geçmiş olarak sunulan dakika")
+    parser.add_argument('--speed', type=float, default=60.0,
+                        help="Replay hızı (1: gerçek zaman, 60: saniyede bir dakika, 0: sadece /mock/advance ile)")
+    parser.add_argument('--live-clock', action='store_true',
+                        help="Mum zamanlarını kaydırarak replay başlangıcını şu anki zamana hizalar")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8800)
+    parser.add_argument('--balance', type=float, default=10000.0, help="Başlangıç USDT cüzdan bakiyesi")
+    parser.add_argument('--leverage', type=int, default=20, help="Varsayılan kaldıraç")
+    parser.add_argument('--maker-fee', type=float, default=0.0002)
+    parser.add_argument('--taker-fee', type=float, default=0.0004)
+    parser.add_argument('--latency', type=float, default=0.0, help="Her isteğe eklenen sabit gecikme (ms)")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Gecikmeye eklenen rastgele sapma üst sınırı (ms)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Hata cevabı döndürülecek istek oranı (0-1)")
+    parser.add_argument('--error-path', action='append',
+                        help="Hata enjeksiyonunun uygulanacağı yol öneki (tekrarlanabilir, varsayılan: /fapi/)")
+    parser.add_argument('--seed', type=int, default=0, help="Gecikme ve hata enjeksiyonu için seed")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    store = CandleStore(args.data_dir)
+    symbols = args.symbols or store.symbols('1m')
+    if not symbols:
+        raise SystemExit(f"{args.data_dir} altında 1m mum verisi yok (önce 'python -m backtest download')")
+
+    exchange = MockExchange.from_store(
+        symbols, store=store, start=args.start, end=args.end, warmup_minutes=args.warmup, balance=args.balance,
+        maker_fee=args.maker_fee, taker_fee=args.taker_fee, leverage=args.leverage
+    )
+    if args.live_clock:
+        exchange.time_shift = int(time.time() * 1000) // MINUTE_MS * MINUTE_MS - exchange.now
+
+    server = MockBinanceServer(
+        exchange, host=args.host, port=args.port, latency_ms=args.latency, jitter_ms=args.jitter,
+        error_rate=args.error_rate, error_paths=args.error_path, speed=args.speed, seed=args.seed
+    )
+    logging.info(f"{len(exchange.books)} sembol yüklendi: {', '.join(exchange.books)}")
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
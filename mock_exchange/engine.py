@@ -0,0 +1,763 @@
+import logging
+import math
+import threading
+
+import numpy as np
+
+from backtest.candle_store import CandleStore, interval_ms, to_ms
+
+MINUTE_MS = 60_000
+
+ORDER_TYPES = ('LIMIT', 'MARKET', 'STOP_MARKET', 'TAKE_PROFIT_MARKET')
+CONDITIONAL_TYPES = ('STOP_MARKET', 'TAKE_PROFIT_MARKET')
+TIME_IN_FORCE = ('GTC', 'IOC', 'FOK', 'GTX')
+OPEN_STATUSES = ('NEW', 'PARTIALLY_FILLED')
+
+
+class ExchangeError(Exception):
+    """Binance formatında ({"code": ..., "msg": ...}) döndürülecek borsa hatası"""
+
+    def __init__(self, code, msg, status=400):
+        super().__init__(f"APIError(code={code}): {msg}")
+        self.code = code
+        self.msg = msg
+        self.status = status
+
+
+def format_number(value, decimals=8):
+    """Sayıyı Binance'in döndürdüğü gibi metne çevirir (sondaki sıfırlar atılır)"""
+    text = f"{value:.{decimals}f}".rstrip('0').rstrip('.')
+    return '0' if text in ('', '-0') else text
+
+
+def decimals_of(step):
+    """Adım büyüklüğünün ondalık basamak sayısı (0.001 -> 3)"""
+    return max(0, int(round(-math.log10(step))))
+
+
+def derive_filters(price):
+    """
+    Sembolün fiyat seviyesinden deterministik tick / lot adımı türetir
+    - tickSize: fiyatın yaklaşık 1/100000'i (BTC 60000 -> 0.1)
+    - stepSize: yaklaşık 10 USDT nominale karşılık gelen adım (BTC -> 0.0001)
+    """
+    tick = 10.0 ** (math.floor(math.log10(price)) - 5)
+    step = 10.0 ** min(0, math.floor(math.log10(10.0 / price)))
+    return {'tick_size': tick, 'step_size': step, 'min_qty': step, 'max_qty': 1_000_000.0, 'min_notional': 5.0}
+
+
+class Order:
+    """Mock borsadaki tek bir emir"""
+
+    def __init__(self, order_id, client_order_id, symbol, side, type, quantity, price, stop_price, time_in_force,
+                 reduce_only, close_position, time):
+        self.order_id = order_id
+        self.client_order_id = client_order_id
+        self.symbol = symbol
+        self.side = side
+        self.type = type
+        self.quantity = quantity
+        self.price = price
+        self.stop_price = stop_price
+        self.time_in_force = time_in_force
+        self.reduce_only = reduce_only
+        self.close_position = close_position
+        self.time = time
+        self.update_time = time
+        self.status = 'NEW'
+        self.executed_qty = 0.0
+        self.avg_price = 0.0
+        self.maker = False
+
+    @property
+    def is_open(self):
+        return self.status in OPEN_STATUSES
+
+    def trigger(self):
+        """(tetik fiyatı, yön) - yön 'down': fiyat <= tetik, 'up': fiyat >= tetik"""
+        if self.type == 'LIMIT':
+            return self.price, 'down' if self.side == 'BUY' else 'up'
+        if self.type == 'STOP_MARKET':
+            return self.stop_price, 'up' if self.side == 'BUY' else 'down'
+        # TAKE_PROFIT_MARKET
+        return self.stop_price, 'down' if self.side == 'BUY' else 'up'
+
+
+class SymbolBook:
+    """Sembol başına mum verisi, replay imleci, açık emirler ve pozisyon"""
+
+    def __init__(self, symbol, arrays, filters, leverage):
+        self.symbol = symbol
+        self.open_time = arrays['open_time'].astype(np.int64)
+        self.open = arrays['open'].astype(float)
+        self.high = arrays['high'].astype(float)
+        self.low = arrays['low'].astype(float)
+        self.close = arrays['close'].astype(float)
+        self.volume = arrays['volume'].astype(float)
+        self.cursor = -1  # İşlenmiş (kapanmış) son 1m mumun indeksi
+        self.orders = {}  # Açık emirler (orderId -> Order)
+        self.leverage = leverage
+        self.position_amt = 0.0
+        self.entry_price = 0.0
+        self.update_time = 0
+
+        self.tick_size = filters['tick_size']
+        self.step_size = filters['step_size']
+        self.min_qty = filters['min_qty']
+        self.max_qty = filters['max_qty']
+        self.min_notional = filters['min_notional']
+        self.price_decimals = decimals_of(self.tick_size)
+        self.qty_decimals = decimals_of(self.step_size)
+
+    @property
+    def price(self):
+        """Son kapanmış 1m mumun kapanışı (replay başlamadan önce ilk mumun açılışı)"""
+        return float(self.close[self.cursor]) if self.cursor >= 0 else float(self.open[0])
+
+    def unrealized_pnl(self):
+        return self.position_amt * (self.price - self.entry_price) if self.position_amt else 0.0
+
+
+class MockExchange:
+    """
+    Yerel mum deposundan replay edilen deterministik Binance Futures eşleştirme motoru
+    - Saat 1m adımlarla ilerler; her yeni 1m mum için açık emirler mum içi fiyat yoluna göre eşleştirilir
+      (yükselen mum: açılış -> low -> high -> kapanış, düşen mum: açılış -> high -> low -> kapanış)
+    - LIMIT emirler tetik fiyatından (açılışta zaten geçilmişse açılış fiyatından) maker olarak dolar;
+      piyasa fiyatını geçen LIMIT ve MARKET emirler anında son fiyattan taker olarak dolar
+    - STOP_MARKET / TAKE_PROFIT_MARKET emirleri tetik fiyatından (boşlukta açılış fiyatından) dolar,
+      anında tetiklenecek koşullu emirler Binance gibi -2021 ile reddedilir
+    - Tek yönlü (one-way) pozisyon, cross marjin, USDT cüzdan bakiyesi ve maker / taker komisyonu
+    - Aynı veri, başlangıç ve emir sırası her çalıştırmada aynı sonucu verir
+    """
+
+    def __init__(self, candles, start=None, balance=10000.0, maker_fee=0.0002, taker_fee=0.0004, leverage=20,
+                 warmup_minutes=3000, time_shift=0):
+        """
+        Args:
+            candles: {sembol: {'open_time', 'open', 'high', 'low', 'close', 'volume'} 1m dizileri}
+            start: Replay başlangıcı (tarih metni veya ms); verilmezse ilk mumdan warmup_minutes sonrası
+            warmup_minutes: Başlangıçtan önce kline isteklerine geçmiş olarak sunulacak dakika sayısı
+            time_shift: Dışarı verilen tüm zamanlara eklenecek ms (replay'i gerçek saate hizalamak için)
+        """
+        if not candles:
+            raise ValueError("Mock borsa için mum verisi yok")
+        self.books = {}
+        for symbol, arrays in sorted(candles.items()):
+            if not len(arrays['open_time']):
+                raise ValueError(f"{symbol}: mum verisi boş")
+            filters = derive_filters(float(arrays['close'][0]))
+            self.books[symbol.upper()] = SymbolBook(symbol.upper(), arrays, filters, leverage)
+
+        first = min(int(book.open_time[0]) for book in self.books.values())
+        self.end_time = max(int(book.open_time[-1]) for book in self.books.values()) + MINUTE_MS
+        start_ms = to_ms(start) if start is not None else first + warmup_minutes * MINUTE_MS
+        self.now = min(max(start_ms // MINUTE_MS * MINUTE_MS, first), self.end_time)
+        self.time_shift = time_shift
+
+        self.balance = float(balance)
+        self.maker_fee = maker_fee
+        self.taker_fee = taker_fee
+        self.orders = {}  # Tüm emirler (orderId -> Order)
+        self.next_order_id = 1
+        self.listeners = []  # Kullanıcı verisi olayları için callback(event)
+        self.fills = 0
+        self._lock = threading.RLock()
+
+        for book in self.books.values():
+            book.cursor = int(np.searchsorted(book.open_time, self.now - MINUTE_MS, side='right')) - 1
+
+    @classmethod
+    def from_store(cls, symbols, store=None, start=None, end=None, warmup_minutes=3000, **kwargs):
+        """CandleStore'daki 1m veriden mock borsa oluşturur (start'tan warmup_minutes öncesi geçmiş olarak yüklenir)"""
+        store = store or CandleStore()
+        load_start = to_ms(start) - warmup_minutes * MINUTE_MS if start is not None else None
+        candles = {}
+        for symbol in symbols:
+            df = store.load(symbol, '1m', load_start, end)
+            candles[symbol.upper()] = {
+                'open_time': df['Open time'].to_numpy(dtype=np.int64),
+                'open': df['Open'].to_numpy(dtype=float),
+                'high': df['High'].to_numpy(dtype=float),
+                'low': df['Low'].to_numpy(dtype=float),
+                'close': df['Close'].to_numpy(dtype=float),
+                'volume': df['Volume'].to_numpy(dtype=float),
+            }
+        return cls(candles, start=start, warmup_minutes=warmup_minutes, **kwargs)
+
+    # ------------------------------------------------------------------ saat
+
+    @property
+    def server_time(self):
+        return self.now + self.time_shift
+
+    @property
+    def finished(self):
+        return self.now >= self.end_time
+
+    def advance(self, minutes=1):
+        """Replay saatini ilerletir ve yeni kapanan 1m mumlarda emirleri eşleştirir; işlenen mum sayısını döndürür"""
+        processed = 0
+        with self._lock:
+            for _ in range(int(minutes)):
+                if self.finished:
+                    break
+                self.now += MINUTE_MS
+                for book in self.books.values():
+                    cursor = int(np.searchsorted(book.open_time, self.now - MINUTE_MS, side='right')) - 1
+                    while book.cursor < cursor:
+                        book.cursor += 1
+                        self._match_bar(book, book.cursor)
+                        processed += 1
+        return processed
+
+    def advance_to(self, time_ms):
+        """Saati verilen zamana (dış zaman, time_shift dahil) kadar ilerletir"""
+        minutes = (to_ms(time_ms) - self.time_shift - self.now) // MINUTE_MS
+        return self.advance(minutes) if minutes > 0 else 0
+
+    # ------------------------------------------------------------------ piyasa verisi
+
+    def book(self, symbol):
+        book = self.books.get(str(symbol).upper()) if symbol else None
+        if book is None:
+            raise ExchangeError(-1121, 'Invalid symbol.')
+        return book
+
+    def exchange_info(self):
+        symbols = []
+        for book in self.books.values():
+            symbols.append({
+                'symbol': book.symbol,
+                'pair': book.symbol,
+                'contractType': 'PERPETUAL',
+                'status': 'TRADING',
+                'baseAsset': book.symbol[:-4] if book.symbol.endswith('USDT') else book.symbol,
+                'quoteAsset': 'USDT',
+                'marginAsset': 'USDT',
+                'pricePrecision': book.price_decimals,
+                'quantityPrecision': book.qty_decimals,
+                'orderTypes': list(ORDER_TYPES),
+                'timeInForce': list(TIME_IN_FORCE),
+                'filters': [
+                    {'filterType': 'PRICE_FILTER', 'minPrice': format_number(book.tick_size, 10),
+                     'maxPrice': '10000000', 'tickSize': format_number(book.tick_size, 10)},
+                    {'filterType': 'LOT_SIZE', 'minQty': format_number(book.min_qty, 10),
+                     'maxQty': format_number(book.max_qty), 'stepSize': format_number(book.step_size, 10)},
+                    {'filterType': 'MARKET_LOT_SIZE', 'minQty': format_number(book.min_qty, 10),
+                     'maxQty': format_number(book.max_qty), 'stepSize': format_number(book.step_size, 10)},
+                    {'filterType': 'MIN_NOTIONAL', 'notional': format_number(book.min_notional)},
+                ],
+            })
+        return {'timezone': 'UTC', 'serverTime': self.server_time, 'rateLimits': [], 'assets': [],
+                'symbols': symbols}
+
+    def klines(self, symbol, interval, limit=500, start_time=None, end_time=None):
+        """
+        Kapanmış 1m mumlardan istenen timeframe'de kline listesi üretir
+        - Son kline canlı borsadaki gibi henüz tamamlanmamış (mevcut kova) olabilir
+        """
+        book = self.book(symbol)
+        try:
+            step = interval_ms(interval)
+        except ValueError:
+            raise ExchangeError(-1120, 'Invalid interval.')
+        limit = max(1, min(int(limit or 500), 1500))
+
+        with self._lock:
+            open_time = book.open_time
+            hi = book.cursor + 1
+            if end_time is not None:
+                hi = min(hi, int(np.searchsorted(open_time, int(end_time) - self.time_shift, side='right')))
+            if start_time is not None:
+                first_bucket = -(-(int(start_time) - self.time_shift) // step) * step
+                lo = int(np.searchsorted(open_time, first_bucket, side='left'))
+            elif hi > 0:
+                first_bucket = open_time[hi - 1] // step * step - (limit - 1) * step
+                lo = int(np.searchsorted(open_time, first_bucket, side='left'))
+            else:
+                lo = hi
+            if lo >= hi:
+                return []
+
+            bucket = open_time[lo:hi] // step * step
+            starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+            if len(starts) > limit:
+                # startTime verildiyse ilk, verilmediyse son `limit` kline
+                if start_time is not None:
+                    hi = lo + int(starts[limit])
+                    bucket, starts = bucket[:hi - lo], starts[:limit]
+                else:
+                    lo += int(starts[-limit])
+                    bucket, starts = bucket[starts[-limit]:], starts[-limit:] - starts[-limit]
+            ends = np.r_[starts[1:], len(bucket)] - 1
+
+            highs = np.maximum.reduceat(book.high[lo:hi], starts)
+            lows = np.minimum.reduceat(book.low[lo:hi], starts)
+            volumes = np.add.reduceat(book.volume[lo:hi], starts)
+            opens = book.open[lo:hi][starts]
+            closes = book.close[lo:hi][ends]
+            counts = ends - starts + 1
+
+        decimals = book.price_decimals
+        rows = []
+        for i, open_ms in enumerate(bucket[starts]):
+            open_ms = int(open_ms) + self.time_shift
+            rows.append([
+                open_ms,
+                format_number(opens[i], decimals), format_number(highs[i], decimals),
+                format_number(lows[i], decimals), format_number(closes[i], decimals),
+                format_number(volumes[i], 3),
+                open_ms + step - 1,
+                format_number(volumes[i] * closes[i], 4),
+                int(counts[i]), '0', '0', '0',
+            ])
+        return rows
+
+    def ticker(self, symbol=None):
+        with self._lock:
+            books = [self.book(symbol)] if symbol else list(self.books.values())
+            tickers = [{'symbol': book.symbol, 'price': format_number(book.price, book.price_decimals),
+                        'time': self.server_time} for book in books]
+        return tickers[0] if symbol else tickers
+
+    def mark_price(self, symbol=None):
+        with self._lock:
+            books = [self.book(symbol)] if symbol else list(self.books.values())
+            marks = [{'symbol': book.symbol, 'markPrice': format_number(book.price, book.price_decimals),
+                      'indexPrice': format_number(book.price, book.price_decimals), 'lastFundingRate': '0',
+                      'interestRate': '0', 'nextFundingTime': 0, 'time': self.server_time} for book in books]
+        return marks[0] if symbol else marks
+
+    # ------------------------------------------------------------------ hesap
+
+    def set_leverage(self, symbol, leverage):
+        book = self.book(symbol)
+        try:
+            leverage = int(leverage)
+        except (TypeError, ValueError):
+            raise ExchangeError(-1102, "Mandatory parameter 'leverage' was not sent, was empty/null, or malformed.")
+        if not 1 <= leverage <= 125:
+            raise ExchangeError(-4028, 'Leverage is not valid')
+        with self._lock:
+            book.leverage = leverage
+        return {'leverage': leverage, 'maxNotionalValue': '1000000', 'symbol': book.symbol}
+
+    def _used_margin(self):
+        return sum(abs(book.position_amt) * book.price / book.leverage for book in self.books.values())
+
+    def _unrealized(self):
+        return sum(book.unrealized_pnl() for book in self.books.values())
+
+    def available_balance(self):
+        return self.balance + self._unrealized() - self._used_margin()
+
+    def positions(self, symbol=None):
+        with self._lock:
+            books = [self.book(symbol)] if symbol else list(self.books.values())
+            result = []
+            for book in books:
+                result.append({
+                    'symbol': book.symbol,
+                    'positionAmt': format_number(book.position_amt, book.qty_decimals),
+                    'entryPrice': format_number(book.entry_price, 8),
+                    'breakEvenPrice': format_number(book.entry_price, 8),
+                    'markPrice': format_number(book.price, 8),
+                    'unRealizedProfit': format_number(book.unrealized_pnl(), 8),
+                    'liquidationPrice': '0',
+                    'leverage': str(book.leverage),
+                    'maxNotionalValue': '1000000',
+                    'marginType': 'cross',
+                    'isolatedMargin': '0.00000000',
+                    'isAutoAddMargin': 'false',
+                    'positionSide': 'BOTH',
+                    'notional': format_number(book.position_amt * book.price, 8),
+                    'isolatedWallet': '0',
+                    'updateTime': book.update_time + self.time_shift if book.update_time else 0,
+                })
+        return result
+
+    def account_balance(self):
+        with self._lock:
+            unrealized = self._unrealized()
+            available = self.available_balance()
+            return [{
+                'accountAlias': 'mock', 'asset': 'USDT', 'balance': format_number(self.balance),
+                'crossWalletBalance': format_number(self.balance), 'crossUnPnl': format_number(unrealized),
+                'availableBalance': format_number(available), 'maxWithdrawAmount': format_number(max(available, 0)),
+                'marginAvailable': True, 'updateTime': self.server_time,
+            }]
+
+    def account(self):
+        with self._lock:
+            unrealized = self._unrealized()
+            used = self._used_margin()
+            available = self.available_balance()
+            return {
+                'feeTier': 0, 'canTrade': True, 'canDeposit': True, 'canWithdraw': True,
+                'updateTime': self.server_time,
+                'totalInitialMargin': format_number(used),
+                'totalMaintMargin': '0',
+                'totalWalletBalance': format_number(self.balance),
+                'totalUnrealizedProfit': format_number(unrealized),
+                'totalMarginBalance': format_number(self.balance + unrealized),
+                'totalPositionInitialMargin': format_number(used),
+                'totalOpenOrderInitialMargin': '0',
+                'totalCrossWalletBalance': format_number(self.balance),
+                'totalCrossUnPnl': format_number(unrealized),
+                'availableBalance': format_number(available),
+                'maxWithdrawAmount': format_number(max(available, 0)),
+                'assets': self.account_balance(),
+                'positions': self.positions(),
+            }
+
+    # ------------------------------------------------------------------ emirler
+
+    def _parse_float(self, params, name, required=False):
+        value = params.get(name)
+        if value in (None, ''):
+            if required:
+                raise ExchangeError(-1102, f"Mandatory parameter '{name}' was not sent, was empty/null, or malformed.")
+            return None
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            raise ExchangeError(-1102, f"Mandatory parameter '{name}' was not sent, was empty/null, or malformed.")
+
+    @staticmethod
+    def _parse_bool(value):
+        return str(value).lower() == 'true'
+
+    @staticmethod
+    def _check_step(value, step, name):
+        units = value / step
+        if abs(units - round(units)) > 1e-6:
+            raise ExchangeError(-1111, f'Precision is over the maximum defined for this asset ({name}).')
+
+    def create_order(self, params):
+        """Binance POST /fapi/v1/order parametreleriyle emir oluşturur"""
+        book = self.book(params.get('symbol'))
+        side = str(params.get('side', '')).upper()
+        if side not in ('BUY', 'SELL'):
+            raise ExchangeError(-1117, 'Invalid side.')
+        type = str(params.get('type', '')).upper()
+        if type not in ORDER_TYPES:
+            raise ExchangeError(-1116, 'Invalid orderType.')
+
+        close_position = self._parse_bool(params.get('closePosition'))
+        reduce_only = self._parse_bool(params.get('reduceOnly')) or close_position
+        if close_position and type not in CONDITIONAL_TYPES:
+            raise ExchangeError(-4136, 'Target strategy invalid for orderType MARKET,closePosition true')
+        quantity = self._parse_float(params, 'quantity', required=not close_position)
+        price = self._parse_float(params, 'price', required=type == 'LIMIT')
+        stop_price = self._parse_float(params, 'stopPrice', required=type in CONDITIONAL_TYPES)
+        time_in_force = str(params.get('timeInForce') or 'GTC').upper()
+        if type == 'LIMIT' and time_in_force not in TIME_IN_FORCE:
+            raise ExchangeError(-1115, 'Invalid timeInForce.')
+
+        if quantity is not None:
+            if quantity <= 0:
+                raise ExchangeError(-4003, 'Quantity less than or equal to zero.')
+            self._check_step(quantity, book.step_size, 'quantity')
+            if quantity < book.min_qty - 1e-12 or quantity > book.max_qty:
+                raise ExchangeError(-1013, 'Filter failure: LOT_SIZE')
+        for name, value in (('price', price), ('stopPrice', stop_price)):
+            if value is not None:
+                if value <= 0:
+                    raise ExchangeError(-4001, 'Price less than 0.')
+                self._check_step(value, book.tick_size, name)
+
+        with self._lock:
+            client_order_id = params.get('newClientOrderId')
+            if client_order_id and any(o.client_order_id == client_order_id and o.is_open
+                                       for o in book.orders.values()):
+                raise ExchangeError(-4015, 'Client order id is not valid.')
+
+            market = book.price
+            if type == 'STOP_MARKET':
+                if (side == 'BUY' and stop_price <= market) or (side == 'SELL' and stop_price >= market):
+                    raise ExchangeError(-2021, 'Order would immediately trigger.')
+            elif type == 'TAKE_PROFIT_MARKET':
+                if (side == 'BUY' and stop_price >= market) or (side == 'SELL' and stop_price <= market):
+                    raise ExchangeError(-2021, 'Order would immediately trigger.')
+
+            marketable = type == 'MARKET' or (type == 'LIMIT' and (
+                (side == 'BUY' and price >= market) or (side == 'SELL' and price <= market)))
+            if type == 'LIMIT' and time_in_force == 'GTX' and marketable:
+                raise ExchangeError(-5022, 'Due to the order could not be executed as maker, the Post Only order '
+                                           'will be rejected.')
+            if marketable:
+                fill_qty = self._fill_quantity(book, side, quantity, reduce_only, close_position)
+                if fill_qty is None:
+                    raise ExchangeError(-2022, 'ReduceOnly Order is rejected.')
+                if self._increases_exposure(book, side) and \
+                        fill_qty * market / book.leverage > self.available_balance() + 1e-9:
+                    raise ExchangeError(-2019, 'Margin is insufficient.')
+
+            order_id = self.next_order_id
+            self.next_order_id += 1
+            order = Order(order_id, client_order_id or f"mock_{order_id}", book.symbol, side, type, quantity,
+                          price, stop_price, time_in_force, reduce_only, close_position, self.now)
+            self.orders[order_id] = order
+            self._emit_order(order, 'NEW')
+
+            if marketable:
+                self._fill(book, order, market, maker=False, time=self.now)
+            elif type == 'LIMIT' and time_in_force in ('IOC', 'FOK'):
+                self._finish(order, 'EXPIRED', self.now)
+            else:
+                book.orders[order_id] = order
+            return self.order_response(order)
+
+    def _find_order(self, params):
+        book = self.book(params.get('symbol'))
+        order_id = params.get('orderId')
+        client_order_id = params.get('origClientOrderId')
+        if order_id in (None, '') and not client_order_id:
+            raise ExchangeError(-1102, "Param 'origClientOrderId' or 'orderId' must be sent, but both were empty/null!")
+        if order_id not in (None, ''):
+            try:
+                order = self.orders.get(int(order_id))
+            except (TypeError, ValueError):
+                order = None
+        else:
+            order = next((o for o in reversed(list(self.orders.values()))
+                          if o.client_order_id == client_order_id), None)
+        if order is None or order.symbol != book.symbol:
+            raise ExchangeError(-2013, 'Order does not exist.')
+        return book, order
+
+    def get_order(self, params):
+        with self._lock:
+            _, order = self._find_order(params)
+            return self.order_response(order, include_time=True)
+
+    def cancel_order(self, params):
+        with self._lock:
+            book, order = self._find_order(params)
+            if not order.is_open:
+                raise ExchangeError(-2011, 'Unknown order sent.')
+            book.orders.pop(order.order_id, None)
+            self._finish(order, 'CANCELED', self.now)
+            return self.order_response(order)
+
+    def cancel_all_orders(self, symbol):
+        book = self.book(symbol)
+        with self._lock:
+            for order in list(book.orders.values()):
+                self._finish(order, 'CANCELED', self.now)
+            book.orders.clear()
+        return {'code': 200, 'msg': 'The operation of cancel all open order is done.'}
+
+    def open_orders(self, symbol=None):
+        with self._lock:
+            books = [self.book(symbol)] if symbol else list(self.books.values())
+            return [self.order_response(order, include_time=True)
+                    for book in books for order in book.orders.values()]
+
+    def all_orders(self, symbol, limit=500):
+        book = self.book(symbol)
+        with self._lock:
+            orders = [o for o in self.orders.values() if o.symbol == book.symbol][-int(limit or 500):]
+            return [self.order_response(order, include_time=True) for order in orders]
+
+    def order_response(self, order, include_time=False):
+        book = self.books[order.symbol]
+        price_decimals = book.price_decimals
+        response = {
+            'orderId': order.order_id,
+            'symbol': order.symbol,
+            'status': order.status,
+            'clientOrderId': order.client_order_id,
+            'price': format_number(order.price or 0, price_decimals),
+            'avgPrice': format_number(order.avg_price, 8),
+            'origQty': format_number(order.quantity or 0, book.qty_decimals),
+            'executedQty': format_number(order.executed_qty, book.qty_decimals),
+            'cumQty': format_number(order.executed_qty, book.qty_decimals),
+            'cumQuote': format_number(order.executed_qty * order.avg_price, 8),
+            'timeInForce': order.time_in_force,
+            'type': order.type,
+            'reduceOnly': order.reduce_only,
+            'closePosition': order.close_position,
+            'side': order.side,
+            'positionSide': 'BOTH',
+            'stopPrice': format_number(order.stop_price or 0, price_decimals),
+            'workingType': 'CONTRACT_PRICE',
+            'priceProtect': False,
+            'origType': order.type,
+            'updateTime': order.update_time + self.time_shift,
+        }
+        if include_time:
+            response['time'] = order.time + self.time_shift
+        return response
+
+    # ------------------------------------------------------------------ eşleştirme
+
+    def _match_bar(self, book, index):
+        """Bir 1m mumda tetiklenen emirleri fiyat yolu sırasına göre doldurur"""
+        if not book.orders:
+            return
+        o, h, l, c = book.open[index], book.high[index], book.low[index], book.close[index]
+        path = (o, l, h, c) if c >= o else (o, h, l, c)
+        bar_time = int(book.open_time[index])
+
+        triggered = []
+        for order in book.orders.values():
+            level, direction = order.trigger()
+            position = self._trigger_position(path, level, direction)
+            if position is not None:
+                triggered.append((position, order.order_id, order, level))
+        if not triggered:
+            return
+
+        total = sum(abs(b - a) for a, b in zip(path, path[1:])) or 1.0
+        for position, _, order, level in sorted(triggered):
+            book.orders.pop(order.order_id, None)
+            fill_time = bar_time + int(position / total * (MINUTE_MS - 1))
+            fill_price = o if position == 0 else level
+            if order.type == 'LIMIT':
+                # Açılışta zaten geçilmiş limit daha iyi fiyattan (açılış) dolar
+                fill_price = min(level, o) if order.side == 'BUY' else max(level, o)
+            fill_qty = self._fill_quantity(book, order.side, order.quantity, order.reduce_only, order.close_position)
+            if fill_qty is None or (self._increases_exposure(book, order.side) and
+                                    fill_qty * fill_price / book.leverage > self.available_balance() + 1e-9):
+                self._finish(order, 'EXPIRED', fill_time)
+                continue
+            self._fill(book, order, fill_price, maker=order.type == 'LIMIT', time=fill_time)
+
+    @staticmethod
+    def _trigger_position(path, level, direction):
+        """Fiyat yolunda tetik seviyesine ulaşılan mesafe (0: açılışta), ulaşılmıyorsa None"""
+        if (direction == 'down' and path[0] <= level) or (direction == 'up' and path[0] >= level):
+            return 0.0
+        travelled = 0.0
+        for a, b in zip(path, path[1:]):
+            if (direction == 'down' and b <= level) or (direction == 'up' and b >= level):
+                return travelled + abs(a - level)
+            travelled += abs(b - a)
+        return None
+
+    @staticmethod
+    def _increases_exposure(book, side):
+        return book.position_amt == 0 or (book.position_amt > 0) == (side == 'BUY')
+
+    @staticmethod
+    def _fill_quantity(book, side, quantity, reduce_only, close_position):
+        """Dolacak miktar; reduceOnly emir pozisyonu büyütecekse None"""
+        if not reduce_only:
+            return quantity
+        position = book.position_amt
+        if position == 0 or (position > 0) == (side == 'BUY'):
+            return None
+        return abs(position) if close_position else min(quantity, abs(position))
+
+    def _fill(self, book, order, price, maker, time):
+        quantity = self._fill_quantity(book, order.side, order.quantity, order.reduce_only, order.close_position)
+        signed = quantity if order.side == 'BUY' else -quantity
+        position = book.position_amt
+
+        realized = 0.0
+        if position and (position > 0) != (signed > 0):
+            closed = min(abs(position), abs(signed))
+            realized = closed * (price - book.entry_price) * (1 if position > 0 else -1)
+        new_position = round(position + signed, 12)
+        if new_position == 0:
+            book.entry_price = 0.0
+        elif position == 0 or (position > 0) != (new_position > 0):
+            book.entry_price = price  # Yeni veya ters yöne dönen pozisyon
+        elif (position > 0) == (signed > 0):
+            book.entry_price = (abs(position) * book.entry_price + quantity * price) / abs(new_position)
+        book.position_amt = new_position
+        book.update_time = time
+
+        commission = quantity * price * (self.maker_fee if maker else self.taker_fee)
+        self.balance += realized - commission
+        self.fills += 1
+
+        order.executed_qty = quantity
+        order.avg_price = price
+        order.maker = maker
+        order.status = 'FILLED'
+        order.update_time = time
+        self._emit_order(order, 'TRADE', last_qty=quantity, last_price=price, commission=commission,
+                         realized=realized)
+        self._emit_account(book, time)
+        logging.debug(f"Mock borsa: {book.symbol} {order.type} {order.side} {quantity} @ {price} doldu "
+                      f"(pozisyon {new_position})")
+
+    def _finish(self, order, status, time):
+        order.status = status
+        order.update_time = time
+        self._emit_order(order, status)
+
+    # ------------------------------------------------------------------ kullanıcı verisi olayları
+
+    def _emit(self, event):
+        for listener in list(self.listeners):
+            try:
+                listener(event)
+            except Exception as e:
+                logging.error(f"Mock borsa olay dinleyicisi hatası: {e}")
+
+    def _emit_order(self, order, execution_type, last_qty=0.0, last_price=0.0, commission=0.0, realized=0.0):
+        if not self.listeners:
+            return
+        book = self.books[order.symbol]
+        time = order.update_time + self.time_shift
+        self._emit({
+            'e': 'ORDER_TRADE_UPDATE', 'E': time, 'T': time,
+            'o': {
+                's': order.symbol, 'c': order.client_order_id, 'S': order.side, 'o': order.type,
+                'f': order.time_in_force, 'q': format_number(order.quantity or 0, book.qty_decimals),
+                'p': format_number(order.price or 0, book.price_decimals), 'ap': format_number(order.avg_price, 8),
+                'sp': format_number(order.stop_price or 0, book.price_decimals), 'x': execution_type,
+                'X': order.status, 'i': order.order_id, 'l': format_number(last_qty, book.qty_decimals),
+                'z': format_number(order.executed_qty, book.qty_decimals), 'L': format_number(last_price, 8),
+                'N': 'USDT', 'n': format_number(commission), 'T': time, 't': order.order_id if last_qty else 0,
+                'm': order.maker, 'R': order.reduce_only, 'wt': 'CONTRACT_PRICE', 'ot': order.type,
+                'ps': 'BOTH', 'cp': order.close_position, 'rp': format_number(realized),
+            },
+        })
+
+    def _emit_account(self, book, time):
+        if not self.listeners:
+            return
+        time += self.time_shift
+        self._emit({
+            'e': 'ACCOUNT_UPDATE', 'E': time, 'T': time,
+            'a': {
+                'm': 'ORDER',
+                'B': [{'a': 'USDT', 'wb': format_number(self.balance), 'cw': format_number(self.balance),
+                       'bc': '0'}],
+                'P': [{'s': book.symbol, 'pa': format_number(book.position_amt, book.qty_decimals),
+                       'ep': format_number(book.entry_price, 8), 'cr': '0',
+                       'up': format_number(book.unrealized_pnl(), 8), 'mt': 'cross', 'iw': '0',
+                       'ps': 'BOTH'}],
+            },
+        })
+
+    def kline_event(self, symbol, interval):
+        """<sembol>@kline_<interval> akışı için güncel (henüz kapanmamış olabilir) kline olayı"""
+        rows = self.klines(symbol, interval, limit=1)
+        if not rows:
+            return None
+        k = rows[0]
+        return {
+            'e': 'kline', 'E': self.server_time, 's': symbol.upper(),
+            'k': {'t': k[0], 'T': k[6], 's': symbol.upper(), 'i': interval, 'o': k[1], 'c': k[4], 'h': k[2],
+                  'l': k[3], 'v': k[5], 'n': k[8], 'x': k[6] < self.server_time, 'q': k[7]},
+        }
+
+    def state(self):
+        """Replay saati, bakiye ve emir özetleri"""
+        with self._lock:
+            return {
+                'server_time': self.server_time,
+                'finished': self.finished,
+                'balance': round(self.balance, 8),
+                'unrealized_pnl': round(self._unrealized(), 8),
+                'orders': len(self.orders),
+                'open_orders': sum(len(book.orders) for book in self.books.values()),
+                'fills': self.fills,
+                'positions': {book.symbol: book.position_amt for book in self.books.values() if book.position_amt},
+            }
@@ -0,0 +1,374 @@
+import asyncio
+import json
+import logging
+import random
+import secrets
+import threading
+import time
+from collections import Counter
+
+from aiohttp import WSMsgType, web
+
+from .engine import ExchangeError
+
+# Hata enjeksiyonunda döndürülen gerçek Binance hataları: (HTTP durum kodu, hata kodu, mesaj)
+INJECTED_ERRORS = (
+    (500, -1001, 'Internal error; unable to process your request. Please try again.'),
+    (503, -1007, 'Timeout waiting for response from backend server. Send status unknown; execution status unknown.'),
+    (429, -1003, 'Too many requests; current limit is 2400 requests per minute.'),
+    (400, -1021, "Timestamp for this request is outside of the recvWindow."),
+)
+
+
+class MockBinanceServer:
+    """
+    MockExchange'i Binance Futures REST / WebSocket API'si olarak sunan yerel sunucu
+    - REST: python-binance'in kullandığı /api/v3 ve /fapi/v1, /fapi/v2 uç noktaları (imza kontrol edilmez)
+    - WebSocket: /ws/<listenKey> kullanıcı verisi (ORDER_TRADE_UPDATE, ACCOUNT_UPDATE) ve
+      /ws/<sembol>@kline_<interval> mum akışı
+    - Telegram: /bot<token>/sendMessage bildirimleri gönderilmeden sayılır (TELEGRAM_API_URL)
+    - Her isteğe sabit gecikme + rastgele sapma, seçilen yollarda belirli oranda Binance hata cevabı eklenebilir
+      (aynı seed ile aynı hata dizisi)
+    - speed > 0 ise replay saati gerçek zamanın speed katı hızla kendiliğinden ilerler (60: saniyede bir dakika),
+      speed = 0 ise saat sadece POST /mock/advance ile ilerler
+    """
+
+    def __init__(self, exchange, host='127.0.0.1', port=0, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0,
+                 error_paths=None, speed=0.0, seed=0):
+        self.exchange = exchange
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_paths = tuple(error_paths or ('/fapi/',))
+        self.speed = speed
+        self.rng = random.Random(seed)
+
+        self.request_counts = Counter()  # (metod, yol) -> istek sayısı
+        self.injected_errors = 0
+        self.telegram_messages = 0
+        self.started_at = None
+        self._listen_keys = {}  # listenKey -> son keepalive zamanı
+        self._subscribers = {}  # akış adı -> {asyncio.Queue}
+        self._loop = None
+        self._runner = None
+        self._clock_task = None
+        self._thread = None
+        self._ready = threading.Event()
+        self._stopped = None
+
+        exchange.listeners.append(self._on_user_event)
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def stream_url(self):
+        return f"ws://{self.host}:{self.port}/"
+
+    # ------------------------------------------------------------------ uygulama
+
+    def build_app(self):
+        app = web.Application(middlewares=[self._middleware])
+        routes = [
+            ('GET', '/api/v3/ping', self.ping),
+            ('GET', '/api/v3/time', self.server_time),
+            ('GET', '/fapi/v1/ping', self.ping),
+            ('GET', '/fapi/v1/time', self.server_time),
+            ('GET', '/fapi/v1/exchangeInfo', self.exchange_info),
+            ('GET', '/fapi/v1/klines', self.klines),
+            ('GET', '/fapi/v1/ticker/price', self.ticker),
+            ('GET', '/fapi/v1/premiumIndex', self.mark_price),
+            ('POST', '/fapi/v1/order', self.create_order),
+            ('GET', '/fapi/v1/order', self.get_order),
+            ('DELETE', '/fapi/v1/order', self.cancel_order),
+            ('GET', '/fapi/v1/openOrders', self.open_orders),
+            ('GET', '/fapi/v1/allOrders', self.all_orders),
+            ('DELETE', '/fapi/v1/allOpenOrders', self.cancel_all_orders),
+            ('POST', '/fapi/v1/leverage', self.leverage),
+            ('GET', '/fapi/v2/positionRisk', self.position_risk),
+            ('GET', '/fapi/v2/balance', self.balance),
+            ('GET', '/fapi/v2/account', self.account),
+            ('POST', '/fapi/v1/listenKey', self.create_listen_key),
+            ('PUT', '/fapi/v1/listenKey', self.keepalive_listen_key),
+            ('DELETE', '/fapi/v1/listenKey', self.close_listen_key),
+            ('GET', '/ws/{stream}', self.websocket),
+            ('POST', '/bot{token}/sendMessage', self.telegram_message),
+            ('GET', '/mock/state', self.mock_state),
+            ('POST', '/mock/advance', self.mock_advance),
+            ('POST', '/mock/config', self.mock_config),
+        ]
+        for method, path, handler in routes:
+            app.router.add_route(method, path, handler)
+        return app
+
+    @web.middleware
+    async def _middleware(self, request, handler):
+        path = request.path
+        # Yol parametreli uç noktalar (listenKey, bot token) tek satırda sayılır
+        resource = request.match_info.route.resource
+        self.request_counts[(request.method, resource.canonical if resource is not None else path)] += 1
+        if path.startswith('/mock/'):
+            return await handler(request)
+
+        delay = self.latency_ms + (self.rng.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        if self.error_rate > 0 and path.startswith(self.error_paths) and self.rng.random() < self.error_rate:
+            status, code, msg = self.rng.choice(INJECTED_ERRORS)
+            self.injected_errors += 1
+            return web.json_response({'code': code, 'msg': msg}, status=status)
+
+        try:
+            return await handler(request)
+        except ExchangeError as e:
+            return web.json_response({'code': e.code, 'msg': e.msg}, status=e.status)
+
+    @staticmethod
+    async def _params(request):
+        """Sorgu parametreleri ve form gövdesi (python-binance POST / DELETE parametrelerini gövdede gönderir)"""
+        params = dict(request.query)
+        if request.can_read_body:
+            params.update(await request.post())
+        return params
+
+    # ------------------------------------------------------------------ REST
+
+    async def ping(self, request):
+        return web.json_response({})
+
+    async def server_time(self, request):
+        return web.json_response({'serverTime': self.exchange.server_time})
+
+    async def exchange_info(self, request):
+        return web.json_response(self.exchange.exchange_info())
+
+    async def klines(self, request):
+        params = await self._params(request)
+        start_time = params.get('startTime')
+        end_time = params.get('endTime')
+        return web.json_response(self.exchange.klines(
+            params.get('symbol'), params.get('interval'), params.get('limit', 500),
+            int(start_time) if start_time else None, int(end_time) if end_time else None,
+        ))
+
+    async def ticker(self, request):
+        params = await self._params(request)
+        return web.json_response(self.exchange.ticker(params.get('symbol')))
+
+    async def mark_price(self, request):
+        params = await self._params(request)
+        return web.json_response(self.exchange.mark_price(params.get('symbol')))
+
+    async def create_order(self, request):
+        return web.json_response(self.exchange.create_order(await self._params(request)))
+
+    async def get_order(self, request):
+        return web.json_response(self.exchange.get_order(await self._params(request)))
+
+    async def cancel_order(self, request):
+        return web.json_response(self.exchange.cancel_order(await self._params(request)))
+
+    async def open_orders(self, request):
+        params = await self._params(request)
+        return web.json_response(self.exchange.open_orders(params.get('symbol')))
+
+    async def all_orders(self, request):
+        params = await self._params(request)
+        return web.json_response(self.exchange.all_orders(params.get('symbol'), params.get('limit', 500)))
+
+    async def cancel_all_orders(self, request):
+        params = await self._params(request)
+        return web.json_response(self.exchange.cancel_all_orders(params.get('symbol')))
+
+    async def leverage(self, request):
+        params = await self._params(request)
+        return web.json_response(self.exchange.set_leverage(params.get('symbol'), params.get('leverage')))
+
+    async def position_risk(self, request):
+        params = await self._params(request)
+        return web.json_response(self.exchange.positions(params.get('symbol')))
+
+    async def balance(self, request):
+        return web.json_response(self.exchange.account_balance())
+
+    async def account(self, request):
+        return web.json_response(self.exchange.account())
+
+    async def create_listen_key(self, request):
+        listen_key = secrets.token_hex(32)
+        self._listen_keys[listen_key] = time.time()
+        return web.json_response({'listenKey': listen_key})
+
+    async def keepalive_listen_key(self, request):
+        params = await self._params(request)
+        listen_key = params.get('listenKey')
+        if listen_key not in self._listen_keys:
+            raise ExchangeError(-1125, 'This listenKey does not exist.')
+        self._listen_keys[listen_key] = time.time()
+        return web.json_response({})
+
+    async def close_listen_key(self, request):
+        params = await self._params(request)
+        self._listen_keys.pop(params.get('listenKey'), None)
+        return web.json_response({})
+
+    async def telegram_message(self, request):
+        """Telegram sendMessage yerine geçer (TELEGRAM_API_URL ile yönlendirilen bildirimler sadece sayılır)"""
+        params = await self._params(request)
+        self.telegram_messages += 1
+        return web.json_response({'ok': True, 'result': {'message_id': self.telegram_messages,
+                                                         'chat': {'id': params.get('chat_id')},
+                                                         'text': params.get('text', '')}})
+
+    # ------------------------------------------------------------------ WebSocket
+
+    async def websocket(self, request):
+        stream = request.match_info['stream']
+        if stream not in self._listen_keys and '@kline_' not in stream:
+            raise ExchangeError(-1125, 'This listenKey does not exist.')
+
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+        queue = asyncio.Queue()
+        self._subscribers.setdefault(stream, set()).add(queue)
+
+        async def forward():
+            while True:
+                await ws.send_str(json.dumps(await queue.get()))
+
+        sender = asyncio.ensure_future(forward())
+        try:
+            async for message in ws:
+                if message.type in (WSMsgType.ERROR, WSMsgType.CLOSE):
+                    break
+        finally:
+            sender.cancel()
+            self._subscribers[stream].discard(queue)
+        return ws
+
+    def _publish(self, stream, event):
+        for queue in self._subscribers.get(stream, ()):
+            queue.put_nowait(event)
+
+    def _on_user_event(self, event):
+        """Eşleştirme motorundan gelen kullanıcı verisi olayını tüm listenKey akışlarına iletir"""
+        if self._loop is None:
+            return
+        for listen_key in self._listen_keys:
+            if listen_key in self._subscribers:
+                self._loop.call_soon_threadsafe(self._publish, listen_key, event)
+
+    def _publish_klines(self):
+        for stream in list(self._subscribers):
+            if '@kline_' not in stream or not self._subscribers[stream]:
+                continue
+            symbol, interval = stream.split('@kline_', 1)
+            try:
+                event = self.exchange.kline_event(symbol, interval)
+            except ExchangeError:
+                continue
+            if event is not None:
+                self._publish(stream, event)
+
+    # ------------------------------------------------------------------ replay saati ve yönetim
+
+    async def _run_clock(self):
+        interval = 60.0 / self.speed
+        next_tick = time.monotonic() + interval
+        while not self.exchange.finished:
+            await asyncio.sleep(max(0.0, next_tick - time.monotonic()))
+            next_tick += interval
+            self.exchange.advance(1)
+            self._publish_klines()
+        logging.info("Mock borsa: replay verisi bitti")
+
+    async def mock_state(self, request):
+        state = self.exchange.state()
+        elapsed = time.time() - self.started_at if self.started_at else 0.0
+        state.update({
+            'requests': sum(self.request_counts.values()),
+            'requests_per_minute': round(sum(self.request_counts.values()) / elapsed * 60, 1) if elapsed else 0.0,
+            'injected_errors': self.injected_errors,
+            'telegram_messages': self.telegram_messages,
+            'endpoints': {f"{method} {path}": count for (method, path), count in sorted(self.request_counts.items())},
+        })
+        return web.json_response(state)
+
+    async def mock_advance(self, request):
+        params = await self._params(request)
+        if params.get('time'):
+            processed = self.exchange.advance_to(int(params['time']))
+        else:
+            processed = self.exchange.advance(int(params.get('minutes', 1)))
+        self._publish_klines()
+        return web.json_response({'processed_bars': processed, 'server_time': self.exchange.server_time,
+                                  'finished': self.exchange.finished})
+
+    async def mock_config(self, request):
+        """Gecikme ve hata enjeksiyonunu çalışma sırasında değiştirir"""
+        params = await self._params(request)
+        for name in ('latency_ms', 'jitter_ms', 'error_rate'):
+            if name in params:
+                setattr(self, name, float(params[name]))
+        if 'error_paths' in params:
+            self.error_paths = tuple(path for path in params['error_paths'].split(',') if path)
+        return web.json_response({'latency_ms': self.latency_ms, 'jitter_ms': self.jitter_ms,
+                                  'error_rate': self.error_rate, 'error_paths': list(self.error_paths)})
+
+    # ------------------------------------------------------------------ çalıştırma
+
+    async def _start(self):
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        self._runner = web.AppRunner(self.build_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        # port=0 verildiyse işletim sisteminin atadığı portu kullan
+        self.port = self._runner.addresses[0][1]
+        self.started_at = time.time()
+        if self.speed > 0:
+            self._clock_task = asyncio.ensure_future(self._run_clock())
+        logging.info(f"Mock Binance sunucusu çalışıyor: {self.base_url} (replay hızı: {self.speed or 'manuel'})")
+
+    async def _serve(self):
+        await self._start()
+        self._ready.set()
+        try:
+            await self._stopped.wait()
+        finally:
+            if self._clock_task is not None:
+                self._clock_task.cancel()
+            await self._runner.cleanup()
+
+    def serve_forever(self):
+        """Sunucuyu mevcut thread'de çalıştırır (Ctrl+C ile durur)"""
+        try:
+            asyncio.run(self._serve())
+        except KeyboardInterrupt:
+            pass
+
+    def start(self):
+        """Sunucuyu arka plan thread'inde başlatır ve base URL'yi döndürür (testler ve benchmarklar için)"""
+        self._thread = threading.Thread(target=lambda: asyncio.run(self._serve()), name='mock-binance', daemon=True)
+        self._thread.start()
+        if not self._ready.wait(timeout=10):
+            raise RuntimeError("Mock Binance sunucusu başlatılamadı")
+        return self.base_url
+
+    def stop(self):
+        if self._loop is not None and self._stopped is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+            self._thread = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -0,0 +1,20 @@
+"""
+Recording package.
+
+Canlı oturumların kaydı ve deterministik replay'i. SESSION_RECORD_DIR
+verildiğinde Binance REST istekleri, Telegram mesajları ve koordinatörden
+gelen kline verisi zaman damgalarıyla sıkıştırılmış kayıt dosyasına yazılır.
+Replay (recording.replay) botları bu kayıttan gerçek veya en yüksek hızda
+besler; hata ayıklama ve trade_logic performans ölçümü için kullanılır.
+"""
+
+from .log import Event, LogWriter, read_log
+from .recorder import SessionRecorder, get_recorder
+
+__all__ = [
+    'Event',
+    'LogWriter',
+    'read_log',
+    'SessionRecorder',
+    'get_recorder',
+]
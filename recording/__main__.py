@@ -0,0 +1,119 @@
+"""
+Oturum kaydı komut satırı aracı
+
+Kayıt almak için botları SESSION_RECORD_DIR ile çalıştırın:
+    SESSION_RECORD_DIR=data/recordings python runner.py BTCUSDT ETHUSDT
+
+Kullanım:
+    python -m recording info data/recordings/session_20250101_120000_1234.rec
+    python -m recording replay data/recordings/session_...rec BTCUSDT ETHUSDT              # en yüksek hız
+    python -m recording replay data/recordings/session_...rec BTCUSDT --speed 1            # gerçek zaman
+    python -m recording replay data/recordings/session_...rec BTCUSDT:15m:atr_strategy --output rapor.json
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+from collections import Counter
+from datetime import datetime
+
+from benchmark.report import write_report
+from core.runner import BotSpec
+from recording.log import KIND_NAMES, META, REST, STREAM, TELEGRAM, read_log
+
+REPORT_DIR = os.path.join('data', 'benchmarks')
+
+
+def cmd_info(args):
+    kinds, endpoints, errors = Counter(), Counter(), Counter()
+    first = last = None
+    meta = {}
+    for event in read_log(args.recording):
+        first = event.time if first is None else min(first, event.time)
+        last = event.time if last is None else max(last, event.time)
+        kinds[KIND_NAMES.get(event.kind, event.kind)] += 1
+        if event.kind == META:
+            meta = event.payload
+        elif event.kind == REST:
+            endpoints[f"{event.payload['method']} {event.payload['path']}"] += 1
+            if event.payload.get('error'):
+                errors[event.payload['error']] += 1
+        elif event.kind == TELEGRAM and event.payload.get('error'):
+            errors[f"telegram {event.payload['error']}"] += 1
+        elif event.kind == STREAM:
+            endpoints[f"stream {event.payload['stream']} {event.payload['symbol']}"] += 1
+
+    if first is None:
+        print("Kayıt boş")
+        return
+    print(f"Komut:  {' '.join(meta.get('argv', []))}")
+    print(f"Aralık: {datetime.fromtimestamp(first):%Y-%m-%d %H:%M:%S} - {datetime.fromtimestamp(last):%H:%M:%S} "
+          f"({last - first:.0f} sn)")
+    print("Olaylar: " + ", ".join(f"{kind}={count}" for kind, count in kinds.items()))
+    for endpoint, count in endpoints.most_common():
+        print(f"  {endpoint:<48} {count:>8}")
+    if errors:
+        print("Hatalar: " + ", ".join(f"{error}={count}" for error, count in errors.items()))
+
+
+def cmd_replay(args):
+    from recording.replay import ReplaySession
+
+    specs = [BotSpec.parse(text, args.timeframe, args.strategy, args.leverage, args.amount) for text in args.specs]
+    recording = os.path.abspath(args.recording)
+    output = os.path.abspath(args.output or os.path.join(REPORT_DIR, f"replay_{datetime.now():%Y%m%d_%H%M%S}.json"))
+    until = args.until
+    if until is not None:
+        until = datetime.fromisoformat(until).timestamp()
+
+    # Botların CSV logları canlı loglara karışmasın diye replay ayrı klasörde çalışır
+    workdir = args.workdir or tempfile.mkdtemp(prefix='replay_')
+    os.makedirs(workdir, exist_ok=True)
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        report = ReplaySession(recording, specs, speed=args.speed, until=until).run()
+    finally:
+        os.chdir(cwd)
+
+    write_report(report, output)
+    rest = report['rest']
+    logging.info(f"Replay tamamlandı: {report['virtual_seconds']:.0f} sn kayıt {report['wall_seconds']:.1f} sn'de "
+                 f"(x{report['speedup']}), döngü={sum(report['cycles'].values())}, emir={rest['orders']}, "
+                 f"sapma={rest['divergences']}, parametre farkı={rest['param_mismatches']}, "
+                 f"telegram farkı={rest['telegram']['mismatches']}")
+    for name, summary in report['latency_ms'].items():
+        if summary['count']:
+            logging.info(f"{name}: p50={summary['p50']} ms, p95={summary['p95']} ms, p99={summary['p99']} ms, "
+                         f"max={summary['max']} ms ({summary['count']} ölçüm)")
+    logging.info(f"Rapor kaydedildi: {output} (bot logları: {workdir})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Canlı oturum kayıtlarını inceleme ve replay")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    info = subparsers.add_parser('info', help="Kaydın özeti: zaman aralığı, endpoint ve hata sayıları")
+    info.add_argument('recording')
+
+    replay = subparsers.add_parser('replay', help="Kaydı botlara replay eder ve performans raporu üretir")
+    replay.add_argument('recording')
+    replay.add_argument('specs', nargs='+',
+                        help="SYMBOL[:TIMEFRAME[:STRATEGY[:LEVERAGE[:TRADE_AMOUNT]]]] (kayıttaki botlarla aynı)")
+    replay.add_argument('--timeframe', default='15m')
+    replay.add_argument('--strategy', default='psar_atr_strategy')
+    replay.add_argument('--leverage', type=int, default=10)
+    replay.add_argument('--amount', type=int, default=100)
+    replay.add_argument('--speed', type=float, default=0.0, help="Replay hızı (0: en yüksek hız, 1: gerçek zaman)")
+    replay.add_argument('--until', help="Replay bitişi (ISO tarih/saat, verilmezse kaydın sonu)")
+    replay.add_argument('--output', help="JSON rapor dosyası (varsayılan data/benchmarks/replay_<zaman>.json)")
+    replay.add_argument('--workdir', help="Bot loglarının yazılacağı klasör (varsayılan geçici klasör)")
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    {'info': cmd_info, 'replay': cmd_replay}[args.command](args)
+
+
+if __name__ == "__main__":
+    main()
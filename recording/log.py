@@ -0,0 +1,84 @@
+import gzip
+import json
+import os
+import struct
+import threading
+import zlib
+
+MAGIC = b'BOTREC1\n'
+
+# Kayıt türleri
+META = 0
+REST = 1
+TELEGRAM = 2
+STREAM = 3
+KIND_NAMES = {META: 'meta', REST: 'rest', TELEGRAM: 'telegram', STREAM: 'stream'}
+
+# tür (uint8), zaman (epoch saniye, double), süre (saniye, float32), veri uzunluğu (uint32)
+_HEADER = struct.Struct('<BdfI')
+
+
+class Event:
+    """Oturum kaydındaki tek bir olay"""
+
+    __slots__ = ('kind', 'time', 'duration', 'payload')
+
+    def __init__(self, kind, time, duration, payload):
+        self.kind = kind
+        self.time = time
+        self.duration = duration
+        self.payload = payload
+
+    def __repr__(self):
+        return f"Event({KIND_NAMES.get(self.kind, self.kind)}, {self.time:.3f}, {self.payload.get('path', '')})"
+
+
+class LogWriter:
+    """
+    Oturum kaydı yazıcısı
+    - Dosya gzip sıkıştırılmış kayıt dizisidir: sabit başlık + JSON veri
+    - Her kayıttan sonra sıkıştırma akışı senkronlanır; süreç çökse bile o ana kadarki kayıtlar okunabilir
+    """
+
+    def __init__(self, path, compresslevel=6):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.path = path
+        self._file = gzip.open(path, 'wb', compresslevel=compresslevel)
+        self._file.write(MAGIC)
+        self._lock = threading.Lock()
+
+    def write(self, kind, timestamp, duration, payload):
+        data = json.dumps(payload, separators=(',', ':'), ensure_ascii=False, default=str).encode('utf-8')
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(_HEADER.pack(kind, timestamp, duration, len(data)) + data)
+            self._file.flush(zlib.Z_SYNC_FLUSH)
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def read_log(path):
+    """
+    Oturum kaydındaki olayları sırayla döndürür
+    Yarım kalmış (süreç kapanırken kesilmiş) dosyalarda son tam kayda kadar okunur
+    """
+    with gzip.open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Oturum kaydı değil: {path}")
+        while True:
+            try:
+                header = f.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    return
+                kind, timestamp, duration, length = _HEADER.unpack(header)
+                data = f.read(length)
+            except (EOFError, zlib.error):
+                return
+            if len(data) < length:
+                return
+            yield Event(kind, timestamp, duration, json.loads(data))
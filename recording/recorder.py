@@ -0,0 +1,108 @@
+import atexit
+import logging
+import os
+import platform
+import sys
+import threading
+import time
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from binance.exceptions import BinanceAPIException
+
+from recording.log import META, REST, STREAM, TELEGRAM, LogWriter
+
+RECORD_DIR_ENV = 'SESSION_RECORD_DIR'
+
+# İmzalı isteklerde her seferinde değişen parametreler kayda alınmaz
+VOLATILE_PARAMS = ('timestamp', 'signature', 'recvWindow')
+
+
+class SessionRecorder:
+    """
+    Canlı oturum kaydı
+    - REST: python-binance Client üzerinden giden tüm istekler (BinanceClient, OrderManager, executor'lar)
+    - Telegram: gönderilen mesaj metni ve API cevabı (bot token ve chat id kaydedilmez)
+    - Stream: süreç dışından gelen piyasa verisi (çoklu süreçte koordinatörün dağıttığı kline verisi)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.writer = LogWriter(path)
+        self.writer.write(META, time.time(), 0.0, {
+            'argv': sys.argv, 'pid': os.getpid(), 'cwd': os.getcwd(), 'python': platform.python_version(),
+            'started': datetime.now().isoformat(timespec='seconds'),
+        })
+        logging.info(f"Oturum kaydı başlatıldı: {path}")
+
+    def rest(self, method, uri, params, started, duration, status, body, error=None):
+        payload = {
+            'method': method.upper(), 'path': urlsplit(uri).path,
+            'params': {key: value for key, value in params.items() if key not in VOLATILE_PARAMS},
+            'status': status, 'body': body,
+        }
+        if error:
+            payload['error'] = error
+        self.writer.write(REST, started, duration, payload)
+
+    def telegram(self, text, started, duration, status, body, error=None):
+        payload = {'text': text, 'status': status, 'body': body}
+        if error:
+            payload['error'] = error
+        self.writer.write(TELEGRAM, started, duration, payload)
+
+    def stream(self, name, payload):
+        self.writer.write(STREAM, time.time(), 0.0, {'stream': name, **payload})
+
+    def close(self):
+        self.writer.close()
+
+
+_recorder = None
+_recorder_lock = threading.Lock()
+
+
+def get_recorder():
+    """
+    SESSION_RECORD_DIR ortam değişkeni verilmişse süreç için tek oturum kaydını döndürür (yoksa None)
+    Dosya ilk kullanımda açılır: <dizin>/session_<zaman>_<pid>.rec
+    """
+    global _recorder
+    if _recorder is not None:
+        return _recorder
+    directory = os.getenv(RECORD_DIR_ENV)
+    if not directory:
+        return None
+    with _recorder_lock:
+        if _recorder is None:
+            path = os.path.join(directory, f"session_{datetime.now():%Y%m%d_%H%M%S}_{os.getpid()}.rec")
+            _recorder = SessionRecorder(path)
+            atexit.register(_recorder.close)
+    return _recorder
+
+
+def recording_client_class(base):
+    """python-binance Client sınıfını tüm istek / cevapları oturum kaydına yazan alt sınıfa çevirir"""
+
+    class RecordingClient(base):
+        def _request(self, method, uri, signed, force_params=False, **kwargs):
+            # timestamp / signature aynı sözlüğe sonradan eklendiği için parametreler önceden kopyalanır
+            params = dict(kwargs.get('data') or {})
+            started = time.time()
+            begin = time.perf_counter()
+            try:
+                result = super()._request(method, uri, signed, force_params, **kwargs)
+            except BinanceAPIException as e:
+                get_recorder().rest(method, uri, params, started, time.perf_counter() - begin, e.status_code,
+                                    {'code': e.code, 'msg': e.message}, error='BinanceAPIException')
+                raise
+            except Exception as e:
+                get_recorder().rest(method, uri, params, started, time.perf_counter() - begin, None, str(e),
+                                    error=type(e).__name__)
+                raise
+            get_recorder().rest(method, uri, params, started, time.perf_counter() - begin,
+                                self.response.status_code, result)
+            return result
+
+    RecordingClient.__name__ = f"Recording{base.__name__}"
+    return RecordingClient
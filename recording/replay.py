@@ -0,0 +1,393 @@
+import bisect
+import heapq
+import importlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from urllib.parse import urlsplit
+
+import requests
+from binance.client import Client
+from binance.exceptions import BinanceAPIException, BinanceRequestException
+
+from benchmark.load import summarize
+from core.telegram.coalescer import telegram_coalescer
+from core.telegram.delivery import telegram_delivery
+from core.trade_journal import trade_journal
+from recording.log import META, REST, STREAM, TELEGRAM, read_log
+from recording.recorder import RECORD_DIR_ENV, VOLATILE_PARAMS
+
+# Saat yamalanmadan önceki gerçek fonksiyonlar (replay sırasında gerçek bekleme ve ölçüm için)
+_real_sleep = time.sleep
+_real_monotonic = time.monotonic
+
+# Sanal saatin datetime.now() için yamalandığı modüller
+CLOCK_MODULES = ('strategies.', 'core.', 'adapters.')
+
+
+class ReplayDivergence(Exception):
+    """Bot kayıtta karşılığı olmayan bir istek yaptı (replay kayıttan ayrıldı)"""
+
+
+def _params_key(params):
+    return tuple(sorted((key, str(value)) for key, value in params.items() if key not in VOLATILE_PARAMS))
+
+
+class ReplayLog:
+    """
+    Oturum kaydını replay için indeksler
+    - GET istekleri (kline, pozisyon, bakiye...) durumsuzdur: aynı parametrelerle yapılan, sanal saate göre en son
+      kaydedilmiş cevap döndürülür; parametreler tutmazsa aynı sembolün en son cevabına düşülür
+    - Diğer istekler (emir açma / iptal, kaldıraç) kayıttaki sırayla tüketilir; parametre farkları sayılır
+    - Telegram mesajları kayıttaki sırayla eşleştirilir
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.meta = {}
+        self.streams = []
+        self.telegram = []
+        self._reads = defaultdict(lambda: ([], []))
+        self._reads_by_symbol = defaultdict(lambda: ([], []))
+        self._writes = defaultdict(list)
+        self._write_pos = Counter()
+        self._telegram_pos = 0
+        self._lock = threading.Lock()
+
+        times = []
+        for event in read_log(path):
+            times.append(event.time)
+            if event.kind == META:
+                self.meta = event.payload
+            elif event.kind == REST:
+                self._index_rest(event)
+            elif event.kind == TELEGRAM:
+                self.telegram.append(event)
+            elif event.kind == STREAM:
+                self.streams.append(event)
+        if not times:
+            raise ValueError(f"Oturum kaydı boş: {path}")
+        self.start, self.end = min(times), max(times)
+        self.streams.sort(key=lambda event: event.time)
+
+        self.served = Counter()
+        self.divergences = []
+        self.param_mismatches = 0
+        self.orders = 0
+        self.telegram_mismatches = 0
+        self.telegram_extra = 0
+
+    def _index_rest(self, event):
+        payload = event.payload
+        method, path, params = payload['method'], payload['path'], payload['params']
+        if method == 'GET':
+            for index, key in ((self._reads, (method, path, _params_key(params))),
+                               (self._reads_by_symbol, (method, path, params.get('symbol')))):
+                times, events = index[key]
+                times.append(event.time)
+                events.append(event)
+        else:
+            self._writes[(method, path, params.get('symbol'))].append(event)
+
+    @staticmethod
+    def _latest(entry, now):
+        """Sanal saatten önceki en son kayıt (henüz yoksa ilk kayıt)"""
+        times, events = entry
+        if not events:
+            return None
+        return events[max(bisect.bisect_right(times, now) - 1, 0)]
+
+    def respond(self, method, path, params, now):
+        """İsteğe kayıttaki cevabı döndürür; kayıtta hata varsa aynı hatayı fırlatır"""
+        method = method.upper()
+        with self._lock:
+            if method == 'GET':
+                event = (self._latest(self._reads.get((method, path, _params_key(params)), ([], [])), now) or
+                         self._latest(self._reads_by_symbol.get((method, path, params.get('symbol')), ([], [])), now))
+            else:
+                key = (method, path, params.get('symbol'))
+                queue, position = self._writes.get(key, []), self._write_pos[key]
+                event = queue[position] if position < len(queue) else None
+                if event is not None:
+                    self._write_pos[key] += 1
+                    if _params_key(params) != _params_key(event.payload['params']):
+                        self.param_mismatches += 1
+                        logging.warning(f"Replay parametre farkı: {method} {path} "
+                                        f"kayıt={event.payload['params']} replay={params}")
+                    if path.endswith('/order'):
+                        self.orders += 1
+            if event is None:
+                self.divergences.append(f"{method} {path} {params}")
+                raise ReplayDivergence(f"Kayıtta karşılığı yok: {method} {path} {params}")
+            self.served[f"{method} {path}"] += 1
+        return self._result(event.payload)
+
+    @staticmethod
+    def _result(payload):
+        error = payload.get('error')
+        if error is None:
+            return payload['body']
+        if error == 'BinanceAPIException':
+            raise BinanceAPIException(None, payload['status'], json.dumps(payload['body']))
+        exception_class = getattr(requests.exceptions, error, None)
+        if exception_class is not None:
+            raise exception_class(payload['body'])
+        raise BinanceRequestException(payload['body'])
+
+    def next_telegram(self, text):
+        """Sıradaki kayıtlı Telegram mesajı (kayıttakinden fazla mesaj gönderildiyse None)"""
+        with self._lock:
+            if self._telegram_pos >= len(self.telegram):
+                self.telegram_extra += 1
+                return None
+            event = self.telegram[self._telegram_pos]
+            self._telegram_pos += 1
+            if event.payload['text'] != text:
+                self.telegram_mismatches += 1
+            return event
+
+    def stats(self):
+        return {
+            'served': dict(self.served),
+            'orders': self.orders,
+            'param_mismatches': self.param_mismatches,
+            'divergences': len(self.divergences),
+            'divergence_samples': self.divergences[:10],
+            'telegram': {'recorded': len(self.telegram), 'sent': self._telegram_pos + self.telegram_extra,
+                         'mismatches': self.telegram_mismatches, 'extra': self.telegram_extra},
+        }
+
+
+class ReplayClient(Client):
+    """İstekleri ağ yerine oturum kaydından cevaplayan python-binance Client"""
+
+    def __init__(self, log, clock):
+        self.log = log
+        self.clock = clock
+        super().__init__(None, None)
+
+    def ping(self):
+        # Client.__init__ içindeki bağlantı kontrolü replay'de atlanır
+        return {}
+
+    def _request(self, method, uri, signed, force_params=False, **kwargs):
+        return self.log.respond(method, urlsplit(uri).path, dict(kwargs.get('data') or {}), self.clock.time())
+
+
+def replay_notifier_class(base):
+    """TelegramNotifier'ı mesajları kayıttaki cevaplarla eşleştiren alt sınıfa çevirir"""
+
+    class ReplayNotifier(base):
+        def __init__(self, log, symbol=None):
+            super().__init__(symbol=symbol)
+            self.log = log
+
+        def _post(self, payload):
+            event = self.log.next_telegram(payload['text'])
+            recorded = event.payload if event is not None else {'status': 200, 'body': '{"ok":true}'}
+            if recorded.get('error'):
+                raise getattr(requests.exceptions, recorded['error'], requests.exceptions.RequestException)(
+                    recorded['body'])
+            response = requests.Response()
+            response.status_code = recorded['status']
+            response._content = str(recorded['body']).encode('utf-8')
+            return response
+
+    return ReplayNotifier
+
+
+class VirtualClock:
+    """
+    Replay saati
+    - Sürücü thread (replay döngüsü) sleep çağırınca saat ileri alınır; speed > 0 ise gerçek zamanda s/speed beklenir
+    - Diğer thread'ler (TP/SL takibi) saat hedefe gelene kadar bekler; saat ilerlemezse en fazla max_wait
+      gerçek saniye sonra devam eder
+    """
+
+    def __init__(self, start, speed=0.0, max_wait=1.0):
+        self._now = start
+        self.speed = speed
+        self.max_wait = max_wait
+        self.driver = None
+        self._condition = threading.Condition()
+
+    def time(self):
+        return self._now
+
+    def advance_to(self, target):
+        if target <= self._now:
+            return
+        if self.speed > 0:
+            _real_sleep((target - self._now) / self.speed)
+        with self._condition:
+            self._now = target
+            self._condition.notify_all()
+
+    def sleep(self, seconds):
+        if seconds <= 0:
+            return
+        target = self._now + seconds
+        if threading.get_ident() == self.driver:
+            self.advance_to(target)
+            return
+        deadline = _real_monotonic() + (seconds / self.speed if self.speed > 0 else self.max_wait)
+        with self._condition:
+            while self._now < target:
+                remaining = deadline - _real_monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+    @contextmanager
+    def installed(self):
+        """
+        time.time / time.monotonic / time.sleep ve bot modüllerindeki datetime.now() sanal saate bağlanır
+        Modüller (strategies, core, adapters) bu bağlamdan önce import edilmiş olmalıdır
+        """
+        clock = self
+
+        class ClockDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return datetime.fromtimestamp(clock.time(), tz)
+
+        modules = [module for name, module in list(sys.modules.items())
+                   if name.startswith(CLOCK_MODULES) and getattr(module, 'datetime', None) is datetime]
+        originals = (time.time, time.monotonic, time.sleep)
+        self.driver = threading.get_ident()
+        time.time, time.monotonic, time.sleep = self.time, self.time, self.sleep
+        for module in modules:
+            module.datetime = ClockDatetime
+        try:
+            yield self
+        finally:
+            time.time, time.monotonic, time.sleep = originals
+            for module in modules:
+                module.datetime = datetime
+
+
+class ReplaySession:
+    """
+    Kaydedilmiş oturumu botlara replay eder
+    - Botlar runner'daki gibi oluşturulur; REST ve Telegram cevapları kayıttan, kline stream'i kayıttaki zamanlarda
+      piyasa verisi önbelleğine beslenir
+    - speed=0 en yüksek hız (beklemeler atlanır), speed=1 gerçek zaman
+    - trade_logic ve döngü süreleri gerçek zamanla ölçülür; replay, üretim trafiğinde performans ölçümü olarak
+      kullanılabilir
+    """
+
+    def __init__(self, path, specs, speed=0.0, until=None, market_data_ttl=5):
+        self.log = ReplayLog(path)
+        self.specs = list(specs)
+        self.speed = speed
+        self.until = until
+        self.market_data_ttl = market_data_ttl
+
+    def _build_bots(self, clock):
+        from adapters.binance.market_data import MarketDataCache
+        from core.runner import MultiSymbolRunner
+        from core.telegram.telegram_notifier import TelegramNotifier
+
+        runner = MultiSymbolRunner(self.specs)
+        runner.client = ReplayClient(self.log, clock)
+        runner.market_data = MarketDataCache(ttl=self.market_data_ttl)
+        notifier_class = replay_notifier_class(TelegramNotifier)
+        bots = {}
+        for spec in self.specs:
+            bot = runner._create_bot(spec)
+            bot.telegram = notifier_class(self.log, symbol=spec.symbol)
+            bots[spec.name] = bot
+        return runner, bots
+
+    @staticmethod
+    def _timed(bot, samples):
+        trade_logic = bot.trade_logic
+
+        def timed():
+            begin = time.perf_counter()
+            try:
+                return trade_logic()
+            finally:
+                samples.append((time.perf_counter() - begin) * 1000)
+
+        bot.trade_logic = timed
+
+    def run(self):
+        # Replay sırasında yeni kayıt açılmaz
+        os.environ.pop(RECORD_DIR_ENV, None)
+        # Telegram cevapları kayıttan gelir; chat hız sınırı ve tekrar deneme beklemesi gerçek zamanda uygulanmaz,
+        # özetler gerçek saatle zamanlandığı için birleştirme kapatılır (her mesaj kayıttakiyle eşleştirilir)
+        telegram_delivery.chat_interval = telegram_delivery.backoff = 0
+        telegram_coalescer.dedup_seconds = telegram_coalescer.digest_seconds = 0
+        for spec in self.specs:
+            importlib.import_module(f'strategies.{spec.strategy}').Bot
+        import core.runner  # noqa: F401  (datetime yaması için modül önceden yüklenir)
+
+        end = min(self.log.end, self.until) if self.until else self.log.end
+        clock = VirtualClock(self.log.start, speed=self.speed)
+        cycle_ms, trade_logic_ms = [], []
+        cycles = Counter()
+        errors = Counter()
+        streams = 0
+        wall_start = time.perf_counter()
+
+        with clock.installed():
+            runner, bots = self._build_bots(clock)
+            for bot in bots.values():
+                self._timed(bot, trade_logic_ms)
+                bot.on_start()
+
+            queue = [(clock.time(), index, name) for index, name in enumerate(bots)]
+            heapq.heapify(queue)
+            while queue:
+                due, index, name = heapq.heappop(queue)
+                if due > end:
+                    break
+                while streams < len(self.log.streams) and self.log.streams[streams].time <= due:
+                    payload = self.log.streams[streams].payload
+                    runner.market_data.put_klines(payload['symbol'], payload['interval'], payload['limit'],
+                                                  payload['data'])
+                    streams += 1
+                clock.advance_to(due)
+
+                bot = bots[name]
+                begin = time.perf_counter()
+                try:
+                    delay = bot.run_cycle()
+                except ReplayDivergence as e:
+                    logging.error(f"[{name}] {e}")
+                    errors[name] += 1
+                    delay = bot.ERROR_RETRY_INTERVAL
+                cycle_ms.append((time.perf_counter() - begin) * 1000)
+                cycles[name] += 1
+                if bot.running:
+                    heapq.heappush(queue, (clock.time() + delay, index, name))
+
+            for bot in bots.values():
+                bot.running = False
+            virtual_seconds = clock.time() - self.log.start
+
+        # Kuyruktaki Telegram mesajları kayıtla eşleştirilir, işlem günlüğü kayıtları replay klasöründen çıkmadan yazılır
+        telegram_delivery.flush()
+        trade_journal.flush()
+        wall_seconds = time.perf_counter() - wall_start
+        return {
+            'recording': os.path.abspath(self.log.path),
+            'recorded_argv': self.log.meta.get('argv'),
+            'bots': [spec.name for spec in self.specs],
+            'speed': self.speed,
+            'cycles': dict(cycles),
+            'errors': dict(errors),
+            'latency_ms': {'cycle': summarize(cycle_ms), 'trade_logic': summarize(trade_logic_ms)},
+            'rest': self.log.stats(),
+            'stream_messages': streams,
+            'virtual_seconds': round(virtual_seconds, 1),
+            'wall_seconds': round(wall_seconds, 3),
+            'speedup': round(virtual_seconds / wall_seconds, 1) if wall_seconds else None,
+        }
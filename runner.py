@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Çoklu Sembol Runner
+Birden fazla sembol/stratejiyi tek süreçte çalıştırır (her coin için ayrı main_*.py süreci yerine).
+
+Kullanım:
+    python runner.py BTCUSDT ETHUSDT:15m:eralp_strateji2:5:50
+    python runner.py --file bots.txt
+    RUNNER_SPECS="BTCUSDT,ETHUSDT" python runner.py
+    python runner.py --file bots.txt --workers 4   # botları 4 sürece dağıtır (0: CPU sayısı kadar)
+
+Bot tanımı: SYMBOL[:TIMEFRAME[:STRATEGY[:LEVERAGE[:TRADE_AMOUNT]]]]
+Eksik alanlar --timeframe/--strategy/--leverage/--amount (veya STRATEGY, LEVERAGE,
+TRADE_AMOUNT ortam değişkenleri) ile doldurulur.
+"""
+
+import argparse
+import os
+
+from core.coordinator import Coordinator
+from core.log_server import start_log_writer
+from core.logging_config import LoggingConfig
+from core.runner import BotSpec, MultiSymbolRunner
+
+
+def load_specs(args):
+    """Komut satırı, dosya ve RUNNER_SPECS ortam değişkeninden bot tanımlarını toplar"""
+    texts = list(args.specs)
+    if args.file:
+        with open(args.file, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.split('#', 1)[0].strip()
+                if line:
+                    texts.append(line)
+    if not texts and os.getenv('RUNNER_SPECS'):
+        texts = [text for text in os.getenv('RUNNER_SPECS').split(',') if text.strip()]
+
+    return [
+        BotSpec.parse(text, timeframe=args.timeframe, strategy=args.strategy,
+                      leverage=args.leverage, trade_amount=args.amount)
+        for text in texts
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Birden fazla botu tek süreçte çalıştırır")
+    parser.add_argument('specs', nargs='*', help="SYMBOL[:TIMEFRAME[:STRATEGY[:LEVERAGE[:TRADE_AMOUNT]]]]")
+    parser.add_argument('--file', help="Her satırda bir bot tanımı içeren dosya")
+    parser.add_argument('--timeframe', default='15m')
+    parser.add_argument('--strategy', default=os.getenv('STRATEGY', 'psar_atr_strategy'))
+    parser.add_argument('--leverage', type=int, default=int(os.getenv('LEVERAGE', 10)))
+    parser.add_argument('--amount', type=int, default=int(os.getenv('TRADE_AMOUNT', 100)))
+    parser.add_argument('--market-data-ttl', type=float, default=5,
+                        help="Paylaşılan piyasa verisi önbellek süresi (saniye)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Worker süreç sayısı (1: tek süreç, 0: CPU çekirdeği sayısı kadar)")
+    parser.add_argument('--market-data-interval', type=float, default=15,
+                        help="Çoklu süreçte koordinatörün kline verisini dağıtma aralığı (saniye)")
+    args = parser.parse_args()
+
+    specs = load_specs(args)
+    if not specs:
+        parser.error("En az bir bot tanımı gerekli")
+
+    # LOG_SERVER tanımlıysa ve dinleyen yazıcı yoksa log yazıcısı bu süreçte açılır (worker'lar ona iletir)
+    start_log_writer()
+    logger = LoggingConfig().setup_logging("runner")
+    logger.info(f"Runner başlatılıyor: {specs}")
+    if args.workers == 1:
+        MultiSymbolRunner(specs, logger=logger, market_data_ttl=args.market_data_ttl).run()
+    else:
+        Coordinator(specs, workers=args.workers or None, logger=logger,
+                    market_data_interval=args.market_data_interval).run()
+
+
+if __name__ == "__main__":
+    main()
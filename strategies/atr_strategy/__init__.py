@@ -5,7 +5,11 @@ This package contains the implementation of various trading strategies
 using the strategy pattern.
 """
 
-from .bot import Bot
+from core.lazy_imports import lazy_module_getattr
+
+__getattr__ = lazy_module_getattr(__name__, {
+    'Bot': '.bot',
+})
 
 __all__ = [
     'Bot',
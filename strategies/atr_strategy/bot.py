@@ -5,33 +5,50 @@ import os
 import ntplib
 import socket
 import threading
-import csv
 from datetime import datetime
 import pandas as pd
 
 # Konfigürasyon ve diğer modüllerin import edildiğini varsayıyoruz
 from core.logging_config import LoggingConfig
+from core.startup import StartupOrchestrator
 from adapters.binance.binance_client import BinanceClient
 from strategies.atr_strategy.strategy import Strategy
 from strategies.atr_strategy.config import Config
 from strategies.atr_strategy.executor import Executor
 from core.telegram.telegram_notifier import TelegramNotifier
 from core.signal_logger import signal_logger
+from core.order_latency import order_latency
+from core.timing import spans
+from core.trade_journal import pick_indicators, trade_journal
 
 class Bot:
-    def __init__(self, symbol, timeframe, leverage, trade_amount):
+    LOOP_INTERVAL = 10  # Döngüler arası bekleme (saniye)
+    ERROR_RETRY_INTERVAL = 30  # Hata sonrası bekleme (saniye)
+    # İşlem günlüğüne yazılan sinyal indikatörleri: (anahtar, etiket, format)
+    TRADE_LOG_INDICATORS = (
+        ('Close', 'Close', '.4f'),
+        ('atr', 'ATR', '.6f'),
+        ('atr_upper', 'ATR_Upper', '.4f'),
+        ('atr_lower', 'ATR_Lower', '.4f'),
+        ('ema_9', 'EMA_9', '.4f'),
+        ('ema_21', 'EMA_21', '.4f'),
+        ('rsi', 'RSI', '.2f'),
+        ('buy_signal', 'Buy_Signal', ''),
+        ('sell_signal', 'Sell_Signal', ''),
+        ('buy', 'Buy', ''),
+        ('sell', 'Sell', ''),
+    )
+
+    def __init__(self, symbol, timeframe, leverage, trade_amount, client=None, market_data=None):
 
-        # NTP senkronizasyonunu en başta yap
-        self._sync_ntp_time()
-
-        # Windows sisteminde zamanı senkronize et
-        if platform.system() == 'Windows':
-            os.system('w32tm /resync')
         self.logging_config = LoggingConfig()
 
         # Logging ayarları - Yeni dosya tabanlı sistem
         self.logger = self.logging_config.setup_logging("atr_strategy_bot")
         self.logger.info("🚀 ATR Strategy Bot başlatılıyor...")
+
+        # Başlangıç adımlarını paralel çalıştıran ve süreleri raporlayan orkestratör
+        self.startup = StartupOrchestrator(f"atr_strategy:{symbol}", logger=self.logger)
         
         # Konfigürasyon ayarları
         self.symbol = symbol
@@ -43,6 +60,7 @@ class Bot:
         Trading Bot inizializasyonu
         - Konfigürasyon ayarları
         - Gerekli servislerin başlatılması
+        - client/market_data verilirse (runner) Binance bağlantısı ve piyasa verisi diğer botlarla paylaşılır
         """
 
         # Telegram bildirim servisi
@@ -51,10 +69,30 @@ class Bot:
         # Config dosyasını yükle
         self.config = Config()
 
+        # Runner içinde çalışırken client ve NTP kontrolü tüm botlar için ortaktır
+        self.hosted = client is not None
+
+        # NTP senkronizasyonu ve Binance bağlantısı birbirinden bağımsız, aynı anda yapılır
+        init_steps = {
+            'binance_client': lambda: BinanceClient(symbol, timeframe, leverage, client=client, market_data=market_data),
+        }
+        if not self.hosted:
+            init_steps['ntp_sync'] = self._sync_ntp_time
+        # Windows sisteminde zamanı senkronize et
+        if platform.system() == 'Windows':
+            init_steps['windows_time_sync'] = lambda: os.system('w32tm /resync')
+        results = self.startup.run_parallel('init', init_steps)
+
         # Binance client ve diğer servislerin inizializasyonu
-        self.client = BinanceClient(symbol, timeframe, leverage)
+        self.client = results['binance_client']
         self.strategy = Strategy(timeframe)
-        self.executor = Executor(self.client, symbol, trade_amount)
+
+        # Executor kurulumu ve sembol bilgisi (exchange info) önbelleği paralel hazırlanır
+        results = self.startup.run_parallel('exchange', {
+            'executor': lambda: Executor(self.client, symbol, trade_amount, leverage=leverage),
+            'exchange_info': self.client.load_symbol_info,
+        })
+        self.executor = results['executor']
 
         # Durum değişkenleri
         self.position = 0  # 0: No Position, 1: Long, -1: Short
@@ -255,74 +293,15 @@ class Bot:
             self.telegram.send_notification(f"⚠️ Trade hatası: {str(e)}")
             return False
 
+    @spans.timed('csv_log.trade_activity')
     def _log_trade_activity_to_csv(self, action, side="", quantity=0, price=0, details="", signal_data=None):
-        """Tüm trade aktivitelerini CSV dosyasına kaydeder"""
+        """Trade aktivitesini işlem günlüğüne ekler (CSV yazımı arka plan thread'inde, emir olayları fsync edilir)"""
         try:
-            # logs klasörü yoksa oluştur
-            os.makedirs('logs', exist_ok=True)
-            
-            # CSV dosya yolu - symbol bazlı trade log
-            csv_filename = f'logs/atr_trades_{self.symbol.lower()}.csv'
-            
-            # Signal data varsa indikatör değerlerini al
-            signal_indicators = ""
-            if signal_data is not None:
-                indicators = []
-                # Temel indikatörler
-                if 'Close' in signal_data:
-                    indicators.append(f"Close: {signal_data['Close']:.4f}")
-                if 'atr' in signal_data:
-                    indicators.append(f"ATR: {signal_data['atr']:.6f}")
-                if 'atr_upper' in signal_data:
-                    indicators.append(f"ATR_Upper: {signal_data['atr_upper']:.4f}")
-                if 'atr_lower' in signal_data:
-                    indicators.append(f"ATR_Lower: {signal_data['atr_lower']:.4f}")
-                if 'ema_9' in signal_data:
-                    indicators.append(f"EMA_9: {signal_data['ema_9']:.4f}")
-                if 'ema_21' in signal_data:
-                    indicators.append(f"EMA_21: {signal_data['ema_21']:.4f}")
-                if 'rsi' in signal_data:
-                    indicators.append(f"RSI: {signal_data['rsi']:.2f}")
-                # Sinyal koşulları
-                if 'buy_signal' in signal_data:
-                    indicators.append(f"Buy_Signal: {signal_data['buy_signal']}")
-                if 'sell_signal' in signal_data:
-                    indicators.append(f"Sell_Signal: {signal_data['sell_signal']}")
-                if 'buy' in signal_data:
-                    indicators.append(f"Buy: {signal_data['buy']}")
-                if 'sell' in signal_data:
-                    indicators.append(f"Sell: {signal_data['sell']}")
-                
-                signal_indicators = " | ".join(indicators)
-            
-            # CSV verisi
-            csv_data = [
-                datetime.now().strftime('%Y-%m-%d %H:%M:%S'),  # Tarih/Saat
-                self.symbol,                                    # Sembol
-                action,                                        # Aksiyon (POSITION_OPEN, ORDERS_CREATED, POSITION_CLOSE, etc.)
-                side,                                          # BUY/SELL
-                f"{quantity:.6f}" if quantity else "",         # Miktar
-                f"{price:.4f}" if price else "",               # Fiyat
-                details,                                       # Detaylar
-                signal_indicators                              # Sinyal indikatörleri
-            ]
-            
-            # Dosya yoksa header ekle
-            file_exists = os.path.exists(csv_filename)
-            
-            with open(csv_filename, 'a', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
-                
-                # Header yazma (sadece dosya yoksa)
-                if not file_exists:
-                    header = ['Tarih/Saat', 'Sembol', 'Aksiyon', 'Yön', 'Miktar', 'Fiyat', 'Detaylar', 'Sinyal_İndikatörleri']
-                    writer.writerow(header)
-                
-                # Veri yazma
-                writer.writerow(csv_data)
-            
-            logging.info(f"Trade aktivitesi CSV'ye kaydedildi: {action}")
-            
+            trade_journal.trade_activity(
+                f'logs/atr_trades_{self.symbol.lower()}.csv', self.symbol, action, side, quantity, price, details,
+                pick_indicators(signal_data, self.TRADE_LOG_INDICATORS)
+            )
+            logging.info(f"Trade aktivitesi CSV kuyruğuna alındı: {action}")
         except Exception as e:
             logging.error(f"Trade aktivitesi CSV log kaydetme hatası: {e}")
 
@@ -395,6 +374,7 @@ class Bot:
 
 ⏰ {time.strftime('%d.%m.%Y %H:%M')}"""
 
+    @spans.timed()
     def check_and_sync_position(self):
         """
         Pozisyon durumunu kontrol et ve senkronize et
@@ -525,48 +505,19 @@ class Bot:
             )
             self.telegram.send_notification("🔄 Pozisyon kapatıldı")
 
+    @spans.timed('csv_log.position_close')
     def _log_position_close_to_csv(self, timestamp, symbol, position_type, entry_price, exit_price, 
                                    price_change_percent, leveraged_pnl_percent, status):
-        """Pozisyon kapanış bilgilerini CSV dosyasına kaydeder"""
+        """Pozisyon kapanış bilgilerini işlem günlüğüne ekler (CSV yazımı arka plan thread'inde, fsync edilir)"""
         try:
-            # logs klasörü yoksa oluştur
-            os.makedirs('logs', exist_ok=True)
-            
-            # CSV dosya yolu - symbol bazlı farklılaştırma
             csv_filename = f'logs/atr_positions_{symbol.lower()}.csv'
-            
-            # CSV verisi
-            csv_data = [
-                timestamp.strftime('%Y-%m-%d %H:%M:%S'),  # Tarih/Saat
-                symbol,                                    # Sembol
-                position_type,                            # Pozisyon tipi
-                f"{entry_price:.4f}",                    # Giriş fiyatı
-                f"{exit_price:.4f}",                     # Çıkış fiyatı
-                f"{price_change_percent:+.2f}%",         # Fiyat değişim yüzdesi
-                f"{leveraged_pnl_percent:+.2f}%",        # Kaldıraçlı P&L yüzdesi
-                status                                    # Durum (KAR/ZARAR)
-            ]
-            
-            # Dosya yoksa header ekle
-            file_exists = os.path.exists(csv_filename)
-            
-            with open(csv_filename, 'a', newline='', encoding='utf-8') as csvfile:
-                writer = csv.writer(csvfile)
-                
-                # Header yazma (sadece dosya yoksa)
-                if not file_exists:
-                    header = ['Tarih/Saat', 'Sembol', 'Pozisyon', 'Giriş Fiyatı', 
-                             'Çıkış Fiyatı', 'Fiyat Değişimi', 'Kaldıraçlı P&L', 'Durum']
-                    writer.writerow(header)
-                
-                # Veri yazma
-                writer.writerow(csv_data)
-            
-            logging.info(f"Pozisyon kapanış bilgisi CSV'ye kaydedildi: {csv_filename}")
-            
+            trade_journal.position_close(csv_filename, timestamp, symbol, position_type, entry_price, exit_price,
+                                         price_change_percent, leveraged_pnl_percent, status)
+            logging.info(f"Pozisyon kapanış bilgisi CSV kuyruğuna alındı: {csv_filename}")
         except Exception as e:
             logging.error(f"CSV log kaydetme hatası: {e}")
 
+    @order_latency.traced('atr_strategy')
     def process_signal(self, last_row):
         """
         Sinyal işleme fonksiyonu
@@ -835,42 +786,55 @@ class Bot:
         self.pending_signal_time = None
         self.pending_signal_data = None
 
-    def start_trading(self):
+    def on_start(self):
+        """Trading döngüsü öncesi başlangıç işlemleri (runner tarafından da çağrılır)"""
+        self.running = True
+        logging.info("🟢 Trading bot başlatıldı")
+        # Bot başlangıcını logla
+        self._log_trade_activity_to_csv(
+            action="BOT_START",
+            details=f"Bot started - Symbol: {self.symbol}, Timeframe: {self.timeframe}, Leverage: {self.leverage}x"
+        )
+        # Telegram bildirimi ve periyodik NTP thread'i kritik değil, ilk döngüden sonraya ertelenir
+        self.startup.defer('telegram_start', lambda: self.telegram.send_notification("🟢 Trading bot aktif hale getirildi"))
+        if not self.hosted:
+            self.startup.defer('ntp_thread', self._start_ntp_sync_thread)
+
+    def run_cycle(self):
         """
-        Sürekli çalışan ticaret döngüsü
-        - Her 10 saniyede bir trade_logic metodunu çağırır
-        - Hata yönetimi ve bildirim sistemi
+        Tek bir ticaret döngüsü çalıştırır
+        Returns:
+            int: Bir sonraki döngüye kadar beklenecek süre (saniye)
         """
         try:
-            logging.info("🟢 Trading bot başlatıldı")
-            # Bot başlangıcını logla
+            # Asıl ticaret mantığını çalıştır (TIMING_SPANS=1 ile döngü sonunda span süre dökümü loglanır)
+            with spans.tick(f"atr_strategy:{self.symbol}"):
+                self.trade_logic()
+            self.startup.mark_first_tick()
+            return self.LOOP_INTERVAL
+
+        except Exception as cycle_error:
+            logging.error(f"Ticaret döngüsü hatası: {cycle_error}")
             self._log_trade_activity_to_csv(
-                action="BOT_START",
-                details=f"Bot started - Symbol: {self.symbol}, Timeframe: {self.timeframe}, Leverage: {self.leverage}x"
+                action="TRADING_ERROR",
+                details=f"Trading cycle error: {str(cycle_error)}"
             )
-            self.telegram.send_notification("🟢 Trading bot aktif hale getirildi")
-            
-            # Periyodik NTP senkronizasyon thread'ini başlat
-            self._start_ntp_sync_thread()
+            self.telegram.send_notification(f"⚠️ Ticaret döngüsü hatası: {str(cycle_error)}")
 
-            while True:
-                try:
-                    # Asıl ticaret mantığını çalıştır
-                    self.trade_logic()
-
-                    # 10 saniye bekle
-                    time.sleep(10)
+            # Hatadan sonra kısa bir süre bekle
+            return self.ERROR_RETRY_INTERVAL
 
-                except Exception as cycle_error:
-                    logging.error(f"Ticaret döngüsü hatası: {cycle_error}")
-                    self._log_trade_activity_to_csv(
-                        action="TRADING_ERROR",
-                        details=f"Trading cycle error: {str(cycle_error)}"
-                    )
-                    self.telegram.send_notification(f"⚠️ Ticaret döngüsü hatası: {str(cycle_error)}")
+    def start_trading(self):
+        """
+        Sürekli çalışan ticaret döngüsü
+        - Her 10 saniyede bir trade_logic metodunu çağırır
+        - Hata yönetimi ve bildirim sistemi
+        """
+        try:
+            self.on_start()
 
-                    # Hatadan sonra kısa bir süre bekle
-                    time.sleep(30)
+            while self.running:
+                time.sleep(self.run_cycle())
 
         except KeyboardInterrupt:
             logging.info("🔴 Bot manuel olarak durduruldu")
@@ -892,3 +856,14 @@ class Bot:
             # NTP thread'ini durdur
             self._stop_ntp_sync_thread()
 
+    def stop_trading(self):
+        """Bot'u durdurur"""
+        self.running = False
+        logging.info("Bot durduruluyor...")
+        self._log_trade_activity_to_csv(
+            action="BOT_STOP",
+            details="Bot stopped"
+        )
+        self.telegram.send_notification("🛑 Bot durduruldu")
+        # NTP thread'ini durdur
+        self._stop_ntp_sync_thread()
@@ -6,6 +6,8 @@ import ntplib
 import socket
 from core import TradingSignal
 from adapters.binance.order_manager import OrderManager
+from core.order_latency import order_latency
+from core.timing import spans
 from strategies.atr_strategy.config import Config
 
 
@@ -32,12 +34,7 @@ class Executor:
         self.pending_signal = None
         self.last_signal_time = None
 
-        # NTP senkronizasyonunu önce yap
-        self._sync_ntp_time()
-
-        # Windows zaman senkronizasyonunu yap
-        self._sync_windows_time()
-
+        # NTP ve Windows zaman senkronizasyonu Bot başlangıcında yapılır
         # İlk zaman senkronizasyonunu yap ve leverage ayarını yap
         self._initialize()
 
@@ -119,6 +116,14 @@ class Executor:
 
     def _initialize_time_sync(self):
         """Başlangıç zaman senkronizasyonunu yapar"""
+        # BinanceClient bağlantı sırasında sunucu offset'ini zaten hesapladıysa tekrar sorgulama
+        client_offset = getattr(self.client, 'time_offset', None)
+        if client_offset is not None:
+            self.time_offset = client_offset
+            self.last_sync_time = time.time()
+            logging.info(f"İlk zaman senkronizasyonu BinanceClient'tan alındı. Offset: {self.time_offset}ms")
+            return
+
         for attempt in range(self.max_sync_retries):
             try:
                 # Sunucu zamanını al
@@ -186,6 +191,11 @@ class Executor:
             logging.error("Config sınıfında leverage özelliği bulunamadı")
             return
 
+        # BinanceClient aynı kaldıracı zaten uyguladıysa tekrar API çağrısı yapma
+        if getattr(self.client, '_applied_leverage', None) == self.config.leverage:
+            logging.info(f"Leverage zaten {self.config.leverage}x olarak ayarlı")
+            return
+
         try:
             # Leverage ayarını yap
             self.client.client.futures_change_leverage(
@@ -211,6 +221,7 @@ class Executor:
         """Yeni bir Signal objesi oluşturur"""
         return TradingSignal(side, quantity, entry_price, stop_loss, take_profit)
 
+    @spans.timed()
     def execute_trade(self, side, quantity, entry_price, stop_loss, take_profit):
         """Trade'i başlatır"""
         signal = self.create_signal(side, quantity, entry_price, stop_loss, take_profit)
@@ -248,6 +259,7 @@ class Executor:
                 if not self.order_manager.verify_position(signal.side, signal.quantity):
                     logging.error("Pozisyon doğrulanamadı, TP/SL emirleri oluşturulmayacak")
                     return False
+                order_latency.mark('verified')
 
                 # Stop Loss emri
                 sl_order = self.order_manager.create_order_with_retry(
@@ -317,9 +329,8 @@ class Executor:
                 logging.error("Geçersiz giriş fiyatı.")
                 return None, None
 
-            # Sembol bilgilerini al
-            symbol_info = self.client.client.futures_exchange_info()
-            symbol_data = next((item for item in symbol_info['symbols'] if item['symbol'] == self.symbol), None)
+            # Sembol bilgilerini al (BinanceClient önbelleğinden)
+            symbol_data = self.client.get_symbol_data()
 
             if not symbol_data:
                 logging.error(f"Sembol bilgisi alınamadı: {self.symbol}")
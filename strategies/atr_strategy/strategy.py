@@ -1,6 +1,8 @@
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
+from strategies import indicators
+from core.timing import spans
 from strategies.atr_strategy.config import Config
 
 
@@ -59,6 +61,7 @@ class Strategy:
         
         return candle_start1 == candle_start2
 
+    @spans.timed()
     def calculate_atr_trailing_stop(self, df):
         """TradingView'deki ATR Trailing Stop hesaplaması"""
         # ATR hesapla
@@ -66,25 +69,11 @@ class Strategy:
         df['n_loss'] = self.config.key_value * df['atr']
 
         # Trailing stop hesapla
-        df['trailing_stop'] = 0.0
-
-        for i in range(1, len(df)):
-            prev_close = df.loc[i - 1, 'Close']
-            curr_close = df.loc[i, 'Close']
-            prev_stop = df.loc[i - 1, 'trailing_stop']
-            n_loss = df.loc[i, 'n_loss']
-
-            if curr_close > prev_stop and prev_close > prev_stop:
-                df.loc[i, 'trailing_stop'] = max(prev_stop, curr_close - n_loss)
-            elif curr_close < prev_stop and prev_close < prev_stop:
-                df.loc[i, 'trailing_stop'] = min(prev_stop, curr_close + n_loss)
-            elif curr_close > prev_stop:
-                df.loc[i, 'trailing_stop'] = curr_close - n_loss
-            else:
-                df.loc[i, 'trailing_stop'] = curr_close + n_loss
+        df['trailing_stop'] = indicators.atr_trailing_stop(df['Close'], df['n_loss'])
 
         return df
 
+    @spans.timed()
     def calculate_super_trend(self, df):
         """TradingView'deki Super Trend hesaplaması"""
         df['hl2'] = (df['High'] + df['Low']) / 2
@@ -92,37 +81,23 @@ class Strategy:
         df['trend_up'] = df['hl2'] - df['super_trend_atr']
         df['trend_down'] = df['hl2'] + df['super_trend_atr']
 
-        df['super_trend'] = 0.0
-        df['super_trend_direction'] = 0  # 1: yukarı, -1: aşağı
-
-        for i in range(1, len(df)):
-            curr_close = df.loc[i, 'Close']
-            prev_trend = df.loc[i - 1, 'super_trend']
-            trend_up = df.loc[i, 'trend_up']
-            trend_down = df.loc[i, 'trend_down']
-
-            if curr_close > prev_trend:
-                df.loc[i, 'super_trend'] = trend_down
-                df.loc[i, 'super_trend_direction'] = 1
-            else:
-                df.loc[i, 'super_trend'] = trend_up
-                df.loc[i, 'super_trend_direction'] = -1
+        # super_trend_direction: 1 yukarı, -1 aşağı
+        df['super_trend'], df['super_trend_direction'] = indicators.super_trend(
+            df['Close'], df['trend_up'], df['trend_down'])
 
         return df
 
+    @spans.timed()
     def calculate_atr(self, df, period):
         """ATR hesaplaması"""
-        high_low = df['High'] - df['Low']
-        high_close = np.abs(df['High'] - df['Close'].shift())
-        low_close = np.abs(df['Low'] - df['Close'].shift())
-        ranges = pd.concat([high_low, high_close, low_close], axis=1)
-        true_range = np.max(ranges, axis=1)
-        return true_range.rolling(window=period).mean()
+        return pd.Series(indicators.atr(df['High'], df['Low'], df['Close'], period), index=df.index)
 
+    @spans.timed()
     def calculate_ema(self, df, period):
         """EMA hesaplaması"""
         return df['Close'].ewm(span=period, adjust=False).mean()
 
+    @spans.timed()
     def determine_position(self, df):
         """TradingView'deki sinyal mantığı"""
         # ATR Trailing Stop hesapla
@@ -1,6 +1,8 @@
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
+from strategies import indicators
+from core.timing import spans
 from strategies.eralp_strateji2.config import Config
 
 
@@ -64,76 +66,26 @@ class Strategy:
         
         return candle_start1 == candle_start2
 
+    @spans.timed()
     def calculate_psar(self, df):
         """Parabolic SAR hesaplaması"""
-        high = df['High']
-        low = df['Low']
-        close = df['Close']
-
         # PSAR parametreleri
         start = self.config.psar_start * 0.01
         increment = self.config.psar_increment * 0.01
         maximum = self.config.psar_maximum * 0.10
 
-        # PSAR hesaplama
-        psar = pd.Series(index=df.index, dtype=float)
-        trend = pd.Series(index=df.index, dtype=int)
-        ep = pd.Series(index=df.index, dtype=float)
-        acc = pd.Series(index=df.index, dtype=float)
-
-        # İlk değerler
-        psar[0] = low[0]
-        trend[0] = 1
-        ep[0] = high[0]
-        acc[0] = start
-
-        for i in range(1, len(df)):
-            # Trend devam ediyor mu kontrol et
-            if trend[i - 1] == 1:
-                psar[i] = psar[i - 1] + acc[i - 1] * (ep[i - 1] - psar[i - 1])
-                if low[i] < psar[i]:
-                    trend[i] = -1
-                    psar[i] = ep[i - 1]
-                    acc[i] = start
-                    ep[i] = low[i]
-                else:
-                    trend[i] = 1
-                    if high[i] > ep[i - 1]:
-                        ep[i] = high[i]
-                        acc[i] = min(acc[i - 1] + increment, maximum)
-                    else:
-                        ep[i] = ep[i - 1]
-                        acc[i] = acc[i - 1]
-            else:
-                psar[i] = psar[i - 1] + acc[i - 1] * (ep[i - 1] - psar[i - 1])
-                if high[i] > psar[i]:
-                    trend[i] = 1
-                    psar[i] = ep[i - 1]
-                    acc[i] = start
-                    ep[i] = high[i]
-                else:
-                    trend[i] = -1
-                    if low[i] < ep[i - 1]:
-                        ep[i] = low[i]
-                        acc[i] = min(acc[i - 1] + increment, maximum)
-                    else:
-                        ep[i] = ep[i - 1]
-                        acc[i] = acc[i - 1]
+        psar, trend = indicators.parabolic_sar(df['High'], df['Low'], start, increment, maximum)
 
         df['psar'] = psar
         df['psar_trend'] = trend
         return df
 
+    @spans.timed()
     def calculate_atr(self, df, period=10):
         """ATR hesaplaması"""
-        high_low = df['High'] - df['Low']
-        high_close = np.abs(df['High'] - df['Close'].shift())
-        low_close = np.abs(df['Low'] - df['Close'].shift())
-        ranges = pd.concat([high_low, high_close, low_close], axis=1)
-        true_range = np.max(ranges, axis=1)
-        atr = true_range.rolling(window=period).mean()
-        return atr
+        return pd.Series(indicators.atr(df['High'], df['Low'], df['Close'], period), index=df.index)
 
+    @spans.timed()
     def calculate_rsi(self, df, period=14):
         """RSI hesaplaması"""
         delta = df['Close'].diff()
@@ -143,6 +95,7 @@ class Strategy:
         rsi = 100 - (100 / (1 + rs))
         return rsi
 
+    @spans.timed()
     def calculate_zones(self, df):
         """ATR tabanlı bölgeleri hesaplar"""
         # ATR hesapla
@@ -155,39 +108,15 @@ class Strategy:
         df['down_zone'] = df['hl2'] + (df['atr'] * self.config.zone_multiplier)
         df['up_zone'] = df['hl2'] - (df['atr'] * self.config.zone_multiplier)
 
-        # Önceki değerleri kullanarak bölgeleri güncelle
-        for i in range(1, len(df)):
-            prev_close = df.loc[i - 1, 'Close']
-            prev_down = df.loc[i - 1, 'down_zone']
-            prev_up = df.loc[i - 1, 'up_zone']
-            current_down = df.loc[i, 'down_zone']
-            current_up = df.loc[i, 'up_zone']
-
-            # Pine Script'teki mantığı uygula
-            if prev_close < prev_down:
-                df.loc[i, 'down_zone'] = min(current_down, prev_down)
-
-            if prev_close > prev_up:
-                df.loc[i, 'up_zone'] = max(current_up, prev_up)
+        # Önceki değerleri kullanarak bölgeleri güncelle (Pine Script mantığı)
+        df['down_zone'], df['up_zone'] = indicators.atr_zones(df['Close'], df['down_zone'], df['up_zone'])
 
         # Zone Decider hesapla
-        df['zone_decider'] = 1  # Başlangıç değeri
-
-        for i in range(1, len(df)):
-            prev_decider = df.loc[i - 1, 'zone_decider']
-            current_close = df.loc[i, 'Close']
-            current_down = df.loc[i, 'down_zone']
-            current_up = df.loc[i, 'up_zone']
-
-            if prev_decider == -1 and current_close > current_down:
-                df.loc[i, 'zone_decider'] = 1
-            elif prev_decider == 1 and current_close < current_up:
-                df.loc[i, 'zone_decider'] = -1
-            else:
-                df.loc[i, 'zone_decider'] = prev_decider
+        df['zone_decider'] = indicators.zone_decider(df['Close'], df['down_zone'], df['up_zone'])
 
         return df
 
+    @spans.timed()
     def calculate_donchian(self, df):
         """Donchian Channel hesaplaması"""
         df['upper_donchian'] = df['High'].rolling(window=self.config.donchian_length).max()
@@ -195,17 +124,15 @@ class Strategy:
         df['middle_donchian'] = (df['upper_donchian'] + df['lower_donchian']) / 2
         return df
 
+    @spans.timed()
     def calculate_ema(self, df, period):
         """EMA hesaplaması"""
         return df['Close'].ewm(span=period, adjust=False).mean()
 
+    @spans.timed()
     def calculate_hma(self, df, period):
         """HMA hesaplaması"""
-        wmaf = df['Close'].rolling(window=period // 2).apply(
-            lambda x: np.sum(x * np.arange(1, len(x) + 1)) / np.sum(np.arange(1, len(x) + 1)))
-        wmas = df['Close'].rolling(window=period).apply(
-            lambda x: np.sum(x * np.arange(1, len(x) + 1)) / np.sum(np.arange(1, len(x) + 1)))
-        return wmaf * 2 - wmas
+        return pd.Series(indicators.hma(df['Close'], period), index=df.index)
 
     def check_market_conditions(self, df):
         """Market koşullarını kontrol eder"""
@@ -259,6 +186,23 @@ class Strategy:
         
         return score_filter_ok
 
+    def market_conditions_mask(self, df):
+        """check_market_conditions sonucunu tüm satırlar için tek seferde hesaplar"""
+        # İlk 199 satırda yeterli veri yok, sonrasında market koşulları her zaman uygun
+        return pd.Series(np.arange(len(df)) >= 199, index=df.index)
+
+    def score_filter_mask(self, df):
+        """check_score_filter sonucunu tüm satırlar için tek seferde hesaplar"""
+        tolerance = self.config.bad_signal_tolerance
+        blocked = np.zeros(len(df), dtype=bool)
+
+        for column, bad_list in (('rsi', self.bad_rsi_signals), ('atr', self.bad_atr_signals)):
+            values = df[column].to_numpy(dtype=float)
+            for bad_value in bad_list:
+                blocked |= np.abs(values - bad_value) < tolerance
+
+        return pd.Series(~blocked, index=df.index)
+
     def add_bad_signal(self, rsi_value, atr_value):
         """Zararlı işlem sinyallerini kaydet"""
         self.bad_rsi_signals.insert(0, rsi_value)
@@ -270,6 +214,7 @@ class Strategy:
         if len(self.bad_atr_signals) > self.config.max_bad_signals:
             self.bad_atr_signals.pop()
 
+    @spans.timed()
     def determine_position(self, df):
         """Pozisyon belirleme mantığı"""
         # PSAR hesapla
@@ -307,9 +252,9 @@ class Strategy:
             (df['Close'] < df['middle_donchian'])
         )
 
-        # Market condition ve score filter kontrolleri
-        df['market_conditions_ok'] = df.apply(lambda row: self.check_market_conditions(df.loc[:df.index.get_loc(row.name)]), axis=1)
-        df['score_filter_ok'] = df.apply(lambda row: self.check_score_filter(df.loc[:df.index.get_loc(row.name)]), axis=1)
+        # Market condition ve score filter kontrolleri (her satır için o satıra kadar olan veriyle)
+        df['market_conditions_ok'] = self.market_conditions_mask(df)
+        df['score_filter_ok'] = self.score_filter_mask(df)
         
         # Final trade koşulları
         df['can_trade'] = df['market_conditions_ok'] & df['score_filter_ok']
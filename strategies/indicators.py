@@ -0,0 +1,204 @@
+"""
+Ortak indikatör çekirdekleri
+
+Stratejilerdeki özyinelemeli (her değer bir önceki değere bağlı) hesaplamaların
+numpy dizileri üzerinde çalışan karşılıkları. Döngüler DataFrame.loc yerine düz
+Python listeleri üzerinde çalışır; sonuçlar stratejilerin eski satır satır
+hesaplamalarıyla birebir aynıdır, sadece çok daha hızlıdır. Böylece aynı kod hem
+canlı botlarda (100 mum) hem de geçmiş veri testlerinde (yüz binlerce mum)
+kullanılabilir.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def true_range(high, low, close):
+    """True Range (ilk mumda önceki kapanış olmadığından sadece High-Low kullanılır)"""
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    close = np.asarray(close, dtype=float)
+
+    prev_close = np.empty_like(close)
+    prev_close[0] = np.nan
+    prev_close[1:] = close[:-1]
+
+    ranges = np.column_stack([high - low, np.abs(high - prev_close), np.abs(low - prev_close)])
+    # pandas max(axis=1) gibi NaN değerleri atla
+    return np.fmax(np.fmax(ranges[:, 0], ranges[:, 1]), ranges[:, 2])
+
+
+def rolling_mean(values, window):
+    """Hareketli ortalama (pandas rolling ile aynı sonuç)"""
+    return pd.Series(values).rolling(window=window).mean().to_numpy()
+
+
+def atr(high, low, close, period):
+    """Basit hareketli ortalamalı ATR"""
+    return rolling_mean(true_range(high, low, close), period)
+
+
+def parabolic_sar(high, low, start, increment, maximum):
+    """
+    Parabolic SAR hesaplaması
+
+    Returns:
+        tuple: (psar, trend) dizileri, trend 1 (yukarı) / -1 (aşağı)
+    """
+    high = np.asarray(high, dtype=float).tolist()
+    low = np.asarray(low, dtype=float).tolist()
+    n = len(high)
+
+    psar = [np.nan] * n
+    trend = [np.nan] * n
+    if n == 0:
+        return np.array(psar), np.array(trend)
+
+    prev_psar = low[0]
+    prev_trend = 1
+    prev_ep = high[0]
+    prev_acc = start
+    psar[0] = prev_psar
+    trend[0] = prev_trend
+
+    for i in range(1, n):
+        value = prev_psar + prev_acc * (prev_ep - prev_psar)
+        if prev_trend == 1:
+            if low[i] < value:
+                prev_trend = -1
+                value = prev_ep
+                prev_acc = start
+                prev_ep = low[i]
+            elif high[i] > prev_ep:
+                prev_ep = high[i]
+                prev_acc = min(prev_acc + increment, maximum)
+        else:
+            if high[i] > value:
+                prev_trend = 1
+                value = prev_ep
+                prev_acc = start
+                prev_ep = high[i]
+            elif low[i] < prev_ep:
+                prev_ep = low[i]
+                prev_acc = min(prev_acc + increment, maximum)
+
+        prev_psar = value
+        psar[i] = value
+        trend[i] = prev_trend
+
+    return np.array(psar), np.array(trend, dtype=float)
+
+
+def atr_zones(close, down_zone, up_zone):
+    """
+    ATR bölgelerini önceki mumlara göre daraltır (Pine Script mantığı)
+
+    Args:
+        close: Kapanış fiyatları
+        down_zone: hl2 + atr * çarpan
+        up_zone: hl2 - atr * çarpan
+
+    Returns:
+        tuple: Güncellenmiş (down_zone, up_zone) dizileri
+    """
+    close = np.asarray(close, dtype=float).tolist()
+    down = np.asarray(down_zone, dtype=float).tolist()
+    up = np.asarray(up_zone, dtype=float).tolist()
+
+    for i in range(1, len(close)):
+        prev_close = close[i - 1]
+        if prev_close < down[i - 1]:
+            down[i] = min(down[i], down[i - 1])
+        if prev_close > up[i - 1]:
+            up[i] = max(up[i], up[i - 1])
+
+    return np.array(down), np.array(up)
+
+
+def zone_decider(close, down_zone, up_zone, lag=0):
+    """
+    Zone decider hesaplaması (1: yeşil bölge, -1: kırmızı bölge)
+
+    Args:
+        lag: Karşılaştırmada kullanılacak bölge değerinin kaç mum önceki olduğu
+             (psar/eralp stratejileri 0, skorlama stratejisi 1 kullanır)
+    """
+    close = np.asarray(close, dtype=float).tolist()
+    down = np.asarray(down_zone, dtype=float).tolist()
+    up = np.asarray(up_zone, dtype=float).tolist()
+
+    decider = [1] * len(close)
+    prev = 1
+    for i in range(1, len(close)):
+        if prev == -1 and close[i] > down[i - lag]:
+            prev = 1
+        elif prev == 1 and close[i] < up[i - lag]:
+            prev = -1
+        decider[i] = prev
+
+    return np.array(decider, dtype=np.int64)
+
+
+def wma(values, period):
+    """Ağırlıklı hareketli ortalama (ağırlıklar 1..period)"""
+    values = np.asarray(values, dtype=float)
+    result = np.full(len(values), np.nan)
+    if period <= 0 or len(values) < period:
+        return result
+
+    weights = np.arange(1, period + 1, dtype=float)
+    # convolve ağırlıkları ters çevirdiği için ters sırayla veriyoruz
+    result[period - 1:] = np.convolve(values, weights[::-1], mode='valid') / weights.sum()
+    return result
+
+
+def hma(values, period):
+    """Stratejilerde kullanılan HMA: 2 * WMA(period/2) - WMA(period)"""
+    return wma(values, period // 2) * 2 - wma(values, period)
+
+
+def atr_trailing_stop(close, n_loss):
+    """ATR Trailing Stop hesaplaması (ilk değer 0.0)"""
+    close = np.asarray(close, dtype=float).tolist()
+    n_loss = np.asarray(n_loss, dtype=float).tolist()
+
+    stop = [0.0] * len(close)
+    for i in range(1, len(close)):
+        prev_close = close[i - 1]
+        curr_close = close[i]
+        prev_stop = stop[i - 1]
+
+        if curr_close > prev_stop and prev_close > prev_stop:
+            stop[i] = max(prev_stop, curr_close - n_loss[i])
+        elif curr_close < prev_stop and prev_close < prev_stop:
+            stop[i] = min(prev_stop, curr_close + n_loss[i])
+        elif curr_close > prev_stop:
+            stop[i] = curr_close - n_loss[i]
+        else:
+            stop[i] = curr_close + n_loss[i]
+
+    return np.array(stop)
+
+
+def super_trend(close, trend_up, trend_down):
+    """
+    Super Trend hesaplaması (ilk değer 0.0)
+
+    Returns:
+        tuple: (super_trend, direction) dizileri, direction 1 (yukarı) / -1 (aşağı)
+    """
+    close = np.asarray(close, dtype=float).tolist()
+    trend_up = np.asarray(trend_up, dtype=float).tolist()
+    trend_down = np.asarray(trend_down, dtype=float).tolist()
+
+    values = [0.0] * len(close)
+    direction = [0] * len(close)
+    for i in range(1, len(close)):
+        if close[i] > values[i - 1]:
+            values[i] = trend_down[i]
+            direction[i] = 1
+        else:
+            values[i] = trend_up[i]
+            direction[i] = -1
+
+    return np.array(values), np.array(direction, dtype=np.int64)
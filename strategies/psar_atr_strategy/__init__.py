@@ -5,10 +5,14 @@ This package contains the implementation of various trading strategies
 using the strategy pattern.
 """
 
-from .bot import Bot
-from .strategy import Strategy
-from .executor import Executor
-from .config import Config
+from core.lazy_imports import lazy_module_getattr
+
+__getattr__ = lazy_module_getattr(__name__, {
+    'Bot': '.bot',
+    'Strategy': '.strategy',
+    'Executor': '.executor',
+    'Config': '.config',
+})
 
 __all__ = [
     'Bot',
@@ -5,6 +5,8 @@ import ntplib
 import socket
 from core import TradingSignal
 from adapters.binance.order_manager import OrderManager
+from core.order_latency import order_latency
+from core.timing import spans
 from strategies.psar_atr_strategy.config import Config
 
 class Executor:
@@ -22,11 +24,14 @@ class Executor:
         self.pending_signal = None
         self.last_signal_time = None
         
-        # NTP senkronizasyonunu önce yap
-        self._sync_ntp_time()
-        
-        # Zaman senkronizasyonunu başlat
-        self._sync_time()
+        # NTP senkronizasyonu Bot başlangıcında yapılır; Binance sunucu offset'i
+        # BinanceClient bağlantı sırasında hesaplandıysa tekrar sorgulanmaz
+        client_offset = getattr(client, 'time_offset', None)
+        if client_offset is not None:
+            self.time_offset = client_offset
+            logging.info(f"Zaman senkronizasyonu BinanceClient'tan alındı. Offset: {self.time_offset}ms")
+        else:
+            self._sync_time()
 
     def _sync_ntp_time(self):
         """NTP sunucusu ile sistem saatini senkronize eder"""
@@ -100,6 +105,7 @@ class Executor:
         """Yeni bir Signal objesi oluşturur"""
         return TradingSignal(side, quantity, entry_price, stop_loss, take_profit)
 
+    @spans.timed()
     def execute_trade(self, side, quantity, entry_price, stop_loss, take_profit):
         """Trade'i başlatır"""
         signal = self.create_signal(side, quantity, entry_price, stop_loss, take_profit)
@@ -136,6 +142,7 @@ class Executor:
                 if not self.order_manager.verify_position(signal.side, signal.quantity):
                     logging.error("Pozisyon doğrulanamadı, TP/SL emirleri oluşturulmayacak")
                     return False
+                order_latency.mark('verified')
 
                 # Stop Loss emri
                 sl_order = self.order_manager.create_order_with_retry(
@@ -205,9 +212,8 @@ class Executor:
                 logging.error("Geçersiz giriş fiyatı.")
                 return None, None
 
-            # Sembol bilgilerini al
-            symbol_info = self.client.client.futures_exchange_info()
-            symbol_data = next((item for item in symbol_info['symbols'] if item['symbol'] == self.symbol), None)
+            # Sembol bilgilerini al (BinanceClient önbelleğinden)
+            symbol_data = self.client.get_symbol_data()
 
             if not symbol_data:
                 logging.error(f"Sembol bilgisi alınamadı: {self.symbol}")
@@ -1,6 +1,8 @@
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
+from strategies import indicators
+from core.timing import spans
 from strategies.psar_atr_strategy.config import Config
 
 
@@ -60,76 +62,26 @@ class Strategy:
         
         return candle_start1 == candle_start2
 
+    @spans.timed()
     def calculate_psar(self, df):
         """Parabolic SAR hesaplaması"""
-        high = df['High']
-        low = df['Low']
-        close = df['Close']
-
         # PSAR parametreleri
         start = self.config.psar_start * 0.01
         increment = self.config.psar_increment * 0.01
         maximum = self.config.psar_maximum * 0.10
 
-        # PSAR hesaplama
-        psar = pd.Series(index=df.index, dtype=float)
-        trend = pd.Series(index=df.index, dtype=int)
-        ep = pd.Series(index=df.index, dtype=float)
-        acc = pd.Series(index=df.index, dtype=float)
-
-        # İlk değerler
-        psar[0] = low[0]
-        trend[0] = 1
-        ep[0] = high[0]
-        acc[0] = start
-
-        for i in range(1, len(df)):
-            # Trend devam ediyor mu kontrol et
-            if trend[i - 1] == 1:
-                psar[i] = psar[i - 1] + acc[i - 1] * (ep[i - 1] - psar[i - 1])
-                if low[i] < psar[i]:
-                    trend[i] = -1
-                    psar[i] = ep[i - 1]
-                    acc[i] = start
-                    ep[i] = low[i]
-                else:
-                    trend[i] = 1
-                    if high[i] > ep[i - 1]:
-                        ep[i] = high[i]
-                        acc[i] = min(acc[i - 1] + increment, maximum)
-                    else:
-                        ep[i] = ep[i - 1]
-                        acc[i] = acc[i - 1]
-            else:
-                psar[i] = psar[i - 1] + acc[i - 1] * (ep[i - 1] - psar[i - 1])
-                if high[i] > psar[i]:
-                    trend[i] = 1
-                    psar[i] = ep[i - 1]
-                    acc[i] = start
-                    ep[i] = high[i]
-                else:
-                    trend[i] = -1
-                    if low[i] < ep[i - 1]:
-                        ep[i] = low[i]
-                        acc[i] = min(acc[i - 1] + increment, maximum)
-                    else:
-                        ep[i] = ep[i - 1]
-                        acc[i] = acc[i - 1]
+        psar, trend = indicators.parabolic_sar(df['High'], df['Low'], start, increment, maximum)
 
         df['psar'] = psar
         df['psar_trend'] = trend
         return df
 
+    @spans.timed()
     def calculate_atr(self, df, period=10):
         """ATR hesaplaması"""
-        high_low = df['High'] - df['Low']
-        high_close = np.abs(df['High'] - df['Close'].shift())
-        low_close = np.abs(df['Low'] - df['Close'].shift())
-        ranges = pd.concat([high_low, high_close, low_close], axis=1)
-        true_range = np.max(ranges, axis=1)
-        atr = true_range.rolling(window=period).mean()
-        return atr
+        return pd.Series(indicators.atr(df['High'], df['Low'], df['Close'], period), index=df.index)
 
+    @spans.timed()
     def calculate_zones(self, df):
         """ATR tabanlı bölgeleri hesaplar"""
         # ATR hesapla
@@ -142,39 +94,15 @@ class Strategy:
         df['down_zone'] = df['hl2'] + (df['atr'] * self.config.zone_multiplier)
         df['up_zone'] = df['hl2'] - (df['atr'] * self.config.zone_multiplier)
 
-        # Önceki değerleri kullanarak bölgeleri güncelle
-        for i in range(1, len(df)):
-            prev_close = df.loc[i - 1, 'Close']
-            prev_down = df.loc[i - 1, 'down_zone']
-            prev_up = df.loc[i - 1, 'up_zone']
-            current_down = df.loc[i, 'down_zone']
-            current_up = df.loc[i, 'up_zone']
-
-            # Pine Script'teki mantığı uygula
-            if prev_close < prev_down:
-                df.loc[i, 'down_zone'] = min(current_down, prev_down)
-
-            if prev_close > prev_up:
-                df.loc[i, 'up_zone'] = max(current_up, prev_up)
+        # Önceki değerleri kullanarak bölgeleri güncelle (Pine Script mantığı)
+        df['down_zone'], df['up_zone'] = indicators.atr_zones(df['Close'], df['down_zone'], df['up_zone'])
 
         # Zone Decider hesapla
-        df['zone_decider'] = 1  # Başlangıç değeri
-
-        for i in range(1, len(df)):
-            prev_decider = df.loc[i - 1, 'zone_decider']
-            current_close = df.loc[i, 'Close']
-            current_down = df.loc[i, 'down_zone']
-            current_up = df.loc[i, 'up_zone']
-
-            if prev_decider == -1 and current_close > current_down:
-                df.loc[i, 'zone_decider'] = 1
-            elif prev_decider == 1 and current_close < current_up:
-                df.loc[i, 'zone_decider'] = -1
-            else:
-                df.loc[i, 'zone_decider'] = prev_decider
+        df['zone_decider'] = indicators.zone_decider(df['Close'], df['down_zone'], df['up_zone'])
 
         return df
 
+    @spans.timed()
     def calculate_donchian(self, df):
         """Donchian Channel hesaplaması"""
         df['upper_donchian'] = df['High'].rolling(window=self.config.donchian_length).max()
@@ -182,18 +110,17 @@ class Strategy:
         df['middle_donchian'] = (df['upper_donchian'] + df['lower_donchian']) / 2
         return df
 
+    @spans.timed()
     def calculate_ema(self, df, period):
         """EMA hesaplaması"""
         return df['Close'].ewm(span=period, adjust=False).mean()
 
+    @spans.timed()
     def calculate_hma(self, df, period):
         """HMA hesaplaması"""
-        wmaf = df['Close'].rolling(window=period // 2).apply(
-            lambda x: np.sum(x * np.arange(1, len(x) + 1)) / np.sum(np.arange(1, len(x) + 1)))
-        wmas = df['Close'].rolling(window=period).apply(
-            lambda x: np.sum(x * np.arange(1, len(x) + 1)) / np.sum(np.arange(1, len(x) + 1)))
-        return wmaf * 2 - wmas
+        return pd.Series(indicators.hma(df['Close'], period), index=df.index)
 
+    @spans.timed()
     def determine_position(self, df):
         """Pozisyon belirleme mantığı"""
         # PSAR hesapla
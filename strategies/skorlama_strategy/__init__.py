@@ -14,8 +14,13 @@ Strateji özellikleri:
 - Adaptive Early Exit
 """
 
-from .bot import Bot
-from .strategy import SkorlamaStrategy
-from .executor import SkorlamaExecutor
+from core.lazy_imports import lazy_module_getattr
+
+__getattr__ = lazy_module_getattr(__name__, {
+    'Bot': '.bot',
+    'SkorlamaStrategy': '.strategy',
+    'SkorlamaExecutor': '.executor',
+})
+
 
 __all__ = ['Bot', 'SkorlamaStrategy', 'SkorlamaExecutor'] 
\ No newline at end of file
@@ -5,6 +5,8 @@ import ntplib
 import socket
 from core import TradingSignal
 from adapters.binance.order_manager import OrderManager
+from core.order_latency import order_latency
+from core.timing import spans
 from strategies.skorlama_strategy.config import SkorlamaConfig
 
 class SkorlamaBinanceExecutor:
@@ -100,6 +102,7 @@ class SkorlamaBinanceExecutor:
         """Yeni bir Signal objesi oluşturur"""
         return TradingSignal(side, quantity, entry_price, stop_loss, take_profit)
 
+    @spans.timed()
     def execute_trade(self, side, quantity, entry_price, stop_loss, take_profit):
         """Trade'i başlatır"""
         signal = self.create_signal(side, quantity, entry_price, stop_loss, take_profit)
@@ -136,6 +139,7 @@ class SkorlamaBinanceExecutor:
                 if not self.order_manager.verify_position(signal.side, signal.quantity):
                     logging.error("Pozisyon doğrulanamadı, TP/SL emirleri oluşturulmayacak")
                     return False
+                order_latency.mark('verified')
 
                 # Stop Loss emri
                 sl_order = self.order_manager.create_order_with_retry(
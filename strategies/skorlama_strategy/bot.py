@@ -12,7 +12,6 @@ import logging
 from datetime import datetime, timedelta
 from typing import Dict, Optional, List
 import os
-import csv
 import platform
 import ntplib
 import socket
@@ -26,6 +25,17 @@ from .strategy import SkorlamaStrategy
 from .executor import SkorlamaExecutor
 from .config import SkorlamaConfig
 from core.signal_logger import signal_logger
+from core.trade_journal import trade_journal
+
+TRADES_HEADER = (
+    'timestamp', 'symbol', 'action', 'position', 'price', 'size',
+    'leverage', 'trade_amount', 'take_profit', 'stop_loss',
+    'pnl_percent', 'reason', 'score', 'adx', 'rsi'
+)
+POSITIONS_HEADER = (
+    'timestamp', 'symbol', 'position', 'entry_price', 'current_price',
+    'pnl_percent', 'take_profit', 'stop_loss', 'leverage', 'trade_amount'
+)
 
 class SkorlamaBot:
     """Skorlama Stratejisi Bot Sınıfı"""
@@ -76,13 +86,10 @@ class SkorlamaBot:
         self.is_running = False
         self.last_candle_time = None
         
-        # CSV dosya yolları
+        # CSV dosya yolları (dosyalar ilk kayıtta header ile oluşturulur)
         self.trades_file = f'logs/trades_{self.symbol.lower()}.csv'
         self.positions_file = f'logs/positions_{self.symbol.lower()}.csv'
         
-        # CSV dosyalarını oluştur
-        self._initialize_csv_files()
-        
         # Durum değişkenleri
         self.position = 0  # 0: No Position, 1: Long, -1: Short
         self.entry_price = 0.0
@@ -104,74 +111,51 @@ class SkorlamaBot:
         self.current_signal_id = None
         self.position_entry_price = None
     
-    def _initialize_csv_files(self):
-        """CSV dosyalarını başlatma"""
-        # Trades CSV
-        if not os.path.exists(self.trades_file):
-            with open(self.trades_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow([
-                    'timestamp', 'symbol', 'action', 'position', 'price', 'size', 
-                    'leverage', 'trade_amount', 'take_profit', 'stop_loss', 
-                    'pnl_percent', 'reason', 'score', 'adx', 'rsi'
-                ])
-        
-        # Positions CSV
-        if not os.path.exists(self.positions_file):
-            with open(self.positions_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow([
-                    'timestamp', 'symbol', 'position', 'entry_price', 'current_price',
-                    'pnl_percent', 'take_profit', 'stop_loss', 'leverage', 'trade_amount'
-                ])
-    
     def _log_trade(self, trade_data: Dict, signal_data: Dict = None):
-        """İşlem verilerini CSV'ye kaydetme"""
+        """İşlem verilerini işlem günlüğüne ekler (CSV yazımı arka plan thread'inde, fsync edilir)"""
         try:
-            with open(self.trades_file, 'a', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                
-                if trade_data['type'] == 'entry':
-                    writer.writerow([
-                        trade_data['timestamp'],
-                        self.symbol,
-                        'ENTRY',
-                        trade_data['position'],
-                        trade_data['price'],
-                        trade_data['size'],
-                        trade_data['leverage'],
-                        trade_data['trade_amount'],
-                        trade_data['take_profit'],
-                        trade_data['stop_loss'],
-                        '',  # pnl_percent
-                        '',  # reason
-                        signal_data.get('score', '') if signal_data else '',
-                        signal_data.get('adx', '') if signal_data else '',
-                        signal_data.get('rsi', '') if signal_data else ''
-                    ])
-                else:  # exit
-                    writer.writerow([
-                        trade_data['timestamp'],
-                        self.symbol,
-                        'EXIT',
-                        trade_data['position'],
-                        trade_data['exit_price'],
-                        '',  # size
-                        '',  # leverage
-                        '',  # trade_amount
-                        '',  # take_profit
-                        '',  # stop_loss
-                        trade_data['pnl_percent'],
-                        trade_data['reason'],
-                        '',  # score
-                        '',  # adx
-                        ''   # rsi
-                    ])
+            if trade_data['type'] == 'entry':
+                row = (
+                    trade_data['timestamp'],
+                    self.symbol,
+                    'ENTRY',
+                    trade_data['position'],
+                    trade_data['price'],
+                    trade_data['size'],
+                    trade_data['leverage'],
+                    trade_data['trade_amount'],
+                    trade_data['take_profit'],
+                    trade_data['stop_loss'],
+                    '',  # pnl_percent
+                    '',  # reason
+                    signal_data.get('score', '') if signal_data else '',
+                    signal_data.get('adx', '') if signal_data else '',
+                    signal_data.get('rsi', '') if signal_data else ''
+                )
+            else:  # exit
+                row = (
+                    trade_data['timestamp'],
+                    self.symbol,
+                    'EXIT',
+                    trade_data['position'],
+                    trade_data['exit_price'],
+                    '',  # size
+                    '',  # leverage
+                    '',  # trade_amount
+                    '',  # take_profit
+                    '',  # stop_loss
+                    trade_data['pnl_percent'],
+                    trade_data['reason'],
+                    '',  # score
+                    '',  # adx
+                    ''   # rsi
+                )
+            trade_journal.append(self.trades_file, TRADES_HEADER, list, (row,), durable=True)
         except Exception as e:
             self.logger.error(f"Trade log kaydetme hatası: {e}")
     
     def _log_position(self, position_info: Dict, current_price: float):
-        """Pozisyon verilerini CSV'ye kaydetme"""
+        """Pozisyon verilerini işlem günlüğüne ekler (tanı kaydı, fsync edilmez)"""
         try:
             if position_info:
                 pnl_percent = 0
@@ -180,20 +164,19 @@ class SkorlamaBot:
                 else:  # short
                     pnl_percent = ((position_info['entry_price'] - current_price) / position_info['entry_price']) * 100
                 
-                with open(self.positions_file, 'a', newline='', encoding='utf-8') as f:
-                    writer = csv.writer(f)
-                    writer.writerow([
-                        datetime.now(),
-                        self.symbol,
-                        position_info['position'],
-                        position_info['entry_price'],
-                        current_price,
-                        pnl_percent,
-                        position_info['take_profit'],
-                        position_info['stop_loss'],
-                        self.leverage,
-                        self.trade_amount
-                    ])
+                row = (
+                    datetime.now(),
+                    self.symbol,
+                    position_info['position'],
+                    position_info['entry_price'],
+                    current_price,
+                    pnl_percent,
+                    position_info['take_profit'],
+                    position_info['stop_loss'],
+                    self.leverage,
+                    self.trade_amount
+                )
+                trade_journal.append(self.positions_file, POSITIONS_HEADER, list, (row,))
         except Exception as e:
             self.logger.error(f"Position log kaydetme hatası: {e}")
     
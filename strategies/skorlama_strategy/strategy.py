@@ -18,6 +18,8 @@ import pandas as pd
 import numpy as np
 import ta
 from typing import Dict, Tuple, Optional
+from strategies import indicators
+from core.timing import spans
 from .config import SkorlamaConfig
 
 class SkorlamaStrategy:
@@ -36,6 +38,7 @@ class SkorlamaStrategy:
         self.down_zone_history = []
         self.up_zone_history = []
         
+    @spans.timed()
     def calculate_psar(self, high: pd.Series, low: pd.Series, close: pd.Series) -> Tuple[pd.Series, pd.Series]:
         """
         PSAR (Parabolic SAR) hesaplama
@@ -64,18 +67,13 @@ class SkorlamaStrategy:
         psar = psar_indicator.psar()
         
         # PSAR yukarı ve aşağı değerlerini ayır
-        psar_up = pd.Series(index=close.index, dtype=float)
-        psar_down = pd.Series(index=close.index, dtype=float)
-        
-        for i in range(len(close)):
-            if not pd.isna(psar.iloc[i]):
-                if close.iloc[i] >= psar.iloc[i]:
-                    psar_up.iloc[i] = psar.iloc[i]
-                else:
-                    psar_down.iloc[i] = psar.iloc[i]
+        is_up = close >= psar
+        psar_up = psar.where(is_up)
+        psar_down = psar.where(~is_up & psar.notna())
         
         return psar_up, psar_down
     
+    @spans.timed()
     def calculate_atr_zone(self, high: pd.Series, low: pd.Series, close: pd.Series) -> Tuple[pd.Series, pd.Series, pd.Series]:
         """
         ATR Zone sistemi hesaplama
@@ -106,33 +104,19 @@ class SkorlamaStrategy:
         # Up zone hesapla
         up_zone = hl2 - self.config.ATR_ZONE_MULTIPLIER * atr
         
-        # Zone decider hesapla
-        zone_decider = pd.Series(1, index=close.index)
+        # Zone'ları önceki mumlara göre güncelle
+        down_values, up_values = indicators.atr_zones(close, down_zone, up_zone)
+        down_zone = pd.Series(down_values, index=close.index)
+        up_zone = pd.Series(up_values, index=close.index)
         
-        for i in range(1, len(close)):
-            # Down zone güncelleme
-            if close.iloc[i-1] < down_zone.iloc[i-1]:
-                down_zone.iloc[i] = min(down_zone.iloc[i], down_zone.iloc[i-1])
-            else:
-                down_zone.iloc[i] = down_zone.iloc[i]
-            
-            # Up zone güncelleme
-            if close.iloc[i-1] > up_zone.iloc[i-1]:
-                up_zone.iloc[i] = max(up_zone.iloc[i], up_zone.iloc[i-1])
-            else:
-                up_zone.iloc[i] = up_zone.iloc[i]
-            
-            # Zone decider güncelleme
-            prev_decider = zone_decider.iloc[i-1]
-            if prev_decider == -1 and close.iloc[i] > down_zone.iloc[i-1]:
-                zone_decider.iloc[i] = 1
-            elif prev_decider == 1 and close.iloc[i] < up_zone.iloc[i-1]:
-                zone_decider.iloc[i] = -1
-            else:
-                zone_decider.iloc[i] = prev_decider
+        # Zone decider hesapla (bir önceki mumun zone değerleriyle karşılaştırılır)
+        zone_decider = pd.Series(
+            indicators.zone_decider(close, down_values, up_values, lag=1), index=close.index
+        )
         
         return down_zone, up_zone, zone_decider
     
+    @spans.timed()
     def calculate_donchian_channel(self, high: pd.Series, low: pd.Series) -> Tuple[pd.Series, pd.Series, pd.Series]:
         """
         Donchian Channel hesaplama
@@ -158,6 +142,7 @@ class SkorlamaStrategy:
         
         return upper_donchian, lower_donchian, middle_donchian
     
+    @spans.timed()
     def calculate_ema(self, close: pd.Series) -> Tuple[pd.Series, pd.Series]:
         """
         EMA 50 ve 200 hesaplama
@@ -168,11 +153,12 @@ class SkorlamaStrategy:
         Returns:
             Tuple[pd.Series, pd.Series]: EMA 50, EMA 200
         """
-        ema50 = ta.trend.EMAIndicator(close=close, window=self.config.EMA_FAST).ema()
-        ema200 = ta.trend.EMAIndicator(close=close, window=self.config.EMA_SLOW).ema()
+        ema50 = ta.trend.EMAIndicator(close=close, window=self.config.EMA_FAST).ema_indicator()
+        ema200 = ta.trend.EMAIndicator(close=close, window=self.config.EMA_SLOW).ema_indicator()
         
         return ema50, ema200
     
+    @spans.timed()
     def calculate_adx(self, high: pd.Series, low: pd.Series, close: pd.Series) -> Tuple[pd.Series, pd.Series, pd.Series]:
         """
         ADX göstergesi hesaplama
@@ -199,6 +185,7 @@ class SkorlamaStrategy:
         
         return adx, plus_di, minus_di
     
+    @spans.timed()
     def calculate_rsi(self, close: pd.Series) -> pd.Series:
         """
         RSI hesaplama
@@ -211,6 +198,7 @@ class SkorlamaStrategy:
         """
         return ta.momentum.RSIIndicator(close=close, window=self.config.RSI_LENGTH).rsi()
     
+    @spans.timed()
     def calculate_volume_ma(self, volume: pd.Series) -> pd.Series:
         """
         Volume Moving Average hesaplama
@@ -223,6 +211,7 @@ class SkorlamaStrategy:
         """
         return volume.rolling(window=self.config.VOLUME_MA_LENGTH).mean()
     
+    @spans.timed()
     def calculate_atr_volatility(self, high: pd.Series, low: pd.Series, close: pd.Series) -> Tuple[pd.Series, pd.Series]:
         """
         ATR volatilite hesaplama
@@ -246,6 +235,7 @@ class SkorlamaStrategy:
         
         return atr, atr_ma
     
+    @spans.timed()
     def calculate_score(self, adx: pd.Series, ema50: pd.Series, ema200: pd.Series, 
                        rsi: pd.Series, volume: pd.Series, volume_ma: pd.Series) -> pd.Series:
         """
@@ -301,40 +291,27 @@ class SkorlamaStrategy:
         Returns:
             Tuple[pd.Series, pd.Series]: Buy sinyalleri, Sell sinyalleri
         """
-        buy_signals = pd.Series(False, index=close.index)
-        sell_signals = pd.Series(False, index=close.index)
+        # Trend durumu
+        is_trend = ema50 > ema200
         
-        for i in range(1, len(close)):
-            # Trend durumu
-            is_trend = ema50.iloc[i] > ema200.iloc[i]
-            
-            # Güçlü trend
-            is_strong_trend = adx.iloc[i] > self.config.ADX_MIN
-            
-            # Volatilite
-            is_volatile = atr.iloc[i] > atr_ma.iloc[i]
-            
-            # Zone değişimi
-            green_zone = zone_decider.iloc[i] == 1 and zone_decider.iloc[i-1] == -1
-            red_zone = zone_decider.iloc[i] == -1 and zone_decider.iloc[i-1] == 1
-            
-            # Buy sinyali
-            if (green_zone and 
-                close.iloc[i] > middle_donchian.iloc[i] and 
-                is_trend and 
-                is_strong_trend and 
-                is_volatile and 
-                score.iloc[i] >= self.config.MIN_SCORE):
-                buy_signals.iloc[i] = True
-            
-            # Sell sinyali
-            if (red_zone and 
-                close.iloc[i] < middle_donchian.iloc[i] and 
-                is_trend and 
-                is_strong_trend and 
-                is_volatile and 
-                score.iloc[i] >= self.config.MIN_SCORE):
-                sell_signals.iloc[i] = True
+        # Güçlü trend
+        is_strong_trend = adx > self.config.ADX_MIN
+        
+        # Volatilite
+        is_volatile = atr > atr_ma
+        
+        # Zone değişimi
+        prev_decider = zone_decider.shift(1)
+        green_zone = (zone_decider == 1) & (prev_decider == -1)
+        red_zone = (zone_decider == -1) & (prev_decider == 1)
+        
+        filters_ok = is_trend & is_strong_trend & is_volatile & (score >= self.config.MIN_SCORE)
+        
+        # Buy sinyali
+        buy_signals = green_zone & (close > middle_donchian) & filters_ok
+        
+        # Sell sinyali
+        sell_signals = red_zone & (close < middle_donchian) & filters_ok
         
         return buy_signals, sell_signals
     
@@ -371,12 +348,15 @@ class SkorlamaStrategy:
         
         return trend_reversed_long, trend_reversed_short
     
-    def analyze_data(self, df: pd.DataFrame) -> Dict:
+    @spans.timed()
+    def analyze_data(self, df: pd.DataFrame, include_psar: bool = True) -> Dict:
         """
         Tüm veriyi analiz etme ve sinyaller üretme
         
         Args:
             df: OHLCV veri çerçevesi
+            include_psar: PSAR hesaplansın mı (sinyallerde kullanılmaz, sadece gösterim
+                          içindir; uzun geçmiş veride en yavaş adım olduğundan atlanabilir)
             
         Returns:
             Dict: Analiz sonuçları
@@ -388,7 +368,10 @@ class SkorlamaStrategy:
         volume = df['volume']
         
         # Göstergeleri hesapla
-        psar_up, psar_down = self.calculate_psar(high, low, close)
+        if include_psar:
+            psar_up, psar_down = self.calculate_psar(high, low, close)
+        else:
+            psar_up = psar_down = pd.Series(np.nan, index=close.index)
         down_zone, up_zone, zone_decider = self.calculate_atr_zone(high, low, close)
         upper_donchian, lower_donchian, middle_donchian = self.calculate_donchian_channel(high, low)
         ema50, ema200 = self.calculate_ema(close)
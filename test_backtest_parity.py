@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Backtest Parity Test Script
+Bu script, strategies/indicators.py çekirdekleriyle hesaplanan strateji kolonlarının
+stratejilerin eski satır satır hesaplamalarıyla birebir aynı olduğunu ve
+VectorizedBacktester'ın canlı botların determine_position sinyalleriyle çalıştığını
+sabit tohumlu sentetik mumlar üzerinde kontrol eder.
+
+Referans fonksiyonlar çekirdeklerden önceki strateji kodunun kopyasıdır.
+"""
+
+import numpy as np
+import pandas as pd
+
+from backtest import StrategyAdapter, VectorizedBacktester, simulate_trades
+from strategies import indicators
+
+PARITY_STRATEGIES = ('psar_atr_strategy', 'eralp_strateji2', 'atr_strategy')
+
+
+def synthetic_candles(n=600, seed=7):
+    """Yön değiştiren rastgele yürüyüş (bölge geçişleri ve sinyaller oluşsun diye rejimli)"""
+    rng = np.random.default_rng(seed)
+    drift = np.repeat(rng.choice([-0.003, 0.003], size=n // 30 + 1), 30)[:n]
+    close = 100 * np.exp(np.cumsum(drift + rng.normal(0, 0.004, n)))
+    open_ = np.concatenate([[close[0]], close[:-1]])
+    spread = np.abs(rng.normal(0, 0.003, n)) * close
+    return pd.DataFrame({
+        'datetime': pd.date_range('2026-01-01', periods=n, freq='15min'),
+        'Open': open_,
+        'High': np.maximum(open_, close) + spread,
+        'Low': np.minimum(open_, close) - spread,
+        'Close': close,
+        'Volume': rng.uniform(100, 1000, n),
+    })
+
+
+# --- Eski (çekirdek öncesi) hesaplamalar ---
+
+def reference_psar(df, start, increment, maximum):
+    high = df['High']
+    low = df['Low']
+    psar = pd.Series(index=df.index, dtype=float)
+    trend = pd.Series(index=df.index, dtype=float)
+    ep = pd.Series(index=df.index, dtype=float)
+    acc = pd.Series(index=df.index, dtype=float)
+
+    psar[0] = low[0]
+    trend[0] = 1
+    ep[0] = high[0]
+    acc[0] = start
+
+    for i in range(1, len(df)):
+        if trend[i - 1] == 1:
+            psar[i] = psar[i - 1] + acc[i - 1] * (ep[i - 1] - psar[i - 1])
+            if low[i] < psar[i]:
+                trend[i] = -1
+                psar[i] = ep[i - 1]
+                acc[i] = start
+                ep[i] = low[i]
+            else:
+                trend[i] = 1
+                if high[i] > ep[i - 1]:
+                    ep[i] = high[i]
+                    acc[i] = min(acc[i - 1] + increment, maximum)
+                else:
+                    ep[i] = ep[i - 1]
+                    acc[i] = acc[i - 1]
+        else:
+            psar[i] = psar[i - 1] + acc[i - 1] * (ep[i - 1] - psar[i - 1])
+            if high[i] > psar[i]:
+                trend[i] = 1
+                psar[i] = ep[i - 1]
+                acc[i] = start
+                ep[i] = high[i]
+            else:
+                trend[i] = -1
+                if low[i] < ep[i - 1]:
+                    ep[i] = low[i]
+                    acc[i] = min(acc[i - 1] + increment, maximum)
+                else:
+                    ep[i] = ep[i - 1]
+                    acc[i] = acc[i - 1]
+    return psar, trend
+
+
+def reference_atr(df, period):
+    high_low = df['High'] - df['Low']
+    high_close = np.abs(df['High'] - df['Close'].shift())
+    low_close = np.abs(df['Low'] - df['Close'].shift())
+    ranges = pd.concat([high_low, high_close, low_close], axis=1)
+    true_range = np.max(ranges, axis=1)
+    return true_range.rolling(window=period).mean()
+
+
+def reference_zones(df):
+    for i in range(1, len(df)):
+        prev_close = df.loc[i - 1, 'Close']
+        prev_down = df.loc[i - 1, 'down_zone']
+        prev_up = df.loc[i - 1, 'up_zone']
+        if prev_close < prev_down:
+            df.loc[i, 'down_zone'] = min(df.loc[i, 'down_zone'], prev_down)
+        if prev_close > prev_up:
+            df.loc[i, 'up_zone'] = max(df.loc[i, 'up_zone'], prev_up)
+
+    df['zone_decider'] = 1
+    for i in range(1, len(df)):
+        prev_decider = df.loc[i - 1, 'zone_decider']
+        current_close = df.loc[i, 'Close']
+        if prev_decider == -1 and current_close > df.loc[i, 'down_zone']:
+            df.loc[i, 'zone_decider'] = 1
+        elif prev_decider == 1 and current_close < df.loc[i, 'up_zone']:
+            df.loc[i, 'zone_decider'] = -1
+        else:
+            df.loc[i, 'zone_decider'] = prev_decider
+    return df
+
+
+def reference_hma(df, period):
+    wmaf = df['Close'].rolling(window=period // 2).apply(
+        lambda x: np.sum(x * np.arange(1, len(x) + 1)) / np.sum(np.arange(1, len(x) + 1)))
+    wmas = df['Close'].rolling(window=period).apply(
+        lambda x: np.sum(x * np.arange(1, len(x) + 1)) / np.sum(np.arange(1, len(x) + 1)))
+    return wmaf * 2 - wmas
+
+
+def reference_trailing_stop(df):
+    df['trailing_stop'] = 0.0
+    for i in range(1, len(df)):
+        prev_close = df.loc[i - 1, 'Close']
+        curr_close = df.loc[i, 'Close']
+        prev_stop = df.loc[i - 1, 'trailing_stop']
+        n_loss = df.loc[i, 'n_loss']
+        if curr_close > prev_stop and prev_close > prev_stop:
+            df.loc[i, 'trailing_stop'] = max(prev_stop, curr_close - n_loss)
+        elif curr_close < prev_stop and prev_close < prev_stop:
+            df.loc[i, 'trailing_stop'] = min(prev_stop, curr_close + n_loss)
+        elif curr_close > prev_stop:
+            df.loc[i, 'trailing_stop'] = curr_close - n_loss
+        else:
+            df.loc[i, 'trailing_stop'] = curr_close + n_loss
+    return df
+
+
+def reference_super_trend(df):
+    df['super_trend'] = 0.0
+    df['super_trend_direction'] = 0
+    for i in range(1, len(df)):
+        if df.loc[i, 'Close'] > df.loc[i - 1, 'super_trend']:
+            df.loc[i, 'super_trend'] = df.loc[i, 'trend_down']
+            df.loc[i, 'super_trend_direction'] = 1
+        else:
+            df.loc[i, 'super_trend'] = df.loc[i, 'trend_up']
+            df.loc[i, 'super_trend_direction'] = -1
+    return df
+
+
+def reference_strategy(name):
+    """Hesaplama metotları eski koda döndürülmüş strateji nesnesi"""
+    strategy = StrategyAdapter(name).strategy
+    config = strategy.config
+
+    def calculate_psar(df):
+        df['psar'], df['psar_trend'] = reference_psar(
+            df, config.psar_start * 0.01, config.psar_increment * 0.01, config.psar_maximum * 0.10)
+        return df
+
+    def calculate_zones(df):
+        df['atr'] = reference_atr(df, config.zone_length)
+        df['hl2'] = (df['High'] + df['Low']) / 2
+        df['down_zone'] = df['hl2'] + (df['atr'] * config.zone_multiplier)
+        df['up_zone'] = df['hl2'] - (df['atr'] * config.zone_multiplier)
+        return reference_zones(df)
+
+    def calculate_atr_trailing_stop(df):
+        df['atr'] = reference_atr(df, config.atr_period)
+        df['n_loss'] = config.key_value * df['atr']
+        return reference_trailing_stop(df)
+
+    def calculate_super_trend(df):
+        df['hl2'] = (df['High'] + df['Low']) / 2
+        df['super_trend_atr'] = df['atr'] * config.super_trend_factor
+        df['trend_up'] = df['hl2'] - df['super_trend_atr']
+        df['trend_down'] = df['hl2'] + df['super_trend_atr']
+        return reference_super_trend(df)
+
+    strategy.calculate_atr = lambda df, period=10: reference_atr(df, period)
+    if name == 'atr_strategy':
+        strategy.calculate_atr_trailing_stop = calculate_atr_trailing_stop
+        strategy.calculate_super_trend = calculate_super_trend
+    else:
+        strategy.calculate_psar = calculate_psar
+        strategy.calculate_zones = calculate_zones
+        strategy.calculate_hma = reference_hma
+    if name == 'eralp_strateji2':
+        # Eski hali: her satır için o satıra kadar olan veriyle df.apply
+        strategy.market_conditions_mask = lambda df: df.apply(
+            lambda row: strategy.check_market_conditions(df.loc[:df.index.get_loc(row.name)]), axis=1)
+        strategy.score_filter_mask = lambda df: df.apply(
+            lambda row: strategy.check_score_filter(df.loc[:df.index.get_loc(row.name)]), axis=1)
+    return strategy
+
+
+def test_indicator_kernels_match_reference():
+    """Çekirdekler eski satır satır hesaplamalarla aynı sonucu vermeli"""
+    df = synthetic_candles()
+
+    psar, trend = indicators.parabolic_sar(df['High'], df['Low'], 0.02, 0.02, 0.2)
+    ref_psar, ref_trend = reference_psar(df, 0.02, 0.02, 0.2)
+    np.testing.assert_allclose(psar, ref_psar.to_numpy(), rtol=0, atol=1e-12)
+    np.testing.assert_array_equal(trend, ref_trend.to_numpy())
+
+    np.testing.assert_allclose(indicators.atr(df['High'], df['Low'], df['Close'], 10),
+                               reference_atr(df, 10).to_numpy(), rtol=1e-12, equal_nan=True)
+    np.testing.assert_allclose(indicators.hma(df['Close'], 200), reference_hma(df, 200).to_numpy(),
+                               rtol=1e-12, equal_nan=True)
+
+    zones = df.copy()
+    zones['atr'] = reference_atr(zones, 10)
+    hl2 = (zones['High'] + zones['Low']) / 2
+    zones['down_zone'] = hl2 + zones['atr'] * 3
+    zones['up_zone'] = hl2 - zones['atr'] * 3
+    down, up = indicators.atr_zones(zones['Close'], zones['down_zone'], zones['up_zone'])
+    decider = indicators.zone_decider(zones['Close'], down, up)
+    zones = reference_zones(zones)
+    np.testing.assert_array_equal(down, zones['down_zone'].to_numpy())
+    np.testing.assert_array_equal(up, zones['up_zone'].to_numpy())
+    np.testing.assert_array_equal(decider, zones['zone_decider'].to_numpy())
+    assert (np.diff(decider) != 0).sum() > 4, "Sentetik veride bölge geçişi yok"
+
+
+def test_strategy_columns_match_reference():
+    """determine_position eski hesaplamalarla aynı kolonları ve sinyalleri üretmeli"""
+    df = synthetic_candles()
+    for name in PARITY_STRATEGIES:
+        result = StrategyAdapter(name).strategy.determine_position(df.copy())
+        expected = reference_strategy(name).determine_position(df.copy())
+        assert list(result.columns) == list(expected.columns), name
+        for column in expected.columns:
+            if column == 'datetime':
+                continue
+            np.testing.assert_allclose(result[column].to_numpy(dtype=float), expected[column].to_numpy(dtype=float),
+                                       rtol=1e-12, equal_nan=True, err_msg=f"{name}.{column}")
+        assert expected['buy'].any() and expected['sell'].any(), f"{name}: sentetik veride sinyal yok"
+
+
+def test_backtester_uses_live_signals():
+    """
+    VectorizedBacktester sinyalleri, aynı başlangıçtan itibaren mum mum çağrılan determine_position'ın
+    son satırıyla (canlı bot) aynı olmalı; işlemler eski hesaplamanın sinyalleriyle aynı olmalı
+    """
+    df = synthetic_candles()
+    for name in PARITY_STRATEGIES:
+        backtester = VectorizedBacktester(name, timeframe='15m')
+        buy, sell = backtester.adapter.signals(df)
+
+        live = StrategyAdapter(name).strategy
+        for i in sorted(set(range(1, len(df), 9)) | set(np.flatnonzero(buy | sell))):
+            last = live.determine_position(df.iloc[:i + 1].copy()).iloc[-1]
+            assert bool(last['buy']) == buy[i], f"{name} bar {i} buy"
+            assert bool(last['sell'] and not last['buy']) == sell[i], f"{name} bar {i} sell"
+
+        expected = reference_strategy(name).determine_position(df.copy())
+        ref_buy = expected['buy'].to_numpy(dtype=bool)
+        ref_sell = expected['sell'].to_numpy(dtype=bool) & ~ref_buy
+        raw_trades = simulate_trades(
+            df['Open'].to_numpy(), df['High'].to_numpy(), df['Low'].to_numpy(), df['Close'].to_numpy(),
+            ref_buy, ref_sell, backtester.adapter.take_profit_percent, backtester.adapter.stop_loss_percent,
+            confirm_bars=backtester.confirm_bars
+        )
+        result = backtester.run(df)
+        pd.testing.assert_frame_equal(result.trades, backtester.build_trades(df, raw_trades))
+        assert len(result.trades) > 0, f"{name}: işlem yok"
+
+
+if __name__ == "__main__":
+    print("Backtest Parity Test başlatılıyor...")
+    test_indicator_kernels_match_reference()
+    test_strategy_columns_match_reference()
+    test_backtester_uses_live_signals()
+    print("\nTest tamamlandı!")
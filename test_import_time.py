@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Import Time Test Script
+Bu script, strateji paketlerinin import süresini ve import sırasında dosya işlemi
+yapılmadığını kontrol eder. Ölçüm `python -X importtime` çıktısından yapılır.
+
+Limit IMPORT_TIME_CAP_MS ortam değişkeni ile değiştirilebilir (varsayılan 3000 ms).
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+IMPORT_TIME_CAP_MS = float(os.getenv('IMPORT_TIME_CAP_MS', 3000))
+
+
+def _run_python(code, cwd, *flags):
+    """Kodu temiz bir Python sürecinde çalıştırır"""
+    env = dict(os.environ, PYTHONPATH=REPO_DIR, PYTHONDONTWRITEBYTECODE='1')
+    return subprocess.run(
+        [sys.executable, *flags, '-c', code],
+        cwd=cwd, env=env, capture_output=True, text=True, timeout=120
+    )
+
+
+def _import_times(module_name, cwd):
+    """-X importtime çıktısını {modül: cumulative ms} sözlüğüne çevirir"""
+    result = _run_python(f"import {module_name}", cwd, '-X', 'importtime')
+    assert result.returncode == 0, result.stderr
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        # "import time:   self [us] | cumulative | imported package"
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative_us) / 1000
+    return times
+
+
+def test_no_file_io_at_import():
+    """Sinyal logger'ı ve strateji paketleri import edilince logs klasörü oluşmamalı"""
+    with tempfile.TemporaryDirectory() as cwd:
+        result = _run_python(
+            "import core.signal_logger, strategies.psar_atr_strategy.bot, strategies.eralp_strateji2.bot",
+            cwd
+        )
+        assert result.returncode == 0, result.stderr
+        assert not os.path.exists(os.path.join(cwd, 'logs')), "Import sırasında logs klasörü oluşturuldu"
+
+
+def test_strategy_kernel_does_not_load_exchange():
+    """Strateji hesaplama modülleri binance kütüphanesini yüklememeli"""
+    with tempfile.TemporaryDirectory() as cwd:
+        for strategy in ('psar_atr_strategy', 'eralp_strateji2', 'atr_strategy'):
+            result = _run_python(
+                f"import sys, strategies.{strategy}.strategy; print('binance' in sys.modules)",
+                cwd
+            )
+            assert result.returncode == 0, result.stderr
+            assert result.stdout.strip() == 'False', f"{strategy}.strategy binance yükledi"
+
+
+def test_bot_import_time_cap():
+    """Bot modülünün toplam import süresi limitin altında olmalı"""
+    with tempfile.TemporaryDirectory() as cwd:
+        for strategy in ('psar_atr_strategy', 'eralp_strateji2', 'atr_strategy'):
+            module_name = f'strategies.{strategy}.bot'
+            times = _import_times(module_name, cwd)
+            elapsed = times[module_name]
+            print(f"{module_name}: {elapsed:.1f} ms (limit {IMPORT_TIME_CAP_MS:.0f} ms)")
+            assert elapsed < IMPORT_TIME_CAP_MS, f"{module_name} import süresi {elapsed:.1f} ms"
+
+
+if __name__ == "__main__":
+    print("Import Time Test başlatılıyor...")
+    test_no_file_io_at_import()
+    test_strategy_kernel_does_not_load_exchange()
+    test_bot_import_time_cap()
+    print("\nTest tamamlandı!")
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Log Archive Test Script
+Bu script, bot CSV loglarının kolonsal arşivini kontrol eder: compact() işleminin kapanmış
+günleri arşive taşıyıp bugünün satırlarını güncel CSV'de bırakması, skorlama dosyalarının
+arşive alınması, tail ve sources filtreleri ve to_records çıktısının CSV biçimini koruması.
+"""
+
+import csv
+import os
+import types
+from datetime import date, datetime
+
+import pytest
+
+from core import log_archive as log_archive_module
+from core.log_archive import LogArchive, dataset_for
+from core.telegram.telegram_notifier import TELEGRAM_CSV_HEADER
+from core.trade_journal import (POSITION_CLOSE_HEADER, TRADE_ACTIVITY_HEADER, _position_close_row,
+                                _trade_activity_row)
+from strategies.skorlama_strategy.bot import POSITIONS_HEADER as SKORLAMA_POSITIONS_HEADER
+from strategies.skorlama_strategy.bot import TRADES_HEADER as SKORLAMA_TRADES_HEADER
+
+TODAY = date(2026, 10, 19)
+
+
+def _trade(day, hour, action='POSITION_OPEN', side='BUY', quantity=0.01, price=65000.5, details='', symbol='BTCUSDT'):
+    timestamp = datetime(2026, 10, day, hour, 30, 15).timestamp()
+    return _trade_activity_row(timestamp, symbol, action, side, quantity, price, details,
+                               (('ATR', '.2f', 12.345), ('Zone', 'd', 1)))
+
+
+def _position(day, hour, pnl=4.5):
+    return _position_close_row(datetime(2026, 10, day, hour, 0, 0), 'BTCUSDT', 'LONG', 65000, 65100.25,
+                               pnl / 10, pnl, 'TP')
+
+
+def _write_csv(path, header, rows, mode='w'):
+    with open(path, mode, newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        if mode == 'w':
+            writer.writerow(header)
+        writer.writerows(rows)
+
+
+def _read_csv(path):
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        return list(csv.reader(f))
+
+
+def _no_grace(monkeypatch, on_sleep=None):
+    """Yeniden adlandırma beklemesini kaldırır; on_sleep verilirse her beklemede çağrılır"""
+    monkeypatch.setattr(log_archive_module, 'time', types.SimpleNamespace(sleep=on_sleep or (lambda seconds: None)))
+
+
+def test_compact_archives_closed_days_and_keeps_today_live(tmp_path, monkeypatch):
+    """Bugünden önceki satırlar arşive taşınmalı; bugünün ve arada yazılan satırlar güncel CSV'de kalmalı"""
+    logs = tmp_path / 'logs'
+    logs.mkdir()
+    trades = logs / 'psar_trades_btcusdt.csv'
+    old_rows = [_trade(17, 9), _trade(17, 10, 'SIGNAL', '', 0, 0, 'tanı'), _trade(18, 23, 'POSITION_CLOSE', 'SELL')]
+    today_rows = [_trade(19, 0), _trade(19, 1, 'SIGNAL', '', 0, 0)]
+    _write_csv(trades, TRADE_ACTIVITY_HEADER, old_rows + today_rows)
+    positions = logs / 'atr_positions_ethusdt.csv'
+    _write_csv(positions, POSITION_CLOSE_HEADER, [_position(16, 8), _position(18, 12, -2.0)])
+    telegram = logs / 'telegram_general.csv'
+    _write_csv(telegram, TELEGRAM_CSV_HEADER,
+               [['2026-10-18 12:00:00', 'GENERAL', 'test', 'çok\nsatırlı', 'SUCCESS', ''],
+                ['2026-10-19 00:00:01', 'GENERAL', 'test', 'bugün', 'ERROR', 'HTTP 502']])
+    skorlama = logs / 'trades_btcusdt.csv'
+    _write_csv(skorlama, SKORLAMA_TRADES_HEADER,
+               [['2026-10-18 10:00:00.123456', 'BTCUSDT', 'ENTRY', 'long', 65000.5, 0.01, 10, 100, 66000, 64000, '',
+                 '', 7.5, 31.2, 55.0]])
+    current = logs / 'atr_trades_btcusdt.csv'
+    _write_csv(current, TRADE_ACTIVITY_HEADER, [_trade(19, 2)])
+    current_before = current.read_bytes()
+
+    # Yeniden adlandırmadan sonra bot yeni psar_trades dosyasına bir satır yazmış olsun
+    late_row = _trade(19, 3, 'ORDERS_CREATED')
+    sleeps = []
+
+    def bot_writes(seconds):
+        sleeps.append(seconds)
+        if len(sleeps) == 1:
+            _write_csv(trades, TRADE_ACTIVITY_HEADER, [late_row])
+
+    _no_grace(monkeypatch, bot_writes)
+    archive = LogArchive(str(logs))
+    counts = archive.compact(today=TODAY)
+
+    assert counts == {'trades': 3, 'positions': 2, 'telegram': 1, 'skorlama_trades': 1, 'skorlama_positions': 0,
+                      'signals': 0}
+    assert _read_csv(trades) == [list(TRADE_ACTIVITY_HEADER)] + today_rows + [late_row]
+    assert not positions.exists()
+    assert _read_csv(telegram)[1:] == [['2026-10-19 00:00:01', 'GENERAL', 'test', 'bugün', 'ERROR', 'HTTP 502']]
+    assert not skorlama.exists()
+    assert current.read_bytes() == current_before
+    assert sorted(os.listdir(logs)) == ['archive', 'atr_trades_btcusdt.csv', 'psar_trades_btcusdt.csv',
+                                        'telegram_general.csv']
+
+    assert archive.days('trades') == [date(2026, 10, 17), date(2026, 10, 18)]
+    assert archive.days('positions') == [date(2026, 10, 16), date(2026, 10, 18)]
+    assert archive.days('skorlama_trades') == [date(2026, 10, 18)]
+    assert archive.sources('trades') == {'psar_trades_btcusdt': ['2026-10-17', '2026-10-18']}
+
+    # Tekrar çalıştırmak bir şey değiştirmez: güncel dosyalar bugünle başlıyor
+    assert sum(archive.compact(today=TODAY).values()) == 0
+    assert len(archive.query('trades', sources=['psar_trades_btcusdt'])) == 6
+    frame = archive.query('skorlama_trades')
+    assert str(frame['time'][0]) == '2026-10-18 10:00:00'
+    assert frame['score'][0] == 7.5 and frame['action'][0] == 'ENTRY'
+
+
+def test_query_tail_and_sources(tmp_path, monkeypatch):
+    """sources yalnızca verilen dosyaların satırlarını, tail en yeni N satırı döndürmeli"""
+    _no_grace(monkeypatch)
+    logs = tmp_path / 'logs'
+    logs.mkdir()
+    _write_csv(logs / 'psar_trades_btcusdt.csv', TRADE_ACTIVITY_HEADER,
+               [_trade(day, 12, price=100 + day) for day in (15, 16, 17)] + [_trade(19, 1, price=119)])
+    _write_csv(logs / 'atr_trades_ethusdt.csv', TRADE_ACTIVITY_HEADER,
+               [_trade(day, 13, price=200 + day, symbol='ETHUSDT') for day in (16, 18)] +
+               [_trade(19, 2, price=219, symbol='ETHUSDT')])
+    archive = LogArchive(str(logs))
+    assert archive.compact(today=TODAY)['trades'] == 5
+    assert archive.sources('trades') == {'atr_trades_ethusdt': ['2026-10-16', '2026-10-18'],
+                                         'psar_trades_btcusdt': ['2026-10-15', '2026-10-17']}
+
+    frame = archive.query('trades', columns=['time', 'price', 'source'], sources=['atr_trades_ethusdt'])
+    assert list(frame['price']) == [216, 218, 219]
+    assert set(frame['source']) == {'atr_trades_ethusdt'}
+
+    assert list(archive.query('trades', columns=['price'], tail=3)['price']) == [218, 119, 219]
+    assert list(archive.query('trades', columns=['price'], sources=['psar_trades_btcusdt'], tail=2)['price']) == \
+        [117, 119]
+    assert list(archive.query('trades', columns=['price'], symbols=['BTCUSDT'], start='2026-10-16',
+                              end='2026-10-17')['price']) == [116, 117]
+    assert list(archive.query('trades', columns=['price'], live=False)['price']) == [115, 116, 216, 117, 218]
+
+    # Güncel satırlar yeterliyse arşiv bölümleri açılmaz
+    with open(os.path.join(archive.root, 'trades', '2026-10-15.npz'), 'wb') as f:
+        f.write(b'bozuk')
+    assert list(archive.query('trades', columns=['price'], tail=2)['price']) == [119, 219]
+    # sources aralığı dışında kalan günler de açılmaz
+    assert list(archive.query('trades', columns=['price'], sources=['atr_trades_ethusdt'])['price']) == [216, 218, 219]
+
+    with pytest.raises(ValueError):
+        archive.query('trades', columns=['yok'])
+
+
+def test_to_records_round_trips_csv_format(tmp_path, monkeypatch):
+    """to_records arşivlenmiş ve güncel satırları CSV'deki başlık ve biçimle aynen vermeli"""
+    _no_grace(monkeypatch)
+    logs = tmp_path / 'logs'
+    logs.mkdir()
+    files = {
+        'psar_trades_btcusdt': (TRADE_ACTIVITY_HEADER,
+                                [_trade(18, 9), _trade(18, 10, 'SIGNAL', '', 0, 0, 'tanı'),
+                                 _trade(19, 1, 'POSITION_CLOSE', 'SELL', 0.123456, 64999.1234)]),
+        'psar_positions_btcusdt': (POSITION_CLOSE_HEADER, [_position(18, 9), _position(19, 2, -12.345)]),
+        'telegram_btcusdt': (TELEGRAM_CSV_HEADER,
+                             [['2026-10-18 12:00:00', 'BTCUSDT', 'production', '🟢 <b>LONG</b>\nFiyat: 65000, ok',
+                               'SUCCESS', ''],
+                              ['2026-10-19 00:00:01', 'BTCUSDT', 'production', 'mesaj', 'DROPPED',
+                               'Telegram kuyruğu dolu']]),
+        'trades_btcusdt': (SKORLAMA_TRADES_HEADER,
+                           [['2026-10-18 10:00:00', 'BTCUSDT', 'ENTRY', 'long', '65000.5', '0.01', '10', '100',
+                             '66000', '64000', '', '', '7.5', '31.2', '55'],
+                            ['2026-10-19 11:00:00', 'BTCUSDT', 'EXIT', 'long', '65100', '', '', '', '', '',
+                             '0.1538', 'TP', '', '', '']]),
+        'positions_btcusdt': (SKORLAMA_POSITIONS_HEADER,
+                              [['2026-10-18 10:05:00', 'BTCUSDT', 'long', '65000.5', '65020.25', '0.0303',
+                                '66000', '64000', '10', '100']]),
+    }
+    for stem, (header, rows) in files.items():
+        _write_csv(logs / f'{stem}.csv', header, rows)
+    expected = {stem: [dict(zip(header, row)) for row in rows] for stem, (header, rows) in files.items()}
+
+    archive = LogArchive(str(logs))
+    archive.compact(today=TODAY)
+    assert archive.days('positions') == [date(2026, 10, 18)]
+
+    for stem in files:
+        dataset = dataset_for(f'{stem}.csv')
+        records = LogArchive.to_records(dataset, archive.query(dataset, sources=[stem]))
+        assert records == expected[stem], stem
+
+
+def test_dataset_for():
+    """Dosya adları doğru veri kümesine eşlenmeli; skorlama dosyaları diğer desenlerle karışmamalı"""
+    assert dataset_for('logs/psar_trades_btcusdt.csv') == 'trades'
+    assert dataset_for('eralp_trades_BTCUSDT.csv') == 'trades'
+    assert dataset_for('atr_positions_ethusdt.csv') == 'positions'
+    assert dataset_for('telegram_general.csv') == 'telegram'
+    assert dataset_for('trades_btcusdt.csv') == 'skorlama_trades'
+    assert dataset_for('positions_btcusdt.csv') == 'skorlama_positions'
+    assert dataset_for('sinyal_kontrol.csv') is None
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    print("Log Archive Test başlatılıyor...")
+    for test in (test_compact_archives_closed_days_and_keeps_today_live, test_query_tail_and_sources,
+                 test_to_records_round_trips_csv_format):
+        with tempfile.TemporaryDirectory() as directory, pytest.MonkeyPatch.context() as monkeypatch:
+            test(Path(directory), monkeypatch)
+    test_dataset_for()
+    print("\nTest tamamlandı!")
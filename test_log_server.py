@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Log Server Test Script
+Bu script, tek yazıcılı log sunucusunu kontrol eder: soket dosyasının yalnızca sahibine
+açık olması, kayıtların JSON olarak taşınması, pickle ve geçersiz kayıtların reddedilmesi
+ve log klasörü dışındaki CSV yollarına yazılmaması.
+"""
+
+import logging
+import os
+import pickle
+import socket
+import stat
+import struct
+import time
+
+import pytest
+
+from core.log_server import LogWriter, _ForwardHandler, encode_record
+from core.logging_config import LoggingConfig
+
+
+def _writer(tmp_path):
+    config = LoggingConfig()
+    config.log_dir = str(tmp_path / 'logs')
+    return LogWriter(os.path.join(config.log_dir, 'log_server.sock'), config).start(), config
+
+
+def _send(path, *payloads):
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(path)
+    for payload in payloads:
+        client.sendall(payload)
+    client.close()
+
+
+def _wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def _read(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def test_socket_is_private_and_single_writer(tmp_path):
+    """Soket 0600 olmalı; aynı sokette ikinci yazıcı açılmamalı, durunca soket silinmeli"""
+    writer, config = _writer(tmp_path)
+    try:
+        assert stat.S_IMODE(os.stat(writer.path).st_mode) == 0o600
+        with pytest.raises(OSError):
+            LogWriter(writer.path, config).start()
+    finally:
+        writer.stop()
+    assert not os.path.exists(writer.path)
+
+    # Önceki yazıcıdan kalan (dinlenmeyen) soket dosyası yeni yazıcıyı engellemez
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(writer.path)
+    stale.close()
+    LogWriter(writer.path, config).start().stop()
+
+
+def test_forwarded_records_and_csv_rows_are_written(tmp_path):
+    """Handler'ın gönderdiği kayıtlar logger dosyasına, WARNING'ler errors.txt'ye, CSV satırları dosyaya yazılmalı"""
+    writer, config = _writer(tmp_path)
+    handler = _ForwardHandler(writer.path, config)
+    try:
+        record = logging.makeLogRecord({'name': 'bot', 'msg': 'fiyat %s', 'args': (65000,), 'levelno': logging.WARNING,
+                                        'levelname': 'WARNING'})
+        record.log_file = 'psar_btcusdt'
+        handler.emit(record)
+        csv_path = os.path.join(config.log_dir, 'telegram_general.csv')
+        handler.emit(logging.makeLogRecord({'name': 'csv', 'msg': 'telegram_general.csv', 'csv_path': csv_path,
+                                            'csv_header': ['Tarih/Saat', 'Mesaj'],
+                                            'csv_row': ['2026-10-19 01:00:00', 'çok, satırlı\nmesaj']}))
+        assert _wait_for(lambda: writer.written == 2)
+    finally:
+        handler.close()
+        writer.stop()
+
+    assert handler.forwarded == 2 and handler.fallbacks == 0
+    assert 'fiyat 65000' in _read(os.path.join(config.log_dir, 'psar_btcusdt.txt'))
+    assert 'fiyat 65000' in _read(os.path.join(config.log_dir, 'errors.txt'))
+    assert _read(csv_path) == 'Tarih/Saat,Mesaj\n2026-10-19 01:00:00,"çok, satırlı\nmesaj"\n'
+
+
+def test_untrusted_payloads_are_rejected(tmp_path):
+    """Pickle, tür hatalı kayıtlar ve log klasörü dışındaki CSV yolları yazılmamalı"""
+    writer, config = _writer(tmp_path)
+    outside = tmp_path / 'outside.csv'
+    marker = tmp_path / 'pwned'
+    try:
+        pickled = pickle.dumps({'name': 'x', 'msg': 'pickle'})
+        _send(writer.path,
+              struct.pack('>L', len(pickled)) + pickled,
+              encode_record({'name': 'x', 'msg': 'tür', 'levelno': 'WARNING'}),
+              encode_record(['liste']),
+              encode_record({'name': 'csv', 'msg': 'dış', 'csv_path': str(outside),
+                             'csv_header': ['a'], 'csv_row': ['b']}),
+              encode_record({'name': 'csv', 'msg': 'geri', 'csv_header': ['a'], 'csv_row': ['b'],
+                             'csv_path': os.path.join(config.log_dir, '..', 'outside.csv')}),
+              encode_record({'name': 'csv', 'msg': 'uzantı', 'csv_header': ['a'], 'csv_row': ['b'],
+                             'csv_path': os.path.join(config.log_dir, 'bot.py')}),
+              encode_record({'name': 'ok', 'msg': 'geçerli kayıt', 'levelno': logging.INFO, 'levelname': 'INFO'}))
+        assert _wait_for(lambda: writer.written == 1 and writer.rejected == 3)
+        assert writer._server.rejected == 3
+    finally:
+        writer.stop()
+
+    assert not outside.exists() and not marker.exists()
+    assert not os.path.exists(os.path.join(config.log_dir, 'bot.py'))
+    assert 'geçerli kayıt' in _read(os.path.join(config.log_dir, 'ok.txt'))
+    assert not os.path.exists(os.path.join(config.log_dir, 'x.txt'))
+
+
+def test_oversized_record_closes_connection(tmp_path):
+    """Sınırı aşan uzunluk öneki bağlantıyı kapatmalı, sunucu çalışmaya devam etmeli"""
+    writer, config = _writer(tmp_path)
+    try:
+        _send(writer.path, struct.pack('>L', 1 << 30))
+        _send(writer.path, encode_record({'name': 'ok', 'msg': 'sonra', 'levelno': logging.INFO,
+                                          'levelname': 'INFO'}))
+        assert _wait_for(lambda: writer.written == 1)
+    finally:
+        writer.stop()
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    print("Log Server Test başlatılıyor...")
+    for test in (test_socket_is_private_and_single_writer, test_forwarded_records_and_csv_rows_are_written,
+                 test_untrusted_payloads_are_rejected, test_oversized_record_closes_connection):
+        with tempfile.TemporaryDirectory() as directory:
+            test(Path(directory))
+    print("\nTest tamamlandı!")
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Signal Logger Test Script
+Bu script, sinyal kontrol kaydının SQLite deposunu kontrol eder: eski sinyal_kontrol.csv
+aktarımı, pozisyon güncellemelerinin tek satırı değiştirmesi, birden fazla sürecin aynı
+dosyaya yazması ve export_csv çıktısının eski CSV başlığıyla aynı olması.
+"""
+
+import csv
+import io
+import multiprocessing
+import os
+import sqlite3
+
+from core.signal_logger import HEADER, SignalLogger
+
+# Eski (CSV tabanlı) SignalLogger'ın yazdığı başlık
+LEGACY_HEADER = [
+    'signal_id', 'timestamp', 'strategy', 'symbol', 'bar_index', 'signal_type',
+    'close', 'high', 'low', 'pSAR_UpValue', 'pSAR_DownValue',
+    'zoneATR', 'upZone', 'downZone', 'zoneDecider',
+    'greenZone', 'redZone', 'middleDonchian', 'upperDonchian',
+    'lowerDonchian', 'emaLower', 'emaMedium', 'hmaLong',
+    'position_opened', 'entry_price', 'exit_price', 'pnl_usdt', 'pnl_percent', 'position_closed_at'
+]
+
+SIGNAL_DATA = {'buy': True, 'close': 65000.5, 'atr': 12.5, 'zone_decider': 1, 'greenZone': True}
+
+
+def _logger(tmp_path):
+    return SignalLogger(db_filename=str(tmp_path / 'sinyal_kontrol.db'),
+                        csv_filename=str(tmp_path / 'sinyal_kontrol.csv'))
+
+
+def _row_count(logger):
+    connection = sqlite3.connect(logger.db_filename)
+    try:
+        return connection.execute('SELECT COUNT(*) FROM signals').fetchone()[0]
+    finally:
+        connection.close()
+
+
+def _write_signals(db_filename, csv_filename, worker, count):
+    """Ayrı süreçte sinyal yazar ve her birini açıp kapatır"""
+    logger = SignalLogger(db_filename=db_filename, csv_filename=csv_filename)
+    ids = []
+    for i in range(count):
+        signal_id = logger.log_signal(f'worker{worker}', 'BTCUSDT', dict(SIGNAL_DATA, bar_index=i))
+        logger.update_position_opened(signal_id, 100 + i)
+        logger.update_position_closed(signal_id, 101 + i, 1.5, 0.75)
+        ids.append(signal_id)
+    return ids
+
+
+def test_legacy_csv_import(tmp_path):
+    """Eski CSV ilk açılışta aktarılmalı; signal_id'si olmayan satırlara ID verilmeli"""
+    legacy = tmp_path / 'sinyal_kontrol.csv'
+    with open(legacy, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(LEGACY_HEADER)
+        writer.writerow(['abc12345', '2026-10-18 10:00:00', 'psar', 'BTCUSDT', '5', 'BUY', '65000.0000'] +
+                        [''] * 16 + ['true', '65000.0000', '', '', '', ''])
+    # Çok eski format: signal_id kolonu yok
+    old = tmp_path / 'old.csv'
+    with open(old, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(LEGACY_HEADER[1:7])
+        writer.writerow(['2026-10-17 09:00:00', 'eralp', 'ETHUSDT', '3', 'SELL', '2500.0000'])
+        writer.writerow(['2026-10-17 09:15:00', 'eralp', 'ETHUSDT', '4', 'BUY', '2510.0000'])
+
+    logger = _logger(tmp_path)
+    rows = logger.read_signals()
+    assert len(rows) == 1
+    assert rows[0]['signal_id'] == 'abc12345'
+    assert rows[0]['position_opened'] == 'true' and rows[0]['entry_price'] == '65000.0000'
+
+    # Tablo doluyken ikinci açılış tekrar aktarmaz
+    assert len(_logger(tmp_path).read_signals()) == 1
+
+    other = tmp_path / 'other'
+    other.mkdir()
+    os.replace(old, other / 'sinyal_kontrol.csv')
+    rows = _logger(other).read_signals()
+    assert [row['close'] for row in rows] == ['2500.0000', '2510.0000']
+    assert all(len(row['signal_id']) == 8 for row in rows)
+    assert rows[0]['signal_id'] != rows[1]['signal_id']
+    assert rows[0]['entry_price'] == ''
+
+
+def test_position_updates_change_exactly_one_row(tmp_path):
+    """update_position_opened/closed yalnızca verilen signal_id satırını değiştirmeli"""
+    logger = _logger(tmp_path)
+    ids = [logger.log_signal('psar', 'BTCUSDT', dict(SIGNAL_DATA, bar_index=i)) for i in range(5)]
+    before = {row['signal_id']: row for row in logger.read_signals()}
+
+    logger.update_position_opened(ids[2], 65010.25)
+    logger.update_position_closed(ids[2], 65100.0, 4.5, 1.25)
+    logger.update_position_closed('missing1', 1.0, 1.0, 1.0)
+
+    after = {row['signal_id']: row for row in logger.read_signals()}
+    assert len(after) == 5
+    changed = [signal_id for signal_id in ids if after[signal_id] != before[signal_id]]
+    assert changed == [ids[2]]
+    row = after[ids[2]]
+    assert row['position_opened'] == 'true'
+    assert row['entry_price'] == '65010.2500'
+    assert row['exit_price'] == '65100.0000'
+    assert row['pnl_usdt'] == '4.5000'
+    assert row['pnl_percent'] == '1.25%'
+    assert row['position_closed_at']
+    # Sinyal kolonlarına dokunulmaz
+    assert {name: row[name] for name in HEADER[:23]} == {name: before[ids[2]][name] for name in HEADER[:23]}
+
+
+def test_concurrent_writers(tmp_path):
+    """Aynı veritabanına birden fazla süreç yazdığında kayıt kaybolmamalı"""
+    logger = _logger(tmp_path)
+    first = logger.log_signal('main', 'BTCUSDT', SIGNAL_DATA)
+
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(4) as pool:
+        results = pool.starmap(_write_signals, [(logger.db_filename, logger.csv_filename, worker, 100)
+                                                for worker in range(4)])
+
+    ids = [signal_id for worker_ids in results for signal_id in worker_ids]
+    assert None not in ids
+    assert len(set(ids + [first])) == 401
+    assert _row_count(logger) == 401
+
+    rows = logger.read_signals()
+    closed = [row for row in rows if row['position_closed_at']]
+    assert len(closed) == 400
+    assert all(row['position_opened'] == 'true' and row['pnl_percent'] == '0.75%' for row in closed)
+
+
+def test_export_csv_keeps_legacy_header(tmp_path):
+    """export_csv eski sinyal_kontrol.csv başlığını ve kayıt sırasını korumalı"""
+    logger = _logger(tmp_path)
+    ids = [logger.log_signal('atr', 'SOLUSDT', dict(SIGNAL_DATA, bar_index=i)) for i in range(3)]
+
+    buffer = io.StringIO()
+    assert logger.export_csv(buffer) == 3
+    rows = list(csv.reader(io.StringIO(buffer.getvalue())))
+    assert rows[0] == LEGACY_HEADER
+    assert [row[0] for row in rows[1:]] == ids
+
+    path = tmp_path / 'export.csv'
+    assert logger.export_csv(str(path)) == 3
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        assert list(csv.reader(f)) == rows
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    print("Signal Logger Test başlatılıyor...")
+    for test in (test_legacy_csv_import, test_position_updates_change_exactly_one_row, test_concurrent_writers,
+                 test_export_csv_keeps_legacy_header):
+        with tempfile.TemporaryDirectory() as directory:
+            test(Path(directory))
+    print("\nTest tamamlandı!")
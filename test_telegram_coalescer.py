@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Telegram Coalescer Test Script
+Bu script, Telegram bildirim birleştirme katmanını sahte bir gönderici ve kısa sürelerle
+kontrol eder: işlem bildirimlerinin bastırılmadan geçmesi, dedup süresi içindeki tekrarların
+bastırılıp "N kez tekrarlandı" notuyla gönderilmesi ve sembol bazında uyarı özetleri.
+"""
+
+import time
+
+from core.telegram.coalescer import PRIORITY_ALERT, PRIORITY_TRADE, NotificationCoalescer
+
+
+class _FakeDelivery:
+    """Gönderilen mesajları kaydeden gönderici"""
+
+    def __init__(self):
+        self.messages = []
+        self.closed = False
+
+    def submit(self, notifier, message):
+        self.messages.append((notifier.symbol, message))
+        return True
+
+    def close(self, timeout=10):
+        self.closed = True
+        return True
+
+    def _ensure_started(self):
+        pass
+
+
+class _Notifier:
+    def __init__(self, symbol):
+        self.symbol = symbol
+
+
+BTC = _Notifier('BTCUSDT')
+ETH = _Notifier('ETHUSDT')
+
+
+def _coalescer(dedup_seconds, digest_seconds):
+    delivery = _FakeDelivery()
+    return NotificationCoalescer(dedup_seconds, digest_seconds, delivery=delivery), delivery
+
+
+def test_trade_messages_bypass_coalescing():
+    """İşlem bildirimleri hiç bastırılmamalı; süreler 0 ise birleştirme kapalı olmalı"""
+    coalescer, delivery = _coalescer(0.2, 0.2)
+    try:
+        for _ in range(3):
+            assert coalescer.submit(BTC, '🟢 LONG pozisyon açıldı')
+        assert coalescer.submit(BTC, '🚨 Emir hatası', priority=PRIORITY_TRADE)
+        assert delivery.messages == [('BTCUSDT', '🟢 LONG pozisyon açıldı')] * 3 + [('BTCUSDT', '🚨 Emir hatası')]
+        assert coalescer.suppressed == {'duplicate': 0, 'digest': 0}
+        assert coalescer._thread is None
+    finally:
+        coalescer.close()
+
+    coalescer, delivery = _coalescer(0, 0)
+    assert not coalescer.enabled
+    for _ in range(2):
+        coalescer.submit(BTC, '⚠️ Uyarı')
+    assert len(delivery.messages) == 2
+
+
+def test_duplicates_suppressed_within_window_with_repeat_note():
+    """Aynı sembolün aynı metni dedup süresi içinde bastırılmalı, süre dolunca tekrar notu gönderilmeli"""
+    coalescer, delivery = _coalescer(0.2, 0)
+    try:
+        for _ in range(4):
+            assert coalescer.submit(BTC, '🚨 Bağlantı hatası')
+        coalescer.submit(ETH, '🚨 Bağlantı hatası')
+        assert delivery.messages == [('BTCUSDT', '🚨 Bağlantı hatası'), ('ETHUSDT', '🚨 Bağlantı hatası')]
+        assert coalescer.suppressed['duplicate'] == 3
+
+        # Süre dolmadan flush bir şey göndermez
+        assert coalescer.flush() == 0
+
+        time.sleep(0.25)
+        assert coalescer.flush() == 1
+        symbol, note = delivery.messages[-1]
+        assert symbol == 'BTCUSDT'
+        assert note.startswith('🚨 Bağlantı hatası\n\n🔁 Son 0 sn içinde 3 kez tekrarlandı')
+        # Tekrarı olmayan ETH kaydı temizlenir
+        assert ('ETHUSDT', '🚨 Bağlantı hatası') not in coalescer._recent
+
+        # Hata sürüyor: not sonrası yeni pencere açılır; süre dolunca gelen mesaj bekleyen tekrarları taşır
+        coalescer.submit(BTC, '🚨 Bağlantı hatası')
+        assert len(delivery.messages) == 3
+        time.sleep(0.25)
+        coalescer.submit(BTC, '🚨 Bağlantı hatası')
+        assert delivery.messages[-1][1].endswith('1 kez tekrarlandı')
+        assert coalescer.suppressed['duplicate'] == 4
+    finally:
+        coalescer.close()
+
+
+def test_per_symbol_digest():
+    """Sembolün ilk uyarısı hemen gitmeli, seri içindeki diğerleri sembol bazında tek özette toplanmalı"""
+    coalescer, delivery = _coalescer(0, 0.1)
+    try:
+        coalescer.submit(BTC, '⚠️ Düşük bakiye')
+        coalescer.submit(BTC, '⚠️ Yüksek spread')
+        coalescer.submit(BTC, '⚠️ Yüksek spread')
+        coalescer.submit(BTC, '⚠️ Gecikmeli veri')
+        coalescer.submit(ETH, '⚠️ Düşük bakiye')
+        # Seri içinde yeni kritik hata özete girmez, hemen gönderilir
+        coalescer.submit(BTC, '🚨 Emir reddedildi', priority=PRIORITY_ALERT)
+
+        assert delivery.messages == [('BTCUSDT', '⚠️ Düşük bakiye'), ('ETHUSDT', '⚠️ Düşük bakiye'),
+                                     ('BTCUSDT', '🚨 Emir reddedildi')]
+        assert coalescer.suppressed['digest'] == 3
+
+        time.sleep(0.15)
+        assert coalescer.flush() == 1
+        symbol, digest = delivery.messages[-1]
+        assert symbol == 'BTCUSDT'
+        assert digest.splitlines() == ['📋 <b>BTCUSDT uyarı özeti</b> (son 0 sn, 3 bildirim)',
+                                       '• ⚠️ Yüksek spread (×2)',
+                                       '• ⚠️ Gecikmeli veri (×1)']
+        assert coalescer._bursts == {}
+        assert coalescer.digests == 1
+
+        # Seri bittikten sonraki ilk uyarı yine hemen gider
+        coalescer.submit(BTC, '⚠️ Yüksek spread')
+        assert delivery.messages[-1] == ('BTCUSDT', '⚠️ Yüksek spread')
+    finally:
+        coalescer.close()
+
+
+def test_close_sends_pending_digest():
+    """close() süresi dolmamış özetleri ve tekrar notlarını da göndermeli ve göndericiyi kapatmalı"""
+    coalescer, delivery = _coalescer(60, 60)
+    coalescer.submit(BTC, '⚠️ A')
+    coalescer.submit(BTC, '⚠️ B')
+    coalescer.submit(BTC, '⚠️ A')
+
+    assert coalescer.close()
+    assert delivery.closed
+    assert len(delivery.messages) == 3
+    assert delivery.messages[1][1].endswith('• ⚠️ B (×1)')
+    assert delivery.messages[2][1].endswith('1 kez tekrarlandı')
+    assert coalescer._recent == {} and coalescer._bursts == {}
+
+
+if __name__ == "__main__":
+    print("Telegram Coalescer Test başlatılıyor...")
+    test_trade_messages_bypass_coalescing()
+    test_duplicates_suppressed_within_window_with_repeat_note()
+    test_per_symbol_digest()
+    test_close_sends_pending_digest()
+    print("\nTest tamamlandı!")
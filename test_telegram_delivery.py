@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Telegram Delivery Test Script
+Bu script, arka plan Telegram göndericisini sahte bir notifier ile kontrol eder: 429 cevabında
+retry_after kadar beklenmesi, üstel artan tekrar deneme süreleri, close() sırasında kalan
+mesajların birer kez denenmesi ve kuyruk doluyken mesajların DROPPED olarak yazılması.
+"""
+
+import threading
+import time
+
+from core.telegram.delivery import TelegramDelivery
+
+
+class _StubNotifier:
+    """_attempt sonuçları sırayla script'ten dönen notifier; script bitince son sonuç tekrarlanır"""
+
+    def __init__(self, script, chat_id='42', symbol='BTCUSDT', gate=None):
+        self.script = list(script)
+        self.chat_id = chat_id
+        self.symbol = symbol
+        self.gate = gate
+        self.attempts = []
+        self.finished = []
+        self.csv_rows = []
+        self.attempted = threading.Event()
+
+    def _attempt(self, message):
+        self.attempts.append(message)
+        self.attempted.set()
+        if self.gate is not None:
+            self.gate.wait(10)
+        return self.script.pop(0) if len(self.script) > 1 else self.script[0]
+
+    def _finish(self, message, ok, error_msg):
+        self.finished.append((message, ok, error_msg))
+
+    def _log_to_csv(self, message, status, error_msg=''):
+        self.csv_rows.append((message, status, error_msg))
+
+
+class _RecordingEvent(threading.Event):
+    """Beklenen süreleri kaydeder, gerçekten beklemez"""
+
+    def __init__(self):
+        super().__init__()
+        self.waits = []
+
+    def wait(self, timeout=None):
+        self.waits.append(timeout)
+        return self.is_set()
+
+
+OK = (True, None, False, None)
+
+
+def _delivery(**kwargs):
+    kwargs.setdefault('chat_interval', 0)
+    delivery = TelegramDelivery(**kwargs)
+    delivery._closing = _RecordingEvent()
+    return delivery
+
+
+def test_rate_limit_waits_retry_after():
+    """429 cevabında Telegram'ın verdiği retry_after kadar beklenip tekrar denenmeli"""
+    delivery = _delivery(backoff=1.0)
+    notifier = _StubNotifier([(False, 'HTTP 429: Too Many Requests', True, 7), OK])
+
+    delivery._deliver(notifier, 'mesaj')
+
+    assert delivery._closing.waits == [7]
+    assert notifier.attempts == ['mesaj', 'mesaj']
+    assert notifier.finished == [('mesaj', True, None)]
+    assert (delivery.sent, delivery.failed, delivery.retries) == (1, 0, 1)
+
+
+def test_exponential_backoff_until_max_attempts():
+    """Ağ/5xx hatalarında bekleme süresi ikiye katlanmalı, max_backoff'u aşmamalı ve max_attempts'te bırakılmalı"""
+    delivery = _delivery(max_attempts=5, backoff=1.0, max_backoff=3.0)
+    notifier = _StubNotifier([(False, 'HTTP 502', True, None)])
+
+    delivery._deliver(notifier, 'mesaj')
+
+    assert delivery._closing.waits == [1.0, 2.0, 3.0, 3.0]
+    assert len(notifier.attempts) == 5
+    assert notifier.finished == [('mesaj', False, 'HTTP 502')]
+    assert (delivery.sent, delivery.failed, delivery.retries) == (0, 1, 4)
+
+    # Tekrar denenmeyecek hata (ör. 400) tek denemede bırakılır
+    notifier = _StubNotifier([(False, 'HTTP 400', False, None)])
+    delivery._deliver(notifier, 'hatalı')
+    assert notifier.attempts == ['hatalı']
+    assert delivery.failed == 2 and delivery.retries == 4
+
+
+def test_close_drains_queue_with_single_attempts():
+    """close() bekleyen tekrar denemeyi kesmeli ve kuyrukta kalan mesajları birer kez denemeli"""
+    delivery = TelegramDelivery(chat_interval=0, max_attempts=4, backoff=30.0)
+    notifier = _StubNotifier([(False, 'Bağlantı hatası', True, None)])
+
+    for i in range(3):
+        assert delivery.submit(notifier, f'mesaj {i}')
+    # İlk mesaj 30 sn'lik tekrar bekleme sürecine girene kadar beklenir
+    deadline = time.monotonic() + 5
+    while delivery.retries == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert delivery.retries == 1 and delivery.depth == 2
+
+    assert delivery.close(timeout=5)
+    assert notifier.attempts == ['mesaj 0', 'mesaj 0', 'mesaj 1', 'mesaj 2']
+    assert [ok for _, ok, _ in notifier.finished] == [False, False, False]
+    assert (delivery.failed, delivery.retries) == (3, 1)
+
+
+def test_full_queue_drops_and_logs():
+    """Kuyruk doluyken yeni mesaj atılmalı, DROPPED olarak CSV'ye yazılmalı ve sayılmalı"""
+    gate = threading.Event()
+    delivery = TelegramDelivery(max_queue=1, chat_interval=0)
+    notifier = _StubNotifier([OK], gate=gate)
+
+    assert delivery.submit(notifier, 'gönderiliyor')
+    assert notifier.attempted.wait(5)
+    assert delivery.submit(notifier, 'kuyrukta')
+    assert not delivery.submit(notifier, 'atılan')
+
+    assert delivery.dropped == 1
+    assert notifier.csv_rows == [('atılan', 'DROPPED', 'Telegram kuyruğu dolu')]
+
+    gate.set()
+    assert delivery.flush(timeout=5)
+    assert notifier.attempts == ['gönderiliyor', 'kuyrukta']
+    assert delivery.sent == 2
+    assert dict(delivery._collect_metrics()[0][4])[('dropped',)] == 1
+
+
+if __name__ == "__main__":
+    print("Telegram Delivery Test başlatılıyor...")
+    test_rate_limit_waits_retry_after()
+    test_exponential_backoff_until_max_attempts()
+    test_close_drains_queue_with_single_attempts()
+    test_full_queue_drops_and_logs()
+    print("\nTest tamamlandı!")
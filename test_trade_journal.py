@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Trade Journal Test Script
+Bu script, işlem günlüğünün kuyruk doluyken davranışını kontrol eder: emir kayıtları
+yer açılana kadar bekler, tanı kayıtları atılıp sayılır, yalnızca emir kaydı içeren
+toplu yazımlar fsync edilir ve flush() kuyruğu boşaltır.
+"""
+
+import csv
+import threading
+from datetime import datetime
+
+from core import trade_journal as trade_journal_module
+from core.trade_journal import TRADE_ACTIVITY_HEADER, TradeJournal
+
+
+def _read_rows(path):
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return list(csv.reader(f))
+
+
+def _blocked_journal(path, max_queue):
+    """Yazıcı thread'i ilk kayıtta gate açılana kadar bekleyen günlük"""
+    journal = TradeJournal(max_queue=max_queue, batch_size=2)
+    started = threading.Event()
+    gate = threading.Event()
+
+    def blocking_row():
+        started.set()
+        gate.wait(10)
+        return ['2026-10-19 00:00:00', 'BTCUSDT', 'POSITION_OPEN', 'BUY', '', '', 'gate', '']
+
+    journal.append(path, TRADE_ACTIVITY_HEADER, blocking_row, (), durable=True)
+    assert started.wait(5), "Yazıcı thread'i başlamadı"
+    return journal, gate
+
+
+def test_full_queue_blocks_orders_and_drops_diagnostics(tmp_path):
+    """Kuyruk doluyken tanı kayıtları atılmalı, emir kayıtları beklemeli ve hiçbiri kaybolmamalı"""
+    path = str(tmp_path / 'psar_trades_btcusdt.csv')
+    journal, gate = _blocked_journal(path, max_queue=5)
+
+    accepted = []
+
+    def diagnostics():
+        for _ in range(10):
+            accepted.append(journal.trade_activity(path, 'BTCUSDT', 'SIGNAL', details='tanı'))
+
+    threads = [threading.Thread(target=diagnostics) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    assert accepted.count(True) == 5
+    assert journal.dropped == 35
+
+    def orders():
+        for _ in range(2):
+            journal.trade_activity(path, 'BTCUSDT', 'POSITION_OPEN', 'BUY', 0.01, 65000)
+
+    order_threads = [threading.Thread(target=orders) for _ in range(3)]
+    for thread in order_threads:
+        thread.start()
+    for thread in order_threads:
+        thread.join(0.2)
+    # Kuyruk dolu: emir kayıtları atılmaz, yer açılmasını bekler
+    assert all(thread.is_alive() for thread in order_threads)
+    assert journal.dropped == 35
+
+    gate.set()
+    for thread in order_threads:
+        thread.join(5)
+    assert journal.flush(timeout=5)
+    assert journal.depth == 0 and journal._queue.unfinished_tasks == 0
+
+    rows = _read_rows(path)
+    assert rows.count(list(TRADE_ACTIVITY_HEADER)) == 1
+    assert rows[0] == list(TRADE_ACTIVITY_HEADER)
+    body = rows[1:]
+    assert len(body) == 1 + 5 + 6
+    assert sum(row[2] == 'SIGNAL' for row in body) == 5
+    assert sum(row[2] == 'POSITION_OPEN' for row in body) == 7
+    assert journal.written == 12
+
+
+def test_only_durable_groups_are_fsynced(tmp_path, monkeypatch):
+    """Tanı kayıtları fsync edilmemeli; emir ve pozisyon kapanış kayıtları edilmeli"""
+    synced = []
+    real_fsync = trade_journal_module.os.fsync
+    monkeypatch.setattr(trade_journal_module.os, 'fsync', lambda fd: synced.append(fd) or real_fsync(fd))
+
+    journal = TradeJournal()
+    trades = str(tmp_path / 'atr_trades_ethusdt.csv')
+    positions = str(tmp_path / 'atr_positions_ethusdt.csv')
+
+    journal.trade_activity(trades, 'ETHUSDT', 'SIGNAL', details='tanı')
+    assert journal.flush(timeout=5)
+    assert synced == []
+
+    journal.trade_activity(trades, 'ETHUSDT', 'POSITION_OPEN', 'SELL', 0.5, 2500)
+    assert journal.flush(timeout=5)
+    assert len(synced) == 1
+
+    journal.position_close(positions, datetime(2026, 10, 19, 1, 0), 'ETHUSDT', 'SHORT', 2500, 2490, 0.4, 4.0, 'TP')
+    assert journal.flush(timeout=5)
+    assert len(synced) == 2
+
+    assert len(_read_rows(trades)) == 3
+    assert _read_rows(positions)[1] == ['2026-10-19 01:00:00', 'ETHUSDT', 'SHORT', '2500.0000', '2490.0000',
+                                        '+0.40%', '+4.00%', 'TP']
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    print("Trade Journal Test başlatılıyor...")
+    with tempfile.TemporaryDirectory() as directory:
+        test_full_queue_blocks_orders_and_drops_diagnostics(Path(directory))
+    print("\nTest tamamlandı!")